@@ -0,0 +1,3 @@
+"""
+Benchmarks de l'import NetCDF -> DuckDB
+"""
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'import NetCDF -> DuckDB sur des fichiers SAFRAN synthétiques
+
+Chaque cas (variable × mode) est exécuté dans un processus neuf, sur une base
+vide, pour mesurer un pic de mémoire propre à l'import. Les résultats (lignes/s,
+MB/s lus, pic RSS, taille finale de la base) sont écrits en JSON pour comparer
+les exécutions.
+
+Usage:
+    poetry run python benchmarks/bench_import.py --years 2015-2016 --output bench.json
+    poetry run python benchmarks/bench_import.py --ny 40 --nx 40 --modes grid --bulk-load
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Ajouter le répertoire backend au path pour les imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+import duckdb
+
+from duckdb_loader import DuckDBClimateLoader
+from models import VariableType, ExperimentType
+from points_config import get_all_points
+from benchmarks.generate_safran import SAFRAN_SHAPE, VARIABLES, synthetic_filename, write_safran_file, parse_years
+
+BENCH_VARIABLES = {
+    "prAdjust": VariableType.PR,
+    "tasAdjust": VariableType.TAS,
+}
+
+MODES = ("points", "grid")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du processus courant (MB), None si indisponible"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en KB sous Linux
+    return round(peak / 1e6 if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def init_case_worker():
+    """Redirige la sortie du processus fils vers stderr (stdout reste réservé au JSON)"""
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+
+def run_case(file_path: str, variable: str, mode: str, db_path: str, options: dict) -> dict:
+    """
+    Importe un fichier dans une base vide et mesure l'import (exécuté dans un processus fils).
+    
+    Returns:
+        Mesures du cas (durées, débits, pic RSS, taille de la base)
+    """
+    if mode == "points":
+        lat_filter, lon_filter = get_all_points(format="lat_lon")
+    else:
+        lat_filter, lon_filter = None, None
+    
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    with DuckDBClimateLoader(db_path=db_path, read_only=False) as loader:
+        rows = loader.import_netcdf_file(
+            file_path=file_path,
+            variable=BENCH_VARIABLES[variable],
+            experiment=ExperimentType.SSP370,
+            gcm="CNRM-ESM2-1",
+            rcm="CNRM-ALADIN63-EMUL",
+            member="r1",
+            lat_filter=lat_filter,
+            lon_filter=lon_filter,
+            **options
+        )
+        stats = loader.last_import_stats
+        loader.conn.execute("CHECKPOINT")
+    elapsed = time.perf_counter() - start
+    
+    result = {
+        "variable": variable,
+        "mode": mode,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "mb_read": round(stats["bytes_read"] / 1e6, 2),
+        "mb_per_second": round(stats["bytes_read"] / 1e6 / elapsed, 2) if elapsed > 0 else None,
+        "read_seconds": round(stats["read_seconds"], 3),
+        "read_mb_per_second": round(stats["read_mb_s"], 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": rss_before,
+        "db_size_mb": round(Path(db_path).stat().st_size / 1e6, 2),
+    }
+    for key in ("inserted", "duplicates"):
+        if key in stats:
+            result[key] = stats[key]
+    if "stages" in stats:
+        result["stages"] = {
+            name: {k: round(v, 3) if isinstance(v, float) else v for k, v in stage.items()}
+            for name, stage in stats["stages"].items()
+        }
+    return result
+
+
+def parse_args():
+    """Analyse les options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Benchmark de l'import NetCDF -> DuckDB")
+    parser.add_argument("--years", type=parse_years, default=(2015, 2016), help="Période générée, ex: 2015-2019")
+    parser.add_argument("--ny", type=int, default=SAFRAN_SHAPE[0], help=f"Mailles en y (défaut: {SAFRAN_SHAPE[0]})")
+    parser.add_argument("--nx", type=int, default=SAFRAN_SHAPE[1], help=f"Mailles en x (défaut: {SAFRAN_SHAPE[1]})")
+    parser.add_argument("--variables", nargs="+", choices=list(VARIABLES), default=list(VARIABLES))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--compress", action="store_true", help="Fichiers générés compressés (zlib)")
+    parser.add_argument("--max-block-mb", type=float, default=256, help="Budget mémoire d'un bloc de lecture")
+    parser.add_argument("--pipelined", action="store_true", help="Import en mode pipeline")
+    parser.add_argument("--bulk-load", action="store_true", help="Import via table de staging")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="Répertoire des fichiers générés, réutilisés s'ils existent (défaut: temporaire)")
+    parser.add_argument("--output", type=Path, default=None, help="Fichier JSON de résultats (défaut: stdout)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start_year, end_year = args.years
+    
+    work_dir = Path(tempfile.mkdtemp(prefix="agroclimavisio_bench_"))
+    data_dir = args.data_dir or work_dir
+    options = {"max_block_mb": args.max_block_mb, "pipelined": args.pipelined, "bulk_load": args.bulk_load}
+    
+    # Un processus neuf par cas: le pic RSS ne cumule pas les cas précédents
+    ctx = multiprocessing.get_context("spawn")
+    cases = []
+    try:
+        for variable in args.variables:
+            path = data_dir / f"{args.ny}x{args.nx}" / synthetic_filename(variable, start_year, end_year)
+            if not path.exists():
+                print(f"🧪 Génération de {path.name} ({args.ny}×{args.nx}, {start_year}-{end_year})...", file=sys.stderr)
+                write_safran_file(path, variable, start_year, end_year, args.ny, args.nx, compress=args.compress)
+            
+            for mode in args.modes:
+                db_path = work_dir / f"{variable}_{mode}.duckdb"
+                print(f"⏱️  {variable} / {mode}...", file=sys.stderr)
+                with ctx.Pool(1, initializer=init_case_worker) as pool:
+                    result = pool.apply(run_case, (str(path), variable, mode, str(db_path), options))
+                result["file_mb"] = round(path.stat().st_size / 1e6, 2)
+                cases.append(result)
+                print(f"   ✅ {result['rows']:,} lignes, {result['rows_per_second']:,.0f} lignes/s, "
+                      f"{result['mb_per_second']} MB/s, pic {result['peak_rss_mb']} MB, "
+                      f"base {result['db_size_mb']} MB", file=sys.stderr)
+                db_path.unlink(missing_ok=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "platform": platform.platform(),
+        "grid": [args.ny, args.nx],
+        "years": [start_year, end_year],
+        "options": options,
+        "cases": cases,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n")
+        print(f"📄 Résultats écrits dans {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
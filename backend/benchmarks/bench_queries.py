@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark des endpoints de graphiques avant/après optimize_layout (tri de la table)
+
+Une base est construite à partir de fichiers SAFRAN synthétiques (pr et tas,
+plusieurs membres), importés dans l'ordre des fichiers. Les endpoints
+/api/charts/monthly, /api/charts/cover-crop-feasibility et /api/charts/corn-viability
+sont chronométrés, puis la table est réécrite triée et les mêmes requêtes sont
+rejouées. Les résultats sont écrits en JSON.
+
+Usage:
+    poetry run python benchmarks/bench_queries.py --years 2015-2024 --members 3
+    poetry run python benchmarks/bench_queries.py --ny 60 --nx 60 --normalized --output queries.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire backend au path pour les imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import duckdb
+
+import main
+from duckdb_loader import DuckDBClimateLoader
+from models import VariableType, ExperimentType
+from benchmarks.generate_safran import SAFRAN_SHAPE, synthetic_filename, write_safran_file, parse_years
+
+BENCH_VARIABLES = {
+    "prAdjust": VariableType.PR,
+    "tasAdjust": VariableType.TAS,
+}
+
+
+def chart_requests(start_year: int, end_year: int):
+    """Requêtes des endpoints de graphiques: (nom, fonction, requête)"""
+    return [
+        ("monthly_pr", main.get_monthly_chart_data, main.MonthlyChartRequest(
+            start_date=f"{start_year}-01-01", end_date=f"{end_year}-12-31", variable="pr"
+        )),
+        ("monthly_tas_one_city", main.get_monthly_chart_data, main.MonthlyChartRequest(
+            start_date=f"{start_year}-01-01", end_date=f"{end_year}-12-31", variable="tas", cities=["Chartres"]
+        )),
+        ("cover_crop", main.get_cover_crop_feasibility, main.CoverCropFeasibilityRequest(
+            city="Chartres", start_year=start_year, end_year=end_year
+        )),
+        ("corn", main.get_corn_viability, main.CornViabilityRequest(
+            city="Orléans", start_year=start_year, end_year=end_year
+        )),
+    ]
+
+
+def time_requests(requests, repeat: int) -> dict:
+    """Meilleur temps (ms) de chaque endpoint sur repeat exécutions"""
+    timings = {}
+    for name, endpoint, request in requests:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = asyncio.run(endpoint(request))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if response.get("error"):
+            raise RuntimeError(f"{name}: {response['error']}")
+        timings[name] = round(best * 1000, 1)
+    return timings
+
+
+def parse_args():
+    """Analyse les options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Benchmark des endpoints de graphiques avant/après --optimize")
+    parser.add_argument("--years", type=parse_years, default=(2015, 2019), help="Période générée, ex: 2015-2024")
+    parser.add_argument("--ny", type=int, default=SAFRAN_SHAPE[0], help=f"Mailles en y (défaut: {SAFRAN_SHAPE[0]})")
+    parser.add_argument("--nx", type=int, default=SAFRAN_SHAPE[1], help=f"Mailles en x (défaut: {SAFRAN_SHAPE[1]})")
+    parser.add_argument("--members", type=int, default=2, help="Nombre de membres d'ensemble")
+    parser.add_argument("--normalized", action="store_true", help="Schéma normalisé (runs, cells, climate_values)")
+    parser.add_argument("--repeat", type=int, default=3, help="Exécutions par endpoint (meilleur temps retenu)")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="Répertoire des fichiers générés, réutilisés s'ils existent (défaut: temporaire)")
+    parser.add_argument("--output", type=Path, default=None, help="Fichier JSON de résultats (défaut: stdout)")
+    return parser.parse_args()
+
+
+def main_bench():
+    args = parse_args()
+    start_year, end_year = args.years
+    members = [f"r{i}" for i in range(1, args.members + 1)]
+    
+    work_dir = Path(tempfile.mkdtemp(prefix="agroclimavisio_bench_"))
+    data_dir = args.data_dir or work_dir
+    db_path = work_dir / "climate_data.duckdb"
+    try:
+        # Messages de progression de l'import sur stderr: stdout reste réservé au JSON
+        with contextlib.redirect_stdout(sys.stderr), \
+                DuckDBClimateLoader(db_path=str(db_path), read_only=False, normalized=args.normalized) as loader:
+            import_start = time.perf_counter()
+            for variable_name, variable in BENCH_VARIABLES.items():
+                for seed, member in enumerate(members):
+                    path = data_dir / f"{args.ny}x{args.nx}" / synthetic_filename(variable_name, start_year, end_year, member)
+                    if not path.exists():
+                        print(f"🧪 Génération de {path.name}...", file=sys.stderr)
+                        write_safran_file(path, variable_name, start_year, end_year, args.ny, args.nx, seed=seed)
+                    loader.import_netcdf_file(
+                        file_path=str(path),
+                        variable=variable,
+                        experiment=ExperimentType.SSP370,
+                        gcm="CNRM-ESM2-1",
+                        rcm="CNRM-ALADIN63-EMUL",
+                        member=member,
+                        bulk_load=True
+                    )
+            loader.conn.execute("CHECKPOINT")
+            rows = loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0]
+            import_seconds = time.perf_counter() - import_start
+            
+            # Les endpoints utilisent le chargeur partagé de l'API
+            main._duckdb_loader = loader
+            requests = chart_requests(start_year, end_year)
+            
+            print("⏱️  Endpoints, ordre d'import...", file=sys.stderr)
+            before = {"db_size_mb": round(db_path.stat().st_size / 1e6, 2), "ms": time_requests(requests, args.repeat)}
+            
+            optimize_start = time.perf_counter()
+            loader.optimize_layout()
+            optimize_seconds = time.perf_counter() - optimize_start
+            
+            print("⏱️  Endpoints, table triée...", file=sys.stderr)
+            after = {"db_size_mb": round(db_path.stat().st_size / 1e6, 2), "ms": time_requests(requests, args.repeat)}
+            main._duckdb_loader = None
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    for name in before["ms"]:
+        print(f"   {name}: {before['ms'][name]:,.1f} ms -> {after['ms'][name]:,.1f} ms "
+              f"(x{before['ms'][name] / max(after['ms'][name], 1e-9):.1f})", file=sys.stderr)
+    
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "platform": platform.platform(),
+        "grid": [args.ny, args.nx],
+        "years": [start_year, end_year],
+        "members": members,
+        "layout": "normalized" if args.normalized else "long",
+        "rows": rows,
+        "import_seconds": round(import_seconds, 1),
+        "optimize_seconds": round(optimize_seconds, 1),
+        "before": before,
+        "after": after,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n")
+        print(f"📄 Résultats écrits dans {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main_bench()
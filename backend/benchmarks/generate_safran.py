@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Générateur de fichiers NetCDF synthétiques au format des projections Météo-France
+(grille SAFRAN 8 km, time × y × x, lat/lon 2D, prAdjust/tasAdjust)
+
+Usage: poetry run python benchmarks/generate_safran.py --years 2015-2019 --output-dir /tmp/bench
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import netCDF4 as nc
+
+# Grille SAFRAN France métropolitaine (Lambert-II étendu, 8 km)
+SAFRAN_SHAPE = (134, 143)
+
+# Emprise approximative de la grille (degrés)
+LAT_RANGE = (41.3, 51.2)
+LON_RANGE = (-5.2, 9.6)
+
+VARIABLES = {
+    "prAdjust": {
+        "units": "kg m-2 s-1",
+        "long_name": "Bias-Adjusted Precipitation",
+        "standard_name": "precipitation_flux",
+    },
+    "tasAdjust": {
+        "units": "K",
+        "long_name": "Bias-Adjusted Near-Surface Air Temperature",
+        "standard_name": "air_temperature",
+    },
+}
+
+
+def synthetic_filename(variable: str, start_year: int, end_year: int, member: str = "r1") -> str:
+    """Nom de fichier au format des fichiers Météo-France (reconnu par import_to_duckdb.py)"""
+    return (
+        f"{variable}_FR-Metro_CNRM-ESM2-1_ssp370_{member}i1p1f2_CNRM-MF_CNRM-ALADIN63-EMUL_v1-r1_"
+        f"MF-CDFt-ANASTASIA-SAFRAN-1985-2014_day_{start_year}0101-{end_year}1231.nc"
+    )
+
+
+def safran_grid(ny: int, nx: int):
+    """
+    Coordonnées 2D (lat, lon) d'une grille curviligne couvrant la France.
+    
+    Returns:
+        Tuple (lat, lon, land) où land est le masque des mailles terrestres
+        (ellipse approchant le territoire, le reste est de la "mer" masquée)
+    """
+    y = np.linspace(0.0, 1.0, ny)[:, None]
+    x = np.linspace(0.0, 1.0, nx)[None, :]
+    # Légère courbure des lignes de latitude, comme une projection conique
+    lat = LAT_RANGE[0] + (LAT_RANGE[1] - LAT_RANGE[0]) * y + 0.4 * (x - 0.5) ** 2
+    lon = LON_RANGE[0] + (LON_RANGE[1] - LON_RANGE[0]) * x * (1.0 - 0.05 * (y - 0.5))
+    land = ((x - 0.55) / 0.5) ** 2 + ((y - 0.5) / 0.52) ** 2 <= 1.0
+    return lat, lon, land
+
+
+def synthetic_values(variable: str, day_of_year: np.ndarray, shape, rng: np.random.Generator) -> np.ndarray:
+    """Valeurs journalières plausibles (float32) pour un bloc de jours"""
+    season = np.cos(2 * np.pi * (day_of_year[:, None, None] - 200) / 365.25)
+    if variable == "tasAdjust":
+        noise = rng.normal(0.0, 3.0, size=(len(day_of_year),) + shape)
+        return (284.0 + 8.0 * season + noise).astype("f4")
+    # Précipitations: ~55 % de jours secs, intensités exponentielles (mm/jour -> kg m-2 s-1)
+    wet = rng.random((len(day_of_year),) + shape) > 0.55
+    amount = rng.exponential(4.0, size=wet.shape) * (1.0 - 0.2 * season)
+    return (np.where(wet, amount, 0.0) / 86400.0).astype("f4")
+
+
+def write_safran_file(
+    path: Path,
+    variable: str = "prAdjust",
+    start_year: int = 2015,
+    end_year: int = 2019,
+    ny: int = SAFRAN_SHAPE[0],
+    nx: int = SAFRAN_SHAPE[1],
+    compress: bool = False,
+    seed: Optional[int] = 0,
+    block_days: int = 366
+) -> Path:
+    """
+    Écrit un fichier NetCDF synthétique au format Météo-France.
+    
+    Args:
+        path: Fichier à écrire
+        variable: prAdjust ou tasAdjust
+        start_year: Première année (1er janvier)
+        end_year: Dernière année (31 décembre)
+        ny: Nombre de mailles en y
+        nx: Nombre de mailles en x
+        compress: Compression zlib (comme les fichiers distribués)
+        seed: Graine du générateur aléatoire
+        block_days: Nombre de jours écrits par bloc (limite la mémoire)
+    
+    Returns:
+        Chemin du fichier écrit
+    """
+    if variable not in VARIABLES:
+        raise ValueError(f"Variable non supportée: {variable} (attendu: {', '.join(VARIABLES)})")
+    
+    rng = np.random.default_rng(seed)
+    lat_grid, lon_grid, land = safran_grid(ny, nx)
+    
+    start = np.datetime64(f"{start_year}-01-01")
+    dates = np.arange(start, np.datetime64(f"{end_year + 1}-01-01"), dtype="datetime64[D]")
+    offsets = (dates - np.datetime64("1850-01-01")).astype(np.int64)
+    day_of_year = (dates - dates.astype("datetime64[Y]").astype("datetime64[D]")).astype(np.int64) + 1
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with nc.Dataset(path, "w") as ds:
+        ds.createDimension("time", None)
+        ds.createDimension("y", ny)
+        ds.createDimension("x", nx)
+        
+        time = ds.createVariable("time", "f8", ("time",))
+        time.units = "days since 1850-01-01 00:00:00"
+        time.calendar = "standard"
+        time.standard_name = "time"
+        time[:] = offsets
+        
+        lat = ds.createVariable("lat", "f8", ("y", "x"))
+        lat.units = "degrees_north"
+        lat[:] = lat_grid
+        lon = ds.createVariable("lon", "f8", ("y", "x"))
+        lon.units = "degrees_east"
+        lon[:] = lon_grid
+        
+        var = ds.createVariable(
+            variable, "f4", ("time", "y", "x"), fill_value=np.float32(1e20),
+            zlib=compress, chunksizes=(1, ny, nx)
+        )
+        var.setncatts(VARIABLES[variable])
+        
+        sea = ~land
+        for t0 in range(0, len(dates), block_days):
+            t1 = min(t0 + block_days, len(dates))
+            values = synthetic_values(variable, day_of_year[t0:t1], (ny, nx), rng)
+            var[t0:t1] = np.ma.masked_array(values, mask=np.broadcast_to(sea, values.shape))
+    
+    return path
+
+
+def parse_years(text: str):
+    """Analyse une période "2015-2019" (ou une seule année "2015")"""
+    first, _, last = text.partition("-")
+    return int(first), int(last or first)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère des fichiers NetCDF synthétiques au format SAFRAN")
+    parser.add_argument("--output-dir", type=Path, default=Path("benchmarks/data"), help="Répertoire de sortie")
+    parser.add_argument("--variables", nargs="+", default=list(VARIABLES), help="Variables à générer")
+    parser.add_argument("--years", type=parse_years, default=(2015, 2019), help="Période, ex: 2015-2019")
+    parser.add_argument("--ny", type=int, default=SAFRAN_SHAPE[0], help=f"Mailles en y (défaut: {SAFRAN_SHAPE[0]})")
+    parser.add_argument("--nx", type=int, default=SAFRAN_SHAPE[1], help=f"Mailles en x (défaut: {SAFRAN_SHAPE[1]})")
+    parser.add_argument("--compress", action="store_true", help="Compression zlib des valeurs")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur aléatoire")
+    args = parser.parse_args()
+    
+    start_year, end_year = args.years
+    for variable in args.variables:
+        path = args.output_dir / synthetic_filename(variable, start_year, end_year)
+        try:
+            write_safran_file(
+                path, variable, start_year, end_year, args.ny, args.nx,
+                compress=args.compress, seed=args.seed
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ {path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Bitmaps journaliers de dépassement de seuil (jours chauds, jours de pluie, jours secs)
+
+Un jour par bit, ordre little-endian: le jour d d'une série est le bit d % 64
+du mot d // 64. Le nombre de jours d'une période est un popcount des mots
+couverts, la plus longue suite de jours s'obtient en répétant x & (x >> 1)
+jusqu'à ce que plus aucun bit ne reste.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+WORD_BITS = 64
+
+# Nombre de bits à 1 de chaque octet (numpy < 2.0 n'a pas np.bitwise_count)
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Nombre de bits à 1 de chaque mot uint64"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).astype(np.int64)
+    counts = _BYTE_POPCOUNT[np.ascontiguousarray(words).view(np.uint8)]
+    return counts.reshape(words.shape + (8,)).sum(axis=-1, dtype=np.int64)
+
+
+def pack_flags(flags: np.ndarray) -> np.ndarray:
+    """
+    Compacte des indicateurs journaliers en mots de 64 bits.
+    
+    Args:
+        flags: Tableau booléen (m, n)
+    
+    Returns:
+        Tableau uint64 (m, ceil(n / 64)), bits au-delà de n à 0
+    """
+    m, n = flags.shape
+    n_words = -(-n // WORD_BITS)
+    padded = np.zeros((m, n_words * WORD_BITS), dtype=bool)
+    padded[:, :n] = flags
+    packed = np.packbits(padded, axis=1, bitorder="little")
+    return np.ascontiguousarray(packed).view("<u8").astype(np.uint64)
+
+
+def unpack_flags(words: np.ndarray, n: int) -> np.ndarray:
+    """Indicateurs journaliers (m, n) d'un tableau de mots uint64 (m, n_words)"""
+    as_bytes = np.ascontiguousarray(words.astype("<u8")).view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=n, bitorder="little").astype(bool)
+
+
+def _range_words(words: np.ndarray, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """
+    Mots couvrant chaque intervalle [first, last], bits hors intervalle à 0.
+    
+    Returns:
+        Tableau (m, q, largeur maximale en mots) aligné sur le premier mot de chaque intervalle
+    """
+    first_word, last_word = first // WORD_BITS, last // WORD_BITS
+    width = int((last_word - first_word).max()) + 1
+    offsets = first_word[:, None] + np.arange(width)
+    inside = offsets <= last_word[:, None]
+    padded = np.concatenate([words, np.zeros((words.shape[0], 1), dtype=np.uint64)], axis=1)
+    spans = padded[:, np.where(inside, offsets, words.shape[1])]
+    
+    # Bits avant first dans le premier mot et après last dans le dernier mot
+    all_bits = np.uint64(0xFFFFFFFFFFFFFFFF)
+    mask = np.full((len(first), width), all_bits, dtype=np.uint64)
+    mask[:, 0] &= all_bits << (first % WORD_BITS).astype(np.uint64)
+    tail = all_bits >> (WORD_BITS - 1 - last % WORD_BITS).astype(np.uint64)
+    mask[np.arange(len(first)), last_word - first_word] &= tail
+    return spans & mask
+
+
+def _clip_ranges(n: int, first, last):
+    """Intervalles ramenés dans [0, n - 1]; masque des intervalles non vides"""
+    first = np.maximum(np.asarray(first, dtype=np.int64), 0)
+    last = np.minimum(np.asarray(last, dtype=np.int64), n - 1)
+    return first, last, first <= last
+
+
+def count_in_ranges(words: np.ndarray, n: int, first, last) -> np.ndarray:
+    """
+    Nombre de bits à 1 de chaque série sur des intervalles de jours.
+    
+    Args:
+        words: Bitmaps (m, n_words)
+        n: Nombre de jours des séries
+        first: Premiers jours (q,), inclus
+        last: Derniers jours (q,), inclus
+    
+    Returns:
+        Tableau int64 (m, q)
+    """
+    first, last, valid = _clip_ranges(n, first, last)
+    counts = np.zeros((words.shape[0], len(first)), dtype=np.int64)
+    if valid.any():
+        counts[:, valid] = popcount(_range_words(words, first[valid], last[valid])).sum(axis=2)
+    return counts
+
+
+def longest_runs(words: np.ndarray, n: int, first, last) -> np.ndarray:
+    """
+    Plus longue suite de bits à 1 de chaque série sur des intervalles de jours.
+    
+    Chaque itération x &= x >> 1 (avec retenue d'un mot à l'autre) raccourcit
+    toutes les suites d'un jour: le nombre d'itérations avant qu'un intervalle
+    ne soit vide est la longueur de sa plus longue suite.
+    
+    Args:
+        words: Bitmaps (m, n_words)
+        n: Nombre de jours des séries
+        first: Premiers jours (q,), inclus
+        last: Derniers jours (q,), inclus
+    
+    Returns:
+        Tableau int64 (m, q)
+    """
+    first, last, valid = _clip_ranges(n, first, last)
+    runs = np.zeros((words.shape[0], len(first)), dtype=np.int64)
+    if not valid.any():
+        return runs
+    
+    spans = _range_words(words, first[valid], last[valid])
+    longest = np.zeros(spans.shape[:2], dtype=np.int64)
+    one, carry_shift = np.uint64(1), np.uint64(WORD_BITS - 1)
+    remaining = spans.any(axis=2)
+    while remaining.any():
+        longest += remaining
+        shifted = spans >> one
+        shifted[:, :, :-1] |= spans[:, :, 1:] << carry_shift
+        spans &= shifted
+        remaining = spans.any(axis=2)
+    runs[:, valid] = longest
+    return runs
@@ -5,6 +5,7 @@ Module pour charger et traiter les données climatiques NetCDF
 try:
     import xarray as xr
     import numpy as np
+    from time_axis import load_time_axis
     XARRAY_AVAILABLE = True
 except ImportError:
     XARRAY_AVAILABLE = False
@@ -38,6 +39,8 @@ except ImportError:
         SSP245 = "ssp245"
         SSP126 = "ssp126"
 
+from units import MM_PER_DAY, CELSIUS, convert_units
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +55,8 @@ class ClimateDataLoader:
             data_directory: Chemin vers le répertoire contenant les fichiers NetCDF
         """
         self.data_directory = Path(data_directory) if data_directory else None
+        # Cache disque des axes temporels décodés (partagé avec l'import DuckDB)
+        self.cache_dir = self.data_directory / ".cache" if self.data_directory else None
         self._cache: Dict[str, xr.Dataset] = {}
     
     def load_dataset(
@@ -157,7 +162,7 @@ class ClimateDataLoader:
         
         try:
             logger.info(f"Chargement du fichier: {file_path}")
-            ds = xr.open_dataset(file_path)
+            ds = self._decode_time(xr.open_dataset(file_path, decode_times=False), file_path)
             
             # Sélectionner l'année si spécifiée
             if year and 'time' in ds.coords:
@@ -172,6 +177,26 @@ class ClimateDataLoader:
             logger.error(f"Erreur lors du chargement de {file_path}: {e}")
             return None
     
+    def _decode_time(self, ds, file_path: Path):
+        """
+        Remplace l'axe temporel brut par des dates datetime64 décodées par time_axis.
+        
+        Le décodage est vectorisé et mis en cache par signature de fichier. Les jours
+        sans équivalent grégorien (29-30 février en calendrier 360_day) sont écartés.
+        """
+        if 'time' not in ds.variables or 'units' not in ds['time'].attrs:
+            return ds
+        
+        ds_time = ds['time']
+        axis = load_time_axis(
+            file_path,
+            read_time=lambda: (ds_time.values, ds_time.attrs['units'], ds_time.attrs.get('calendar', 'standard')),
+            cache_dir=self.cache_dir
+        )
+        if not axis.valid.all():
+            ds = ds.isel(time=np.flatnonzero(axis.valid))
+        return ds.assign_coords(time=axis.dates[axis.valid].astype('datetime64[ns]'))
+    
     def get_data_for_period(
         self,
         variable: VariableType,
@@ -263,7 +288,18 @@ class ClimateDataLoader:
 
 
 class ClimateIndicatorCalculator:
-    """Calcule les indicateurs agro-climatiques à partir des données brutes"""
+    """
+    Calcule les indicateurs agro-climatiques à partir des données brutes.
+    
+    L'unité des données est lue dans leur attribut units (DataArray), à défaut
+    les unités des fichiers NetCDF sont supposées (kg/m²/s, K). Aucune conversion
+    n'est faite pour des données déjà en mm/jour ou en °C.
+    """
+    
+    @staticmethod
+    def _unit_of(data, default_unit: str) -> str:
+        """Unité des données (attribut units, sinon default_unit)"""
+        return getattr(data, "attrs", {}).get("units", default_unit)
     
     @staticmethod
     def calculate_rainfall_total(
@@ -275,26 +311,67 @@ class ClimateIndicatorCalculator:
         Calcule le cumul de précipitations sur une période.
         
         Args:
-            precipitation: DataArray avec les précipitations (kg/m²/s)
+            precipitation: DataArray avec les précipitations (kg/m²/s ou mm/jour)
             start_date: Date de début
             end_date: Date de fin
         
         Returns:
             Cumul de précipitations en mm
         """
-        # Convertir de kg/m²/s à mm
-        # 1 kg/m²/s = 1 mm/s (pour l'eau)
-        # Multiplier par le nombre de secondes dans une journée (86400) pour avoir mm/jour
+        # 1 kg/m²/s = 1 mm/s (pour l'eau): conversion en mm/jour appliquée au cumul
+        source_unit = ClimateIndicatorCalculator._unit_of(precipitation, "kg m-2 s-1")
         if 'time' in precipitation.coords:
             period_data = precipitation.sel(time=slice(start_date.isoformat(), end_date.isoformat()))
         else:
             period_data = precipitation
         
         # Somme sur la période
-        total = period_data.sum(dim='time') * 86400  # Conversion en mm
+        total = convert_units(period_data.sum(dim='time'), source_unit, MM_PER_DAY)
         
         return total
     
+    @staticmethod
+    def calculate_rainfall_totals(
+        precipitation,
+        periods: List[Tuple[date, date]]
+    ):
+        """
+        Calcule les cumuls de précipitations de plusieurs périodes à la fois.
+        
+        Les précipitations sont cumulées une seule fois le long du temps: le cumul
+        d'une période est la différence des cumuls à ses bornes, quelle que soit sa
+        longueur (ex: mars-avril de chaque année d'une simulation).
+        
+        Args:
+            precipitation: DataArray avec les précipitations (kg/m²/s ou mm/jour), dimension time
+            periods: Liste de (date de début, date de fin) incluses
+        
+        Returns:
+            DataArray des cumuls en mm, dimension period en tête (coordonnées start_date, end_date)
+        """
+        source_unit = ClimateIndicatorCalculator._unit_of(precipitation, "kg m-2 s-1")
+        axis = precipitation.get_axis_num('time')
+        times = precipitation['time'].values.astype('datetime64[D]')
+        starts = np.array([np.datetime64(start, 'D') for start, _ in periods], dtype='datetime64[D]')
+        ends = np.array([np.datetime64(end, 'D') for _, end in periods], dtype='datetime64[D]')
+        
+        # Cumul précédé d'un zéro: total de [i, j[ = cumsum[j] - cumsum[i] (NaN comptés comme 0, comme sum)
+        values = np.asarray(precipitation.values, dtype=np.float64)
+        cumsum = np.nancumsum(values, axis=axis)
+        cumsum = np.concatenate([np.zeros_like(np.take(cumsum, [0], axis=axis)), cumsum], axis=axis)
+        first = np.searchsorted(times, starts, side='left')
+        after_last = np.searchsorted(times, ends, side='right')
+        totals = np.take(cumsum, after_last, axis=axis) - np.take(cumsum, first, axis=axis)
+        
+        dims = [dim for dim in precipitation.dims if dim != 'time']
+        coords = {name: coord for name, coord in precipitation.coords.items() if 'time' not in coord.dims}
+        totals = xr.DataArray(
+            np.moveaxis(totals, axis, 0),
+            dims=['period'] + dims,
+            coords={**coords, 'start_date': ('period', starts), 'end_date': ('period', ends)}
+        )
+        return convert_units(totals, source_unit, MM_PER_DAY)
+    
     @staticmethod
     def calculate_consecutive_dry_days(
         precipitation,
@@ -304,45 +381,28 @@ class ClimateIndicatorCalculator:
         Calcule le nombre maximum de jours consécutifs sans pluie.
         
         Args:
-            precipitation: DataArray avec les précipitations (kg/m²/s)
+            precipitation: DataArray avec les précipitations (kg/m²/s ou mm/jour)
             threshold: Seuil de précipitation en mm/jour
         
         Returns:
             Nombre maximum de jours consécutifs sans pluie
         """
         # Convertir en mm/jour
-        pr_mm = precipitation * 86400
+        pr_mm = convert_units(
+            precipitation, ClimateIndicatorCalculator._unit_of(precipitation, "kg m-2 s-1"), MM_PER_DAY
+        )
         
         # Identifier les jours secs (< threshold)
-        dry_days = pr_mm < threshold
+        dry_days = (pr_mm < threshold).values
+        axis = pr_mm.dims.index('time')
         
-        # Calculer les séquences consécutives
-        max_consecutive = xr.zeros_like(pr_mm.isel(time=0))
+        # Longueur de la suite en cours chaque jour: nombre de jours secs depuis le
+        # dernier jour non sec (cumul des jours secs moins sa valeur à ce jour-là)
+        dry_count = np.cumsum(dry_days, axis=axis)
+        last_reset = np.maximum.accumulate(np.where(dry_days, 0, dry_count), axis=axis)
+        max_seq = (dry_count - last_reset).max(axis=axis, initial=0)
         
-        for lat_idx in range(pr_mm.sizes.get('lat', 0)):
-            for lon_idx in range(pr_mm.sizes.get('lon', 0)):
-                if 'lat' in pr_mm.coords and 'lon' in pr_mm.coords:
-                    point_data = dry_days.isel(lat=lat_idx, lon=lon_idx)
-                else:
-                    point_data = dry_days
-                
-                # Trouver la séquence la plus longue
-                max_seq = 0
-                current_seq = 0
-                
-                for day in point_data.values:
-                    if day:
-                        current_seq += 1
-                        max_seq = max(max_seq, current_seq)
-                    else:
-                        current_seq = 0
-                
-                if 'lat' in max_consecutive.coords and 'lon' in max_consecutive.coords:
-                    max_consecutive.isel(lat=lat_idx, lon=lon_idx).values[:] = max_seq
-                else:
-                    max_consecutive.values[:] = max_seq
-        
-        return max_consecutive
+        return xr.zeros_like(pr_mm.isel(time=0)).copy(data=max_seq.astype(pr_mm.dtype))
     
     @staticmethod
     def calculate_hot_days(
@@ -353,14 +413,16 @@ class ClimateIndicatorCalculator:
         Calcule le nombre de jours avec température maximale > seuil.
         
         Args:
-            temperature_max: DataArray avec températures maximales (K)
+            temperature_max: DataArray avec températures maximales (K ou °C)
             threshold: Seuil de température en °C
         
         Returns:
             Nombre de jours > seuil
         """
-        # Convertir de Kelvin à Celsius
-        temp_celsius = temperature_max - 273.15
+        # Convertir en Celsius
+        temp_celsius = convert_units(
+            temperature_max, ClimateIndicatorCalculator._unit_of(temperature_max, "K"), CELSIUS
+        )
         
         # Compter les jours > seuil
         hot_days = (temp_celsius > threshold).sum(dim='time')
@@ -376,14 +438,16 @@ class ClimateIndicatorCalculator:
         Calcule la somme des degrés-jours.
         
         Args:
-            temperature_mean: DataArray avec températures moyennes (K)
+            temperature_mean: DataArray avec températures moyennes (K ou °C)
             base_temperature: Température de base en °C
         
         Returns:
             Somme des degrés-jours
         """
-        # Convertir de Kelvin à Celsius
-        temp_celsius = temperature_mean - 273.15
+        # Convertir en Celsius
+        temp_celsius = convert_units(
+            temperature_mean, ClimateIndicatorCalculator._unit_of(temperature_mean, "K"), CELSIUS
+        )
         
         # Calculer les degrés-jours (max(0, T - T_base))
         degree_days = xr.where(
@@ -406,14 +470,16 @@ class ClimateIndicatorCalculator:
         Calcule le maximum de précipitations cumulées sur une fenêtre glissante.
         
         Args:
-            precipitation: DataArray avec les précipitations (kg/m²/s)
+            precipitation: DataArray avec les précipitations (kg/m²/s ou mm/jour)
             window_size: Taille de la fenêtre en jours
         
         Returns:
             Maximum des cumuls sur fenêtre glissante en mm
         """
         # Convertir en mm/jour
-        pr_mm = precipitation * 86400
+        pr_mm = convert_units(
+            precipitation, ClimateIndicatorCalculator._unit_of(precipitation, "kg m-2 s-1"), MM_PER_DAY
+        )
         
         # Calculer la moyenne glissante
         rolling_sum = pr_mm.rolling(time=window_size, center=False).sum()
@@ -432,14 +498,16 @@ class ClimateIndicatorCalculator:
         Calcule le nombre de jours non praticables (pluie > seuil).
         
         Args:
-            precipitation: DataArray avec les précipitations (kg/m²/s)
+            precipitation: DataArray avec les précipitations (kg/m²/s ou mm/jour)
             threshold: Seuil de précipitation en mm/jour
         
         Returns:
             Nombre de jours avec pluie > seuil
         """
         # Convertir en mm/jour
-        pr_mm = precipitation * 86400
+        pr_mm = convert_units(
+            precipitation, ClimateIndicatorCalculator._unit_of(precipitation, "kg m-2 s-1"), MM_PER_DAY
+        )
         
         # Compter les jours > seuil
         non_workable = (pr_mm > threshold).sum(dim='time')
@@ -0,0 +1,158 @@
+"""
+Pool borné de curseurs DuckDB
+
+Une connexion DuckDB exécute ses requêtes l'une après l'autre: partagée par
+toutes les requêtes de l'API, une requête lente bloque les autres. Chaque
+curseur (conn.cursor()) est une connexion distincte à la même base, et DuckDB
+exécute en parallèle les lectures de connexions différentes. Le pool limite
+le nombre de curseurs utilisés à la fois, attend au plus timeout secondes
+qu'un curseur se libère et mesure sa saturation.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class PoolTimeout(TimeoutError):
+    """Aucun curseur libéré avant la fin du délai d'attente"""
+
+
+class CursorPool:
+    """
+    Curseurs créés à la demande (au plus size) et réutilisés d'une requête à l'autre.
+    
+    Example:
+        pool = CursorPool(conn.cursor, size=4, timeout=30)
+        with pool.checkout() as cursor:
+            cursor.execute("SELECT ...")
+    """
+    
+    def __init__(self, factory: Callable, size: int = 4, timeout: float = 30.0):
+        """
+        Args:
+            factory: Crée un curseur (ex: conn.cursor)
+            size: Nombre maximum de curseurs utilisés à la fois
+            timeout: Attente maximale (secondes) d'un curseur libre
+        """
+        if size < 1:
+            raise ValueError(f"Taille du pool invalide: {size}")
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._available = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: List = []
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._max_in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._closed = False
+    
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """
+        Emprunte un curseur pour la durée du bloc with.
+        
+        Args:
+            timeout: Attente maximale en secondes (timeout du pool si None)
+        
+        Raises:
+            PoolTimeout: Tous les curseurs sont restés utilisés pendant timeout secondes
+            RuntimeError: Le pool est fermé
+        """
+        if self._closed:
+            raise RuntimeError("Pool de curseurs fermé")
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        acquired = self._available.acquire(timeout=timeout)
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+                self._in_use += 1
+                self._max_in_use = max(self._max_in_use, self._in_use)
+                self._wait_seconds += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+                cursor = self._idle.pop() if self._idle else None
+                closed = self._closed
+        if not acquired:
+            raise PoolTimeout(f"Aucun curseur DuckDB libre après {timeout:.1f}s ({self.size} curseurs utilisés)")
+        if closed:
+            # Pool fermé pendant l'attente
+            with self._lock:
+                self._in_use -= 1
+            self._available.release()
+            raise RuntimeError("Pool de curseurs fermé")
+        
+        try:
+            if cursor is None:
+                cursor = self.factory()
+                with self._lock:
+                    self._created += 1
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            self._available.release()
+            raise
+        
+        try:
+            yield cursor
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                closed = self._closed
+                if closed:
+                    self._created -= 1
+                else:
+                    self._idle.append(cursor)
+            if closed:
+                cursor.close()
+            self._available.release()
+    
+    def metrics(self) -> Dict:
+        """
+        État et saturation du pool.
+        
+        Returns:
+            Dictionnaire size, in_use, idle, waiting, created, saturation (in_use / size),
+            max_in_use, checkouts, timeouts, avg_wait_ms, max_wait_ms
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "created": self._created,
+                "saturation": round(self._in_use / self.size, 3),
+                "max_in_use": self._max_in_use,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(1000 * self._wait_seconds / max(self._checkouts, 1), 3),
+                "max_wait_ms": round(1000 * self._max_wait_seconds, 3),
+            }
+    
+    def close(self):
+        """
+        Ferme le pool: les curseurs libres sont fermés, les curseurs empruntés le sont
+        à leur retour, et tout nouvel emprunt lève RuntimeError.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for cursor in idle:
+            cursor.close()
@@ -5,24 +5,198 @@ Optimisé pour accès rapide point par point (carré de grille)
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import logging
+import re
+import threading
+import time
 
 import duckdb
-import xarray as xr
 import numpy as np
 import pandas as pd
-import netCDF4 as nc
-from netCDF4 import num2date
 DUCKDB_AVAILABLE = True
-NETCDF4_AVAILABLE = True
 
 from models import VariableType, ExperimentType
+from netcdf_reader import NetCDFBatchReader, file_fingerprint, selection_key, NETCDF4_AVAILABLE
+from units import NATIVE_UNITS, AGRONOMIC_UNITS, MM_PER_DAY, CELSIUS, unit_conversion, convert_units_sql
+from range_minimum import rolling_sums, RangeMinimumIndex
+from bitmaps import pack_flags, count_in_ranges, longest_runs
+from parquet_store import is_parquet_root, parquet_partition_keys, parquet_glob
+from time_axis import load_time_axis
+from cursor_pool import CursorPool
 
 logger = logging.getLogger(__name__)
 
+# Variables stockées en colonnes dans la table large climate_wide
+WIDE_VARIABLES = [VariableType.PR, VariableType.TAS, VariableType.TASMIN, VariableType.TASMAX]
+
+# Longueur des séries annuelles compactées (indexées par jour de l'année - 1)
+DAYS_PER_PACKED_YEAR = 366
+
+# Encodages de la colonne value: type SQL et borne des entiers stockés
+VALUE_ENCODINGS = {
+    "double": ("DOUBLE", None),
+    "float": ("FLOAT", None),
+    "int16": ("SMALLINT", 32767),
+    "int32": ("INTEGER", 2147483647),
+}
+
+# Pas de quantification (scale) et décalage (add_offset) des encodages entiers, en
+# unités natives (convertis si la variable est stockée en unités agronomiques):
+# valeur = entier * scale + add_offset. Pour les variables positives,
+# le décalage place le zéro en bas de la plage SMALLINT (0 à 65534 pas).
+VALUE_SCALES = {
+    VariableType.PR: (0.01 / 86400, 32767 * 0.01 / 86400),  # 0.01 mm/jour, 0 à 655 mm/jour
+    VariableType.TAS: (0.01, 273.15),  # 0.01 K, ±327 K autour de 0 °C
+    VariableType.TASMIN: (0.01, 273.15),
+    VariableType.TASMAX: (0.01, 273.15),
+    VariableType.RSDS: (0.01, 327.67),  # 0.01 W/m2, 0 à 655 W/m2
+    VariableType.RLDS: (0.01, 327.67),
+    VariableType.HUSS: (1e-6, 0.032767),  # 1e-6 kg/kg, 0 à 0.065 kg/kg
+    VariableType.SFCWIND: (0.01, 327.67),  # 0.01 m/s, 0 à 655 m/s
+}
+
+# Les entiers 32 bits gardent le même décalage avec un pas 100 fois plus fin
+INT32_SCALE_FACTOR = 0.01
+
+# Seuils des bitmaps de dépassement (table exceedance_bitmaps):
+# nom -> (variable, comparaison, seuil, unité du seuil)
+EXCEEDANCE_THRESHOLDS = {
+    "tasmax_gt_30": ("tasmax", ">", 30.0, CELSIUS),  # jours chauds
+    "tasmax_gt_35": ("tasmax", ">", 35.0, CELSIUS),  # jours de forte chaleur
+    "pr_gt_2": ("pr", ">", 2.0, MM_PER_DAY),  # jours non praticables
+    "pr_lt_0.1": ("pr", "<", 0.1, MM_PER_DAY),  # jours secs
+}
+
+# Seuils (mm/jour) des suites de jours secs de la table dry_spells
+DRY_SPELL_THRESHOLDS = (0.1, 1.0)
+
+# Base partitionnée: tables de chaque partition réunies par une vue (UNION ALL)
+# dès qu'une partition les contient, et tables dérivées, réunies seulement si
+# toutes les partitions interrogées les contiennent (sinon calcul depuis climate_data)
+PARTITION_TABLES = ("climate_data", "import_manifest", "variable_units", "value_encodings")
+PARTITION_DERIVED_TABLES = (
+    "climate_series", "monthly_aggregates", "cumulative_sums", "exceedance_bitmaps", "dry_spells"
+)
+
+# Octets par valeur des segments de types fixes (masques de validité: un bit), bornant
+# la taille estimée du dernier segment d'un bloc (voir storage_info)
+SEGMENT_WIDTHS = {
+    "VALIDITY": 1 / 8, "BOOLEAN": 1, "TINYINT": 1, "UTINYINT": 1, "SMALLINT": 2, "USMALLINT": 2,
+    "INTEGER": 4, "UINTEGER": 4, "FLOAT": 4, "DATE": 4, "BIGINT": 8, "UBIGINT": 8, "DOUBLE": 8,
+    "TIME": 8, "TIMESTAMP": 8, "TIMESTAMP WITH TIME ZONE": 8, "HUGEINT": 16, "UHUGEINT": 16,
+}
+
+# Vue climate_data d'une base partitionnée sans partition (colonnes de climate_data)
+_EMPTY_CLIMATE_DATA_SQL = """
+    SELECT NULL::VARCHAR AS variable, NULL::VARCHAR AS experiment, NULL::VARCHAR AS gcm,
+           NULL::VARCHAR AS rcm, NULL::VARCHAR AS member, NULL::DOUBLE AS lat,
+           NULL::DOUBLE AS lon, NULL::DATE AS time, NULL::DOUBLE AS value
+    WHERE false
+"""
+
+# Nombre de jeux de séries (variable, scénario, filtres) gardés en mémoire avec leurs
+# index de minimum des sommes glissantes (voir get_rolling_minima)
+ROLLING_INDEX_CACHE_SIZE = 16
+
+
+def pack_daily_series(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    year: np.ndarray,
+    dayofyear: np.ndarray,
+    value: np.ndarray
+) -> "pd.DataFrame":
+    """
+    Regroupe des valeurs journalières en une série float32 par (point, année).
+    
+    Les entrées doivent être triées par lat, lon puis date. Chaque série compte
+    366 valeurs indexées par jour de l'année - 1; les jours absents valent NaN.
+    
+    Returns:
+        DataFrame avec colonnes: lat, lon, year, daily (tableaux float32 de 366 valeurs)
+    """
+    if len(value) == 0:
+        return pd.DataFrame(columns=["lat", "lon", "year", "daily"])
+    
+    # Nouvelle série à chaque changement de point ou d'année
+    new_group = np.ones(len(value), dtype=bool)
+    new_group[1:] = (lat[1:] != lat[:-1]) | (lon[1:] != lon[:-1]) | (year[1:] != year[:-1])
+    group = np.cumsum(new_group) - 1
+    
+    packed = np.full((group[-1] + 1, DAYS_PER_PACKED_YEAR), np.nan, dtype=np.float32)
+    packed[group, np.asarray(dayofyear, dtype=np.intp) - 1] = value
+    
+    first = np.flatnonzero(new_group)
+    return pd.DataFrame({
+        "lat": lat[first],
+        "lon": lon[first],
+        "year": year[first],
+        "daily": list(packed),
+    })
+
+
+def partition_directory(db_path) -> Path:
+    """
+    Répertoire d'une base partitionnée: une base DuckDB par scénario et variable,
+    <répertoire>/<experiment>/<variable>.duckdb, à côté du chemin de la base.
+    """
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}_partitions")
+
+
+def compact_database_file(path) -> None:
+    """
+    Réécrit un fichier DuckDB fermé dans un nouveau fichier sans blocs libres
+    (COPY FROM DATABASE: tables, clés primaires, vues), qui remplace l'ancien.
+    """
+    path = Path(path)
+    target = path.with_name(f"{path.stem}.compact{path.suffix}")
+    target.unlink(missing_ok=True)
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.execute(f"ATTACH '{path}' AS source (READ_ONLY)")
+        conn.execute(f"ATTACH '{target}' AS target")
+        conn.execute("COPY FROM DATABASE source TO target")
+        conn.execute("DETACH target")
+    except Exception:
+        target.unlink(missing_ok=True)
+        raise
+    finally:
+        conn.close()
+    target.replace(path)
+
+
+def encode_value_sql(column: str, encoding: str, scale: str = "1", add_offset: str = "0") -> str:
+    """
+    Expression SQL qui convertit une valeur brute (DOUBLE) vers le type stocké.
+    
+    Les valeurs hors de la plage d'un encodage entier sont écrêtées à ses bornes.
+    
+    Args:
+        column: Colonne (ou expression) à encoder
+        encoding: Clé de VALUE_ENCODINGS
+        scale: Expression SQL du pas de quantification (encodages entiers)
+        add_offset: Expression SQL du décalage (encodages entiers)
+    """
+    sql_type, limit = VALUE_ENCODINGS[encoding]
+    if encoding == "double":
+        return column
+    if limit is None:
+        return f"CAST({column} AS {sql_type})"
+    return f"CAST(LEAST(GREATEST(ROUND(({column} - {add_offset}) / {scale}), -{limit}), {limit}) AS {sql_type})"
+
+
+def decode_value_sql(column: str, encoding: str, scale: str = "1", add_offset: str = "0") -> str:
+    """Expression SQL inverse de encode_value_sql (résultat DOUBLE)"""
+    if VALUE_ENCODINGS[encoding][1] is None:
+        return f"CAST({column} AS DOUBLE)"
+    return f"({column} * {scale} + {add_offset})"
+
 
 class DuckDBClimateLoader:
     """
@@ -30,98 +204,2846 @@ class DuckDBClimateLoader:
     Optimisé pour requêtes point par point (carré de grille).
     """
     
-    def __init__(self, db_path: Optional[str] = None, data_directory: Optional[str] = None):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        data_directory: Optional[str] = None,
+        read_only: bool = True,
+        normalized: bool = False,
+        value_encoding: Optional[str] = None,
+        agronomic_units: bool = False,
+        partitioned: bool = False,
+        pool_size: int = 4,
+        pool_timeout: float = 30.0
+    ):
+        """
+        Initialise le chargeur DuckDB.
+        
+        Args:
+            db_path: Chemin vers le fichier DuckDB (créé si n'existe pas)
+            data_directory: Répertoire contenant les fichiers NetCDF sources
+            read_only: Ouvrir la base en lecture seule (API). Mettre à False pour l'import.
+            normalized: Créer une base vide au schéma normalisé (runs, cells, climate_values),
+                ou convertir une base existante. Sinon l'organisation existante est conservée.
+            value_encoding: Stockage des valeurs d'une nouvelle base (ou lors de la conversion
+                au schéma normalisé): "double" (défaut), "float", ou entiers "int16"/"int32"
+                avec pas et décalage par variable (schéma normalisé uniquement). Une base
+                existante garde son encodage.
+            agronomic_units: Convertir à l'import les variables pas encore présentes en
+                unités agronomiques (mm/jour, °C) au lieu des unités des fichiers. L'unité
+                de chaque variable est enregistrée dans la table variable_units.
+            partitioned: Une base par scénario et variable dans partition_directory(db_path)
+                au lieu d'un seul fichier (une base existante y est répartie). Utilisé
+                automatiquement si ce répertoire existe.
+            pool_size: Nombre maximum de curseurs utilisés en parallèle (voir cursor)
+            pool_timeout: Attente maximale (secondes) d'un curseur libre
+        
+        db_path peut aussi être une racine Parquet partitionnée (voir parquet_store),
+        lue en lecture seule avec read_parquet.
+        """
+        if value_encoding is not None and value_encoding not in VALUE_ENCODINGS:
+            raise ValueError(
+                f"Encodage de valeurs inconnu: {value_encoding} (attendu: {', '.join(VALUE_ENCODINGS)})"
+            )
+        if not DUCKDB_AVAILABLE:
+            raise ImportError(
+                "DuckDB n'est pas installé. Installez-le avec: "
+                "poetry add duckdb"
+            )
+        
+        self.db_path = Path(db_path) if db_path else Path("climate_data.duckdb")
+        self.data_directory = Path(data_directory) if data_directory else None
+        # Cache disque des index de grille et des axes temporels décodés
+        self.cache_dir = self.data_directory / ".cache" if self.data_directory else None
+        self.read_only = read_only
+        self.last_import_stats: Dict[str, float] = {}
+        self.layout: Optional[str] = None
+        self.value_encoding = "double"
+        self.agronomic_units = agronomic_units
+        # Séries journalières et index de sommes glissantes, vidés à chaque écriture
+        self._rolling_indexes: "OrderedDict[tuple, Dict]" = OrderedDict()
+        # Base partitionnée: partitions attachées (alias, encodage), partition courante
+        # (use_partition) et partitions couvertes par les vues (route)
+        self.partition_dir = partition_directory(self.db_path)
+        self._partitions: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._active_partition: Optional[Tuple[str, str]] = None
+        self._attach_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        # Connexion principale et curseurs empruntés par les threads (voir cursor); les
+        # vues temporaires de route sont propres à chaque connexion
+        self._conn = None
+        self._local = threading.local()
+        self._connection_states: Dict[int, Dict] = {}
+        self.pool = CursorPool(lambda: self._conn.cursor(), size=pool_size, timeout=pool_timeout)
+        
+        if is_parquet_root(self.db_path):
+            # Racine Parquet: fichiers immuables lus par read_parquet (vues de route)
+            self.conn = duckdb.connect(":memory:")
+            self.layout = "parquet"
+            self.read_only = True
+            self._partition_encoding = None
+            return
+        
+        if partitioned or self.partition_dir.exists():
+            if normalized or VALUE_ENCODINGS[value_encoding or "double"][1] is not None:
+                raise ValueError(
+                    "Une base partitionnée stocke climate_data dans chaque partition: "
+                    "schéma normalisé et encodages entiers non disponibles"
+                )
+            # Pas de fichier central: la connexion en mémoire attache les partitions
+            # à la demande, un import n'écrit que dans la partition qu'il alimente
+            self.conn = duckdb.connect(":memory:")
+            self.layout = "partitioned"
+            self.value_encoding = value_encoding or "double"
+            self._partition_encoding = value_encoding
+            if not read_only and not self.partition_dir.exists():
+                self.partition_dir.mkdir(parents=True)
+                if self.db_path.exists():
+                    self._split_into_partitions()
+            return
+        
+        # Connexion DuckDB avec gestion d'erreurs pour les verrous
+        try:
+            self.conn = duckdb.connect(str(self.db_path), read_only=read_only)
+        except Exception as e:
+            if "lock" in str(e).lower() or "conflicting" in str(e).lower():
+                raise IOError(
+                    f"Le fichier DuckDB est verrouillé par un autre processus.\n"
+                    f"Vérifiez qu'aucune autre instance du script ne tourne.\n"
+                    f"Vous pouvez tuer le processus avec: kill <PID>\n"
+                    f"Erreur originale: {e}"
+                )
+            raise
+        
+        # Créer le schéma si nécessaire
+        self._create_schema(normalized, value_encoding)
+    
+    def _detect_layout(self) -> Optional[str]:
+        """
+        Détecte l'organisation de la base.
+        
+        Returns:
+            "long" (table climate_data historique), "normalized" (climate_data est une
+            vue sur runs/cells/climate_values) ou None si la base est vide
+        """
+        try:
+            row = self.conn.execute("""
+                SELECT table_type FROM information_schema.tables
+                WHERE table_name = 'climate_data' AND table_catalog = current_database()
+            """).fetchone()
+        except Exception:
+            # Si information_schema n'est pas disponible, essayer directement
+            try:
+                self.conn.execute("SELECT COUNT(*) FROM climate_values LIMIT 1")
+                return "normalized"
+            except Exception:
+                pass
+            try:
+                self.conn.execute("SELECT COUNT(*) FROM climate_data LIMIT 1")
+                return "long"
+            except Exception:
+                return None
+        if row is None:
+            return None
+        return "normalized" if row[0] == "VIEW" else "long"
+    
+    def _detect_value_encoding(self) -> Optional[str]:
+        """Encodage de la colonne value existante (None si la base est vide)"""
+        table = {"normalized": "climate_values", "long": "climate_data"}.get(self.layout)
+        if table is None:
+            return None
+        row = self.conn.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = ? AND column_name = 'value' AND table_catalog = current_database()
+        """, [table]).fetchone()
+        if row is None:
+            return None
+        for encoding, (sql_type, _) in VALUE_ENCODINGS.items():
+            if row[0] == sql_type:
+                return encoding
+        logger.warning(f"Type de la colonne value non reconnu: {row[0]}, traité comme DOUBLE")
+        return "double"
+    
+    def _create_normalized_schema(self, with_view: bool = True):
+        """
+        Crée le schéma normalisé: dimensions runs et cells, table de faits étroite
+        climate_values et vue climate_data de compatibilité.
+        
+        Chaque ligne de faits ne porte plus que deux entiers (run_id, cell_id), la
+        date et la valeur: les filtres sur la simulation ou le point s'appliquent
+        aux petites tables de dimensions.
+        """
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id SMALLINT PRIMARY KEY,
+                variable VARCHAR NOT NULL,
+                experiment VARCHAR NOT NULL,
+                gcm VARCHAR NOT NULL,
+                rcm VARCHAR NOT NULL,
+                member VARCHAR NOT NULL,
+                UNIQUE (variable, experiment, gcm, rcm, member)
+            );
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cells (
+                cell_id INTEGER PRIMARY KEY,
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                grid_y INTEGER,
+                grid_x INTEGER,
+                UNIQUE (lat, lon)
+            );
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS climate_values (
+                run_id SMALLINT NOT NULL,
+                cell_id INTEGER NOT NULL,
+                time DATE NOT NULL,
+                value {VALUE_ENCODINGS[self.value_encoding][0]} NOT NULL,
+                PRIMARY KEY (run_id, cell_id, time)
+            );
+        """)
+        self._create_encoding_table()
+        if not with_view:
+            return
+        self._create_compat_view()
+        logger.info("Schéma normalisé créé (runs, cells, climate_values, vue climate_data)")
+    
+    def _create_units_table(self):
+        """
+        Table variable_units: unité des valeurs stockées de chaque variable.
+        
+        Les variables déjà présentes dans une base antérieure à la table sont
+        enregistrées avec les unités des fichiers (aucune conversion à l'import).
+        """
+        if self.has_table("variable_units"):
+            return
+        self.conn.execute("""
+            CREATE TABLE variable_units (
+                variable VARCHAR PRIMARY KEY,
+                unit VARCHAR NOT NULL
+            );
+        """)
+        if self.layout is None:
+            return
+        source = "runs" if self.layout == "normalized" else "climate_data"
+        for (name,) in self.conn.execute(f"SELECT DISTINCT variable FROM {source}").fetchall():
+            self.conn.execute("INSERT INTO variable_units VALUES (?, ?)", [name, self._native_unit(name)])
+    
+    @staticmethod
+    def _native_unit(variable) -> str:
+        """Unité des fichiers NetCDF d'une variable"""
+        try:
+            return NATIVE_UNITS[getattr(variable, "value", variable)]
+        except KeyError:
+            logger.warning(f"Unité inconnue pour la variable {variable}, valeurs stockées sans conversion")
+            return ""
+    
+    def _variable_unit(self, variable) -> str:
+        """
+        Unité de stockage d'une variable, enregistrée dans variable_units au premier
+        import (unités agronomiques si agronomic_units, sinon celles des fichiers).
+        """
+        name = getattr(variable, "value", variable)
+        row = self.conn.execute("SELECT unit FROM variable_units WHERE variable = ?", [name]).fetchone()
+        if row is not None:
+            return row[0]
+        unit = self._native_unit(name)
+        if self.agronomic_units and unit:
+            unit = AGRONOMIC_UNITS[name]
+        self.conn.execute("INSERT INTO variable_units VALUES (?, ?)", [name, unit])
+        return unit
+    
+    def get_variable_units(self) -> Dict[str, str]:
+        """
+        Unité des valeurs stockées de chaque variable.
+        
+        Returns:
+            Dictionnaire variable -> unité (unités des fichiers pour les variables
+            absentes de variable_units ou si la table n'existe pas)
+        """
+        units = dict(NATIVE_UNITS)
+        if self.has_table("variable_units"):
+            units.update(dict(self.conn.execute("SELECT variable, unit FROM variable_units").fetchall()))
+        return units
+    
+    def unit_sql(self, variable, unit: str, column: str = "value") -> str:
+        """
+        Expression SQL donnant column (valeurs stockées d'une variable) dans l'unité demandée.
+        
+        Si la variable est déjà stockée dans cette unité, la colonne est utilisée
+        telle quelle (et les statistiques min/max de DuckDB restent exploitables).
+        
+        Example:
+            f"SUM({loader.unit_sql('pr', MM_PER_DAY)})" -> "SUM((value * 86400.0))" ou "SUM(value)"
+        """
+        name = getattr(variable, "value", variable)
+        return convert_units_sql(column, self.get_variable_units()[name], unit)
+    
+    def _create_encoding_table(self):
+        """Table value_encodings: pas, décalage et erreur de décodage par variable"""
+        if self.value_encoding == "double":
+            return
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS value_encodings (
+                variable VARCHAR PRIMARY KEY,
+                encoding VARCHAR NOT NULL,
+                scale DOUBLE,
+                add_offset DOUBLE,
+                max_abs_error DOUBLE NOT NULL,
+                clipped BIGINT NOT NULL
+            );
+        """)
+    
+    def _create_compat_view(self):
+        """
+        Vue climate_data de compatibilité: mêmes colonnes que l'ancienne table.
+        
+        Les valeurs stockées en entiers sont décodées (pas et décalage de
+        value_encodings), les autres encodages sont rendus en DOUBLE.
+        """
+        scaled = VALUE_ENCODINGS[self.value_encoding][1] is not None
+        value = decode_value_sql("v.value", self.value_encoding, "e.scale", "e.add_offset")
+        encoding_join = "JOIN value_encodings e ON e.variable = r.variable" if scaled else ""
+        self.conn.execute(f"""
+            CREATE OR REPLACE VIEW climate_data AS
+            SELECT r.variable, r.experiment, r.gcm, r.rcm, r.member, c.lat, c.lon, v.time, {value} AS value
+            FROM climate_values v
+            JOIN runs r ON r.run_id = v.run_id
+            JOIN cells c ON c.cell_id = v.cell_id
+            {encoding_join}
+        """)
+    
+    def _create_schema(self, normalized: bool = False, value_encoding: Optional[str] = None):
+        """Crée le schéma de la base de données si nécessaire"""
+        self.layout = self._detect_layout()
+        existing_encoding = self._detect_value_encoding()
+        converting = self.layout == "long" and normalized and not self.read_only
+        if existing_encoding is not None and not converting:
+            if value_encoding is not None and value_encoding != existing_encoding:
+                logger.warning(
+                    f"⚠️  La base stocke déjà les valeurs en {existing_encoding}: "
+                    f"encodage {value_encoding} ignoré"
+                )
+            self.value_encoding = existing_encoding
+        else:
+            self.value_encoding = value_encoding or "double"
+        if self.read_only:
+            # Connexion en lecture seule: le schéma doit déjà exister
+            return
+        
+        self._create_units_table()
+        
+        if self.layout is None and normalized:
+            self._create_normalized_schema()
+            self.layout = "normalized"
+        elif self.layout is None:
+            if VALUE_ENCODINGS[self.value_encoding][1] is not None:
+                raise ValueError(
+                    f"L'encodage {self.value_encoding} nécessite le schéma normalisé (--normalized): "
+                    f"la table climate_data ne peut pas décoder les valeurs"
+                )
+            # Créer la table avec PRIMARY KEY pour éviter les doublons
+            self.conn.execute(f"""
+                CREATE TABLE climate_data (
+                    variable VARCHAR NOT NULL,
+                    experiment VARCHAR NOT NULL,
+                    gcm VARCHAR NOT NULL,
+                    rcm VARCHAR NOT NULL,
+                    member VARCHAR NOT NULL,
+                    lat DOUBLE NOT NULL,
+                    lon DOUBLE NOT NULL,
+                    time DATE NOT NULL,
+                    value {VALUE_ENCODINGS[self.value_encoding][0]} NOT NULL,
+                    PRIMARY KEY (variable, experiment, gcm, rcm, member, lat, lon, time)
+                );
+            """)
+            self._create_encoding_table()
+            self.layout = "long"
+            logger.info("Table climate_data créée avec PRIMARY KEY pour éviter les doublons")
+        elif self.layout == "long" and normalized:
+            self.normalize_schema()
+        elif self.layout == "long":
+            # Vérifier si PRIMARY KEY existe déjà
+            try:
+                pk_info = self.conn.execute("""
+                    SELECT COUNT(*) as pk_count
+                    FROM pragma_table_info('climate_data')
+                    WHERE pk > 0
+                """).df()
+                pk_count = pk_info['pk_count'].iloc[0] if not pk_info.empty else 0
+                if pk_count == 0:
+                    logger.warning("⚠️  Table existe sans PRIMARY KEY. Les doublons ne seront pas automatiquement évités.")
+                    logger.warning("   Pour ajouter la PRIMARY KEY, supprimez les doublons existants puis recréez la table.")
+            except Exception:
+                # Si pragma_table_info n'est pas disponible, on continue
+                pass
+        
+        # Suivi des fichiers importés (imports incrémentaux et reprise après interruption)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS import_manifest (
+                path VARCHAR NOT NULL,
+                selection VARCHAR NOT NULL,
+                size BIGINT NOT NULL,
+                mtime DOUBLE NOT NULL,
+                content_hash VARCHAR NOT NULL,
+                variable VARCHAR NOT NULL,
+                experiment VARCHAR NOT NULL,
+                gcm VARCHAR NOT NULL,
+                rcm VARCHAR NOT NULL,
+                member VARCHAR NOT NULL,
+                last_time_index INTEGER,
+                last_time DATE,
+                rows BIGINT NOT NULL,
+                duration_seconds DOUBLE NOT NULL,
+                status VARCHAR NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (path, selection)
+            );
+        """)
+        
+        # Pas d'index secondaires (ART): ils alourdissent le fichier sans accélérer les
+        # lectures par plage. Les requêtes par point et par période s'appuient sur les
+        # min/max des row groups une fois la table triée (voir optimize_layout)
+    
+    def _partition_keys(self) -> List[Tuple[str, str]]:
+        """(variable, scénario) des partitions présentes dans partition_dir (ou sous la racine Parquet)"""
+        if self.layout == "parquet":
+            return parquet_partition_keys(self.db_path)
+        return sorted((path.stem, path.parent.name) for path in self.partition_dir.glob("*/*.duckdb"))
+    
+    @property
+    def conn(self):
+        """Curseur emprunté par le thread courant (cursor), sinon connexion principale"""
+        return getattr(self._local, "cursor", None) or self._conn
+    
+    @conn.setter
+    def conn(self, connection):
+        self._conn = connection
+        self._connection_states = {}
+    
+    @contextmanager
+    def cursor(self, timeout: Optional[float] = None):
+        """
+        Emprunte un curseur du pool pour le thread courant: dans le bloc with, toutes
+        les requêtes du chargeur passent par ce curseur (self.conn), et DuckDB exécute
+        en parallèle les lectures de threads différents. Réentrant dans un même thread.
+        
+        Args:
+            timeout: Attente maximale d'un curseur libre (pool_timeout si None)
+        
+        Raises:
+            PoolTimeout: Aucun curseur libéré à temps
+        
+        Example:
+            with loader.cursor():
+                df = loader.get_time_series(...)
+        """
+        if getattr(self._local, "cursor", None) is not None:
+            yield self._local.cursor
+            return
+        with self.pool.checkout(timeout) as cursor:
+            self._local.cursor = cursor
+            try:
+                yield cursor
+            finally:
+                self._local.cursor = None
+    
+    @property
+    def _connection_state(self) -> Dict:
+        """Partitions couvertes par les vues (route) et vues créées, pour la connexion courante"""
+        return self._connection_states.setdefault(id(self.conn), {"routed": None, "views": []})
+    
+    @property
+    def _routed(self) -> Optional[Tuple[Tuple[str, str], ...]]:
+        return self._connection_state["routed"]
+    
+    @_routed.setter
+    def _routed(self, keys):
+        self._connection_state["routed"] = keys
+    
+    @property
+    def _unified_views(self) -> List[str]:
+        return self._connection_state["views"]
+    
+    @_unified_views.setter
+    def _unified_views(self, names):
+        self._connection_state["views"] = names
+    
+    def get_partitions(self) -> "pd.DataFrame":
+        """
+        Partitions d'une base partitionnée.
+        
+        Returns:
+            DataFrame avec colonnes: variable, experiment, path, size_mb, attached
+        """
+        rows = []
+        for variable, experiment in self._partition_keys():
+            if self.layout == "parquet":
+                # Répertoire variable=/experiment=, "attaché" si couvert par les vues
+                path = Path(parquet_glob(self.db_path, variable, experiment)).parents[2]
+                size = sum(file.stat().st_size for file in path.glob("member=*/year=*/*.parquet"))
+                attached = (variable, experiment) in (self._routed or ())
+            else:
+                path = self.partition_dir / experiment / f"{variable}.duckdb"
+                size = path.stat().st_size
+                attached = (variable, experiment) in self._partitions
+            rows.append((variable, experiment, str(path), round(size / 1e6, 2), attached))
+        return pd.DataFrame(rows, columns=["variable", "experiment", "path", "size_mb", "attached"])
+    
+    def _attach_partition(self, variable: str, experiment: str, create: bool = False) -> str:
+        """
+        Attache la base d'une partition (une seule fois pour la connexion et ses curseurs).
+        
+        Returns:
+            Alias de la partition dans la connexion
+        """
+        key = (variable, experiment)
+        # ATTACH vaut pour tous les curseurs: une seule fois, même depuis plusieurs threads
+        with self._attach_lock:
+            if key in self._partitions:
+                return self._partitions[key][0]
+            path = self.partition_dir / experiment / f"{variable}.duckdb"
+            if not path.exists():
+                if not create:
+                    raise ValueError(f"Partition absente: {experiment}/{variable} ({path})")
+                path.parent.mkdir(parents=True, exist_ok=True)
+            alias = "p_" + re.sub(r"\W", "_", f"{experiment}_{variable}")
+            self.conn.execute(f"ATTACH '{path}' AS {alias}{' (READ_ONLY)' if self.read_only else ''}")
+            self._partitions[key] = (alias, None)
+            return alias
+    
+    def _drop_unified_views(self):
+        """Supprime les vues réunissant les partitions (route)"""
+        for name in self._unified_views:
+            self.conn.execute(f"DROP VIEW IF EXISTS temp.main.{name}")
+        self._unified_views = []
+        self._routed = None
+    
+    @contextmanager
+    def use_partition(self, variable, experiment):
+        """
+        Bascule la connexion sur la partition (variable, scénario), créée si besoin:
+        climate_data, import_manifest et les tables dérivées y désignent les tables
+        de la partition, et une transaction n'écrit que dans ce fichier. Sans effet
+        sur une base non partitionnée.
+        
+        Example:
+            with loader.use_partition("pr", "ssp370"):
+                loader.build_monthly_aggregates()
+        """
+        key = (getattr(variable, "value", variable), getattr(experiment, "value", experiment))
+        if self.layout != "partitioned" or self._active_partition == key:
+            yield
+            return
+        
+        alias = self._attach_partition(*key, create=not self.read_only)
+        previous = self._active_partition
+        self._drop_unified_views()
+        self.conn.execute(f"USE {alias}")
+        self._active_partition = key
+        try:
+            encoding = self._partitions[key][1]
+            if encoding is None:
+                # Première utilisation: schéma créé si besoin, encodage de la partition
+                self._create_schema(value_encoding=self._partition_encoding)
+                self.layout = "partitioned"
+                self._partitions[key] = (alias, self.value_encoding)
+            self.value_encoding = self._partitions[key][1]
+            yield
+        finally:
+            self.conn.execute(f"USE {self._partitions[previous][0] if previous else 'memory'}")
+            self._active_partition = previous
+    
+    def each_partition(self, variables: Optional[List[str]] = None):
+        """
+        Parcourt les partitions en basculant la connexion sur chacune (use_partition).
+        Une seule itération (None) sur une base non partitionnée.
+        
+        Args:
+            variables: Ne parcourir que les partitions de ces variables
+        """
+        if self.layout != "partitioned":
+            yield None
+            return
+        for variable, experiment in self._partition_keys():
+            if variables is None or variable in variables:
+                with self.use_partition(variable, experiment):
+                    yield variable, experiment
+    
+    def route(self, variables=None, experiments=None):
+        """
+        Attache les partitions des variables et scénarios demandés (toutes si None) et
+        définit sur elles seules les vues climate_data, import_manifest et tables
+        dérivées: une requête ne lit que les partitions dont elle a besoin. Sur une
+        racine Parquet, climate_data lit les seuls répertoires variable=/experiment=
+        demandés (read_parquet), les filtres sur member écartant les autres répertoires.
+        Sans effet sur une base non partitionnée ou dans use_partition.
+        
+        Args:
+            variables: Variable ou liste de variables (VariableType ou nom)
+            experiments: Scénario ou liste de scénarios (ExperimentType ou nom)
+        """
+        if self.layout not in ("partitioned", "parquet") or self._active_partition is not None:
+            return
+        
+        def names(values):
+            if values is None:
+                return None
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            return {getattr(value, "value", value) for value in values}
+        
+        variables, experiments = names(variables), names(experiments)
+        keys = tuple(
+            key for key in self._partition_keys()
+            if (variables is None or key[0] in variables) and (experiments is None or key[1] in experiments)
+        )
+        if keys == self._routed:
+            return
+        
+        if self.layout == "parquet":
+            self._drop_unified_views()
+            query = _EMPTY_CLIMATE_DATA_SQL
+            if keys:
+                files = ", ".join(f"'{parquet_glob(self.db_path, *key)}'" for key in keys)
+                query = f"""
+                    SELECT variable, experiment, gcm, rcm, member, lat, lon, time, value
+                    FROM read_parquet([{files}], hive_partitioning = true, union_by_name = true)
+                """
+            self.conn.execute(f"CREATE OR REPLACE TEMP VIEW climate_data AS {query}")
+            self._unified_views.append("climate_data")
+            self._routed = keys
+            return
+        
+        aliases = []
+        for key in keys:
+            try:
+                aliases.append(self._attach_partition(*key))
+            except duckdb.Error as e:
+                # Partition verrouillée par un import en cours: les autres restent lisibles
+                logger.warning(f"⚠️  Partition {key[1]}/{key[0]} non attachée: {e}")
+        tables = {}
+        if aliases:
+            for alias, name in self.conn.execute(f"""
+                SELECT database_name, table_name FROM duckdb_tables()
+                WHERE database_name IN ({','.join('?' for _ in aliases)})
+            """, aliases).fetchall():
+                tables.setdefault(name, []).append(alias)
+        
+        self._drop_unified_views()
+        for name in PARTITION_TABLES + PARTITION_DERIVED_TABLES:
+            sources = [alias for alias in aliases if alias in tables.get(name, [])]
+            if name in PARTITION_DERIVED_TABLES and len(sources) < len(aliases):
+                sources = []
+            if sources:
+                query = " UNION ALL BY NAME ".join(f"SELECT * FROM {alias}.main.{name}" for alias in sources)
+            elif name == "climate_data":
+                query = _EMPTY_CLIMATE_DATA_SQL
+            else:
+                continue
+            self.conn.execute(f"CREATE OR REPLACE TEMP VIEW {name} AS {query}")
+            self._unified_views.append(name)
+        self._routed = keys if len(aliases) == len(keys) else None
+    
+    def _split_into_partitions(self):
+        """
+        Répartit une base existante (un seul fichier, db_path) en une partition par
+        scénario et variable. Le fichier d'origine n'est pas modifié; les tables
+        dérivées ne sont pas copiées et sont à reconstruire.
+        """
+        print(f"🗂️  Répartition de {self.db_path.name} en partitions par scénario et variable...")
+        start = time.perf_counter()
+        self.conn.execute(f"ATTACH '{self.db_path}' AS source (READ_ONLY)")
+        try:
+            tables = {name for (name,) in self.conn.execute(
+                "SELECT table_name FROM information_schema.tables WHERE table_catalog = 'source'"
+            ).fetchall()}
+            if "climate_data" not in tables:
+                return
+            value_type = self.conn.execute("""
+                SELECT data_type FROM information_schema.columns
+                WHERE table_catalog = 'source' AND table_name = 'climate_data' AND column_name = 'value'
+            """).fetchone()[0]
+            self._partition_encoding = "float" if value_type == VALUE_ENCODINGS["float"][0] else "double"
+            
+            total = 0
+            keys = self.conn.execute("SELECT DISTINCT variable, experiment FROM source.climate_data ORDER BY ALL").fetchall()
+            for variable, experiment in keys:
+                with self.use_partition(variable, experiment):
+                    self.conn.begin()
+                    try:
+                        # Valeurs triées par simulation, point puis date (voir optimize_layout)
+                        rows = self.conn.execute("""
+                            INSERT INTO climate_data
+                            SELECT variable, experiment, gcm, rcm, member, lat, lon, time, value
+                            FROM source.climate_data
+                            WHERE variable = ? AND experiment = ?
+                            ORDER BY gcm, rcm, member, lat, lon, time
+                        """, [variable, experiment]).fetchone()[0]
+                        if "import_manifest" in tables:
+                            self.conn.execute("""
+                                INSERT INTO import_manifest
+                                SELECT * FROM source.import_manifest WHERE variable = ? AND experiment = ?
+                            """, [variable, experiment])
+                        if "variable_units" in tables:
+                            self.conn.execute("""
+                                INSERT INTO variable_units
+                                SELECT * FROM source.variable_units WHERE variable = ?
+                                ON CONFLICT DO UPDATE SET unit = excluded.unit
+                            """, [variable])
+                        self.conn.commit()
+                    except Exception:
+                        self.conn.rollback()
+                        raise
+                total += rows
+                print(f"   ✅ {experiment}/{variable}: {rows:,} lignes")
+        finally:
+            self.conn.execute("DETACH source")
+        
+        print(f"   ✅ {total:,} lignes réparties en {len(keys)} partition(s) "
+              f"en {time.perf_counter() - start:.1f}s ({self.partition_dir})")
+        derived = sorted(tables & set(PARTITION_DERIVED_TABLES + ("climate_wide",)))
+        if derived:
+            print(f"   ℹ️  Tables dérivées non copiées, à reconstruire: {', '.join(derived)}")
+    
+    def insert_batch(
+        self,
+        batch: "pd.DataFrame",
+        variable: VariableType,
+        experiment: ExperimentType,
+        gcm: str,
+        rcm: str,
+        member: str = "r1",
+        skip_duplicates: bool = True
+    ) -> int:
+        """
+        Insère un batch colonnaire (lat, lon, time, value) dans climate_data.
+        
+        Les colonnes constantes (variable, experiment, gcm, rcm, member) sont
+        passées en paramètres SQL plutôt que répétées dans le DataFrame.
+        
+        Args:
+            batch: DataFrame avec les colonnes lat, lon, time, value
+            variable: Variable climatique
+            experiment: Scénario climatique
+            gcm: Modèle climatique global
+            rcm: Modèle climatique régional
+            member: Membre d'ensemble
+            skip_duplicates: Si True, ignore les doublons (ON CONFLICT DO NOTHING)
+        
+        Returns:
+            Nombre de lignes insérées (sans les doublons ignorés)
+        """
+        if self.layout == "partitioned" and self._active_partition != (variable.value, experiment.value):
+            with self.use_partition(variable, experiment):
+                return self.insert_batch(batch, variable, experiment, gcm, rcm, member, skip_duplicates)
+        if batch.empty:
+            return 0
+        with self._cache_lock:
+            self._rolling_indexes.clear()
+        
+        if self.layout == "normalized":
+            # Les coordonnées sont remplacées par l'identifiant de cellule
+            insert_sql = f"""
+                INSERT INTO climate_values (run_id, cell_id, time, value)
+                SELECT ?, c.cell_id, CAST(t.time AS DATE), {self._store_sql(variable, 't.value')}
+                FROM temp_chunk t
+                JOIN cells c ON c.lat = t.lat AND c.lon = t.lon
+            """
+            params = [self.get_run_id(variable, experiment, gcm, rcm, member)]
+        else:
+            insert_sql = f"""
+                INSERT INTO climate_data (variable, experiment, gcm, rcm, member, lat, lon, time, value)
+                SELECT ?, ?, ?, ?, ?, lat, lon, CAST(time AS DATE), {self._store_sql(variable, 'value')}
+                FROM temp_chunk
+            """
+            params = [variable.value, experiment.value, gcm, rcm, member]
+        
+        # Enregistrer le DataFrame comme table temporaire (lecture colonnaire, sans copie ligne à ligne)
+        self.conn.register('temp_chunk', batch)
+        try:
+            if self.layout == "normalized":
+                # Cellules absentes de la dimension (import hors import_netcdf_file)
+                self._insert_new_cells('temp_chunk', with_grid=False)
+            if skip_duplicates:
+                # ON CONFLICT DO NOTHING évite les doublons si le fichier est réimporté
+                try:
+                    inserted = self.conn.execute(insert_sql + " ON CONFLICT DO NOTHING", params).fetchone()[0]
+                except Exception as e:
+                    # Si ON CONFLICT n'est pas supporté (table sans PRIMARY KEY), utiliser INSERT normal
+                    if "CONFLICT" in str(e) or "primary key" in str(e).lower():
+                        logger.warning(f"ON CONFLICT non supporté, insertion normale (doublons possibles): {e}")
+                        inserted = self.conn.execute(insert_sql, params).fetchone()[0]
+                    else:
+                        raise
+            else:
+                inserted = self.conn.execute(insert_sql, params).fetchone()[0]
+            self._track_encoding_error(variable, 'temp_chunk')
+        finally:
+            # Nettoyer la table temporaire
+            self.conn.unregister('temp_chunk')
+        
+        return int(inserted)
+    
+    def _value_codec(self, variable) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Pas et décalage de l'encodage d'une variable, enregistrés dans value_encodings
+        au premier import de la variable (valeurs par défaut de VALUE_SCALES).
+        
+        Returns:
+            Tuple (scale, add_offset), (None, None) pour les encodages flottants
+        """
+        if self.value_encoding == "double":
+            return None, None
+        name = getattr(variable, "value", variable)
+        row = self.conn.execute(
+            "SELECT scale, add_offset FROM value_encodings WHERE variable = ?", [name]
+        ).fetchone()
+        if row is not None:
+            return row[0], row[1]
+        
+        scale, add_offset = None, None
+        if VALUE_ENCODINGS[self.value_encoding][1] is not None:
+            try:
+                scale, add_offset = VALUE_SCALES[VariableType(name)]
+                # Pas et décalage exprimés dans l'unité de stockage de la variable
+                factor, shift = unit_conversion(self._native_unit(name), self._variable_unit(name))
+                scale, add_offset = float(f"{scale * factor:.12g}"), float(f"{add_offset * factor + shift:.12g}")
+            except (ValueError, KeyError):
+                logger.warning(f"Pas d'encodage inconnu pour {name}, pas de 0.01 sans décalage")
+                scale, add_offset = 0.01, 0.0
+            if self.value_encoding == "int32":
+                scale *= INT32_SCALE_FACTOR
+        self.conn.execute(
+            "INSERT INTO value_encodings VALUES (?, ?, ?, ?, 0, 0)",
+            [name, self.value_encoding, scale, add_offset]
+        )
+        return scale, add_offset
+    
+    def _store_sql(self, variable, column: str) -> str:
+        """
+        Expression SQL de la valeur stockée à partir de column (valeur lue dans le
+        fichier): conversion dans l'unité de stockage puis encodage (pas et décalage
+        en littéraux).
+        """
+        column = convert_units_sql(column, self._native_unit(variable), self._variable_unit(variable))
+        scale, add_offset = self._value_codec(variable)
+        if scale is None:
+            return encode_value_sql(column, self.value_encoding)
+        return encode_value_sql(column, self.value_encoding, repr(scale), repr(add_offset))
+    
+    def _track_encoding_error(
+        self,
+        variable,
+        source: str,
+        params: Optional[List] = None,
+        convert: bool = True
+    ) -> float:
+        """
+        Met à jour l'erreur maximale de décodage et le nombre de valeurs écrêtées
+        d'une variable à partir des valeurs brutes (colonne value) de source.
+        
+        Args:
+            convert: Les valeurs de source sont dans l'unité des fichiers (False si
+                elles sont déjà dans l'unité de stockage)
+        
+        Returns:
+            Erreur absolue maximale constatée sur source, dans l'unité de stockage
+        """
+        if self.value_encoding == "double":
+            return 0.0
+        scale, add_offset = self._value_codec(variable)
+        limit = VALUE_ENCODINGS[self.value_encoding][1]
+        value = "value"
+        if convert:
+            value = convert_units_sql(value, self._native_unit(variable), self._variable_unit(variable))
+        if scale is None:
+            decoded = decode_value_sql(encode_value_sql(value, self.value_encoding), self.value_encoding)
+            clipped_sql = "0"
+        else:
+            scale, add_offset = repr(scale), repr(add_offset)
+            encoded = encode_value_sql(value, self.value_encoding, scale, add_offset)
+            decoded = decode_value_sql(encoded, self.value_encoding, scale, add_offset)
+            clipped_sql = f"COUNT(*) FILTER (WHERE ABS(ROUND(({value} - {add_offset}) / {scale})) > {limit})"
+        error, clipped = self.conn.execute(f"""
+            SELECT COALESCE(MAX(ABS({decoded} - {value})), 0), {clipped_sql}
+            FROM {source}
+        """, params or []).fetchone()
+        self.conn.execute("""
+            UPDATE value_encodings
+            SET max_abs_error = GREATEST(max_abs_error, ?), clipped = clipped + ?
+            WHERE variable = ?
+        """, [error, clipped, getattr(variable, "value", variable)])
+        return error
+    
+    def encoding_report(self) -> "pd.DataFrame":
+        """
+        Rapport de précision de l'encodage des valeurs.
+        
+        Returns:
+            DataFrame avec colonnes: variable, encoding, scale, add_offset,
+            max_abs_error (erreur absolue maximale de décodage, dans l'unité de
+            stockage de variable_units)
+            et clipped (valeurs écrêtées aux bornes de l'encodage). Vide pour
+            une base en DOUBLE.
+        """
+        self.route()
+        columns = ["variable", "encoding", "scale", "add_offset", "max_abs_error", "clipped"]
+        if not self.has_table("value_encodings"):
+            return pd.DataFrame(columns=columns)
+        return self.conn.execute(f"""
+            SELECT {', '.join(columns)} FROM value_encodings ORDER BY variable
+        """).df()
+    
+    def get_run_id(
+        self,
+        variable: VariableType,
+        experiment: ExperimentType,
+        gcm: str,
+        rcm: str,
+        member: str = "r1",
+        create: bool = True
+    ) -> Optional[int]:
+        """
+        Identifiant d'une simulation dans la dimension runs (schéma normalisé).
+        
+        Args:
+            create: Si True, ajoute la simulation si elle est absente
+        
+        Returns:
+            run_id, ou None si la simulation est absente et create=False
+        """
+        key = [variable.value, experiment.value, gcm, rcm, member]
+        row = self.conn.execute("""
+            SELECT run_id FROM runs
+            WHERE variable = ? AND experiment = ? AND gcm = ? AND rcm = ? AND member = ?
+        """, key).fetchone()
+        if row is not None or not create:
+            return row[0] if row else None
+        run_id = self.conn.execute("SELECT COALESCE(MAX(run_id), 0) + 1 FROM runs").fetchone()[0]
+        self.conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)", [run_id] + key)
+        return run_id
+    
+    def register_cells(self, lat, lon, grid_y=None, grid_x=None) -> int:
+        """
+        Ajoute à la dimension cells les cellules absentes (schéma normalisé).
+        
+        Args:
+            lat: Latitudes des cellules
+            lon: Longitudes des cellules
+            grid_y: Indices des cellules dans la grille du fichier (optionnel)
+            grid_x: Indices des cellules dans la grille du fichier (optionnel)
+        
+        Returns:
+            Nombre de cellules ajoutées
+        """
+        cells = pd.DataFrame({
+            "lat": np.asarray(lat, dtype=np.float64),
+            "lon": np.asarray(lon, dtype=np.float64),
+        })
+        with_grid = grid_y is not None and grid_x is not None
+        if with_grid:
+            cells["grid_y"] = np.asarray(grid_y, dtype=np.int32)
+            cells["grid_x"] = np.asarray(grid_x, dtype=np.int32)
+        
+        self.conn.register('temp_cells', cells)
+        try:
+            return self._insert_new_cells('temp_cells', with_grid)
+        finally:
+            self.conn.unregister('temp_cells')
+    
+    def _insert_new_cells(self, source: str, with_grid: bool) -> int:
+        """Ajoute à cells les couples (lat, lon) de `source` encore inconnus"""
+        grid_columns = "s.grid_y, s.grid_x" if with_grid else "CAST(NULL AS INTEGER), CAST(NULL AS INTEGER)"
+        return self.conn.execute(f"""
+            INSERT INTO cells (cell_id, lat, lon, grid_y, grid_x)
+            SELECT (SELECT COALESCE(MAX(cell_id), 0) FROM cells) + row_number() OVER (ORDER BY lat, lon), *
+            FROM (
+                SELECT DISTINCT ON (s.lat, s.lon) s.lat, s.lon, {grid_columns}
+                FROM {source} s
+                WHERE NOT EXISTS (SELECT 1 FROM cells c WHERE c.lat = s.lat AND c.lon = s.lon)
+            )
+        """).fetchone()[0]
+    
+    def normalize_schema(self):
+        """
+        Convertit une base historique (table climate_data) au schéma normalisé.
+        
+        Les simulations et les points distincts alimentent runs et cells, puis les
+        valeurs sont recopiées dans climate_values triées par (run_id, cell_id, time)
+        et la table est remplacée par la vue climate_data. Les indices de grille des
+        cellules restent inconnus (NULL) pour une base convertie.
+        """
+        if self.layout == "normalized":
+            return
+        
+        print("🔄 Conversion de climate_data au schéma normalisé (runs, cells, climate_values)...")
+        start = time.perf_counter()
+        self.conn.begin()
+        try:
+            self._create_normalized_schema(with_view=False)
+            self.conn.execute("""
+                INSERT INTO runs
+                SELECT row_number() OVER (ORDER BY variable, experiment, gcm, rcm, member), *
+                FROM (SELECT DISTINCT variable, experiment, gcm, rcm, member FROM climate_data)
+            """)
+            self.conn.execute("""
+                INSERT INTO cells
+                SELECT row_number() OVER (ORDER BY lat, lon), lat, lon, NULL, NULL
+                FROM (SELECT DISTINCT lat, lon FROM climate_data)
+            """)
+            # Encodage demandé: pas et décalage de chaque variable, puis valeurs converties
+            variables = [row[0] for row in self.conn.execute("SELECT DISTINCT variable FROM runs").fetchall()]
+            for variable in variables:
+                self._value_codec(variable)
+            value = encode_value_sql("d.value", self.value_encoding, "e.scale", "e.add_offset")
+            encoding_join = (
+                "JOIN value_encodings e ON e.variable = d.variable"
+                if VALUE_ENCODINGS[self.value_encoding][1] is not None else ""
+            )
+            rows = self.conn.execute(f"""
+                INSERT INTO climate_values
+                SELECT DISTINCT ON (r.run_id, c.cell_id, d.time) r.run_id, c.cell_id, d.time, {value}
+                FROM climate_data d
+                JOIN runs r USING (variable, experiment, gcm, rcm, member)
+                JOIN cells c USING (lat, lon)
+                {encoding_join}
+                ORDER BY r.run_id, c.cell_id, d.time
+            """).fetchone()[0]
+            for variable in variables:
+                self._track_encoding_error(
+                    variable, "(SELECT value FROM climate_data WHERE variable = ?)", [variable], convert=False
+                )
+            self.conn.execute("DROP TABLE climate_data")
+            self._create_compat_view()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.layout = "normalized"
+        print(f"   ✅ {rows:,} lignes converties en {time.perf_counter() - start:.1f}s")
+    
+    def get_runs(self, variable: Optional[str] = None, experiment: Optional[str] = None) -> "pd.DataFrame":
+        """
+        Simulations présentes dans la base.
+        
+        Args:
+            variable: Ne lister que les simulations de cette variable
+            experiment: Ne lister que les simulations de ce scénario
+        
+        Returns:
+            DataFrame avec colonnes: variable, experiment, gcm, rcm, member
+        """
+        self.route(variable, experiment)
+        conditions, params = [], []
+        for column, value in (("variable", variable), ("experiment", experiment)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(getattr(value, "value", value))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Schéma normalisé: lecture de la petite table runs au lieu de toutes les valeurs
+        source = "runs" if self.layout == "normalized" else "climate_data"
+        return self.conn.execute(f"""
+            SELECT DISTINCT variable, experiment, gcm, rcm, member
+            FROM {source}
+            {where}
+            ORDER BY ALL
+        """, params).df()
+    
+    def optimize_layout(self) -> int:
+        """
+        Réécrit la table des valeurs triée par simulation, point puis date.
+        
+        L'import écrit les lignes dans l'ordre des fichiers (date par date): les
+        valeurs d'un point sont alors réparties dans tous les row groups. Une fois
+        triées, les min/max de chaque row group (zone maps) permettent à DuckDB de
+        ne lire que les blocs d'un point et d'une période. Les anciens index
+        secondaires (idx_spatial, idx_temporal, idx_variable) sont supprimés.
+        
+        Returns:
+            Nombre de lignes réécrites
+        """
+        if self.layout == "partitioned" and self._active_partition is None:
+            # Base partitionnée: table construite dans chaque partition
+            return sum(self.optimize_layout() for _ in self.each_partition())
+        if self.layout == "normalized":
+            table, order = "climate_values", "run_id, cell_id, time"
+        else:
+            table, order = "climate_data", "variable, experiment, gcm, rcm, member, lat, lon, time"
+        
+        print(f"🗂️  Réécriture de {table} triée par ({order})...")
+        start = time.perf_counter()
+        # Même définition (types, clé primaire), sous un nom temporaire
+        ddl = self.conn.execute(
+            "SELECT sql FROM duckdb_tables() WHERE table_name = ? AND database_name = current_database()", [table]
+        ).fetchone()[0]
+        ddl = ddl.replace(f"CREATE TABLE {table}(", f"CREATE TABLE {table}_sorted(", 1)
+        self.conn.begin()
+        try:
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}_sorted")
+            self.conn.execute(ddl)
+            rows = self.conn.execute(f"""
+                INSERT INTO {table}_sorted SELECT * FROM {table} ORDER BY {order}
+            """).fetchone()[0]
+            self.conn.execute(f"DROP TABLE {table}")
+            self.conn.execute(f"ALTER TABLE {table}_sorted RENAME TO {table}")
+            if self.layout == "normalized":
+                self._create_compat_view()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.execute("CHECKPOINT")
+        print(f"   ✅ {rows:,} lignes réécrites en {time.perf_counter() - start:.1f}s")
+        return rows
+    
+    def maintain(self, compact: bool = True) -> "pd.DataFrame":
+        """
+        Maintenance après des imports: ANALYZE (statistiques de l'optimiseur),
+        CHECKPOINT forcé, puis compaction du fichier.
+        
+        Les imports avec ON CONFLICT et les réécritures (optimize_layout, tables
+        dérivées) laissent des blocs libres que DuckDB réutilise sans réduire le
+        fichier: la compaction recopie la base dans un nouveau fichier
+        (compact_database_file). Base partitionnée: chaque partition.
+        
+        Args:
+            compact: Réécrire chaque fichier pour récupérer la place libre
+        
+        Returns:
+            DataFrame avec colonnes: path, size_before_mb, size_after_mb
+        """
+        if self.read_only or self.layout == "parquet":
+            raise ValueError("Maintenance impossible: base en lecture seule ou racine Parquet (fichiers immuables)")
+        
+        rows = []
+        for partition in self.each_partition():
+            if partition is None:
+                path, name = self.db_path, self.db_path.name
+            else:
+                variable, experiment = partition
+                path, name = self.partition_dir / experiment / f"{variable}.duckdb", f"{experiment}/{variable}.duckdb"
+            print(f"🧹 Maintenance de {name}...")
+            start = time.perf_counter()
+            self.conn.execute("ANALYZE")
+            self.conn.execute("FORCE CHECKPOINT")
+            rows.append((str(path), path.stat().st_size / 1e6))
+            print(f"   ✅ ANALYZE et CHECKPOINT en {time.perf_counter() - start:.1f}s")
+        
+        if compact:
+            # Fichiers fermés pendant leur réécriture: connexion principale ou partitions détachées
+            if self.layout == "partitioned":
+                self._drop_unified_views()
+                for key, (alias, _) in list(self._partitions.items()):
+                    self.conn.execute(f"DETACH {alias}")
+                    del self._partitions[key]
+            else:
+                # Les curseurs du pool appartiennent à la connexion fermée
+                self.pool.close()
+                self._conn.close()
+            try:
+                for path, _ in rows:
+                    start = time.perf_counter()
+                    compact_database_file(path)
+                    print(f"   🗜️  {Path(path).name} compacté en {time.perf_counter() - start:.1f}s")
+            finally:
+                if self.layout != "partitioned":
+                    self.conn = duckdb.connect(str(self.db_path), read_only=False)
+                    self.pool = CursorPool(lambda: self._conn.cursor(), size=self.pool.size, timeout=self.pool.timeout)
+        
+        report = pd.DataFrame(rows, columns=["path", "size_before_mb"])
+        report["size_after_mb"] = [Path(path).stat().st_size / 1e6 for path in report["path"]]
+        return report.round(2)
+    
+    def storage_info(self) -> "pd.DataFrame":
+        """
+        Segments des tables de la base (pragma_storage_info) avec leur taille.
+        
+        DuckDB ne donne que la position de chaque segment dans son bloc: la taille
+        compressée est estimée par l'écart avec le segment suivant du même bloc,
+        plus les blocs supplémentaires d'un segment qui en occupe plusieurs. Le
+        dernier segment d'un bloc (suivi de place libre) est borné par sa taille
+        non compressée (SEGMENT_WIDTHS, longueur maximale des chaînes). Les
+        segments constants (sans bloc) ne prennent pas de place. Faire un
+        CHECKPOINT avant: les données encore en mémoire n'ont pas de bloc.
+        
+        Returns:
+            DataFrame avec colonnes: database, table_name, row_group_id, column_name,
+            segment_type, count, compression, has_updates, bytes
+        """
+        if self.layout == "parquet":
+            raise ValueError("Racine Parquet: voir parquet_metadata() de DuckDB")
+        if self.layout == "partitioned" and self._active_partition is None:
+            frames = [self.storage_info() for _ in self.each_partition()]
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        
+        database = self.conn.execute("SELECT current_database()").fetchone()[0]
+        block_size = self.conn.execute(
+            "SELECT block_size FROM pragma_database_size() WHERE database_name = ?", [database]
+        ).fetchone()[0]
+        tables = [name for (name,) in self.conn.execute("""
+            SELECT table_name FROM duckdb_tables()
+            WHERE database_name = current_database() AND NOT temporary
+            ORDER BY table_name
+        """).fetchall()]
+        frames = []
+        for table in tables:
+            info = self.conn.execute(f"""
+                SELECT row_group_id, column_name, segment_type, count, compression, has_updates, stats,
+                       block_id, block_offset, len(additional_block_ids) AS additional_blocks
+                FROM pragma_storage_info('{table}')
+            """).df()
+            info.insert(0, "table_name", table)
+            frames.append(info)
+        columns = ["database", "table_name", "row_group_id", "column_name", "segment_type",
+                   "count", "compression", "has_updates", "bytes"]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        
+        # Toutes les tables ensemble: des segments de plusieurs tables partagent des blocs
+        segments = pd.concat(frames, ignore_index=True)
+        stored = segments[segments["block_id"] >= 0].sort_values(["block_id", "block_offset"])
+        end = stored.groupby("block_id")["block_offset"].shift(-1)
+        sizes = end.fillna(block_size) - stored["block_offset"] + block_size * stored["additional_blocks"]
+        width = stored["segment_type"].map(SEGMENT_WIDTHS)
+        strings = stored["segment_type"] == "VARCHAR"
+        width[strings] = stored.loc[strings, "stats"].str.extract(r"Max String Length: (\d+)")[0].astype(float) + 4
+        bound = np.ceil(stored["count"] * width)
+        sizes = sizes.where(end.notna() | bound.isna(), np.minimum(sizes, bound))
+        segments["bytes"] = sizes.reindex(segments.index).fillna(0).astype("int64")
+        segments["database"] = database
+        return segments[columns]
+    
+    def storage_report(self) -> Dict[str, "pd.DataFrame"]:
+        """
+        Rapport de stockage (voir storage_info) par colonne et par row group.
+        
+        Returns:
+            {"columns": database, table_name, column_name, rows, row_groups, bytes, compression,
+             "row_groups": database, table_name, row_group_id, rows, bytes, compression, has_updates}
+            compression: types de compression utilisés (hors masques de validité)
+        """
+        segments = self.storage_info()
+        if segments.empty:
+            return {"columns": segments, "row_groups": segments}
+        data = segments[segments["segment_type"] != "VALIDITY"]
+        
+        def compressions(values):
+            return ", ".join(sorted(set(values)))
+        
+        columns = segments.groupby(["database", "table_name", "column_name"], sort=False).agg(
+            row_groups=("row_group_id", "nunique"), bytes=("bytes", "sum")
+        ).join(data.groupby(["database", "table_name", "column_name"], sort=False).agg(
+            rows=("count", "sum"), compression=("compression", compressions)
+        )).reset_index()
+        
+        per_column = data.groupby(["database", "table_name", "row_group_id", "column_name"])["count"].sum()
+        row_groups = segments.groupby(["database", "table_name", "row_group_id"]).agg(
+            bytes=("bytes", "sum"), has_updates=("has_updates", "any")
+        ).join(per_column.groupby(level=[0, 1, 2]).max().rename("rows")).join(
+            data.groupby(["database", "table_name", "row_group_id"])["compression"].agg(compressions)
+        ).reset_index()
+        return {
+            "columns": columns[["database", "table_name", "column_name", "rows", "row_groups", "bytes", "compression"]],
+            "row_groups": row_groups[["database", "table_name", "row_group_id", "rows", "bytes", "compression", "has_updates"]],
+        }
+    
+    def has_table(self, name: str) -> bool:
+        """True si la table (ou vue) existe dans la base (ou la partition courante)"""
+        if self._routed is None:
+            # Base partitionnée sans vues: toutes les partitions
+            self.route()
+        return self.conn.execute("""
+            SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_name = ? AND table_catalog IN (current_database(), 'temp')
+        """, [name]).fetchone()[0] > 0
+    
+    def build_wide_table(self, simulations: Optional[List[Tuple[str, str, str, str]]] = None) -> int:
+        """
+        (Re)construit la table large climate_wide: une ligne par (simulation, point,
+        date) et une colonne par variable (pr, tas, tasmin, tasmax).
+        
+        Les fichiers de chaque variable, déjà importés dans climate_data, sont
+        fusionnés par un seul GROUP BY. Les lignes sont écrites triées par
+        simulation, point et date pour que les lectures d'un point ne touchent que
+        quelques blocs.
+        
+        Args:
+            simulations: (experiment, gcm, rcm, member) à reconstruire; toutes si None
+        
+        Returns:
+            Nombre de lignes écrites dans climate_wide
+        """
+        if self.layout == "partitioned":
+            raise ValueError("climate_wide réunit plusieurs variables: non disponible pour une base partitionnée")
+        variable_columns = ",\n".join(f"{v.value} DOUBLE" for v in WIDE_VARIABLES)
+        
+        where, params = "", []
+        if simulations is not None:
+            if not simulations:
+                return 0
+            where = " OR ".join(["(experiment = ? AND gcm = ? AND rcm = ? AND member = ?)"] * len(simulations))
+            where = f"({where})"
+            params = [str(value) for simulation in simulations for value in simulation]
+        
+        start = time.perf_counter()
+        self.conn.begin()
+        try:
+            self.conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS climate_wide (
+                    experiment VARCHAR NOT NULL,
+                    gcm VARCHAR NOT NULL,
+                    rcm VARCHAR NOT NULL,
+                    member VARCHAR NOT NULL,
+                    lat DOUBLE NOT NULL,
+                    lon DOUBLE NOT NULL,
+                    time DATE NOT NULL,
+                    {variable_columns}
+                );
+            """)
+            self.conn.execute(f"DELETE FROM climate_wide {'WHERE ' + where if where else ''}", params)
+            rows = self.conn.execute(
+                f"INSERT INTO climate_wide {self._wide_pivot_sql(where)}", [v.value for v in WIDE_VARIABLES] + params
+            ).fetchone()[0]
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        print(f"   ✅ climate_wide: {rows:,} lignes écrites en {time.perf_counter() - start:.1f}s")
+        return rows
+    
+    @staticmethod
+    def _wide_pivot_sql(where: str = "") -> str:
+        """Lignes de climate_wide calculées depuis climate_data (paramètres: WIDE_VARIABLES, puis ceux de where)"""
+        pivot_columns = ",\n".join(
+            f"MAX(value) FILTER (WHERE variable = '{v.value}') AS {v.value}" for v in WIDE_VARIABLES
+        )
+        return f"""
+            SELECT experiment, gcm, rcm, member, lat, lon, time,
+                {pivot_columns}
+            FROM climate_data
+            WHERE variable IN ({', '.join('?' for _ in WIDE_VARIABLES)})
+              {'AND ' + where if where else ''}
+            GROUP BY experiment, gcm, rcm, member, lat, lon, time
+            ORDER BY experiment, gcm, rcm, member, lat, lon, time
+        """
+    
+    def refresh_wide_table(
+        self,
+        run: Tuple[str, str, str, str, str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> int:
+        """
+        Recalcule les lignes de climate_wide d'une simulation sur une période (toutes
+        ses variables, relues dans climate_data).
+        
+        Args:
+            run: (variable, experiment, gcm, rcm, member) importé
+            start_date: Premier jour recalculé; toute la simulation si None
+            end_date: Dernier jour recalculé
+        
+        Returns:
+            Nombre de lignes écrites
+        """
+        if run[0] not in {v.value for v in WIDE_VARIABLES}:
+            return 0
+        where = "experiment = ? AND gcm = ? AND rcm = ? AND member = ?"
+        params = list(run[1:])
+        if start_date is not None and end_date is not None:
+            where += " AND time BETWEEN ? AND ?"
+            params += [start_date, end_date]
+        self.conn.execute(f"DELETE FROM climate_wide WHERE {where}", params)
+        return self.conn.execute(
+            f"INSERT INTO climate_wide {self._wide_pivot_sql(where)}", [v.value for v in WIDE_VARIABLES] + params
+        ).fetchone()[0]
+    
+    def build_series_table(
+        self,
+        simulations: Optional[List[Tuple[str, str, str, str, str]]] = None,
+        years_per_chunk: int = 10
+    ) -> int:
+        """
+        (Re)construit la table compacte climate_series: une ligne par (simulation,
+        variable, point, année) contenant les 366 valeurs journalières en float32.
+        
+        Une série de point n'est plus répartie sur 365 lignes par an: la lecture
+        d'un siècle pour un point et dix membres ne touche qu'un millier de lignes.
+        Les lignes sont écrites triées par simulation, point et année.
+        
+        Args:
+            simulations: (variable, experiment, gcm, rcm, member) à reconstruire; toutes si None
+            years_per_chunk: Nombre d'années compactées à la fois (limite la mémoire)
+        
+        Returns:
+            Nombre de séries annuelles écrites
+        """
+        if self.layout == "partitioned" and self._active_partition is None:
+            # Base partitionnée: table construite dans chaque partition
+            return sum(self.build_series_table(simulations, years_per_chunk) for _ in self.each_partition())
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS climate_series (
+                variable VARCHAR NOT NULL,
+                experiment VARCHAR NOT NULL,
+                gcm VARCHAR NOT NULL,
+                rcm VARCHAR NOT NULL,
+                member VARCHAR NOT NULL,
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                year SMALLINT NOT NULL,
+                daily FLOAT[] NOT NULL
+            );
+        """)
+        
+        runs = list(self.get_runs().itertuples(index=False, name=None))
+        if simulations is not None:
+            wanted = {tuple(str(value) for value in simulation) for simulation in simulations}
+            runs = [run for run in runs if run in wanted]
+        
+        start = time.perf_counter()
+        total = 0
+        for run in runs:
+            self.conn.begin()
+            try:
+                total += self.refresh_series_table(run, years_per_chunk=years_per_chunk)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        
+        print(f"   ✅ climate_series: {total:,} séries annuelles ({len(runs)} simulation(s)) "
+              f"en {time.perf_counter() - start:.1f}s")
+        return total
+    
+    def refresh_series_table(
+        self,
+        run: Tuple[str, str, str, str, str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        years_per_chunk: int = 10
+    ) -> int:
+        """
+        Recalcule les séries annuelles de climate_series d'une simulation sur les années
+        couvrant une période.
+        
+        Args:
+            run: (variable, experiment, gcm, rcm, member)
+            start_date: Début de la période (année entière); toute la simulation si None
+            end_date: Fin de la période (année entière)
+            years_per_chunk: Nombre d'années compactées à la fois (limite la mémoire)
+        
+        Returns:
+            Nombre de séries annuelles écrites
+        """
+        run_filter = "variable = ? AND experiment = ? AND gcm = ? AND rcm = ? AND member = ?"
+        if start_date is not None and end_date is not None:
+            first_year, last_year = start_date.year, end_date.year
+            self.conn.execute(
+                f"DELETE FROM climate_series WHERE {run_filter} AND year >= ? AND year <= ?",
+                list(run) + [first_year, last_year]
+            )
+        else:
+            self.conn.execute(f"DELETE FROM climate_series WHERE {run_filter}", list(run))
+            first_year, last_year = self.conn.execute(
+                f"SELECT MIN(year(time)), MAX(year(time)) FROM climate_data WHERE {run_filter}", list(run)
+            ).fetchone()
+            if first_year is None:
+                return 0
+        
+        total = 0
+        for chunk_start in range(first_year, last_year + 1, years_per_chunk):
+            chunk_end = min(chunk_start + years_per_chunk, last_year + 1)
+            data = self.conn.execute(f"""
+                SELECT lat, lon, year(time) AS year, dayofyear(time) AS dayofyear, value
+                FROM climate_data
+                WHERE {run_filter} AND time >= ? AND time < ?
+                ORDER BY lat, lon, time
+            """, list(run) + [date(chunk_start, 1, 1), date(chunk_end, 1, 1)]).fetchnumpy()
+            packed = pack_daily_series(data["lat"], data["lon"], data["year"], data["dayofyear"], data["value"])
+            if packed.empty:
+                continue
+            self.conn.register('temp_series', packed)
+            try:
+                self.conn.execute("""
+                    INSERT INTO climate_series
+                    SELECT ?, ?, ?, ?, ?, lat, lon, year, CAST(daily AS FLOAT[])
+                    FROM temp_series
+                """, list(run))
+            finally:
+                self.conn.unregister('temp_series')
+            total += len(packed)
+        return total
+    
+    def build_monthly_aggregates(self, simulations: Optional[List[Tuple[str, str, str, str, str]]] = None) -> int:
+        """
+        (Re)construit la table monthly_aggregates: somme, moyenne, min, max et nombre
+        de jours par (simulation, variable, point, année, mois).
+        
+        Une fois créée, la table est tenue à jour par chaque import (voir
+        finish_import). Les graphiques mensuels lisent alors environ 30 fois moins
+        de lignes que climate_data.
+        
+        Args:
+            simulations: (variable, experiment, gcm, rcm, member) à reconstruire; toutes si None
+        
+        Returns:
+            Nombre de lignes mensuelles écrites
+        """
+        if self.layout == "partitioned" and self._active_partition is None:
+            # Base partitionnée: table construite dans chaque partition
+            return sum(self.build_monthly_aggregates(simulations) for _ in self.each_partition())
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS monthly_aggregates (
+                variable VARCHAR NOT NULL,
+                experiment VARCHAR NOT NULL,
+                gcm VARCHAR NOT NULL,
+                rcm VARCHAR NOT NULL,
+                member VARCHAR NOT NULL,
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                year SMALLINT NOT NULL,
+                month TINYINT NOT NULL,
+                value_sum DOUBLE NOT NULL,
+                value_mean DOUBLE NOT NULL,
+                value_min DOUBLE NOT NULL,
+                value_max DOUBLE NOT NULL,
+                days_count INTEGER NOT NULL
+            );
+        """)
+        
+        runs = list(self.get_runs().itertuples(index=False, name=None))
+        if simulations is not None:
+            wanted = {tuple(str(value) for value in simulation) for simulation in simulations}
+            runs = [run for run in runs if run in wanted]
+        
+        start = time.perf_counter()
+        total = 0
+        for run in runs:
+            self.conn.begin()
+            try:
+                total += self.refresh_monthly_aggregates(run)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        
+        print(f"   ✅ monthly_aggregates: {total:,} lignes mensuelles ({len(runs)} simulation(s)) "
+              f"en {time.perf_counter() - start:.1f}s")
+        return total
+    
+    def refresh_monthly_aggregates(
+        self,
+        run: Tuple[str, str, str, str, str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> int:
+        """
+        Recalcule les agrégats mensuels d'une simulation sur les mois couvrant une période.
+        
+        Args:
+            run: (variable, experiment, gcm, rcm, member)
+            start_date: Début de la période (mois entier); toute la simulation si None
+            end_date: Fin de la période (mois entier)
+        
+        Returns:
+            Nombre de lignes mensuelles écrites
+        """
+        run_filter = "variable = ? AND experiment = ? AND gcm = ? AND rcm = ? AND member = ?"
+        period_filter, period_params = "", []
+        if start_date is not None and end_date is not None:
+            first_month = date(start_date.year, start_date.month, 1)
+            after_last_month = date(end_date.year + end_date.month // 12, end_date.month % 12 + 1, 1)
+            period_filter = " AND make_date(year, month, 1) >= ? AND make_date(year, month, 1) < ?"
+            period_params = [first_month, after_last_month]
+        
+        self.conn.execute(
+            f"DELETE FROM monthly_aggregates WHERE {run_filter}{period_filter}", list(run) + period_params
+        )
+        time_filter = period_filter.replace("make_date(year, month, 1)", "time")
+        return self.conn.execute(f"""
+            INSERT INTO monthly_aggregates
+            SELECT variable, experiment, gcm, rcm, member, lat, lon,
+                   year(time) AS year, month(time) AS month,
+                   SUM(value), AVG(value), MIN(value), MAX(value), COUNT(*)
+            FROM climate_data
+            WHERE {run_filter}{time_filter}
+            GROUP BY ALL
+            ORDER BY lat, lon, year, month
+        """, list(run) + period_params).fetchone()[0]
+    
+    def get_monthly_values(
+        self,
+        variable: str,
+        experiment: str,
+        start_date: date,
+        end_date: date,
+        aggregate: str = "sum",
+        unit: Optional[str] = None,
+        filters: str = "",
+        filter_params: Optional[List] = None
+    ) -> "pd.DataFrame":
+        """
+        Valeurs mensuelles (somme ou moyenne des valeurs journalières) par simulation et par point.
+        
+        Les mois entièrement compris dans la période sont lus dans monthly_aggregates
+        si la table existe; les mois partiels en début et fin de période, ou toute la
+        période sans la table, sont agrégés depuis climate_data.
+        
+        Args:
+            variable: Variable climatique
+            experiment: Scénario climatique
+            start_date: Premier jour inclus
+            end_date: Dernier jour inclus
+            aggregate: "sum" ou "mean"
+            unit: Unité du résultat (unité de stockage si None)
+            filters: Conditions SQL supplémentaires sur gcm, rcm, member, lat, lon (préfixées par AND)
+            filter_params: Paramètres de filters
+        
+        Returns:
+            DataFrame avec colonnes: lat, lon, gcm, rcm, member, year, month, value, days_count
+        """
+        self.route(variable, experiment)
+        if aggregate not in ("sum", "mean"):
+            raise ValueError(f"Agrégation non supportée: {aggregate} (attendu: sum, mean)")
+        filter_params = filter_params or []
+        stored_unit = self.get_variable_units().get(variable, "")
+        factor, offset = unit_conversion(stored_unit, unit) if unit else (1.0, 0.0)
+        
+        def raw_part(first: date, last: date) -> Tuple[str, List]:
+            value = convert_units_sql("value", stored_unit, unit) if unit else "value"
+            sql = f"""
+                SELECT lat, lon, gcm, rcm, member, year(time) AS year, month(time) AS month,
+                       {"SUM" if aggregate == "sum" else "AVG"}({value}) AS value, COUNT(*) AS days_count
+                FROM climate_data
+                WHERE variable = ? AND experiment = ? AND time >= ? AND time <= ? {filters}
+                GROUP BY lat, lon, gcm, rcm, member, year, month
+            """
+            return sql, [variable, experiment, first, last] + filter_params
+        
+        if not self.has_table("monthly_aggregates"):
+            sql, params = raw_part(start_date, end_date)
+            return self.conn.execute(sql + " ORDER BY ALL", params).df()
+        
+        # Mois entiers de la période: [full_start, full_end[
+        full_start = date(start_date.year, start_date.month, 1)
+        if full_start < start_date:
+            full_start = date(full_start.year + full_start.month // 12, full_start.month % 12 + 1, 1)
+        after_end = end_date + timedelta(days=1)
+        full_end = date(after_end.year, after_end.month, 1)
+        
+        parts, params = [], []
+        if full_start < full_end:
+            if aggregate == "sum":
+                value = f"value_sum * {factor!r} + {offset!r} * days_count"
+            else:
+                value = f"value_mean * {factor!r} + {offset!r}"
+            parts.append(f"""
+                SELECT lat, lon, gcm, rcm, member, year, month, {value} AS value, days_count
+                FROM monthly_aggregates
+                WHERE variable = ? AND experiment = ? AND year >= ? AND year <= ?
+                  AND make_date(year, month, 1) >= ? AND make_date(year, month, 1) < ? {filters}
+            """)
+            last_year = (full_end - timedelta(days=1)).year
+            params += [variable, experiment, full_start.year, last_year, full_start, full_end] + filter_params
+            edges = [(start_date, full_start - timedelta(days=1)), (full_end, end_date)]
+        else:
+            edges = [(start_date, end_date)]
+        for first, last in edges:
+            if first <= last:
+                sql, edge_params = raw_part(first, last)
+                parts.append(sql)
+                params += edge_params
+        return self.conn.execute(" UNION ALL ".join(parts) + " ORDER BY ALL", params).df()
+    
+    def build_cumulative_sums(
+        self,
+        variables: Tuple[str, ...] = ("pr",),
+        simulations: Optional[List[Tuple[str, str, str, str, str]]] = None
+    ) -> int:
+        """
+        (Re)construit la table cumulative_sums: cumul des valeurs et du nombre de jours
+        par (simulation, point), date par date.
+        
+        Le total d'une période [début, fin] est alors cumul(fin) - cumul(début - 1):
+        deux lectures par point au lieu de relire tous les jours de la période (voir
+        get_period_totals). Chaque point a une ligne par jour calendaire entre sa
+        première et sa dernière date, les jours absents reprenant le cumul précédent.
+        Une fois créée, la table est tenue à jour par chaque import (voir finish_import).
+        
+        Args:
+            variables: Variables cumulées (précipitations par défaut)
+            simulations: (variable, experiment, gcm, rcm, member) à reconstruire; toutes si None
+        
+        Returns:
+            Nombre de lignes écrites
+        """
+        if self.layout == "partitioned" and self._active_partition is None:
+            # Base partitionnée: table construite dans chaque partition
+            return sum(self.build_cumulative_sums(variables, simulations) for _ in self.each_partition(variables))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cumulative_sums (
+                variable VARCHAR NOT NULL,
+                experiment VARCHAR NOT NULL,
+                gcm VARCHAR NOT NULL,
+                rcm VARCHAR NOT NULL,
+                member VARCHAR NOT NULL,
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                time DATE NOT NULL,
+                value_cumsum DOUBLE NOT NULL,
+                days_cumcount INTEGER NOT NULL
+            );
+        """)
+        
+        runs = [run for run in self.get_runs().itertuples(index=False, name=None) if run[0] in variables]
+        if simulations is not None:
+            wanted = {tuple(str(value) for value in simulation) for simulation in simulations}
+            runs = [run for run in runs if run in wanted]
+        
+        start = time.perf_counter()
+        total = 0
+        for run in runs:
+            self.conn.begin()
+            try:
+                total += self.refresh_cumulative_sums(run)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        
+        print(f"   ✅ cumulative_sums: {total:,} lignes ({len(runs)} simulation(s)) "
+              f"en {time.perf_counter() - start:.1f}s")
+        return total
+    
+    def has_cumulative_sums(self, variable: str) -> bool:
+        """Vérifie que cumulative_sums existe et contient la variable"""
+        if not self.has_table("cumulative_sums"):
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM cumulative_sums WHERE variable = ? LIMIT 1", [variable]
+        ).fetchone() is not None
+    
+    def refresh_cumulative_sums(self, run: Tuple[str, str, str, str, str], start_date: Optional[date] = None) -> int:
+        """
+        Recalcule les cumuls d'une simulation à partir d'une date.
+        
+        Les cumuls antérieurs à start_date sont conservés et servent de point de
+        départ; ceux à partir de start_date sont réécrits depuis climate_data.
+        
+        Args:
+            run: (variable, experiment, gcm, rcm, member)
+            start_date: Première date recalculée; toute la simulation si None
+        
+        Returns:
+            Nombre de lignes écrites
+        """
+        run_filter = "variable = ? AND experiment = ? AND gcm = ? AND rcm = ? AND member = ?"
+        start_date = start_date or date.min
+        self.conn.execute(
+            f"DELETE FROM cumulative_sums WHERE {run_filter} AND time >= ?", list(run) + [start_date]
+        )
+        return self.conn.execute(f"""
+            INSERT INTO cumulative_sums
+            WITH base AS (
+                SELECT lat, lon, MAX(time) AS time,
+                       arg_max(value_cumsum, time) AS value_cumsum,
+                       arg_max(days_cumcount, time) AS days_cumcount
+                FROM cumulative_sums
+                WHERE {run_filter}
+                GROUP BY lat, lon
+            ),
+            data AS (
+                SELECT lat, lon, time, value FROM climate_data WHERE {run_filter} AND time >= ?
+            ),
+            days AS (
+                -- Un jour calendaire par point, de la fin des cumuls conservés à la dernière date
+                SELECT lat, lon, CAST(unnest(generate_series(
+                    COALESCE(MAX(b.time) + 1, MIN(d.time)), MAX(d.time), INTERVAL 1 DAY
+                )) AS DATE) AS time
+                FROM data d LEFT JOIN base b USING (lat, lon)
+                GROUP BY lat, lon
+            )
+            SELECT ?, ?, ?, ?, ?, days.lat, days.lon, days.time,
+                   COALESCE(b.value_cumsum, 0) + COALESCE(SUM(d.value) OVER w, 0),
+                   COALESCE(b.days_cumcount, 0) + COUNT(d.value) OVER w
+            FROM days
+            LEFT JOIN data d USING (lat, lon, time)
+            LEFT JOIN base b ON b.lat = days.lat AND b.lon = days.lon
+            WINDOW w AS (PARTITION BY days.lat, days.lon ORDER BY days.time ROWS UNBOUNDED PRECEDING)
+            ORDER BY days.lat, days.lon, days.time
+        """, list(run) + list(run) + [start_date] + list(run)).fetchone()[0]
+    
+    def get_period_totals(
+        self,
+        variable: str,
+        experiment: str,
+        periods: List[Tuple[date, date]],
+        unit: Optional[str] = None,
+        filters: str = "",
+        filter_params: Optional[List] = None
+    ) -> "pd.DataFrame":
+        """
+        Totaux de plusieurs périodes à la fois, par simulation et par point.
+        
+        Avec cumulative_sums, chaque total est la différence de deux cumuls lus aux
+        dates cumul(fin) et cumul(début - 1), quel que soit le nombre de périodes
+        et leur longueur. Une période qui se termine après les données d'un point
+        n'a pas de ligne pour ce point. Sans la table (ou pour une variable non
+        cumulée), les totaux sont calculés depuis climate_data.
+        
+        Args:
+            variable: Variable climatique
+            experiment: Scénario climatique
+            periods: Liste de (premier jour, dernier jour) inclus
+            unit: Unité du résultat (unité de stockage si None)
+            filters: Conditions SQL supplémentaires sur gcm, rcm, member, lat, lon (préfixées par AND)
+            filter_params: Paramètres de filters
+        
+        Returns:
+            DataFrame avec colonnes: period (indice dans periods), start_date, end_date,
+            lat, lon, gcm, rcm, member, value, days_count
+        """
+        self.route(variable, experiment)
+        filter_params = filter_params or []
+        stored_unit = self.get_variable_units().get(variable, "")
+        factor, offset = unit_conversion(stored_unit, unit) if unit else (1.0, 0.0)
+        period_df = pd.DataFrame(periods, columns=["start_date", "end_date"])
+        period_df.insert(0, "period", np.arange(len(period_df), dtype=np.int32))
+        period_df["start_date"] = pd.to_datetime(period_df["start_date"])
+        period_df["end_date"] = pd.to_datetime(period_df["end_date"])
+        
+        if self.has_cumulative_sums(variable):
+            sql = f"""
+                WITH periods AS (
+                    SELECT period, CAST(start_date AS DATE) AS start_date, CAST(end_date AS DATE) AS end_date
+                    FROM temp_periods
+                ),
+                sums AS (
+                    SELECT gcm, rcm, member, lat, lon, time, value_cumsum, days_cumcount
+                    FROM cumulative_sums
+                    WHERE variable = ? AND experiment = ? {filters}
+                      AND (time IN (SELECT end_date FROM periods) OR time IN (SELECT start_date - 1 FROM periods))
+                )
+                SELECT p.period, p.start_date, p.end_date, e.lat, e.lon, e.gcm, e.rcm, e.member,
+                       (e.value_cumsum - COALESCE(s.value_cumsum, 0)) * {factor!r}
+                         + {offset!r} * (e.days_cumcount - COALESCE(s.days_cumcount, 0)) AS value,
+                       e.days_cumcount - COALESCE(s.days_cumcount, 0) AS days_count
+                FROM periods p
+                JOIN sums e ON e.time = p.end_date
+                -- Pas de cumul la veille du début: la période commence avant les données
+                LEFT JOIN sums s ON s.time = p.start_date - 1
+                  AND s.gcm = e.gcm AND s.rcm = e.rcm AND s.member = e.member AND s.lat = e.lat AND s.lon = e.lon
+                WHERE e.days_cumcount > COALESCE(s.days_cumcount, 0)
+                ORDER BY ALL
+            """
+        else:
+            value = convert_units_sql("d.value", stored_unit, unit) if unit else "d.value"
+            sql = f"""
+                WITH periods AS (
+                    SELECT period, CAST(start_date AS DATE) AS start_date, CAST(end_date AS DATE) AS end_date
+                    FROM temp_periods
+                ),
+                data AS (
+                    SELECT gcm, rcm, member, lat, lon, time, value
+                    FROM climate_data
+                    WHERE variable = ? AND experiment = ? {filters}
+                      AND time >= (SELECT MIN(start_date) FROM periods) AND time <= (SELECT MAX(end_date) FROM periods)
+                )
+                SELECT p.period, p.start_date, p.end_date, d.lat, d.lon, d.gcm, d.rcm, d.member,
+                       SUM({value}) AS value, CAST(COUNT(*) AS INTEGER) AS days_count
+                FROM periods p
+                JOIN data d ON d.time >= p.start_date AND d.time <= p.end_date
+                GROUP BY ALL
+                ORDER BY ALL
+            """
+        self.conn.register('temp_periods', period_df)
+        try:
+            return self.conn.execute(sql, [variable, experiment] + filter_params).df()
+        finally:
+            self.conn.unregister('temp_periods')
+    
+    def _load_rolling_series(
+        self,
+        variable: str,
+        experiment: str,
+        unit: Optional[str],
+        filters: str,
+        filter_params: List,
+        mean_cells: bool
+    ) -> Dict:
+        """Séries journalières denses (une ligne par simulation ou par simulation et point)"""
+        self.route(variable, experiment)
+        stored_unit = self.get_variable_units().get(variable, "")
+        value = convert_units_sql("value", stored_unit, unit) if unit else "value"
+        keys = ["gcm", "rcm", "member"] if mean_cells else ["gcm", "rcm", "member", "lat", "lon"]
+        data = self.conn.execute(f"""
+            SELECT {', '.join(keys)}, time, {"AVG(" + value + ")" if mean_cells else value} AS value
+            FROM climate_data
+            WHERE variable = ? AND experiment = ? {filters}
+            {"GROUP BY ALL" if mean_cells else ""}
+        """, [variable, experiment] + filter_params).df()
+        
+        series = data[keys].drop_duplicates().sort_values(keys).reset_index(drop=True)
+        if data.empty:
+            return {"keys": series, "origin": np.datetime64("1970-01-01", "D"),
+                    "values": np.empty((0, 0)), "indexes": {}}
+        row = data.merge(series.reset_index(), on=keys, how="left")["index"].to_numpy()
+        days = data["time"].to_numpy().astype("datetime64[D]")
+        origin = days.min()
+        day = (days - origin).astype(np.int64)
+        values = np.full((len(series), day.max() + 1), np.nan)
+        values[row, day] = data["value"].to_numpy(dtype=np.float64)
+        return {"keys": series, "origin": origin, "values": values, "indexes": {}}
+    
+    def get_rolling_minima(
+        self,
+        variable: str,
+        experiment: str,
+        queries: List[Tuple[int, date, date]],
+        unit: Optional[str] = None,
+        filters: str = "",
+        filter_params: Optional[List] = None,
+        mean_cells: bool = False
+    ) -> "pd.DataFrame":
+        """
+        Minimum des sommes sur w jours consécutifs dont la fenêtre est incluse dans une saison.
+        
+        Les séries journalières sont lues une fois, puis pour chaque longueur de
+        fenêtre les sommes glissantes et leur index de minimum (RangeMinimumIndex)
+        sont construits une fois: chaque (fenêtre, saison) est ensuite répondu en
+        temps constant. Séries et index restent en mémoire (par variable, scénario,
+        unité et filtres) jusqu'à la prochaine écriture dans la base, pour que
+        changer les dates de saison ne recalcule rien.
+        
+        Args:
+            variable: Variable climatique
+            experiment: Scénario climatique
+            queries: Liste de (longueur de fenêtre en jours, premier jour, dernier jour de la saison)
+            unit: Unité des sommes (unité de stockage si None)
+            filters: Conditions SQL supplémentaires sur gcm, rcm, member, lat, lon (préfixées par AND)
+            filter_params: Paramètres de filters
+            mean_cells: Moyenne jour par jour des points retenus par filters (une série
+                par simulation, en mm si unit l'est) au lieu d'une série par point
+        
+        Returns:
+            DataFrame avec colonnes: query (indice dans queries), window, start_date, end_date,
+            gcm, rcm, member, (lat, lon si mean_cells est False), value (NaN si aucune
+            fenêtre complète dans la saison), days_count (jours avec valeur dans la saison)
+        """
+        filter_params = filter_params or []
+        key = (variable, experiment, unit, filters, tuple(filter_params), mean_cells)
+        with self._cache_lock:
+            series = self._rolling_indexes.get(key)
+            if series is not None:
+                self._rolling_indexes.move_to_end(key)
+        if series is None:
+            series = self._load_rolling_series(variable, experiment, unit, filters, filter_params, mean_cells)
+            with self._cache_lock:
+                self._rolling_indexes[key] = series
+                while len(self._rolling_indexes) > ROLLING_INDEX_CACHE_SIZE:
+                    self._rolling_indexes.popitem(last=False)
+        
+        windows = np.array([window for window, _, _ in queries], dtype=np.int64)
+        starts = np.array([np.datetime64(start, "D") for _, start, _ in queries], dtype="datetime64[D]")
+        ends = np.array([np.datetime64(end, "D") for _, _, end in queries], dtype="datetime64[D]")
+        first_day = (starts - series["origin"]).astype(np.int64)
+        last_day = (ends - series["origin"]).astype(np.int64)
+        
+        values = series["values"]
+        n_series, n_days = values.shape
+        minima = np.full((n_series, len(queries)), np.nan)
+        days_count = np.zeros((n_series, len(queries)), dtype=np.int64)
+        if n_series and len(queries):
+            for window in np.unique(windows):
+                index = series["indexes"].get(window)
+                if index is None:
+                    index = series["indexes"][window] = RangeMinimumIndex(rolling_sums(values, int(window)))
+                selected = windows == window
+                # Fenêtres se terminant entre first_day + window - 1 et last_day
+                minima[:, selected] = index.query(first_day[selected] + window - 1, last_day[selected])
+            
+            counts = np.concatenate([np.zeros((n_series, 1), dtype=np.int64),
+                                     np.cumsum(~np.isnan(values), axis=1)], axis=1)
+            days_count = np.maximum(counts[:, np.clip(last_day + 1, 0, n_days)]
+                                    - counts[:, np.clip(first_day, 0, n_days)], 0)
+        
+        result = series["keys"].loc[np.repeat(np.arange(n_series), len(queries))].reset_index(drop=True)
+        result.insert(0, "query", np.tile(np.arange(len(queries), dtype=np.int32), n_series))
+        result.insert(1, "window", np.tile(windows, n_series))
+        result.insert(2, "start_date", np.tile(starts, n_series))
+        result.insert(3, "end_date", np.tile(ends, n_series))
+        result["value"] = minima.reshape(-1)
+        result["days_count"] = days_count.reshape(-1)
+        return result.sort_values(["query"], kind="stable").reset_index(drop=True)
+    
+    def _exceedance_flag_sql(self, threshold: str) -> str:
+        """Expression SQL vraie les jours où la valeur dépasse le seuil"""
+        if threshold not in EXCEEDANCE_THRESHOLDS:
+            raise ValueError(
+                f"Seuil inconnu: {threshold} (attendu: {', '.join(EXCEEDANCE_THRESHOLDS)})"
+            )
+        variable, comparison, value, unit = EXCEEDANCE_THRESHOLDS[threshold]
+        return f"({self.unit_sql(variable, unit)} {comparison} {value!r})"
+    
+    def build_exceedance_bitmaps(
+        self,
+        thresholds: Optional[List[str]] = None,
+        simulations: Optional[List[Tuple[str, str, str, str, str]]] = None
+    ) -> int:
+        """
+        (Re)construit la table exceedance_bitmaps: pour chaque seuil, simulation, point
+        et année, un bit par jour (366 bits, indexés par jour de l'année - 1) à 1 si
+        la valeur du jour dépasse le seuil.
+        
+        46 octets par point et par an au lieu de 365 valeurs: compter les jours chauds
+        ou secs d'une période ne relit plus les valeurs journalières (voir
+        get_exceedance_days). Une fois créée, la table est tenue à jour par chaque import.
+        
+        Args:
+            thresholds: Noms de EXCEEDANCE_THRESHOLDS; tous si None
+            simulations: (variable, experiment, gcm, rcm, member) à reconstruire; toutes si None
+        
+        Returns:
+            Nombre de bitmaps annuels écrits
+        """
+        if self.layout == "partitioned" and self._active_partition is None:
+            # Base partitionnée: table construite dans chaque partition
+            return sum(self.build_exceedance_bitmaps(thresholds, simulations) for _ in self.each_partition([EXCEEDANCE_THRESHOLDS[name][0] for name in thresholds or EXCEEDANCE_THRESHOLDS]))
+        thresholds = list(thresholds or EXCEEDANCE_THRESHOLDS)
+        for threshold in thresholds:
+            self._exceedance_flag_sql(threshold)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS exceedance_bitmaps (
+                threshold VARCHAR NOT NULL,
+                experiment VARCHAR NOT NULL,
+                gcm VARCHAR NOT NULL,
+                rcm VARCHAR NOT NULL,
+                member VARCHAR NOT NULL,
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                year SMALLINT NOT NULL,
+                bits BLOB NOT NULL
+            );
+        """)
+        
+        variables = {EXCEEDANCE_THRESHOLDS[threshold][0] for threshold in thresholds}
+        runs = [run for run in self.get_runs().itertuples(index=False, name=None) if run[0] in variables]
+        if simulations is not None:
+            wanted = {tuple(str(value) for value in simulation) for simulation in simulations}
+            runs = [run for run in runs if run in wanted]
+        
+        start = time.perf_counter()
+        total = 0
+        for run in runs:
+            self.conn.begin()
+            try:
+                total += self.refresh_exceedance_bitmaps(run, thresholds=thresholds)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        
+        print(f"   ✅ exceedance_bitmaps: {total:,} bitmaps annuels ({len(runs)} simulation(s)) "
+              f"en {time.perf_counter() - start:.1f}s")
+        return total
+    
+    def _built_thresholds(self, variable: str) -> List[str]:
+        """Seuils de la variable présents dans exceedance_bitmaps"""
+        names = [name for name, (threshold_variable, *_) in EXCEEDANCE_THRESHOLDS.items() if threshold_variable == variable]
+        if not names or not self.has_table("exceedance_bitmaps"):
+            return []
+        return [row[0] for row in self.conn.execute(f"""
+            SELECT DISTINCT threshold FROM exceedance_bitmaps
+            WHERE threshold IN ({','.join('?' for _ in names)})
+        """, names).fetchall()]
+    
+    def refresh_exceedance_bitmaps(
+        self,
+        run: Tuple[str, str, str, str, str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        thresholds: Optional[List[str]] = None,
+        years_per_chunk: int = 10
+    ) -> int:
+        """
+        Recalcule les bitmaps d'une simulation sur les années couvrant une période.
+        
+        Args:
+            run: (variable, experiment, gcm, rcm, member)
+            start_date: Début de la période (année entière); toute la simulation si None
+            end_date: Fin de la période (année entière)
+            thresholds: Seuils recalculés (ceux de la variable déjà présents si None)
+            years_per_chunk: Nombre d'années traitées à la fois (limite la mémoire)
+        
+        Returns:
+            Nombre de bitmaps annuels écrits
+        """
+        variable = run[0]
+        if thresholds is None:
+            thresholds = self._built_thresholds(variable)
+        thresholds = [name for name in thresholds if EXCEEDANCE_THRESHOLDS[name][0] == variable]
+        if not thresholds:
+            return 0
+        
+        run_filter = "variable = ? AND experiment = ? AND gcm = ? AND rcm = ? AND member = ?"
+        if start_date is not None and end_date is not None:
+            first_year, last_year = start_date.year, end_date.year
+        else:
+            first_year, last_year = self.conn.execute(
+                f"SELECT MIN(year(time)), MAX(year(time)) FROM climate_data WHERE {run_filter}", list(run)
+            ).fetchone()
+            if first_year is None:
+                return 0
+        self.conn.execute(f"""
+            DELETE FROM exceedance_bitmaps
+            WHERE threshold IN ({','.join('?' for _ in thresholds)})
+              AND experiment = ? AND gcm = ? AND rcm = ? AND member = ? AND year >= ? AND year <= ?
+        """, thresholds + list(run[1:]) + [first_year, last_year])
+        
+        flags = ", ".join(f"{self._exceedance_flag_sql(name)} AS flag_{i}" for i, name in enumerate(thresholds))
+        total = 0
+        for chunk_start in range(first_year, last_year + 1, years_per_chunk):
+            chunk_end = min(chunk_start + years_per_chunk - 1, last_year)
+            data = self.conn.execute(f"""
+                SELECT lat, lon, year(time) AS year, dayofyear(time) AS dayofyear, {flags}
+                FROM climate_data
+                WHERE {run_filter} AND time >= ? AND time <= ?
+                ORDER BY lat, lon, time
+            """, list(run) + [date(chunk_start, 1, 1), date(chunk_end, 12, 31)]).fetchnumpy()
+            for i, name in enumerate(thresholds):
+                packed = pack_daily_series(data["lat"], data["lon"], data["year"], data["dayofyear"],
+                                           np.asarray(data[f"flag_{i}"], dtype=np.float32))
+                if packed.empty:
+                    continue
+                days = np.stack(packed["daily"]) == 1
+                bits = np.packbits(days, axis=1, bitorder="little")
+                packed = packed.drop(columns="daily")
+                packed["bits"] = [row.tobytes() for row in bits]
+                self.conn.register('temp_bitmaps', packed)
+                try:
+                    self.conn.execute("""
+                        INSERT INTO exceedance_bitmaps
+                        SELECT ?, ?, ?, ?, ?, lat, lon, year, bits FROM temp_bitmaps
+                    """, [name] + list(run[1:]))
+                finally:
+                    self.conn.unregister('temp_bitmaps')
+                total += len(packed)
+        return total
+    
+    def get_exceedance_days(
+        self,
+        threshold: str,
+        experiment: str,
+        periods: List[Tuple[date, date]],
+        filters: str = "",
+        filter_params: Optional[List] = None,
+        longest_run: bool = True
+    ) -> "pd.DataFrame":
+        """
+        Nombre de jours au-delà d'un seuil et plus longue suite de tels jours, pour
+        plusieurs périodes à la fois, par simulation et par point.
+        
+        Les bitmaps annuels de exceedance_bitmaps sont mis bout à bout (une série de
+        bits par point), puis chaque période est un popcount des mots couverts et la
+        plus longue suite s'obtient par décalages et ET binaires. Sans bitmaps pour
+        ce seuil, les jours sont comparés au seuil depuis climate_data.
+        
+        Args:
+            threshold: Nom de EXCEEDANCE_THRESHOLDS (ex: "tasmax_gt_30")
+            experiment: Scénario climatique
+            periods: Liste de (premier jour, dernier jour) inclus
+            filters: Conditions SQL supplémentaires sur gcm, rcm, member, lat, lon (préfixées par AND)
+            filter_params: Paramètres de filters
+            longest_run: Calculer aussi la plus longue suite de jours
+        
+        Returns:
+            DataFrame avec colonnes: period (indice dans periods), start_date, end_date,
+            gcm, rcm, member, lat, lon, days_count, longest_run (si demandé)
+        """
+        flag_sql = self._exceedance_flag_sql(threshold)
+        self.route(EXCEEDANCE_THRESHOLDS[threshold][0], experiment)
+        filter_params = filter_params or []
+        keys = ["gcm", "rcm", "member", "lat", "lon"]
+        starts = np.array([np.datetime64(start, "D") for start, _ in periods], dtype="datetime64[D]")
+        ends = np.array([np.datetime64(end, "D") for _, end in periods], dtype="datetime64[D]")
+        first_year = int(starts.min().astype("datetime64[Y]").astype(int)) + 1970
+        last_year = int(ends.max().astype("datetime64[Y]").astype(int)) + 1970
+        
+        if threshold in self._built_thresholds(EXCEEDANCE_THRESHOLDS[threshold][0]):
+            data = self.conn.execute(f"""
+                SELECT gcm, rcm, member, lat, lon, year, bits
+                FROM exceedance_bitmaps
+                WHERE threshold = ? AND experiment = ? AND year >= ? AND year <= ? {filters}
+            """, [threshold, experiment, first_year, last_year] + filter_params).df()
+            yearly = np.unpackbits(
+                np.frombuffer(b"".join(data["bits"]), dtype=np.uint8).reshape(len(data), -1),
+                axis=1, count=DAYS_PER_PACKED_YEAR, bitorder="little"
+            ).astype(bool)
+        else:
+            variable = EXCEEDANCE_THRESHOLDS[threshold][0]
+            data = self.conn.execute(f"""
+                SELECT gcm, rcm, member, lat, lon, year(time) AS year,
+                       list(dayofyear(time)) FILTER (WHERE {flag_sql}) AS days
+                FROM climate_data
+                WHERE variable = ? AND experiment = ? AND time >= ? AND time <= ? {filters}
+                GROUP BY ALL
+            """, [variable, experiment, date(first_year, 1, 1), date(last_year, 12, 31)] + filter_params).df()
+            yearly = np.zeros((len(data), DAYS_PER_PACKED_YEAR), dtype=bool)
+            for row, days in enumerate(data["days"]):
+                if days is not None and len(days):
+                    yearly[row, np.asarray(days, dtype=np.intp) - 1] = True
+        
+        series = data[keys].drop_duplicates().sort_values(keys).reset_index(drop=True)
+        row_series = data[keys].merge(series.reset_index(), on=keys, how="left")["index"].to_numpy()
+        years = np.arange(first_year, last_year + 1)
+        flags = np.zeros((len(series), len(years), DAYS_PER_PACKED_YEAR), dtype=bool)
+        flags[row_series, data["year"].to_numpy(dtype=np.int64) - first_year] = yearly
+        
+        # Séries continues: jour 366 des années non bissextiles retiré
+        year_starts = (years - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+        slots = year_starts[:, None] + np.arange(DAYS_PER_PACKED_YEAR)
+        keep = slots.astype("datetime64[Y]") == year_starts.astype("datetime64[Y]")[:, None]
+        flags = flags[:, keep]
+        words = pack_flags(flags)
+        first = (starts - year_starts[0]).astype(np.int64)
+        last = (ends - year_starts[0]).astype(np.int64)
+        
+        n_series, n_days = flags.shape
+        result = series.loc[np.repeat(np.arange(n_series), len(periods))].reset_index(drop=True)
+        result.insert(0, "period", np.tile(np.arange(len(periods), dtype=np.int32), n_series))
+        result.insert(1, "start_date", np.tile(starts, n_series))
+        result.insert(2, "end_date", np.tile(ends, n_series))
+        result["days_count"] = count_in_ranges(words, n_days, first, last).reshape(-1)
+        if longest_run:
+            result["longest_run"] = longest_runs(words, n_days, first, last).reshape(-1)
+        return result.sort_values(["period"], kind="stable").reset_index(drop=True)
+    
+    def _dry_spells_sql(self, threshold: float, conditions: str) -> str:
+        """
+        Suites de jours secs des lignes de précipitations de climate_data retenues par
+        conditions (préfixées par AND): les jours secs consécutifs d'un point ont la
+        même date moins leur rang, un jour pluvieux ou manquant coupe la suite.
+        """
+        dry = f"{self.unit_sql('pr', MM_PER_DAY)} < {float(threshold)!r}"
+        return f"""
+            SELECT experiment, gcm, rcm, member, lat, lon,
+                   MIN(time) AS start_date, MAX(time) AS end_date, CAST(COUNT(*) AS INTEGER) AS length
+            FROM (
+                SELECT experiment, gcm, rcm, member, lat, lon, time,
+                       time - CAST(ROW_NUMBER() OVER (
+                           PARTITION BY experiment, gcm, rcm, member, lat, lon ORDER BY time
+                       ) AS INTEGER) AS island
+                FROM climate_data
+                WHERE variable = 'pr' AND {dry} {conditions}
+            )
+            GROUP BY experiment, gcm, rcm, member, lat, lon, island
+        """
+    
+    def has_dry_spells(self, threshold: float) -> bool:
+        """Vérifie que dry_spells existe et contient les suites du seuil (mm/jour)"""
+        if not self.has_table("dry_spells"):
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM dry_spells WHERE threshold = ? LIMIT 1", [float(threshold)]
+        ).fetchone() is not None
+    
+    def build_dry_spells(
+        self,
+        thresholds: Tuple[float, ...] = DRY_SPELL_THRESHOLDS,
+        simulations: Optional[List[Tuple[str, str, str, str, str]]] = None
+    ) -> int:
+        """
+        (Re)construit la table dry_spells: une ligne par suite de jours secs
+        (précipitations < seuil en mm/jour) avec sa date de début, de fin et sa longueur,
+        par seuil, simulation et point.
+        
+        La plus longue période sèche d'une saison se lit alors sur quelques suites au
+        lieu des valeurs journalières (voir get_longest_dry_spells). Une fois créée,
+        la table est tenue à jour par chaque import.
+        
+        Args:
+            thresholds: Seuils de précipitations en mm/jour
+            simulations: (variable, experiment, gcm, rcm, member) à reconstruire; toutes si None
+        
+        Returns:
+            Nombre de suites écrites
+        """
+        if self.layout == "partitioned" and self._active_partition is None:
+            # Base partitionnée: table construite dans chaque partition
+            return sum(self.build_dry_spells(thresholds, simulations) for _ in self.each_partition(["pr"]))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS dry_spells (
+                threshold DOUBLE NOT NULL,
+                experiment VARCHAR NOT NULL,
+                gcm VARCHAR NOT NULL,
+                rcm VARCHAR NOT NULL,
+                member VARCHAR NOT NULL,
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                start_date DATE NOT NULL,
+                end_date DATE NOT NULL,
+                length INTEGER NOT NULL
+            );
+        """)
+        
+        runs = [run for run in self.get_runs().itertuples(index=False, name=None) if run[0] == "pr"]
+        if simulations is not None:
+            wanted = {tuple(str(value) for value in simulation) for simulation in simulations}
+            runs = [run for run in runs if run in wanted]
+        
+        start = time.perf_counter()
+        total = 0
+        for run in runs:
+            self.conn.begin()
+            try:
+                total += self.refresh_dry_spells(run, thresholds=thresholds)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        
+        print(f"   ✅ dry_spells: {total:,} suites de jours secs ({len(runs)} simulation(s)) "
+              f"en {time.perf_counter() - start:.1f}s")
+        return total
+    
+    def refresh_dry_spells(
+        self,
+        run: Tuple[str, str, str, str, str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        thresholds: Optional[Tuple[float, ...]] = None
+    ) -> int:
+        """
+        Recalcule les suites de jours secs d'une simulation touchant une période.
+        
+        Les suites qui chevauchent la période ou la bordent sont supprimées puis
+        recalculées sur la période élargie à ces suites, pour que les suites à cheval
+        sur les données déjà présentes et les nouvelles soient fusionnées.
+        
+        Args:
+            run: (variable, experiment, gcm, rcm, member)
+            start_date: Premier jour importé; toute la simulation si None
+            end_date: Dernier jour importé
+            thresholds: Seuils recalculés (ceux déjà présents dans la table si None)
+        
+        Returns:
+            Nombre de suites écrites
+        """
+        if run[0] != "pr":
+            return 0
+        if thresholds is None:
+            thresholds = [row[0] for row in self.conn.execute("SELECT DISTINCT threshold FROM dry_spells").fetchall()]
+        
+        run_filter = "experiment = ? AND gcm = ? AND rcm = ? AND member = ?"
+        total = 0
+        for threshold in thresholds:
+            params = [float(threshold)] + list(run[1:])
+            if start_date is None or end_date is None:
+                self.conn.execute(f"DELETE FROM dry_spells WHERE threshold = ? AND {run_filter}", params)
+                total += self.conn.execute(f"""
+                    INSERT INTO dry_spells
+                    SELECT ?, * FROM ({self._dry_spells_sql(threshold, f" AND {run_filter}")})
+                """, params).fetchone()[0]
+                continue
+            
+            # Période à recalculer pour chaque point: [start_date, end_date] élargie aux
+            # suites du point qui la chevauchent ou la bordent
+            touching = f"threshold = ? AND {run_filter} AND end_date >= ? AND start_date <= ?"
+            bounds = [start_date - timedelta(days=1), end_date + timedelta(days=1)]
+            cell_bounds = self.conn.execute(f"""
+                SELECT lat, lon, LEAST(?, MIN(start_date)) AS first, GREATEST(?, MAX(end_date)) AS last
+                FROM dry_spells WHERE {touching}
+                GROUP BY lat, lon
+            """, [start_date, end_date] + params + bounds).df()
+            first = min([start_date] + [value.date() for value in cell_bounds["first"]])
+            last = max([end_date] + [value.date() for value in cell_bounds["last"]])
+            self.conn.execute(f"DELETE FROM dry_spells WHERE {touching}", params + bounds)
+            
+            cell_bound = "(SELECT b.{} FROM temp_spell_bounds b WHERE b.lat = climate_data.lat AND b.lon = climate_data.lon)"
+            conditions = f"""
+                AND {run_filter} AND time >= ? AND time <= ?
+                AND time >= COALESCE({cell_bound.format('first')}, ?)
+                AND time <= COALESCE({cell_bound.format('last')}, ?)
+            """
+            self.conn.register('temp_spell_bounds', cell_bounds)
+            try:
+                total += self.conn.execute(f"""
+                    INSERT INTO dry_spells
+                    SELECT ?, * FROM ({self._dry_spells_sql(threshold, conditions)})
+                """, params + [first, last, start_date, end_date]).fetchone()[0]
+            finally:
+                self.conn.unregister('temp_spell_bounds')
+        return total
+    
+    def get_longest_dry_spells(
+        self,
+        experiment: str,
+        periods: List[Tuple[date, date]],
+        threshold: float = 0.1,
+        filters: str = "",
+        filter_params: Optional[List] = None
+    ) -> "pd.DataFrame":
+        """
+        Plus longue suite de jours secs et nombre de jours secs de plusieurs périodes
+        à la fois, par simulation et par point.
+        
+        Les suites à cheval sur le début ou la fin d'une période sont coupées à la
+        période. Avec dry_spells, seules les suites qui chevauchent les périodes sont
+        lues; sinon les suites sont calculées depuis climate_data.
+        
+        Args:
+            experiment: Scénario climatique
+            periods: Liste de (premier jour, dernier jour) inclus
+            threshold: Seuil de précipitations en mm/jour
+            filters: Conditions SQL supplémentaires sur gcm, rcm, member, lat, lon (préfixées par AND)
+            filter_params: Paramètres de filters
+        
+        Returns:
+            DataFrame avec colonnes: period (indice dans periods), start_date, end_date,
+            gcm, rcm, member, lat, lon, longest_spell, dry_days. Un point sans jour sec
+            dans une période n'a pas de ligne pour cette période.
+        """
+        self.route("pr", experiment)
+        filter_params = filter_params or []
+        period_df = pd.DataFrame(periods, columns=["start_date", "end_date"])
+        period_df.insert(0, "period", np.arange(len(period_df), dtype=np.int32))
+        period_df["start_date"] = pd.to_datetime(period_df["start_date"])
+        period_df["end_date"] = pd.to_datetime(period_df["end_date"])
+        
+        if self.has_dry_spells(threshold):
+            spells = f"""
+                SELECT gcm, rcm, member, lat, lon, start_date, end_date FROM dry_spells
+                WHERE threshold = ? AND experiment = ? {filters}
+            """
+            params = [float(threshold), experiment] + filter_params
+        else:
+            spells = self._dry_spells_sql(threshold, f" AND experiment = ? AND time >= ? AND time <= ? {filters}")
+            params = [experiment, min(start for start, _ in periods), max(end for _, end in periods)] + filter_params
+        sql = f"""
+            WITH periods AS (
+                SELECT period, CAST(start_date AS DATE) AS start_date, CAST(end_date AS DATE) AS end_date
+                FROM temp_periods
+            ),
+            clipped AS (
+                SELECT p.period, p.start_date, p.end_date, s.gcm, s.rcm, s.member, s.lat, s.lon,
+                       LEAST(s.end_date, p.end_date) - GREATEST(s.start_date, p.start_date) + 1 AS length
+                FROM periods p
+                JOIN ({spells}) s ON s.start_date <= p.end_date AND s.end_date >= p.start_date
+            )
+            SELECT period, start_date, end_date, gcm, rcm, member, lat, lon,
+                   CAST(MAX(length) AS INTEGER) AS longest_spell, CAST(SUM(length) AS INTEGER) AS dry_days
+            FROM clipped
+            GROUP BY ALL
+            ORDER BY ALL
+        """
+        self.conn.register('temp_periods', period_df)
+        try:
+            return self.conn.execute(sql, params).df()
+        finally:
+            self.conn.unregister('temp_periods')
+    
+    def get_manifest_entry(self, path: str, selection: str) -> Optional[Dict]:
+        """
+        Retourne l'entrée import_manifest d'un fichier pour une sélection donnée.
+        
+        Args:
+            path: Chemin absolu du fichier NetCDF
+            selection: Identifiant de la sélection (voir netcdf_reader.selection_key)
+        
+        Returns:
+            Dictionnaire des colonnes de import_manifest, ou None si jamais importé
+        """
+        result = self.conn.execute(
+            "SELECT * FROM import_manifest WHERE path = ? AND selection = ?", [path, selection]
+        )
+        row = result.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in result.description], row))
+    
+    def plan_import(self, file_path: str, selection: str, force: bool = False) -> Dict:
+        """
+        Compare un fichier à son entrée dans import_manifest pour décider quoi importer.
+        
+        - "skip": fichier inchangé déjà importé en entier (taille et mtime identiques,
+          ou empreinte du contenu identique si seul le mtime a changé)
+        - "resume": import interrompu, ou fichier déjà importé qui a seulement gagné des
+          pas de temps (même date au dernier indice importé, pas de temps sélectionnés
+          après lui), à reprendre après entry["last_time_index"]
+        - "import": import complet. Pour un fichier déjà importé et modifié (valeurs
+          corrigées sur le même axe temporel), plan["previous"] est son ancienne entrée:
+          les lignes de l'import précédent sont remplacées (voir replace_imported_rows)
+        
+        Un fichier qui a gagné des années est repris sans relire les années déjà
+        importées: des corrections de ces années dans le même fichier ne sont pas
+        vues (force=True pour tout réimporter).
+        
+        Args:
+            file_path: Chemin vers le fichier NetCDF
+            selection: Identifiant de la sélection (voir netcdf_reader.selection_key)
+            force: Si True, toujours réimporter en entier
+        
+        Returns:
+            Dictionnaire avec action, signature (path, size, mtime, content_hash), entry
+            (entrée à reprendre) et previous (entrée existante, None si force)
+        """
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        signature = {"path": str(path), "size": stat.st_size, "mtime": stat.st_mtime, "content_hash": None}
+        entry = None if force else self.get_manifest_entry(str(path), selection)
+        
+        # Chemin rapide: fichier non modifié depuis un import complet, sans relire son contenu
+        if (entry is not None and entry["status"] == "complete"
+                and entry["size"] == signature["size"] and entry["mtime"] == signature["mtime"]):
+            signature["content_hash"] = entry["content_hash"]
+            return {"action": "skip", "signature": signature, "entry": entry, "previous": entry}
+        
+        signature["content_hash"] = file_fingerprint(path)
+        if entry is None:
+            return {"action": "import", "signature": signature, "entry": None, "previous": None}
+        
+        if entry["status"] == "complete" and entry["content_hash"] == signature["content_hash"]:
+            # Fichier seulement "touché" (copie, restauration): mettre à jour le mtime
+            self.conn.execute(
+                "UPDATE import_manifest SET mtime = ? WHERE path = ? AND selection = ?",
+                [signature["mtime"], signature["path"], selection]
+            )
+            return {"action": "skip", "signature": signature, "entry": entry, "previous": entry}
+        
+        if entry["last_time_index"] is not None and (entry["status"] != "complete" or self._time_axis_extended(path, selection, entry)):
+            return {"action": "resume", "signature": signature, "entry": entry, "previous": entry}
+        return {"action": "import", "signature": signature, "entry": None, "previous": entry}
+    
+    def _time_axis_extended(self, path: Path, selection: str, entry: Dict) -> bool:
         """
-        Initialise le chargeur DuckDB.
+        True si l'axe temporel d'un fichier déjà importé est inchangé jusqu'au dernier
+        pas de temps importé et a des pas de temps sélectionnés après lui.
+        """
+        axis = load_time_axis(str(path), cache_dir=self.cache_dir)
+        last_index = entry["last_time_index"]
+        if last_index >= len(axis) or axis.dates[last_index] != np.datetime64(entry["last_time"], 'D'):
+            return False
+        return bool(self._selection_mask(axis, selection)[last_index + 1:].any())
+    
+    @staticmethod
+    def _selection_mask(axis, selection: str) -> np.ndarray:
+        """Pas de temps d'un axe compris dans les années d'une sélection (voir selection_key)"""
+        # "<cellules>|<début>-<fin>", * si non bornée
+        start_year, end_year = (None if year == "*" else int(year) for year in selection.rsplit("|", 1)[1].split("-"))
+        return axis.year_mask(start_year, end_year)
+    
+    def replace_imported_rows(self, plan: Dict, progress: Dict, cells: Dict[str, np.ndarray], resumed: bool = False) -> int:
+        """
+        Supprime les lignes d'un import précédent d'un fichier réimporté en entier
+        (fichier modifié, ou reprise impossible car l'axe temporel a changé): sans
+        cela, ON CONFLICT DO NOTHING garderait les anciennes valeurs.
+        
+        Sont supprimées les lignes de la simulation entre la première date
+        sélectionnée du fichier et la dernière (ou la dernière date de l'import
+        précédent si elle est postérieure), limitées aux cellules extraites pour une
+        sélection de points. L'import est marqué "partial" dans la même transaction,
+        et la période supprimée est notée dans progress["replaced"] pour que
+        finish_import recalcule les tables dérivées sur toute cette période.
         
         Args:
-            db_path: Chemin vers le fichier DuckDB (créé si n'existe pas)
-            data_directory: Répertoire contenant les fichiers NetCDF sources
+            plan: Résultat de plan_import
+            progress: Suivi créé par start_import_progress
+            cells: Cellules extraites (NetCDFBatchReader.selected_cells)
+            resumed: True si l'import reprend (rien à supprimer)
+        
+        Returns:
+            Nombre de lignes supprimées
         """
-        if not DUCKDB_AVAILABLE:
-            raise ImportError(
-                "DuckDB n'est pas installé. Installez-le avec: "
-                "poetry add duckdb"
-            )
+        previous = plan.get("previous")
+        if resumed or previous is None:
+            return 0
+        axis = load_time_axis(progress["path"], cache_dir=self.cache_dir)
+        dates = axis.dates[self._selection_mask(axis, progress["selection"])]
+        if previous["last_time"] is not None:
+            dates = np.append(dates, np.datetime64(previous["last_time"], 'D'))
+        if len(dates) == 0:
+            return 0
+        first, last = pd.Timestamp(dates.min()).date(), pd.Timestamp(dates.max()).date()
         
-        self.db_path = Path(db_path) if db_path else Path("climate_data.duckdb")
-        self.data_directory = Path(data_directory) if data_directory else None
+        run = [progress["variable"].value, progress["experiment"].value, progress["gcm"], progress["rcm"], progress["member"]]
+        if self.layout == "normalized":
+            run_id = self.get_run_id(progress["variable"], progress["experiment"], *run[2:])
+            table, where, params = "climate_values", "run_id = ?", [run_id]
+            cell_filter = "cell_id IN (SELECT c.cell_id FROM cells c JOIN replaced_cells r ON c.lat = r.lat AND c.lon = r.lon)"
+        else:
+            table, params = "climate_data", run
+            where = "variable = ? AND experiment = ? AND gcm = ? AND rcm = ? AND member = ?"
+            cell_filter = "(lat, lon) IN (SELECT lat, lon FROM replaced_cells)"
+        if progress["selection"].startswith("points:"):
+            where += f" AND {cell_filter}"
         
-        # Connexion DuckDB avec gestion d'erreurs pour les verrous
+        self.conn.register("replaced_cells", pd.DataFrame({"lat": cells["lat"], "lon": cells["lon"]}))
+        self.conn.begin()
         try:
-            self.conn = duckdb.connect(str(self.db_path), read_only=True)
-        except Exception as e:
-            if "lock" in str(e).lower() or "conflicting" in str(e).lower():
-                raise IOError(
-                    f"Le fichier DuckDB est verrouillé par un autre processus.\n"
-                    f"Vérifiez qu'aucune autre instance du script ne tourne.\n"
-                    f"Vous pouvez tuer le processus avec: kill <PID>\n"
-                    f"Erreur originale: {e}"
-                )
+            deleted = self.conn.execute(
+                f"DELETE FROM {table} WHERE {where} AND time BETWEEN ? AND ?", params + [first, last]
+            ).fetchone()[0]
+            if deleted:
+                progress["replaced"] = (first, last)
+            self._record_import_progress(progress, "partial")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
             raise
+        finally:
+            self.conn.unregister("replaced_cells")
+        with self._cache_lock:
+            self._rolling_indexes.clear()
+        if deleted:
+            print(f"   ♻️  Fichier modifié: {deleted:,} lignes de l'import précédent ({first} à {last}) remplacées")
+        return int(deleted)
+    
+    def start_import_progress(
+        self,
+        plan: Dict,
+        selection: str,
+        variable: VariableType,
+        experiment: ExperimentType,
+        gcm: str,
+        rcm: str,
+        member: str,
+        resumed: bool
+    ) -> Dict:
+        """
+        Prépare le suivi d'un import dans import_manifest (voir append_batch).
         
-        # Créer le schéma si nécessaire
-        self._create_schema()
+        Args:
+            plan: Résultat de plan_import
+            selection: Identifiant de la sélection importée
+            resumed: True si l'import reprend après plan["entry"]["last_time_index"]
+        
+        Returns:
+            Dictionnaire de progression mis à jour à chaque batch écrit
+        """
+        entry = plan["entry"] if resumed else None
+        return {
+            **plan["signature"],
+            "selection": selection,
+            "variable": variable,
+            "experiment": experiment,
+            "gcm": gcm,
+            "rcm": rcm,
+            "member": member,
+            "last_time_index": entry["last_time_index"] if entry else None,
+            "last_time": entry["last_time"] if entry else None,
+            "rows": entry["rows"] if entry else 0,
+            # Première date écrite par cet import (mise à jour de monthly_aggregates)
+            "first_time": None,
+            "previous_seconds": entry["duration_seconds"] if entry else 0.0,
+            "started": time.perf_counter(),
+        }
     
-    def _create_schema(self):
-        """Crée le schéma de la base de données si nécessaire"""
-        # Vérifier si la table existe déjà
-        table_exists = False
+    def _record_import_progress(self, progress: Dict, status: str):
+        """Écrit l'état d'avancement d'un import dans import_manifest"""
+        self.conn.execute("""
+            INSERT OR REPLACE INTO import_manifest (
+                path, selection, size, mtime, content_hash,
+                variable, experiment, gcm, rcm, member,
+                last_time_index, last_time, rows, duration_seconds, status, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [
+            progress["path"], progress["selection"], progress["size"], progress["mtime"], progress["content_hash"],
+            progress["variable"].value, progress["experiment"].value, progress["gcm"], progress["rcm"], progress["member"],
+            progress["last_time_index"], progress["last_time"], progress["rows"],
+            progress["previous_seconds"] + time.perf_counter() - progress["started"], status
+        ])
+    
+    def append_batch(self, batch: "pd.DataFrame", progress: Dict, skip_duplicates: bool = True) -> int:
+        """
+        Insère un batch et avance import_manifest dans la même transaction.
+        
+        En cas d'interruption, le manifest indique donc toujours le dernier pas de
+        temps dont les lignes sont effectivement dans climate_data.
+        
+        Args:
+            batch: DataFrame produit par NetCDFBatchReader (attrs last_time_index/last_time)
+            progress: Suivi créé par start_import_progress
+            skip_duplicates: Si True, ignore les doublons (ON CONFLICT DO NOTHING)
+        
+        Returns:
+            Nombre de lignes insérées (sans les doublons ignorés)
+        """
+        self.conn.begin()
         try:
-            result = self.conn.execute("""
-                SELECT COUNT(*) FROM information_schema.tables 
-                WHERE table_name = 'climate_data'
-            """).fetchone()
-            table_exists = result[0] > 0 if result else False
+            rows = self.insert_batch(
+                batch, progress["variable"], progress["experiment"],
+                progress["gcm"], progress["rcm"], progress["member"], skip_duplicates
+            )
+            progress["rows"] += rows
+            if rows and progress.get("first_time") is None:
+                progress["first_time"] = pd.Timestamp(batch["time"].min()).date()
+            progress["last_time_index"] = batch.attrs.get("last_time_index", progress["last_time_index"])
+            progress["last_time"] = batch.attrs.get("last_time", progress["last_time"])
+            self._record_import_progress(progress, "partial")
+            self.conn.commit()
         except Exception:
-            # Si information_schema n'est pas disponible, essayer directement
-            try:
-                self.conn.execute("SELECT COUNT(*) FROM climate_data LIMIT 1")
-                table_exists = True
-            except Exception:
-                table_exists = False
+            self.conn.rollback()
+            raise
+        return rows
+    
+    def finish_import(self, progress: Dict, last_time_index: Optional[int] = None, last_time: Optional[date] = None):
+        """
+        Marque un import comme complet dans import_manifest.
         
-        if not table_exists:
-            # Créer la table avec PRIMARY KEY pour éviter les doublons
-            self.conn.execute("""
-                CREATE TABLE climate_data (
-                    variable VARCHAR NOT NULL,
-                    experiment VARCHAR NOT NULL,
-                    gcm VARCHAR NOT NULL,
-                    rcm VARCHAR NOT NULL,
-                    member VARCHAR NOT NULL,
-                    lat DOUBLE NOT NULL,
-                    lon DOUBLE NOT NULL,
-                    time DATE NOT NULL,
-                    value DOUBLE NOT NULL,
-                    PRIMARY KEY (variable, experiment, gcm, rcm, member, lat, lon, time)
-                );
+        Si les tables climate_wide, climate_series, monthly_aggregates, cumulative_sums,
+        exceedance_bitmaps ou dry_spells existent, les jours, séries annuelles, mois,
+        cumuls, années et suites de jours secs couverts par l'import y sont recalculés dans la même transaction, ainsi que ceux
+        de la période dont les lignes ont été supprimées par replace_imported_rows
+        (fichier raccourci).
+        
+        Args:
+            progress: Suivi créé par start_import_progress
+            last_time_index: Dernier pas de temps sélectionné du fichier (tous lus)
+            last_time: Date correspondante
+        """
+        if last_time_index is not None:
+            progress["last_time_index"] = int(last_time_index)
+            progress["last_time"] = last_time
+        with self._cache_lock:
+            self._rolling_indexes.clear()
+        self.conn.begin()
+        try:
+            run = (progress["variable"].value, progress["experiment"].value,
+                   progress["gcm"], progress["rcm"], progress["member"])
+            # Période écrite par l'import, élargie à la période supprimée (replace_imported_rows)
+            written = (progress["first_time"], progress["last_time"]) if progress.get("first_time") is not None else None
+            bounds = [period for period in (written, progress.get("replaced")) if period is not None]
+            first_time = min(first for first, _ in bounds) if bounds else None
+            last_time = max((last for _, last in bounds if last is not None), default=None)
+            if first_time is not None and self.has_table("climate_wide"):
+                self.refresh_wide_table(run, first_time, last_time)
+            if first_time is not None and self.has_table("climate_series"):
+                self.refresh_series_table(run, first_time, last_time)
+            if first_time is not None and self.has_table("monthly_aggregates"):
+                self.refresh_monthly_aggregates(run, first_time, last_time)
+            if first_time is not None and self.has_cumulative_sums(run[0]):
+                self.refresh_cumulative_sums(run, first_time)
+            if first_time is not None and self._built_thresholds(run[0]):
+                self.refresh_exceedance_bitmaps(run, first_time, last_time)
+            if first_time is not None and run[0] == "pr" and self.has_table("dry_spells"):
+                self.refresh_dry_spells(run, first_time, last_time)
+            self._record_import_progress(progress, "complete")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def create_staging_table(self, table: str = "climate_staging"):
+        """
+        Crée (ou vide) une table de staging sans clé ni index pour le chargement en masse.
+        
+        Args:
+            table: Nom de la table de staging (une par fichier en cours d'import)
+        """
+        self.conn.execute(f"""
+            CREATE OR REPLACE TABLE {table} (
+                lat DOUBLE NOT NULL,
+                lon DOUBLE NOT NULL,
+                time DATE NOT NULL,
+                value DOUBLE NOT NULL
+            );
+        """)
+    
+    def stage_batch(self, batch: "pd.DataFrame", table: str = "climate_staging") -> int:
+        """
+        Ajoute un batch colonnaire à la table de staging (aucune vérification de clé).
+        
+        Returns:
+            Nombre de lignes ajoutées
+        """
+        if batch.empty:
+            return 0
+        self.conn.register('temp_chunk', batch)
+        try:
+            self.conn.execute(f"""
+                INSERT INTO {table}
+                SELECT lat, lon, CAST(time AS DATE), value FROM temp_chunk
             """)
-            logger.info("Table climate_data créée avec PRIMARY KEY pour éviter les doublons")
-        else:
-            # Vérifier si PRIMARY KEY existe déjà
-            try:
-                pk_info = self.conn.execute("""
-                    SELECT COUNT(*) as pk_count
-                    FROM pragma_table_info('climate_data')
-                    WHERE pk > 0
-                """).df()
-                pk_count = pk_info['pk_count'].iloc[0] if not pk_info.empty else 0
-                if pk_count == 0:
-                    logger.warning("⚠️  Table existe sans PRIMARY KEY. Les doublons ne seront pas automatiquement évités.")
-                    logger.warning("   Pour ajouter la PRIMARY KEY, supprimez les doublons existants puis recréez la table.")
-            except Exception:
-                # Si pragma_table_info n'est pas disponible, on continue
-                pass
+        finally:
+            self.conn.unregister('temp_chunk')
+        return len(batch)
+    
+    def merge_staging(
+        self,
+        progress: Dict,
+        last_time_index: Optional[int],
+        last_time: Optional[date],
+        table: str = "climate_staging"
+    ) -> Tuple[int, int]:
+        """
+        Fusionne la table de staging dans climate_data en une seule passe.
+        
+        Les doublons internes au staging sont éliminés par DISTINCT ON et les lignes
+        déjà présentes par un anti-join (NOT EXISTS) restreint à la simulation
+        importée. La fusion, la mise à jour de import_manifest et le vidage du
+        staging sont faits dans la même transaction.
+        
+        Args:
+            progress: Suivi créé par start_import_progress (identifie la simulation)
+            last_time_index: Dernier pas de temps couvert par le staging
+            last_time: Date correspondante
+            table: Nom de la table de staging
         
-        # Créer les index pour performance
+        Returns:
+            Tuple (lignes insérées, lignes ignorées car déjà présentes ou en double)
+        """
+        self.conn.begin()
         try:
-            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_spatial ON climate_data(lat, lon);")
-            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_temporal ON climate_data(time);")
-            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_variable ON climate_data(variable, experiment, gcm, rcm);")
-        except Exception as e:
-            # Les index peuvent déjà exister
-            logger.debug(f"Index creation: {e}")
+            staged, first_time = self.conn.execute(f"SELECT COUNT(*), MIN(time) FROM {table}").fetchone()
+            if self.layout == "normalized":
+                inserted = self._merge_staging_normalized(progress, table)
+            else:
+                run = [progress["variable"].value, progress["experiment"].value, progress["gcm"], progress["rcm"], progress["member"]]
+                inserted = self.conn.execute(f"""
+                    INSERT INTO climate_data (variable, experiment, gcm, rcm, member, lat, lon, time, value)
+                    SELECT DISTINCT ON (s.lat, s.lon, s.time)
+                        ?, ?, ?, ?, ?, s.lat, s.lon, s.time, {self._store_sql(progress["variable"], 's.value')}
+                    FROM {table} s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM climate_data c
+                        WHERE c.variable = ? AND c.experiment = ? AND c.gcm = ? AND c.rcm = ? AND c.member = ?
+                          AND c.lat = s.lat AND c.lon = s.lon AND c.time = s.time
+                    )
+                """, run + run).fetchone()[0]
+            self._track_encoding_error(progress["variable"], table)
+            self.conn.execute(f"DELETE FROM {table}")
+            progress["rows"] += inserted
+            if inserted and progress.get("first_time") is None:
+                progress["first_time"] = first_time
+            if last_time_index is not None:
+                progress["last_time_index"] = int(last_time_index)
+                progress["last_time"] = last_time
+            self._record_import_progress(progress, "partial")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return inserted, staged - inserted
+    
+    def _merge_staging_normalized(self, progress: Dict, table: str) -> int:
+        """Fusion du staging dans climate_values (schéma normalisé), voir merge_staging"""
+        self._insert_new_cells(table, with_grid=False)
+        run_id = self.get_run_id(progress["variable"], progress["experiment"], progress["gcm"], progress["rcm"], progress["member"])
+        return self.conn.execute(f"""
+            INSERT INTO climate_values (run_id, cell_id, time, value)
+            SELECT DISTINCT ON (c.cell_id, s.time) ?, c.cell_id, s.time, {self._store_sql(progress["variable"], 's.value')}
+            FROM {table} s
+            JOIN cells c ON c.lat = s.lat AND c.lon = s.lon
+            WHERE NOT EXISTS (
+                SELECT 1 FROM climate_values v
+                WHERE v.run_id = ? AND v.cell_id = c.cell_id AND v.time = s.time
+            )
+        """, [run_id, run_id]).fetchone()[0]
+    
+    def drop_staging_table(self, table: str = "climate_staging"):
+        """Supprime une table de staging"""
+        self.conn.execute(f"DROP TABLE IF EXISTS {table}")
     
     def import_netcdf_file(
         self,
@@ -131,16 +3053,48 @@ class DuckDBClimateLoader:
         gcm: str,
         rcm: str,
         member: str = "r1",
-        chunk_size: int = 5000,  # Réduit pour économiser la mémoire
+        chunk_size: int = 500_000,  # Nombre de lignes par batch colonnaire inséré
         lat_filter: Optional[float] = None,  # Filtrer par latitude spécifique (ou liste)
         lon_filter: Optional[float] = None,  # Filtrer par longitude spécifique (ou liste)
         start_year: Optional[int] = None,  # Filtrer par année de début
         end_year: Optional[int] = None,  # Filtrer par année de fin
-        skip_duplicates: bool = True  # Si True, ignore les doublons lors de l'import
+        skip_duplicates: bool = True,  # Si True, ignore les doublons lors de l'import
+        point_read_mode: str = "auto",  # Lecture des points: "auto", "series" ou "bbox"
+        max_block_mb: float = 256,  # Budget mémoire d'un bloc de lecture
+        pipelined: bool = False,  # Lecture, conversion et écriture dans des étages concurrents
+        queue_size: int = 2,  # Taille des files entre étages en mode pipeline
+        force: bool = False,  # Réimporter même si import_manifest indique un fichier inchangé
+        bulk_load: bool = False,  # Charger dans une table de staging puis fusionner en une passe
+        staging_rows: int = 20_000_000  # Lignes accumulées en staging avant chaque fusion
     ) -> int:
         """
         Importe un fichier NetCDF dans DuckDB de manière optimisée en mémoire.
-        Traite les données par chunks temporels pour éviter de charger tout en mémoire.
+        
+        La lecture et la conversion en batchs colonnaires (lat, lon, time, value)
+        sont faites par NetCDFBatchReader (voir netcdf_reader.py): les blocs de pas
+        de temps sont convertis en colonnes NumPy, les cellules NaN étant éliminées
+        par un masque, puis regroupés en batchs d'environ `chunk_size` lignes.
+        
+        Avec un filtre spatial (lat_filter/lon_filter), les séries temporelles des
+        cellules retenues sont lues directement (nc_var[t0:t1, i, j] ou bloc englobant).
+        Sans filtre spatial, la grille est lue par blocs de plusieurs pas de temps
+        (nc_var[t0:t1, :, :]). La taille des blocs dépend de `max_block_mb`. Le débit
+        de lecture obtenu est affiché et conservé dans `self.last_import_stats`.
+        
+        En mode `pipelined`, la lecture NetCDF, la conversion en colonnes et
+        l'insertion DuckDB se recouvrent (threads reliés par des files bornées de
+        `queue_size` éléments). Les temps par étage sont ajoutés aux statistiques.
+        
+        Chaque import est suivi dans la table import_manifest (taille, mtime, empreinte,
+        dernier pas de temps importé, lignes, durée): un fichier inchangé est ignoré
+        immédiatement, un import interrompu reprend au dernier batch validé et un
+        fichier qui a gagné des années n'importe que la nouvelle période.
+        
+        En mode `bulk_load`, les batchs sont ajoutés sans contrôle de clé dans une
+        table de staging, fusionnée dans climate_data par un seul INSERT … SELECT
+        DISTINCT ON / NOT EXISTS tous les `staging_rows` lignes (et en fin de
+        fichier), au lieu d'un ON CONFLICT par batch. Les lignes insérées et les
+        doublons ignorés sont comptés séparément.
         
         Args:
             file_path: Chemin vers le fichier NetCDF
@@ -149,390 +3103,141 @@ class DuckDBClimateLoader:
             gcm: Modèle climatique global
             rcm: Modèle climatique régional
             member: Membre d'ensemble
-            chunk_size: Nombre de lignes à insérer par batch dans DuckDB
-            time_chunk_size: Nombre de pas de temps à traiter à la fois
+            chunk_size: Nombre de lignes (approximatif) par batch inséré dans DuckDB
+            lat_filter: Latitude(s) des points à extraire (toute la grille si None)
+            lon_filter: Longitude(s) des points à extraire (toute la grille si None)
+            start_year: Première année à importer
+            end_year: Dernière année à importer
+            skip_duplicates: Si True, ignore les doublons lors de l'import
+            point_read_mode: Stratégie de lecture des points (voir read_point_series)
+            max_block_mb: Budget mémoire (MB) d'un bloc de pas de temps
+            pipelined: Si True, recouvre lecture, conversion et écriture (voir iter_batches_pipelined)
+            queue_size: Nombre maximum de blocs/batchs en attente entre deux étages
+            force: Si True, ignore import_manifest et réimporte tout le fichier
+            bulk_load: Si True, chargement via table de staging et fusion en une passe
+            staging_rows: Taille (lignes) d'une partition de staging avant fusion
         
         Returns:
-            Nombre de lignes importées
+            Nombre de lignes importées (0 si le fichier est inchangé), en mode
+            bulk_load le nombre de lignes réellement insérées
         """
-        if not DUCKDB_AVAILABLE or not xr:
-            raise ImportError("xarray et duckdb doivent être installés")
-        
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"Fichier non trouvé: {file_path}")
-        
-        logger.info(f"Importation de {file_path} dans DuckDB (mode optimisé mémoire)...")
-        print(f"   📂 Ouverture du fichier NetCDF avec netCDF4 (accès direct aux slices)...")
-        
-        # Vérifier si des données existent déjà pour ce fichier (optionnel)
-        if skip_duplicates:
-            existing_count = self.conn.execute("""
-                SELECT COUNT(*) 
-                FROM climate_data
-                WHERE variable = ?
-                  AND experiment = ?
-                  AND gcm = ?
-                  AND rcm = ?
-                  AND member = ?
-            """, [variable.value, experiment.value, gcm, rcm, member]).fetchone()[0]
-            if existing_count > 0:
-                print(f"   ⚠️  {existing_count:,} lignes existent déjà pour cette combinaison (doublons ignorés)")
-        
-        # Utiliser netCDF4 directement pour un accès plus efficace aux slices
-        # Cela évite l'overhead de xarray et permet un accès direct optimisé
-        if NETCDF4_AVAILABLE:
-            nc_file = nc.Dataset(file_path, 'r')
-            print(f"   ✅ Fichier ouvert avec netCDF4")
-        else:
-            # Fallback sur xarray si netCDF4 n'est pas disponible
-            ds = xr.open_dataset(file_path)
-            print(f"   ✅ Fichier ouvert avec xarray")
-            nc_file = None
-        
-        # Trouver la variable dans le dataset
-        var_names = {
-            VariableType.PR: ["prAdjust", "prAdjusted", "pr"],
-            VariableType.TAS: ["tasAdjust", "tasAdjusted", "tas"],
-            VariableType.TASMAX: ["tasmaxAdjust", "tasmaxAdjusted", "tasmax"],
-            VariableType.TASMIN: ["tasminAdjust", "tasminAdjusted", "tasmin"],
-            VariableType.RSDS: ["rsdsAdjust", "rsdsAdjusted", "rsds"],
-            VariableType.RLDS: ["rldsAdjust", "rldsAdjusted", "rlds"],
-            VariableType.HUSS: ["hussAdjust", "hussAdjusted", "huss"],
-            VariableType.SFCWIND: ["sfcWindAdjust", "sfcWindAdjusted", "sfcWind"]
-        }
-        
-        var_name = None
-        if nc_file:
-            # Utiliser netCDF4 directement
-            for name in var_names.get(variable, [variable.value]):
-                if name in nc_file.variables:
-                    var_name = name
-                    break
-            
-            if not var_name:
-                nc_file.close()
-                raise ValueError(f"Variable {variable.value} non trouvée dans {file_path}")
-            
-            print(f"   🔍 Variable trouvée: {var_name}")
-            nc_var = nc_file.variables[var_name]
-            nc_time = nc_file.variables['time']
-            nc_lat = nc_file.variables['lat']
-            nc_lon = nc_file.variables['lon']
-            
-            # Obtenir les dimensions directement depuis netCDF4
-            print(f"   📊 Lecture des dimensions...")
-            time_coords_raw = nc_time[:]  # Valeurs brutes (jours depuis 1850-01-01)
-            lat_coords_raw = nc_lat[:]
-            lon_coords_raw = nc_lon[:]
-            
-            # Convertir les dates NetCDF en dates Python
-            # Les dates NetCDF sont en "days since 1850-01-01"
-            time_units = nc_time.units
-            time_calendar = getattr(nc_time, 'calendar', 'standard')
-            print(f"   📅 Unités de temps: {time_units}, calendrier: {time_calendar}")
-            
-            # Convertir toutes les dates une seule fois
-            time_coords_dates = num2date(time_coords_raw, units=time_units, calendar=time_calendar)
-            # Convertir cftime en objets date Python pour faciliter le filtrage
-            time_coords = []
-            for d in time_coords_dates:
-                if hasattr(d, 'date'):  # Objet datetime Python standard
-                    time_coords.append(d.date())
-                elif hasattr(d, 'year'):  # Objet cftime
-                    time_coords.append(date(d.year, d.month, d.day))
-                else:
-                    time_coords.append(pd.to_datetime(str(d)).date())
-            
-            # Obtenir la shape de la variable
-            var_shape = nc_var.shape
-            print(f"   📐 Shape de la variable: {var_shape}")
-            print(f"   📅 Période: {time_coords[0]} à {time_coords[-1]}")
-        else:
-            # Fallback sur xarray
-            for name in var_names.get(variable, [variable.value]):
-                if name in ds.data_vars:
-                    var_name = name
-                    break
-            
-            if not var_name:
-                raise ValueError(f"Variable {variable.value} non trouvée dans {file_path}")
-            
-            print(f"   🔍 Variable trouvée: {var_name}")
-            data_array = ds[var_name]
-            
-            if 'lat' not in data_array.coords or 'lon' not in data_array.coords:
-                raise ValueError("Coordonnées 'lat' et 'lon' non trouvées dans le dataset")
-            
-            print(f"   📊 Lecture des dimensions...")
-            time_coords = data_array.coords['time'].values
-            lat_coords_raw = data_array.coords['lat'].values
-            lon_coords_raw = data_array.coords['lon'].values
-            var_shape = data_array.shape
-            nc_var = None
-        
-        # Vérifier si les coordonnées sont 1D ou 2D
-        lat_shape = lat_coords_raw.shape if hasattr(lat_coords_raw, 'shape') else None
-        lon_shape = lon_coords_raw.shape if hasattr(lon_coords_raw, 'shape') else None
-        
-        logger.info(f"Forme des coordonnées lat: {lat_shape}, lon: {lon_shape}")
-        print(f"   📐 Forme des coordonnées lat: {lat_shape}, lon: {lon_shape}")
-        
-        # Obtenir les dimensions de la grille
-        # Si les coordonnées sont 2D, utiliser les dimensions de la grille
-        # Sinon, utiliser les dimensions des coordonnées 1D
-        if lat_shape and len(lat_shape) == 2:
-            # Grille 2D: les coordonnées sont des arrays 2D
-            n_lats, n_lons = lat_shape
-            logger.info(f"Grille 2D détectée: {n_lats} × {n_lons}")
-        else:
-            # Coordonnées 1D: dimensions séparées
-            n_lats = len(lat_coords_raw) if hasattr(lat_coords_raw, '__len__') else 1
-            n_lons = len(lon_coords_raw) if hasattr(lon_coords_raw, '__len__') else 1
-            logger.info(f"Coordonnées 1D détectées: {n_lats} lat × {n_lons} lon")
-        
-        n_times = len(time_coords)
-        
-        def to_float(val):
-            """Convertit une valeur en float Python"""
-            if isinstance(val, (int, float)):
-                return float(val)
-            if isinstance(val, (np.integer, np.floating)):
-                return float(val)
-            if hasattr(val, 'shape') and val.shape == ():
-                return float(val.item())
-            if hasattr(val, '__len__') and len(val) == 1:
-                return float(val[0])
-            return float(val)
-        
-        logger.info(f"Dimensions: {n_times} temps × {n_lats} lat × {n_lons} lon = {n_times * n_lats * n_lons:,} points")
-        print(f"   📏 Dimensions: {n_times} temps × {n_lats} lat × {n_lons} lon = {n_times * n_lats * n_lons:,} points")
-        
-        # Pré-calculer les coordonnées si grille 2D (une seule fois au début)
-        lat_coords_2d = None
-        lon_coords_2d = None
-        if lat_shape and len(lat_shape) == 2:
-            print(f"   🔄 Pré-calcul des coordonnées 2D ({n_lats} × {n_lons} = {n_lats * n_lons:,} points)...")
-            # Convertir toutes les coordonnées une seule fois pour éviter les conversions répétées
-            lat_coords_2d = np.array([[to_float(lat_coords_raw[i, j]) for j in range(n_lons)] for i in range(n_lats)])
-            lon_coords_2d = np.array([[to_float(lon_coords_raw[i, j]) for j in range(n_lons)] for i in range(n_lats)])
-            print(f"   ✅ Coordonnées pré-calculées")
-        
-        # Filtrer les pas de temps si nécessaire
-        time_indices_to_process = list(range(len(time_coords)))
-        if start_year is not None or end_year is not None:
-            print(f"   📅 Filtrage temporel: {start_year or 'début'} - {end_year or 'fin'}...")
-            filtered_indices = []
-            for t_idx, time_date in enumerate(time_coords):
-                # time_coords est déjà une liste de date objects
-                year = time_date.year
-                if start_year is not None and year < start_year:
-                    continue
-                if end_year is not None and year > end_year:
-                    continue
-                filtered_indices.append(t_idx)
-            
-            time_indices_to_process = filtered_indices
-            if len(time_indices_to_process) > 0:
-                first_date = time_coords[time_indices_to_process[0]]
-                last_date = time_coords[time_indices_to_process[-1]]
-                print(f"   ✅ {len(time_indices_to_process)}/{len(time_coords)} pas de temps sélectionnés ({first_date} à {last_date})")
-            else:
-                print(f"   ⚠️  Aucun pas de temps ne correspond au filtre !")
-                print(f"   📅 Période disponible: {time_coords[0]} à {time_coords[-1]}")
-        
-        # Gérer plusieurs points géographiques si filtrage spatial
-        # Convertir en liste si un seul point fourni
-        if lat_filter is not None and lon_filter is not None:
-            if not isinstance(lat_filter, (list, tuple)):
-                lat_filter = [lat_filter]
-                lon_filter = [lon_filter]
-        
-        # Trouver les points géographiques les plus proches dans la grille
-        points_to_process = []  # Liste de (lat_idx, lon_idx, lat_val, lon_val, point_name)
-        if lat_filter is not None and lon_filter is not None:
-            print(f"   📍 Filtrage spatial: {len(lat_filter)} point(s)...")
-            for point_idx, (target_lat, target_lon) in enumerate(zip(lat_filter, lon_filter)):
-                # Trouver le point le plus proche dans la grille
-                min_dist = float('inf')
-                best_lat_idx = None
-                best_lon_idx = None
-                
-                for lat_idx in range(n_lats):
-                    for lon_idx in range(n_lons):
-                        if lat_coords_2d is not None:
-                            lat_val = lat_coords_2d[lat_idx, lon_idx]
-                            lon_val = lon_coords_2d[lat_idx, lon_idx]
-                        else:
-                            lat_val = to_float(lat_coords_raw[lat_idx])
-                            lon_val = to_float(lon_coords_raw[lon_idx])
-                        
-                        # Distance euclidienne simple
-                        dist = np.sqrt((lat_val - target_lat)**2 + (lon_val - target_lon)**2)
-                        if dist < min_dist:
-                            min_dist = dist
-                            best_lat_idx = lat_idx
-                            best_lon_idx = lon_idx
-                
-                if best_lat_idx is not None:
-                    if lat_coords_2d is not None:
-                        actual_lat = lat_coords_2d[best_lat_idx, best_lon_idx]
-                        actual_lon = lon_coords_2d[best_lat_idx, best_lon_idx]
-                    else:
-                        actual_lat = to_float(lat_coords_raw[best_lat_idx])
-                        actual_lon = to_float(lon_coords_raw[best_lon_idx])
-                    
-                    points_to_process.append((best_lat_idx, best_lon_idx, actual_lat, actual_lon))
-                    print(f"   ✅ Point {point_idx+1}: ({target_lat:.4f}, {target_lon:.4f}) → ({actual_lat:.4f}, {actual_lon:.4f}) à {min_dist:.4f}°")
+        if self.layout == "partitioned" and self._active_partition != (variable.value, experiment.value):
+            # Base partitionnée: manifeste, staging et tables dérivées de la partition
+            arguments = {name: value for name, value in locals().items() if name != "self"}
+            with self.use_partition(variable, experiment):
+                return self.import_netcdf_file(**arguments)
+        if self.layout == "parquet":
+            raise ValueError(
+                "Racine Parquet en lecture seule: écrire les fichiers avec "
+                "parquet_store.write_netcdf_to_parquet (import_to_duckdb.py --parquet)"
+            )
+        if not DUCKDB_AVAILABLE or not NETCDF4_AVAILABLE:
+            raise ImportError("netCDF4 et duckdb doivent être installés")
         
-        print(f"   🚀 Début de l'importation...")
+        logger.info(f"Importation de {file_path} dans DuckDB (mode colonnaire)...")
         
+        import_start = time.perf_counter()
         total_rows = 0
-        rows_buffer = []
-        
-        # Traiter seulement les pas de temps filtrés
-        n_filtered_times = len(time_indices_to_process)
-        if n_filtered_times == 0:
-            logger.warning("Aucun pas de temps à traiter après filtrage")
-            if nc_file:
-                nc_file.close()
-            elif 'ds' in locals():
-                ds.close()
+        
+        # Consulter import_manifest: fichier inchangé, reprise ou import complet
+        selection = selection_key(lat_filter, lon_filter, start_year, end_year)
+        plan = self.plan_import(file_path, selection, force=force)
+        if plan["action"] == "skip":
+            print(f"   ⏭️  Fichier inchangé depuis le dernier import ({plan['entry']['rows']:,} lignes), ignoré")
+            self.last_import_stats = {
+                "rows": 0,
+                "bytes_read": 0,
+                "read_seconds": 0.0,
+                "read_mb_s": 0.0,
+                "elapsed_seconds": time.perf_counter() - import_start,
+                "skipped": True,
+            }
             return 0
         
-        for idx, t_idx in enumerate(time_indices_to_process):
-            time_date = time_coords[t_idx]  # Déjà un objet date
-            if idx % 100 == 0 or idx == 0:
-                logger.info(f"Traitement du pas de temps {idx+1}/{n_filtered_times} (t_idx={t_idx+1}/{n_times})...")
-                print(f"   ⏳ Traitement du pas de temps {idx+1}/{n_filtered_times} ({time_date})...")
-            
-            # Charger seulement UN pas de temps à la fois
-            # Utiliser netCDF4 pour un accès direct optimisé au slice
-            time_slice = None
-            if nc_var is not None:
-                # Accès direct avec netCDF4 - beaucoup plus rapide que xarray
-                # Lire directement le slice [t_idx, :, :] sans overhead
-                # Selon https://annefou.github.io/metos_python/07-LargeFiles/, 
-                # netCDF4 permet un accès direct aux slices sans charger tout le fichier
-                values_2d = nc_var[t_idx, :, :]  # Shape: (lat, lon)
-                # Gérer les valeurs masquées (masked arrays) en les convertissant en NaN
-                if hasattr(values_2d, 'mask'):
-                    # Si c'est un masked array, convertir en array numpy normal avec NaN
-                    values_2d = np.ma.filled(values_2d, np.nan)
-            else:
-                # Fallback sur xarray
-                time_slice = data_array.isel(time=t_idx)
-                values_2d = time_slice.load().values  # Shape: (lat, lon) ou (y, x)
-            
-            # time_date est déjà un objet date Python (converti plus haut)
-            
-            # Itérer sur les points à traiter (ou toute la grille si pas de filtre)
-            if points_to_process:
-                # Traiter seulement les points spécifiés
-                points_iter = [(pt[0], pt[1]) for pt in points_to_process]
-            else:
-                # Traiter toute la grille
-                points_iter = [(lat_idx, lon_idx) for lat_idx in range(n_lats) for lon_idx in range(n_lons)]
-            
-            for lat_idx, lon_idx in points_iter:
-                value = float(values_2d[lat_idx, lon_idx])
-                
-                # Ignorer les NaN
-                if np.isnan(value):
-                    continue
-                
-                # Extraire les coordonnées lat/lon pour ce point de grille
-                if lat_coords_2d is not None:
-                    # Grille 2D: utiliser les coordonnées pré-calculées
-                    lat_val = float(lat_coords_2d[lat_idx, lon_idx])
-                    lon_val = float(lon_coords_2d[lat_idx, lon_idx])
+        with NetCDFBatchReader(
+            file_path, variable,
+            lat_filter=lat_filter, lon_filter=lon_filter,
+            start_year=start_year, end_year=end_year,
+            chunk_size=chunk_size, point_read_mode=point_read_mode, max_block_mb=max_block_mb,
+            cache_dir=self.cache_dir
+        ) as reader:
+            resumed = False
+            if plan["action"] == "resume":
+                entry = plan["entry"]
+                resumed = reader.resume_after(entry["last_time_index"], entry["last_time"])
+                if resumed:
+                    print(f"   ↪️  Reprise après le {entry['last_time']} "
+                          f"({len(reader.time_indices)} pas de temps restants)")
                 else:
-                    # Coordonnées 1D: utiliser les indices directement
-                    lat_val = to_float(lat_coords_raw[lat_idx])
-                    lon_val = to_float(lon_coords_raw[lon_idx])
-                
-                rows_buffer.append({
-                    'variable': variable.value,
-                    'experiment': experiment.value,
-                    'gcm': gcm,
-                    'rcm': rcm,
-                    'member': member,
-                    'lat': lat_val,
-                    'lon': lon_val,
-                    'time': time_date,
-                    'value': value
-                })
-                
-                # Insérer par batch pour éviter d'accumuler trop en mémoire
-                if len(rows_buffer) >= chunk_size:
-                    df_chunk = pd.DataFrame(rows_buffer)
-                    # Enregistrer le DataFrame comme table temporaire
-                    self.conn.register('temp_chunk', df_chunk)
-                    # Insérer depuis la table temporaire en ignorant les doublons
-                    # ON CONFLICT DO NOTHING évite les doublons si le fichier est réimporté
-                    if skip_duplicates:
-                        try:
-                            self.conn.execute("""
-                                INSERT INTO climate_data 
-                                SELECT * FROM temp_chunk
-                                ON CONFLICT DO NOTHING
-                            """)
-                        except Exception as e:
-                            # Si ON CONFLICT n'est pas supporté (table sans PRIMARY KEY), utiliser INSERT normal
-                            if "CONFLICT" in str(e) or "primary key" in str(e).lower():
-                                logger.warning(f"ON CONFLICT non supporté, insertion normale (doublons possibles): {e}")
-                                self.conn.execute("INSERT INTO climate_data SELECT * FROM temp_chunk")
-                            else:
-                                raise
-                    else:
-                        self.conn.execute("INSERT INTO climate_data SELECT * FROM temp_chunk")
-                    # Nettoyer la table temporaire
-                    self.conn.unregister('temp_chunk')
-                    total_rows += len(rows_buffer)
-                    rows_buffer = []
-                    
-                    # Afficher progression
-                    if total_rows % (chunk_size * 10) == 0:
+                    print(f"   ⚠️  L'axe temporel a changé depuis le dernier import: import complet")
+            progress = self.start_import_progress(plan, selection, variable, experiment, gcm, rcm, member, resumed)
+            if self.layout == "normalized":
+                self.register_cells(**reader.selected_cells())
+            self.replace_imported_rows(plan, progress, reader.selected_cells(), resumed)
+            
+            batches = reader.iter_batches_pipelined(queue_size) if pipelined else reader.iter_batches()
+            staged_rows, duplicates = 0, 0
+            staged_until = (None, None)
+            if bulk_load:
+                self.create_staging_table()
+            try:
+                for batch in batches:
+                    if not bulk_load:
+                        total_rows += self.append_batch(batch, progress, skip_duplicates)
                         logger.info(f"  Progression: {total_rows:,} lignes importées...")
                         print(f"   💾 {total_rows:,} lignes importées dans la base...")
-            
-            # Libérer la mémoire après chaque pas de temps
-            if time_slice is not None:
-                del time_slice
-            del values_2d
-        
-        # Insérer les dernières lignes
-        if rows_buffer:
-            df_chunk = pd.DataFrame(rows_buffer)
-            self.conn.register('temp_chunk', df_chunk)
-            # Insérer en ignorant les doublons si demandé
-            if skip_duplicates:
-                try:
-                    self.conn.execute("""
-                        INSERT INTO climate_data 
-                        SELECT * FROM temp_chunk
-                        ON CONFLICT DO NOTHING
-                    """)
-                except Exception as e:
-                    # Si ON CONFLICT n'est pas supporté (table sans PRIMARY KEY), utiliser INSERT normal
-                    if "CONFLICT" in str(e) or "primary key" in str(e).lower():
-                        logger.warning(f"ON CONFLICT non supporté, insertion normale (doublons possibles): {e}")
-                        self.conn.execute("INSERT INTO climate_data SELECT * FROM temp_chunk")
-                    else:
-                        raise
-            else:
-                self.conn.execute("INSERT INTO climate_data SELECT * FROM temp_chunk")
-            self.conn.unregister('temp_chunk')
-            total_rows += len(rows_buffer)
+                        continue
+                    
+                    staged_rows += self.stage_batch(batch)
+                    staged_until = (batch.attrs.get("last_time_index"), batch.attrs.get("last_time"))
+                    if staged_rows >= staging_rows:
+                        inserted, skipped = self.merge_staging(progress, *staged_until)
+                        total_rows += inserted
+                        duplicates += skipped
+                        staged_rows = 0
+                        print(f"   💾 {total_rows:,} lignes insérées ({duplicates:,} doublons ignorés)...")
+                
+                if bulk_load and staged_rows:
+                    inserted, skipped = self.merge_staging(progress, *staged_until)
+                    total_rows += inserted
+                    duplicates += skipped
+                    print(f"   💾 {total_rows:,} lignes insérées ({duplicates:,} doublons ignorés)")
+            finally:
+                # Arrêter les étages du pipeline avant de fermer le fichier
+                batches.close()
+                if bulk_load:
+                    self.drop_staging_table()
+            self.finish_import(progress, *reader.last_selected_time)
+            read_stats = dict(reader.stats)
+            read_mb_s = reader.read_mb_s
+        
+        elapsed = time.perf_counter() - import_start
+        self.last_import_stats = {
+            "rows": total_rows,
+            "bytes_read": read_stats["bytes_read"],
+            "read_seconds": read_stats["read_seconds"],
+            "read_mb_s": read_mb_s,
+            "elapsed_seconds": elapsed,
+            "resumed": resumed,
+        }
+        if bulk_load:
+            self.last_import_stats["inserted"] = total_rows
+            self.last_import_stats["duplicates"] = duplicates
         
-            logger.info(f"✅ Importation terminée: {total_rows:,} lignes")
-            print(f"   ✅ Importation terminée: {total_rows:,} lignes")
+        logger.info(f"✅ Importation terminée: {total_rows:,} lignes")
+        print(f"   ✅ Importation terminée: {total_rows:,} lignes en {elapsed:.1f}s "
+              f"({read_stats['bytes_read'] / 1e6:,.0f} MB lus à {read_mb_s:,.1f} MB/s)")
         
-        # Fermer proprement les fichiers
-        if nc_file:
-            nc_file.close()
-        elif 'ds' in locals():
-            ds.close()
+        if "stages" in read_stats:
+            stages = read_stats["stages"]
+            self.last_import_stats["stages"] = stages
+            # L'étage le plus occupé limite le débit du pipeline
+            bottleneck = max(stages, key=lambda name: stages[name]["busy_seconds"])
+            for name, stage in stages.items():
+                print(f"   ⏱️  {name}: {stage['busy_seconds']:.1f}s de travail, "
+                      f"{stage['wait_in_seconds']:.1f}s en attente d'entrée, "
+                      f"{stage['wait_out_seconds']:.1f}s bloqué en sortie ({stage['items']} éléments)")
+            print(f"   🐢 Étage limitant: {bottleneck}")
         
         return total_rows
     
@@ -567,6 +3272,7 @@ class DuckDBClimateLoader:
         Returns:
             DataFrame avec colonnes: variable, time, value
         """
+        self.route(variables, experiment)
         var_names = [v.value for v in variables]
         
         query = """
@@ -652,6 +3358,7 @@ class DuckDBClimateLoader:
         Returns:
             Valeur agrégée
         """
+        self.route(variable, experiment)
         agg_func = {
             'mean': 'AVG',
             'sum': 'SUM',
@@ -703,6 +3410,7 @@ class DuckDBClimateLoader:
         Returns:
             DataFrame avec colonnes: time, value
         """
+        self.route(variable, experiment)
         query = """
             SELECT time, value
             FROM climate_data
@@ -729,10 +3437,197 @@ class DuckDBClimateLoader:
         
         return self.conn.execute(query, params).df()
     
+    def nearest_cell(
+        self,
+        lat: float,
+        lon: float,
+        tolerance: float = 0.1,
+        table: Optional[str] = None
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Coordonnées exactes de la maille stockée la plus proche d'un point.
+        
+        Args:
+            lat: Latitude du point
+            lon: Longitude du point
+            tolerance: Écart maximal en degrés sur chaque coordonnée
+            table: Table où chercher les mailles (par défaut cells en schéma
+                normalisé, climate_data sinon)
+        
+        Returns:
+            Tuple (lat, lon) de la maille, ou None si aucune dans la tolérance
+        """
+        # Schéma normalisé: recherche dans la petite table cells
+        source = table or ("cells" if self.layout == "normalized" else "climate_data")
+        row = self.conn.execute(f"""
+            SELECT lat, lon
+            FROM (SELECT DISTINCT lat, lon FROM {source} WHERE lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?)
+            ORDER BY (lat - ?) * (lat - ?) + (lon - ?) * (lon - ?)
+            LIMIT 1
+        """, [lat - tolerance, lat + tolerance, lon - tolerance, lon + tolerance, lat, lat, lon, lon]).fetchone()
+        return (row[0], row[1]) if row else None
+    
+    def get_multi_variable_series(
+        self,
+        lat: float,
+        lon: float,
+        variables: List[VariableType],
+        experiment: ExperimentType,
+        gcm: Optional[str] = None,
+        rcm: Optional[str] = None,
+        members: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        tolerance: float = 0.1
+    ) -> "pd.DataFrame":
+        """
+        Séries journalières de plusieurs variables pour un point, en une seule lecture.
+        
+        Utilise la table large climate_wide si elle existe (une ligne par jour),
+        sinon pivote climate_data à la volée.
+        
+        Args:
+            lat: Latitude du point
+            lon: Longitude du point
+            variables: Variables à lire (colonnes du résultat)
+            experiment: Scénario climatique
+            gcm: Modèle climatique global (tous si None)
+            rcm: Modèle climatique régional (tous si None)
+            members: Membres d'ensemble (tous si None)
+            start_date: Date de début (optionnel)
+            end_date: Date de fin (optionnel)
+            tolerance: Écart maximal en degrés entre le point et la maille
+        
+        Returns:
+            DataFrame avec colonnes: gcm, rcm, member, time, puis une colonne par variable
+        """
+        self.route(variables, experiment)
+        var_names = [v.value for v in variables]
+        columns = ["gcm", "rcm", "member", "time"] + var_names
+        cell = self.nearest_cell(lat, lon, tolerance)
+        if cell is None:
+            return pd.DataFrame(columns=columns)
+        
+        conditions = ["experiment = ?", "lat = ?", "lon = ?"]
+        params = [experiment.value, cell[0], cell[1]]
+        for column, value in (("gcm", gcm), ("rcm", rcm)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if members:
+            conditions.append(f"member IN ({','.join('?' for _ in members)})")
+            params.extend(members)
+        if start_date:
+            conditions.append("time >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("time <= ?")
+            params.append(end_date)
+        
+        wide_names = {v.value for v in WIDE_VARIABLES}
+        if self.has_table("climate_wide") and set(var_names) <= wide_names:
+            query = f"""
+                SELECT gcm, rcm, member, time, {', '.join(var_names)}
+                FROM climate_wide
+                WHERE {' AND '.join(conditions)}
+                ORDER BY gcm, rcm, member, time
+            """
+        else:
+            pivot = ", ".join(f"MAX(value) FILTER (WHERE variable = '{name}') AS {name}" for name in var_names)
+            conditions.append(f"variable IN ({','.join('?' for _ in var_names)})")
+            params.extend(var_names)
+            query = f"""
+                SELECT gcm, rcm, member, time, {pivot}
+                FROM climate_data
+                WHERE {' AND '.join(conditions)}
+                GROUP BY gcm, rcm, member, time
+                ORDER BY gcm, rcm, member, time
+            """
+        return self.conn.execute(query, params).df()
+    
+    def get_series_array(
+        self,
+        lat: float,
+        lon: float,
+        variable: VariableType,
+        experiment: ExperimentType,
+        gcm: Optional[str] = None,
+        rcm: Optional[str] = None,
+        members: Optional[List[str]] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        tolerance: float = 0.1
+    ) -> Tuple[np.ndarray, List[Tuple[str, str, str]], np.ndarray]:
+        """
+        Séries journalières d'un point pour plusieurs simulations, lues dans climate_series.
+        
+        Args:
+            lat: Latitude du point
+            lon: Longitude du point
+            variable: Variable climatique
+            experiment: Scénario climatique
+            gcm: Modèle climatique global (tous si None)
+            rcm: Modèle climatique régional (tous si None)
+            members: Membres d'ensemble (tous si None)
+            start_year: Première année (optionnel)
+            end_year: Dernière année (optionnel)
+            tolerance: Écart maximal en degrés entre le point et la maille
+        
+        Returns:
+            Tuple (dates datetime64[D], simulations (gcm, rcm, member), valeurs float32
+            de shape (n_simulations, n_dates), NaN pour les jours absents)
+        """
+        self.route(variable, experiment)
+        empty = (np.array([], dtype='datetime64[D]'), [], np.empty((0, 0), dtype=np.float32))
+        cell = self.nearest_cell(lat, lon, tolerance, table="climate_series")
+        if cell is None:
+            return empty
+        
+        conditions = ["variable = ?", "experiment = ?", "lat = ?", "lon = ?"]
+        params = [variable.value, experiment.value, cell[0], cell[1]]
+        for column, value in (("gcm", gcm), ("rcm", rcm)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if members:
+            conditions.append(f"member IN ({','.join('?' for _ in members)})")
+            params.extend(members)
+        if start_year is not None:
+            conditions.append("year >= ?")
+            params.append(start_year)
+        if end_year is not None:
+            conditions.append("year <= ?")
+            params.append(end_year)
+        
+        data = self.conn.execute(f"""
+            SELECT gcm, rcm, member, year, daily
+            FROM climate_series
+            WHERE {' AND '.join(conditions)}
+            ORDER BY gcm, rcm, member, year
+        """, params).fetchnumpy()
+        if len(data["year"]) == 0:
+            return empty
+        
+        keys = list(zip(data["gcm"], data["rcm"], data["member"]))
+        simulations = {key: i for i, key in enumerate(dict.fromkeys(keys))}
+        series_index = np.array([simulations[key] for key in keys])
+        year = np.asarray(data["year"], dtype=np.int64)
+        years = np.arange(year.min(), year.max() + 1)
+        
+        packed = np.full((len(simulations), len(years), DAYS_PER_PACKED_YEAR), np.nan, dtype=np.float32)
+        packed[series_index, year - years[0]] = np.stack(data["daily"])
+        
+        # Jour 366 des années non bissextiles: emplacement inutilisé
+        year_starts = (years - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+        dates = year_starts[:, None] + np.arange(DAYS_PER_PACKED_YEAR)
+        keep = dates.astype('datetime64[Y]') == year_starts.astype('datetime64[Y]')[:, None]
+        return dates[keep], [tuple(str(v) for v in key) for key in simulations], packed[:, keep]
+    
     def close(self):
-        """Ferme la connexion DuckDB"""
-        if self.conn:
-            self.conn.close()
+        """Ferme les curseurs du pool et la connexion DuckDB"""
+        self.pool.close()
+        if self._conn:
+            self._conn.close()
     
     def __enter__(self):
         return self
@@ -0,0 +1,211 @@
+"""
+Index spatial des grilles Météo-France (lat/lon 2D curvilignes)
+Recherche vectorisée des mailles les plus proches, en distance haversine
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Dict, Tuple
+import hashlib
+import logging
+import pickle
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    cKDTree = None
+
+logger = logging.getLogger(__name__)
+
+# Rayon moyen de la Terre (km)
+EARTH_RADIUS_KM = 6371.0
+
+# Version du format des index sérialisés (à incrémenter si GridIndex change)
+GRID_INDEX_VERSION = 1
+
+# Index déjà construits dans ce processus, par signature de grille
+_grid_index_cache: Dict[str, "GridIndex"] = {}
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Distance orthodromique (haversine) en km entre deux ensembles de points.
+    
+    Les arguments sont des scalaires ou des tableaux NumPy diffusables (broadcast).
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def to_unit_vectors(lats, lons) -> np.ndarray:
+    """
+    Convertit des coordonnées (degrés) en vecteurs unitaires 3D.
+    
+    La distance euclidienne (corde) entre deux vecteurs unitaires est une fonction
+    croissante de la distance haversine: le plus proche voisin en 3D est donc le
+    plus proche voisin sur la sphère.
+    """
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def grid_signature(lat_grid: np.ndarray, lon_grid: np.ndarray) -> str:
+    """Signature d'une grille (forme et coordonnées), utilisée comme clé de cache"""
+    digest = hashlib.sha1(f"v{GRID_INDEX_VERSION}:{lat_grid.shape}".encode())
+    digest.update(np.ascontiguousarray(lat_grid, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(lon_grid, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class GridIndex:
+    """
+    Index des mailles d'une grille lat/lon 2D pour les requêtes de plus proche voisin.
+    
+    Les mailles sont projetées sur la sphère unité et indexées par un KD-tree
+    (scipy.spatial.cKDTree). Sans scipy, une recherche exhaustive vectorisée par
+    paquets de points est utilisée. Les mailles aux coordonnées NaN sont ignorées.
+    """
+    
+    def __init__(self, lat_grid: np.ndarray, lon_grid: np.ndarray):
+        """
+        Construit l'index d'une grille.
+        
+        Args:
+            lat_grid: Latitudes des mailles, shape (n_lat, n_lon)
+            lon_grid: Longitudes des mailles, shape (n_lat, n_lon)
+        """
+        lat_grid = np.asarray(lat_grid, dtype=np.float64)
+        lon_grid = np.asarray(lon_grid, dtype=np.float64)
+        if lat_grid.shape != lon_grid.shape or lat_grid.ndim != 2:
+            raise ValueError(f"Grilles lat/lon 2D de même forme attendues: {lat_grid.shape} / {lon_grid.shape}")
+        
+        self.shape = lat_grid.shape
+        self.signature = grid_signature(lat_grid, lon_grid)
+        
+        # Indices aplatis des mailles valides et leurs coordonnées
+        valid = ~(np.isnan(lat_grid) | np.isnan(lon_grid))
+        self.cell_ids = np.flatnonzero(valid)
+        self.cell_lat = lat_grid.ravel()[self.cell_ids]
+        self.cell_lon = lon_grid.ravel()[self.cell_ids]
+        if len(self.cell_ids) == 0:
+            raise ValueError("Aucune maille avec des coordonnées valides")
+        
+        self.points = to_unit_vectors(self.cell_lat, self.cell_lon)
+        self.tree = cKDTree(self.points) if SCIPY_AVAILABLE else None
+    
+    @classmethod
+    def load_or_build(
+        cls,
+        lat_grid: np.ndarray,
+        lon_grid: np.ndarray,
+        cache_dir: Optional[str] = None
+    ) -> "GridIndex":
+        """
+        Retourne l'index d'une grille, depuis le cache si possible.
+        
+        L'index est conservé en mémoire pour le processus et, si cache_dir est
+        fourni, sérialisé sur disque (grid_index_<signature>.pkl) pour les imports
+        suivants.
+        
+        Args:
+            lat_grid: Latitudes des mailles, shape (n_lat, n_lon)
+            lon_grid: Longitudes des mailles, shape (n_lat, n_lon)
+            cache_dir: Répertoire du cache disque (désactivé si None)
+        """
+        signature = grid_signature(np.asarray(lat_grid), np.asarray(lon_grid))
+        if signature in _grid_index_cache:
+            return _grid_index_cache[signature]
+        
+        cache_path = Path(cache_dir) / f"grid_index_{signature}.pkl" if cache_dir else None
+        index = None
+        if cache_path is not None and cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as f:
+                    index = pickle.load(f)
+                # Un index construit sans scipy reste utilisable (recherche exhaustive)
+                if not isinstance(index, cls) or index.signature != signature:
+                    index = None
+                else:
+                    logger.info(f"Index de grille chargé depuis {cache_path}")
+            except Exception as e:
+                logger.warning(f"Cache d'index de grille illisible ({cache_path}): {e}")
+                index = None
+        
+        if index is None:
+            index = cls(lat_grid, lon_grid)
+            logger.info(f"Index de grille construit: {len(index.cell_ids):,} mailles "
+                        f"({'KD-tree' if index.tree is not None else 'recherche exhaustive'})")
+            if cache_path is not None:
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = cache_path.with_suffix(".tmp")
+                    with open(tmp_path, 'wb') as f:
+                        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    tmp_path.replace(cache_path)
+                except OSError as e:
+                    logger.warning(f"Impossible d'écrire le cache d'index de grille: {e}")
+        
+        _grid_index_cache[signature] = index
+        return index
+    
+    def query(self, lats, lons, k: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Recherche les k mailles les plus proches de chaque point.
+        
+        Args:
+            lats: Latitude(s) des points (degrés)
+            lons: Longitude(s) des points (degrés)
+            k: Nombre de voisins par point
+        
+        Returns:
+            Tuple (lat_idx, lon_idx, distances_km), chacun de shape (n_points, k),
+            voisins triés par distance croissante
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        k = min(k, len(self.cell_ids))
+        targets = to_unit_vectors(lats, lons)
+        
+        if self.tree is not None:
+            _, neighbors = self.tree.query(targets, k=k)
+            neighbors = np.asarray(neighbors).reshape(len(lats), k)
+        else:
+            neighbors = self._brute_force(targets, k)
+        
+        lat_idx, lon_idx = np.unravel_index(self.cell_ids[neighbors], self.shape)
+        distances = haversine_km(lats[:, None], lons[:, None], self.cell_lat[neighbors], self.cell_lon[neighbors])
+        return lat_idx, lon_idx, distances
+    
+    def nearest(self, lats, lons) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Maille la plus proche de chaque point.
+        
+        Returns:
+            Tuple (lat_idx, lon_idx, distances_km), chacun de shape (n_points,)
+        """
+        lat_idx, lon_idx, distances = self.query(lats, lons, k=1)
+        return lat_idx[:, 0], lon_idx[:, 0], distances[:, 0]
+    
+    def _brute_force(self, targets: np.ndarray, k: int, max_pairs: int = 4_000_000) -> np.ndarray:
+        """Recherche exhaustive vectorisée (sans scipy), par paquets de points"""
+        neighbors = np.empty((len(targets), k), dtype=np.intp)
+        step = max(1, max_pairs // len(self.points))
+        for start in range(0, len(targets), step):
+            chunk = targets[start:start + step]
+            # Maximiser le produit scalaire revient à minimiser la corde
+            similarity = chunk @ self.points.T
+            if k < similarity.shape[1]:
+                candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            else:
+                candidates = np.tile(np.arange(similarity.shape[1]), (len(chunk), 1))
+            order = np.argsort(-np.take_along_axis(similarity, candidates, axis=1), axis=1)
+            neighbors[start:start + step] = np.take_along_axis(candidates, order, axis=1)
+        return neighbors
@@ -1,18 +1,530 @@
 #!/usr/bin/env python3
 """
 Script pour importer les fichiers NetCDF dans DuckDB
-Usage: poetry run python import_to_duckdb.py
+Usage: poetry run python import_to_duckdb.py [--full-grid] [--max-block-mb 256] [--pipelined] [--workers 4] [--bulk-load]
        ou: poetry shell puis python import_to_duckdb.py
 """
 
+import argparse
 import sys
 import re
+import time
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from duckdb_loader import DuckDBClimateLoader
+from duckdb_loader import DuckDBClimateLoader, WIDE_VARIABLES, VALUE_ENCODINGS
+from netcdf_reader import NetCDFBatchReader, selection_key
+from parquet_store import PARQUET_PARTITIONS, parquet_directory, is_parquet_root, write_netcdf_to_parquet
 from models import VariableType, ExperimentType
 from points_config import get_all_points
 
+# Lignes par row group DuckDB (valeur par défaut): en deçà, row group partiel (voir --maintain)
+ROW_GROUP_SIZE = 122_880
+
+# File de batchs partagée avec les processus de décodage et signal d'arrêt du writer
+# (initialisés par init_decode_worker)
+_batch_queue = None
+_stop_event = None
+
+
+def init_decode_worker(batch_queue, stop_event=None):
+    """Initialise un processus de décodage avec la file de batchs vers le writer"""
+    global _batch_queue, _stop_event
+    _batch_queue = batch_queue
+    _stop_event = stop_event
+
+
+def decode_file(job_id: int, file_path: str, variable: VariableType, reader_options: dict, resume_after=None):
+    """
+    Décode un fichier NetCDF dans un processus du pool.
+    
+    Les batchs colonnaires sont envoyés au writer DuckDB (processus principal)
+    par la file bornée: un put() bloque tant que le writer est en retard, ce qui
+    limite la mémoire occupée par les batchs en attente.
+    
+    Messages envoyés: (job_id, "start", {"resumed", "cells"}), (job_id, "batch", DataFrame),
+    puis (job_id, "done", stats) ou (job_id, "error", message). Le décodage s'arrête
+    sans message de fin si le writer a échoué (_stop_event).
+    
+    Args:
+        resume_after: (last_time_index, last_time) de import_manifest pour reprendre un import
+    """
+    try:
+        with NetCDFBatchReader(file_path, variable, verbose=False, **reader_options) as reader:
+            resumed = reader.resume_after(*resume_after) if resume_after else False
+            _batch_queue.put((job_id, "start", {"resumed": resumed, "cells": reader.selected_cells()}))
+            for batch in reader.iter_batches():
+                if _stop_event is not None and _stop_event.is_set():
+                    return
+                _batch_queue.put((job_id, "batch", batch))
+            last_time_index, last_time = reader.last_selected_time
+            _batch_queue.put((job_id, "done", {
+                **reader.stats,
+                "last_time_index": last_time_index,
+                "last_time": last_time,
+            }))
+    except Exception as e:
+        _batch_queue.put((job_id, "error", f"{type(e).__name__}: {e}"))
+
+
+def parse_args():
+    """Analyse les options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Importe les fichiers NetCDF de data/ dans DuckDB")
+    parser.add_argument(
+        "--full-grid",
+        action="store_true",
+        help="Importer toute la grille au lieu des points représentatifs"
+    )
+    parser.add_argument(
+        "--max-block-mb",
+        type=float,
+        default=256,
+        help="Budget mémoire (MB) d'un bloc de pas de temps lu en mode grille complète (défaut: 256)"
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Recouvrir lecture NetCDF, conversion et écriture DuckDB dans chaque import (threads, import séquentiel uniquement)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Réimporter tous les fichiers, même ceux marqués inchangés dans import_manifest"
+    )
+    parser.add_argument(
+        "--normalized",
+        action="store_true",
+        help="Schéma normalisé (runs, cells, climate_values + vue climate_data); convertit une base existante"
+    )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Une base DuckDB par scénario et variable (climate_data_partitions/<scénario>/<variable>.duckdb); "
+             "répartit une base existante"
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Écrire des fichiers Parquet zstd partitionnés par variable, scénario, membre et année "
+             "(climate_data_parquet/) au lieu de la base DuckDB, un processus par fichier avec --workers"
+    )
+    parser.add_argument(
+        "--value-encoding",
+        choices=list(VALUE_ENCODINGS),
+        default=None,
+        help="Stockage des valeurs d'une nouvelle base: double (défaut), float, ou entiers int16/int32 "
+             "avec pas et décalage par variable (avec --normalized)"
+    )
+    parser.add_argument(
+        "--agronomic-units",
+        action="store_true",
+        help="Convertir les nouvelles variables en unités agronomiques à l'import (mm/jour, °C), "
+             "unités enregistrées dans variable_units"
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Après l'import, réécrire la table des valeurs triée par simulation, point puis date "
+             "(lectures par point et par période ciblées via les min/max des row groups)"
+    )
+    parser.add_argument(
+        "--monthly",
+        action="store_true",
+        help="Créer la table monthly_aggregates (somme, moyenne, min, max par mois), "
+             "ensuite tenue à jour par chaque import"
+    )
+    parser.add_argument(
+        "--cumulative-sums",
+        action="store_true",
+        help="Créer la table cumulative_sums (cumuls journaliers des précipitations par point) "
+             "pour les totaux de périodes, ensuite tenue à jour par chaque import"
+    )
+    parser.add_argument(
+        "--exceedance-bitmaps",
+        action="store_true",
+        help="Créer la table exceedance_bitmaps (un bit par jour au-delà des seuils jours chauds, "
+             "jours de pluie, jours secs), ensuite tenue à jour par chaque import"
+    )
+    parser.add_argument(
+        "--dry-spells",
+        action="store_true",
+        help="Créer la table dry_spells (suites de jours secs par point: début, fin, longueur), "
+             "ensuite tenue à jour par chaque import"
+    )
+    parser.add_argument(
+        "--maintain",
+        action="store_true",
+        help="Maintenance sans import: ANALYZE, CHECKPOINT, compaction du fichier, puis rapport de stockage "
+             "(lignes, octets compressés et compression par colonne et par row group)"
+    )
+    parser.add_argument(
+        "--wide",
+        action="store_true",
+        help="Reconstruire la table large climate_wide (pr, tas, tasmin, tasmax en colonnes) des simulations importées"
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Reconstruire la table climate_series (une série float32 par point et par année) des simulations importées"
+    )
+    parser.add_argument(
+        "--bulk-load",
+        action="store_true",
+        help="Charger chaque fichier dans une table de staging puis fusionner en une passe (gros imports)"
+    )
+    parser.add_argument(
+        "--staging-rows",
+        type=int,
+        default=20_000_000,
+        help="Lignes accumulées en staging avant chaque fusion avec --bulk-load (défaut: 20 000 000)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Nombre de processus de décodage en parallèle (défaut: 1, import séquentiel)"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=None,
+        help="Nombre maximum de batchs en attente d'écriture (défaut: 2 × workers)"
+    )
+    return parser.parse_args()
+
+
+def import_options(config: dict, args) -> dict:
+    """Options de lecture (période, points, taille des blocs) d'un fichier à importer"""
+    # Déterminer la période de filtrage selon le type de fichier
+    # Les fichiers tas* vont seulement jusqu'à 2019, donc utiliser toute la période disponible
+    if config["variable"] in [VariableType.TAS, VariableType.TASMAX, VariableType.TASMIN]:
+        # Pour les températures, utiliser toute la période disponible (2015-2019)
+        start_year = None  # Pas de filtre de début
+        end_year = None    # Pas de filtre de fin
+    else:
+        # Pour les précipitations, filtrer 2025-2100
+        start_year = 1990
+        end_year = 2100
+    
+    # Points représentatifs de la Beauce et de la Bretagne
+    # Utiliser la configuration centralisée (sauf import de toute la grille)
+    if args.full_grid:
+        all_points_lat, all_points_lon = None, None
+    else:
+        all_points_lat, all_points_lon = get_all_points(format="lat_lon")
+    
+    return {
+        # Filtrer pour les points représentatifs de la Beauce et de la Bretagne
+        "lat_filter": all_points_lat,
+        "lon_filter": all_points_lon,
+        "start_year": start_year,
+        "end_year": end_year,
+        "max_block_mb": args.max_block_mb,
+    }
+
+
+def import_sequential(loader: DuckDBClimateLoader, datasets_config: list, args) -> list:
+    """
+    Importe les fichiers un par un dans le processus principal.
+    
+    Returns:
+        Liste de (nom du fichier, lignes importées, durée en secondes, MB lus)
+    """
+    results = []
+    for config in datasets_config:
+        file_path = config["file_path"]
+        print(f"\n📥 Importation de: {file_path.name}")
+        print(f"   Variable: {config['variable'].value}")
+        print(f"   Experiment: {config['experiment'].value}")
+        print(f"   GCM: {config['gcm']}, RCM: {config['rcm']}")
+        
+        try:
+            rows = loader.import_netcdf_file(
+                file_path=str(file_path),
+                variable=config["variable"],
+                experiment=config["experiment"],
+                gcm=config["gcm"],
+                rcm=config["rcm"],
+                member=config["member"],
+                pipelined=args.pipelined,
+                force=args.force,
+                bulk_load=args.bulk_load,
+                staging_rows=args.staging_rows,
+                **import_options(config, args)
+            )
+            stats = loader.last_import_stats
+            results.append((file_path.name, rows, stats.get("elapsed_seconds", 0.0), stats.get("bytes_read", 0) / 1e6))
+            if "duplicates" in stats:
+                print(f"   ✅ {rows:,} lignes insérées, {stats['duplicates']:,} doublons ignorés")
+            else:
+                print(f"   ✅ {rows:,} lignes importées")
+        except Exception as e:
+            print(f"   ❌ Erreur: {e}")
+            import traceback
+            traceback.print_exc()
+    return results
+
+
+def merge_staged(loader: DuckDBClimateLoader, job_id: int, progress: dict, staged: dict, file_rows: dict, duplicates: dict):
+    """Fusionne la table de staging d'un fichier (--bulk-load) dans climate_data"""
+    rows, last_time = staged[job_id]
+    if rows:
+        inserted, skipped = loader.merge_staging(progress[job_id], *last_time, table=f"climate_staging_{job_id}")
+        file_rows[job_id] += inserted
+        duplicates[job_id] += skipped
+    staged[job_id][0] = 0
+
+
+def import_parallel(loader: DuckDBClimateLoader, datasets_config: list, args) -> list:
+    """
+    Importe les fichiers avec un pool de processus de décodage et un seul writer.
+    
+    Chaque processus lit et convertit un fichier entier en batchs colonnaires
+    (NetCDFBatchReader). Les batchs passent par une file bornée jusqu'au processus
+    principal, seul à écrire dans DuckDB (DuckDB n'accepte qu'un writer).
+    import_manifest est consulté avant l'envoi des fichiers aux processus: les
+    fichiers inchangés sont ignorés et les imports interrompus sont repris.
+    Avec --bulk-load, chaque fichier a sa propre table de staging, fusionnée
+    dans climate_data tous les --staging-rows lignes et à la fin du fichier.
+    
+    Returns:
+        Liste de (nom du fichier, lignes importées, durée en secondes, MB lus)
+    """
+    queue_size = args.queue_size or 2 * args.workers
+    print(f"\n🚀 Import parallèle: {args.workers} processus de décodage, file de {queue_size} batchs")
+    
+    # "spawn" évite de dupliquer dans les processus fils la connexion DuckDB ouverte
+    ctx = multiprocessing.get_context("spawn")
+    batch_queue = ctx.Queue(maxsize=queue_size)
+    stop_event = ctx.Event()
+    
+    file_rows = {job_id: 0 for job_id in range(len(datasets_config))}
+    staged = {}
+    duplicates = {}
+    file_start = {}
+    plans = {}
+    progress = {}
+    finished = set()
+    results = []
+    
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=ctx,
+        initializer=init_decode_worker,
+        initargs=(batch_queue, stop_event)
+    ) as pool:
+        futures = {}
+        for job_id, config in enumerate(datasets_config):
+            options = {**import_options(config, args), "cache_dir": loader.cache_dir}
+            selection = selection_key(options["lat_filter"], options["lon_filter"], options["start_year"], options["end_year"])
+            try:
+                # Base partitionnée: manifeste de la partition du fichier
+                with loader.use_partition(config["variable"], config["experiment"]):
+                    plans[job_id] = (loader.plan_import(str(config["file_path"]), selection, force=args.force), selection)
+            except OSError as e:
+                finished.add(job_id)
+                print(f"   ❌ {config['file_path'].name}: {e}")
+                continue
+            
+            plan = plans[job_id][0]
+            if plan["action"] == "skip":
+                finished.add(job_id)
+                print(f"   ⏭️  {config['file_path'].name}: inchangé depuis le dernier import, ignoré")
+                continue
+            
+            resume_after = None
+            if plan["action"] == "resume":
+                resume_after = (plan["entry"]["last_time_index"], plan["entry"]["last_time"])
+            futures[job_id] = pool.submit(
+                decode_file, job_id, str(config["file_path"]), config["variable"], options, resume_after
+            )
+        
+        # Writer unique: vider la file jusqu'à ce que tous les fichiers soient terminés
+        try:
+            while len(finished) < len(datasets_config):
+                try:
+                    job_id, kind, payload = batch_queue.get(timeout=1.0)
+                except queue.Empty:
+                    # Un processus de décodage arrêté brutalement n'envoie pas de message de fin
+                    for job_id, future in futures.items():
+                        if job_id not in finished and future.done() and future.exception() is not None:
+                            finished.add(job_id)
+                            print(f"   ❌ {datasets_config[job_id]['file_path'].name}: {future.exception()}")
+                            # Processus arrêté après "start": table de staging du fichier à supprimer
+                            if job_id in staged:
+                                config = datasets_config[job_id]
+                                with loader.use_partition(config["variable"], config["experiment"]):
+                                    loader.drop_staging_table(f"climate_staging_{job_id}")
+                    continue
+                
+                config = datasets_config[job_id]
+                name = config["file_path"].name
+                
+                # Écritures d'un fichier dans sa partition (base partitionnée)
+                with loader.use_partition(config["variable"], config["experiment"]):
+                    if kind == "start":
+                        file_start[job_id] = time.perf_counter()
+                        plan, selection = plans[job_id]
+                        progress[job_id] = loader.start_import_progress(
+                            plan, selection, config["variable"], config["experiment"],
+                            config["gcm"], config["rcm"], config["member"], payload["resumed"]
+                        )
+                        if loader.layout == "normalized":
+                            loader.register_cells(**payload["cells"])
+                        loader.replace_imported_rows(plan, progress[job_id], payload["cells"], payload["resumed"])
+                        if payload["resumed"]:
+                            print(f"   ↪️  {name}: reprise après le {plan['entry']['last_time']}")
+                        if args.bulk_load:
+                            loader.create_staging_table(f"climate_staging_{job_id}")
+                            staged[job_id], duplicates[job_id] = [0, (None, None)], 0
+                    elif kind == "batch" and args.bulk_load:
+                        staged[job_id][0] += loader.stage_batch(payload, f"climate_staging_{job_id}")
+                        staged[job_id][1] = (payload.attrs.get("last_time_index"), payload.attrs.get("last_time"))
+                        if staged[job_id][0] >= args.staging_rows:
+                            merge_staged(loader, job_id, progress, staged, file_rows, duplicates)
+                            print(f"   💾 {name}: {file_rows[job_id]:,} lignes insérées ({duplicates[job_id]:,} doublons)")
+                    elif kind == "batch":
+                        file_rows[job_id] += loader.append_batch(payload, progress[job_id])
+                        print(f"   💾 {name}: {file_rows[job_id]:,} lignes écrites")
+                    elif kind == "done":
+                        finished.add(job_id)
+                        if args.bulk_load:
+                            merge_staged(loader, job_id, progress, staged, file_rows, duplicates)
+                            loader.drop_staging_table(f"climate_staging_{job_id}")
+                        loader.finish_import(progress[job_id], payload["last_time_index"], payload["last_time"])
+                        elapsed = time.perf_counter() - file_start[job_id]
+                        results.append((name, file_rows[job_id], elapsed, payload["bytes_read"] / 1e6))
+                        skipped = f", {duplicates[job_id]:,} doublons ignorés" if args.bulk_load else ""
+                        print(f"   ✅ {name}: {file_rows[job_id]:,} lignes importées{skipped} "
+                              f"({len(finished)}/{len(datasets_config)} fichiers)")
+                    else:
+                        finished.add(job_id)
+                        if args.bulk_load:
+                            loader.drop_staging_table(f"climate_staging_{job_id}")
+                        print(f"   ❌ {name}: {payload}")
+        except BaseException:
+            # Erreur du writer: sans lecteur, les processus bloqués sur put() (file pleine)
+            # empêcheraient la fermeture du pool. Arrêter le décodage, vider la file
+            # jusqu'à la fin des processus, supprimer les tables de staging, puis relever l'erreur.
+            print("   ❌ Erreur d'écriture: arrêt des processus de décodage...")
+            stop_event.set()
+            for future in futures.values():
+                future.cancel()
+            while not all(future.done() for future in futures.values()):
+                try:
+                    batch_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            try:
+                while True:
+                    batch_queue.get(timeout=0.5)
+            except queue.Empty:
+                pass
+            if args.bulk_load:
+                for job_id in set(staged) - finished:
+                    config = datasets_config[job_id]
+                    try:
+                        with loader.use_partition(config["variable"], config["experiment"]):
+                            loader.drop_staging_table(f"climate_staging_{job_id}")
+                    except Exception as e:
+                        print(f"   ⚠️  Table climate_staging_{job_id} non supprimée: {e}")
+            raise
+    
+    return results
+
+
+def export_parquet(datasets_config: list, args, root: Path) -> list:
+    """
+    Écrit chaque fichier NetCDF en Parquet partitionné sous root (--parquet).
+    
+    Pas de writer unique: chaque fichier source a ses propres fichiers Parquet,
+    écrits directement par le processus qui le décode. Les fichiers inchangés
+    depuis le dernier export sont ignorés (sauf --force).
+    
+    Returns:
+        Liste de (nom du fichier, lignes écrites, durée en secondes, MB lus)
+    """
+    value_type = "FLOAT" if args.value_encoding == "float" else "DOUBLE"
+    print(f"\n🧊 Export Parquet zstd ({'/'.join(PARQUET_PARTITIONS)}) vers {root}, {max(args.workers, 1)} processus")
+    
+    def arguments(config):
+        return dict(
+            file_path=str(config["file_path"]), root=str(root), variable=config["variable"],
+            experiment=config["experiment"], gcm=config["gcm"], rcm=config["rcm"], member=config["member"],
+            value_type=value_type, force=args.force, **import_options(config, args)
+        )
+    
+    def report(name, stats):
+        if stats["skipped"]:
+            print(f"   ⏭️  {name}: inchangé depuis le dernier export, ignoré")
+        else:
+            print(f"   ✅ {name}: {stats['rows']:,} lignes en {stats['files']} fichier(s) Parquet")
+        results.append((name, stats["rows"], stats["elapsed_seconds"], stats["bytes_read"] / 1e6))
+    
+    results = []
+    if args.workers <= 1:
+        for config in datasets_config:
+            print(f"\n📥 Export de: {config['file_path'].name}")
+            try:
+                report(config["file_path"].name, write_netcdf_to_parquet(**arguments(config), verbose=True))
+            except Exception as e:
+                print(f"   ❌ Erreur: {e}")
+        return results
+    
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {
+            pool.submit(write_netcdf_to_parquet, **arguments(config), verbose=False): config["file_path"].name
+            for config in datasets_config
+        }
+        for future in as_completed(futures):
+            try:
+                report(futures[future], future.result())
+            except Exception as e:
+                print(f"   ❌ {futures[future]}: {type(e).__name__}: {e}")
+    return results
+
+
+def run_maintenance(loader: DuckDBClimateLoader):
+    """
+    Maintenance de la base (--maintain): ANALYZE, CHECKPOINT et compaction, puis
+    rapport de stockage par colonne et par row group (voir storage_report).
+    """
+    sizes = loader.maintain()
+    print("\n💽 Taille des fichiers (MB):")
+    print(sizes.to_string(index=False))
+    
+    report = loader.storage_report()
+    columns, row_groups = report["columns"], report["row_groups"]
+    if columns.empty:
+        print("\n📦 Base vide")
+        return
+    print("\n📦 Stockage par colonne:")
+    columns = columns.assign(mb=(columns["bytes"] / 1e6).round(3)).drop(columns="bytes")
+    print(columns.to_string(index=False))
+    
+    # Row groups partiels (moins de ROW_GROUP_SIZE lignes, hors dernier de chaque table) et
+    # segments modifiés en place: signes de fragmentation après des imports ON CONFLICT
+    print("\n🧱 Row groups par table:")
+    summary = row_groups.groupby(["database", "table_name"]).agg(
+        row_groups=("row_group_id", "count"),
+        rows=("rows", "sum"),
+        partial=("rows", lambda rows: max(int((rows < ROW_GROUP_SIZE).sum()) - 1, 0)),
+        with_updates=("has_updates", "sum"),
+        mb=("bytes", lambda sizes: round(sizes.sum() / 1e6, 3)),
+    ).reset_index()
+    print(summary.to_string(index=False))
+    if len(row_groups) <= 50:
+        print("\n🧱 Détail des row groups:")
+        print(row_groups.to_string(index=False))
+    else:
+        print("\n🧱 Row groups les plus petits:")
+        print(row_groups.nsmallest(10, "rows").to_string(index=False))
+
+
 def main():
+    args = parse_args()
+    
     # Configuration
     data_dir = Path(__file__).parent / "data"
     db_path = Path(__file__).parent / "data" / "climate_data.duckdb"
@@ -21,19 +533,48 @@ def main():
         print(f"❌ Répertoire de données non trouvé: {data_dir}")
         sys.exit(1)
     
-    # Créer le chargeur DuckDB avec gestion d'erreurs
+    parquet_root = parquet_directory(db_path)
+    if args.parquet and args.value_encoding not in (None, "double", "float"):
+        print("❌ --parquet: encodage des valeurs double ou float uniquement")
+        sys.exit(1)
+    if args.pipelined and args.workers > 1:
+        print("❌ --pipelined ne s'applique qu'à l'import séquentiel: avec --workers > 1, "
+              "les processus de décodage recouvrent déjà lecture et écriture")
+        sys.exit(1)
+    if args.parquet and args.maintain:
+        print("❌ --maintain ne s'applique pas à --parquet: fichiers Parquet immuables, réécrits par fichier source (--force)")
+        sys.exit(1)
+    
+    # Créer le chargeur DuckDB avec gestion d'erreurs (pas de base DuckDB avec --parquet)
     try:
-        loader = DuckDBClimateLoader(db_path=str(db_path), data_directory=str(data_dir))
+        loader = None if args.parquet else DuckDBClimateLoader(
+            db_path=str(db_path), data_directory=str(data_dir), read_only=False, normalized=args.normalized,
+            value_encoding=args.value_encoding, agronomic_units=args.agronomic_units,
+            partitioned=args.partitioned
+        )
     except IOError as e:
         print("❌ Erreur de connexion à la base de données:")
         print(f"   {e}")
         sys.exit(1)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Erreur inattendue: {e}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
     
+    if args.maintain:
+        try:
+            run_maintenance(loader)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        finally:
+            loader.close()
+        return
+    
     # Trouver les fichiers NetCDF
     nc_files = list(data_dir.glob("*.nc"))
     
@@ -127,56 +668,110 @@ def main():
     
     print(f"\n📊 {len(datasets_config)} fichier(s) configuré(s) pour l'import\n")
     
-    total_imported = 0
+    import_start = time.perf_counter()
+    if args.parquet:
+        results = export_parquet(datasets_config, args, parquet_root)
+    elif args.workers > 1:
+        results = import_parallel(loader, datasets_config, args)
+    else:
+        results = import_sequential(loader, datasets_config, args)
+    wall_seconds = time.perf_counter() - import_start
+    total_imported = sum(rows for _, rows, _, _ in results)
+    total_mb = sum(mb for _, _, _, mb in results)
     
-    for config in datasets_config:
-        file_path = config["file_path"]
-        print(f"\n📥 Importation de: {file_path.name}")
-        print(f"   Variable: {config['variable'].value}")
-        print(f"   Experiment: {config['experiment'].value}")
-        print(f"   GCM: {config['gcm']}, RCM: {config['rcm']}")
-        
-        try:
-            # Déterminer la période de filtrage selon le type de fichier
-            # Les fichiers tas* vont seulement jusqu'à 2019, donc utiliser toute la période disponible
-            if config["variable"] in [VariableType.TAS, VariableType.TASMAX, VariableType.TASMIN]:
-                # Pour les températures, utiliser toute la période disponible (2015-2019)
-                start_year = None  # Pas de filtre de début
-                end_year = None    # Pas de filtre de fin
-            else:
-                # Pour les précipitations, filtrer 2025-2100
-                start_year = 1990
-                end_year = 2100
-            
-            # Points représentatifs de la Beauce et de la Bretagne
-            # Utiliser la configuration centralisée
-            all_points_lat, all_points_lon = get_all_points(format="lat_lon")
-            
-            rows = loader.import_netcdf_file(
-                file_path=str(file_path),
-                variable=config["variable"],
-                experiment=config["experiment"],
-                gcm=config["gcm"],
-                rcm=config["rcm"],
-                member=config["member"],
-                # Filtrer pour les points représentatifs de la Beauce et de la Bretagne
-                lat_filter=all_points_lat,
-                lon_filter=all_points_lon,
-                start_year=start_year,
-                end_year=end_year
-            )
-            total_imported += rows
-            print(f"   ✅ {rows:,} lignes importées")
-        except Exception as e:
-            print(f"   ❌ Erreur: {e}")
-            import traceback
-            traceback.print_exc()
+    updated = {name for name, rows, _, _ in results if rows > 0}
+    if args.parquet:
+        # Tables dérivées et tri: propres à une base DuckDB
+        ignored = [flag for flag in ("optimize", "wide", "monthly", "cumulative_sums", "exceedance_bitmaps",
+                                     "dry_spells", "packed") if getattr(args, flag)]
+        if ignored:
+            print(f"\n⚠️  Ignoré avec --parquet: {', '.join('--' + flag.replace('_', '-') for flag in ignored)}")
+            for flag in ignored:
+                setattr(args, flag, False)
+        if not is_parquet_root(parquet_root):
+            print(f"\n❌ Aucun fichier Parquet écrit dans {parquet_root}")
+            sys.exit(1)
+        # Statistiques lues dans les fichiers Parquet
+        db_path = parquet_root
+        loader = DuckDBClimateLoader(db_path=str(parquet_root))
+    if args.optimize:
+        # Avant les tables dérivées: leur construction lit alors une table triée
+        print()
+        loader.optimize_layout()
+    
+    if args.wide and loader.layout == "partitioned":
+        print("\n⚠️  --wide ignoré: climate_wide réunit plusieurs variables, non disponible pour une base partitionnée")
+    elif args.wide:
+        # Fusionner les fichiers de chaque variable des simulations modifiées
+        simulations = sorted({
+            (config["experiment"].value, config["gcm"], config["rcm"], config["member"])
+            for config in datasets_config
+            if config["file_path"].name in updated and config["variable"] in WIDE_VARIABLES
+        })
+        if not loader.has_table("climate_wide"):
+            # Première construction: toutes les simulations déjà en base
+            simulations = None
+            print("\n🧱 Construction de la table large climate_wide...")
+        else:
+            print(f"\n🧱 Table large climate_wide: {len(simulations)} simulation(s) à reconstruire")
+        loader.build_wide_table(simulations)
+    
+    if args.monthly:
+        if loader.has_table("monthly_aggregates"):
+            # Mois importés déjà recalculés à la fin de chaque fichier (finish_import)
+            print("\n📅 Table monthly_aggregates à jour (mise à jour à chaque import)")
+        else:
+            print("\n📅 Construction de la table monthly_aggregates...")
+            loader.build_monthly_aggregates()
+    
+    if args.cumulative_sums:
+        if loader.has_cumulative_sums("pr"):
+            print("\n➕ Table cumulative_sums à jour (mise à jour à chaque import)")
+        else:
+            print("\n➕ Construction de la table cumulative_sums...")
+            loader.build_cumulative_sums()
+    
+    if args.exceedance_bitmaps:
+        if loader.has_table("exceedance_bitmaps"):
+            print("\n🚩 Table exceedance_bitmaps à jour (mise à jour à chaque import)")
+        else:
+            print("\n🚩 Construction de la table exceedance_bitmaps...")
+            loader.build_exceedance_bitmaps()
+    
+    if args.dry_spells:
+        if loader.has_table("dry_spells"):
+            print("\n🏜️  Table dry_spells à jour (mise à jour à chaque import)")
+        else:
+            print("\n🏜️  Construction de la table dry_spells...")
+            loader.build_dry_spells()
+    
+    if args.packed:
+        simulations = sorted({
+            (config["variable"].value, config["experiment"].value, config["gcm"], config["rcm"], config["member"])
+            for config in datasets_config
+            if config["file_path"].name in updated
+        })
+        if not loader.has_table("climate_series"):
+            simulations = None
+            print("\n📦 Construction de la table compacte climate_series...")
+        else:
+            print(f"\n📦 Table compacte climate_series: {len(simulations)} simulation(s) à reconstruire")
+        loader.build_series_table(simulations)
     
     print(f"\n🎉 Importation terminée: {total_imported:,} lignes au total")
     print(f"📊 Base de données: {db_path}")
     
+    # Débit de l'import: par fichier puis global
+    print("\n⏱️  Débit:")
+    for name, rows, seconds, mb in results:
+        print(f"   {name}: {rows:,} lignes en {seconds:.1f}s ({rows / max(seconds, 1e-9):,.0f} lignes/s, {mb:,.0f} MB lus)")
+    print(f"   Total: {total_imported:,} lignes en {wall_seconds:.1f}s "
+          f"({total_imported / max(wall_seconds, 1e-9):,.0f} lignes/s, {total_mb / max(wall_seconds, 1e-9):,.1f} MB/s lus, "
+          f"{len(results)}/{len(datasets_config)} fichiers, {max(args.workers, 1)} processus)")
+    
     # Afficher quelques statistiques
     print("\n📈 Statistiques:")
+    loader.route()
     stats = loader.conn.execute("""
         SELECT 
             variable,
@@ -193,6 +788,11 @@ def main():
     
     print(stats.to_string(index=False))
     
+    encoding_report = loader.encoding_report()
+    if not encoding_report.empty:
+        print(f"\n🎯 Précision de l'encodage des valeurs ({loader.value_encoding}):")
+        print(encoding_report.to_string(index=False))
+    
     # Fermer proprement la connexion
     try:
         loader.close()
@@ -1,12 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Tuple
 from datetime import date, datetime
 from pathlib import Path
+from functools import wraps
+import calendar
 import random
 import math
 import os
+import threading
 import pandas as pd
 
 from models import (
@@ -17,6 +21,8 @@ from datasets import (
     get_datasets_for_experiment, get_datasets_for_period
 )
 from points_config import get_all_points
+from units import MM_PER_DAY, CELSIUS
+from cursor_pool import PoolTimeout
 
 app = FastAPI(title="AgroClimaVisio API", version="1.0.0")
 
@@ -126,74 +132,113 @@ async def debug_db():
         if exists and debug_info["found_path"] is None:
             debug_info["found_path"] = str(path)
     
+    # Base partitionnée ou racine Parquet: partitions présentes et partitions lues par l'API
+    if _duckdb_loader is not None and _duckdb_loader.layout in ("partitioned", "parquet"):
+        debug_info["partitions"] = _duckdb_loader.get_partitions().to_dict(orient="records")
+    
+    # Pool de curseurs: saturation, attentes et délais dépassés
+    if _duckdb_loader is not None:
+        debug_info["cursor_pool"] = _duckdb_loader.pool.metrics()
+    
     return debug_info
 
 
 # Initialiser le chargeur DuckDB une seule fois au démarrage
 _duckdb_loader = None
 _duckdb_init_error = None
+_duckdb_init_lock = threading.Lock()
 
 def get_duckdb_loader():
     """Obtient ou crée le chargeur DuckDB"""
     global _duckdb_loader, _duckdb_init_error
-    if _duckdb_loader is None:
-        try:
-            from duckdb_loader import DuckDBClimateLoader
-            
-            # Liste des chemins possibles à vérifier (dans l'ordre de priorité)
-            possible_paths = []
-            
-            # 1. Variable d'environnement DUCKDB_PATH (Volume Railway)
-            if os.getenv("DUCKDB_PATH"):
-                possible_paths.append(Path(os.getenv("DUCKDB_PATH")) / "climate_data.duckdb")
-            
-            # 2. backend/data/ (développement local et Railway par défaut)
-            possible_paths.append(Path(__file__).parent / "data" / "climate_data.duckdb")
-            
-            # 3. Chemin absolu /app/backend/data/ (Railway)
-            possible_paths.append(Path("/app/backend/data/climate_data.duckdb"))
-            
-            # 4. Chemin relatif depuis le répertoire courant
-            possible_paths.append(Path("backend/data/climate_data.duckdb"))
-            possible_paths.append(Path("data/climate_data.duckdb"))
-            
-            # Chercher le premier chemin qui existe
-            db_path = None
-            for path in possible_paths:
-                if path.exists():
-                    db_path = path
+    # Endpoints exécutés en parallèle (threadpool): un seul chargeur créé
+    with _duckdb_init_lock:
+        if _duckdb_loader is None:
+            try:
+                from duckdb_loader import DuckDBClimateLoader, partition_directory
+                from parquet_store import parquet_directory, is_parquet_root
+                
+                # Liste des chemins possibles à vérifier (dans l'ordre de priorité)
+                possible_paths = []
+                
+                # 1. Variable d'environnement DUCKDB_PATH (Volume Railway)
+                if os.getenv("DUCKDB_PATH"):
+                    possible_paths.append(Path(os.getenv("DUCKDB_PATH")) / "climate_data.duckdb")
+                
+                # 2. backend/data/ (développement local et Railway par défaut)
+                possible_paths.append(Path(__file__).parent / "data" / "climate_data.duckdb")
+                
+                # 3. Chemin absolu /app/backend/data/ (Railway)
+                possible_paths.append(Path("/app/backend/data/climate_data.duckdb"))
+                
+                # 4. Chemin relatif depuis le répertoire courant
+                possible_paths.append(Path("backend/data/climate_data.duckdb"))
+                possible_paths.append(Path("data/climate_data.duckdb"))
+                
+                # Chercher le premier chemin qui existe (fichier unique, répertoire de partitions
+                # ou, à défaut, racine Parquet climate_data_parquet/ à côté du fichier)
+                db_path = None
+                for path in possible_paths:
+                    if path.exists() or partition_directory(path).exists():
+                        db_path = path
+                    elif is_parquet_root(parquet_directory(path)):
+                        db_path = parquet_directory(path)
+                    else:
+                        continue
                     print(f"✅ Base de données DuckDB trouvée: {db_path}")
                     break
-            
-            if db_path is None:
-                print("⚠️  Base de données DuckDB non trouvée. Chemins vérifiés:")
-                for path in possible_paths:
-                    print(f"   - {path} (existe: {path.exists()})")
-                print(f"   Répertoire courant: {os.getcwd()}")
-                print(f"   __file__ parent: {Path(__file__).parent}")
-                print(f"   DUCKDB_PATH env: {os.getenv('DUCKDB_PATH')}")
-            else:
-                try:
-                    print(f"🔄 Initialisation du loader DuckDB avec: {db_path}")
-                    _duckdb_loader = DuckDBClimateLoader(db_path=str(db_path))
-                    print("✅ Loader DuckDB initialisé avec succès")
-                    _duckdb_init_error = None  # Réinitialiser l'erreur en cas de succès
-                except Exception as loader_error:
-                    _duckdb_init_error = str(loader_error)
-                    print(f"❌ Erreur lors de l'initialisation du loader DuckDB: {loader_error}")
-                    import traceback
-                    traceback.print_exc()
-                    # Ne pas lever l'exception, on veut que l'API démarre même sans DB
-        except Exception as e:
-            _duckdb_init_error = str(e)
-            print(f"⚠️  Erreur lors de l'initialisation de DuckDB: {e}")
-            import traceback
-            traceback.print_exc()
-            # Ne pas lever l'exception ici, on veut que l'API démarre même sans DB
-            # Le loader sera None et les endpoints retourneront une erreur appropriée
+                
+                if db_path is None:
+                    print("⚠️  Base de données DuckDB non trouvée. Chemins vérifiés:")
+                    for path in possible_paths:
+                        print(f"   - {path} (existe: {path.exists()})")
+                    print(f"   Répertoire courant: {os.getcwd()}")
+                    print(f"   __file__ parent: {Path(__file__).parent}")
+                    print(f"   DUCKDB_PATH env: {os.getenv('DUCKDB_PATH')}")
+                else:
+                    try:
+                        print(f"🔄 Initialisation du loader DuckDB avec: {db_path}")
+                        _duckdb_loader = DuckDBClimateLoader(db_path=str(db_path))
+                        print("✅ Loader DuckDB initialisé avec succès")
+                        _duckdb_init_error = None  # Réinitialiser l'erreur en cas de succès
+                    except Exception as loader_error:
+                        _duckdb_init_error = str(loader_error)
+                        print(f"❌ Erreur lors de l'initialisation du loader DuckDB: {loader_error}")
+                        import traceback
+                        traceback.print_exc()
+                        # Ne pas lever l'exception, on veut que l'API démarre même sans DB
+            except Exception as e:
+                _duckdb_init_error = str(e)
+                print(f"⚠️  Erreur lors de l'initialisation de DuckDB: {e}")
+                import traceback
+                traceback.print_exc()
+                # Ne pas lever l'exception ici, on veut que l'API démarre même sans DB
+                # Le loader sera None et les endpoints retourneront une erreur appropriée
     return _duckdb_loader
 
 
+def with_duckdb_cursor(endpoint):
+    """
+    Exécute un endpoint avec un curseur DuckDB emprunté au pool du chargeur.
+    
+    Les endpoints DuckDB sont synchrones: FastAPI les exécute dans son threadpool
+    et chaque requête interroge la base par son propre curseur, les lectures
+    s'exécutant en parallèle. Pool saturé trop longtemps: réponse 503.
+    """
+    @wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        loader = get_duckdb_loader()
+        if loader is None:
+            return endpoint(*args, **kwargs)
+        try:
+            with loader.cursor():
+                return endpoint(*args, **kwargs)
+        except PoolTimeout as e:
+            print(f"⚠️  {e}")
+            return JSONResponse(status_code=503, content={"error": str(e)})
+    return wrapper
+
+
 class MonthlyChartRequest(BaseModel):
     """Requête pour obtenir les données climatiques mensuelles"""
     start_date: str  # Format: "YYYY-MM-DD"
@@ -223,13 +268,49 @@ class CornViabilityRequest(BaseModel):
     # Seuils configurables (seront appliqués côté frontend, mais on peut les prévoir ici pour documentation)
 
 
+class DrySpellsRequest(BaseModel):
+    """Requête pour la plus longue période sèche par année et par membre"""
+    city: str  # Ville pour laquelle calculer les périodes sèches
+    start_year: int = 1990
+    end_year: int = 2100
+    experiment: Optional[str] = "ssp370"
+    season_start: str = "04-01"  # Début de la saison (MM-JJ)
+    season_end: str = "09-30"  # Fin de la saison (MM-JJ), l'année suivante si avant le début
+    threshold: float = 0.1  # Seuil de précipitations d'un jour sec (mm/jour)
+    
+    @field_validator("season_start", "season_end")
+    @classmethod
+    def check_month_day(cls, value: str) -> str:
+        """Jour de l'année au format MM-JJ (02-29 accepté)"""
+        parts = value.split("-")
+        if len(parts) != 2 or not all(len(part) == 2 and part.isdigit() for part in parts):
+            raise ValueError(f"Date de saison invalide: {value} (format MM-JJ attendu)")
+        try:
+            date(2000, int(parts[0]), int(parts[1]))
+        except ValueError:
+            raise ValueError(f"Date de saison invalide: {value}") from None
+        return value
+    
+    def season(self, year: int) -> Tuple[date, date]:
+        """Premier et dernier jour de la saison commençant l'année year (29 février -> 28 hors années bissextiles)"""
+        def day(year, month_day):
+            month, day = (int(part) for part in month_day.split("-"))
+            if (month, day) == (2, 29) and not calendar.isleap(year):
+                day = 28
+            return date(year, month, day)
+        
+        crosses_year = self.season_end < self.season_start
+        return day(year, self.season_start), day(year + crosses_year, self.season_end)
+
+
 class SQLQueryRequest(BaseModel):
     """Requête SQL libre (développement uniquement)"""
     query: str  # Requête SQL à exécuter
 
 
 @app.post("/api/charts/monthly")
-async def get_monthly_chart_data(request: MonthlyChartRequest):
+@with_duckdb_cursor
+def get_monthly_chart_data(request: MonthlyChartRequest):
     """
     Récupère les données climatiques mensuelles pour les points représentatifs
     sur une période donnée.
@@ -297,68 +378,53 @@ async def get_monthly_chart_data(request: MonthlyChartRequest):
                 "points": []
             }
         
-        # Construire la requête SQL selon la variable
+        # Filtres communs (simulations et points), appliqués aux agrégats mensuels
+        # précalculés s'ils existent, sinon aux valeurs journalières
         # IMPORTANT: Grouper par gcm/rcm/member pour éviter le double comptage
         # Filtrer uniquement les données EMUL
-        if request.variable == 'pr':
-            # Précipitations: somme mensuelle (convertir kg/m²/s en mm)
-            aggregation = "SUM(value * 86400) as monthly_total"
-        else:  # tas
-            # Température: moyenne mensuelle (convertir Kelvin en Celsius)
-            # Les données sont stockées en Kelvin, on soustrait 273.15 pour obtenir °C
-            aggregation = "AVG(value - 273.15) as monthly_avg"
-        
-        query = f"""
-            SELECT 
-                lat,
-                lon,
-                gcm,
-                rcm,
-                member,
-                EXTRACT(YEAR FROM time) as year,
-                EXTRACT(MONTH FROM time) as month,
-                {aggregation},
-                COUNT(*) as days_count
-            FROM climate_data
-            WHERE variable = ?
-              AND experiment = ?
-              AND time >= ?
-              AND time <= ?
-              AND (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
-        """
-        
-        params = [request.variable, experiment.value, start_date, end_date]
+        filters = " AND (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')"
+        filter_params = []
         
         # Ajouter filtres GCM/RCM si spécifiés
         if request.gcm:
-            query += " AND gcm = ?"
-            params.append(request.gcm)
+            filters += " AND gcm = ?"
+            filter_params.append(request.gcm)
         
         if request.rcm:
-            query += " AND rcm = ?"
-            params.append(request.rcm)
+            filters += " AND rcm = ?"
+            filter_params.append(request.rcm)
         
         # Filtrer par membres d'ensemble si spécifiés
         if request.members and len(request.members) > 0:
             # Créer une liste de placeholders pour les membres
             member_placeholders = ','.join(['?' for _ in request.members])
-            query += f" AND member IN ({member_placeholders})"
-            params.extend(request.members)
+            filters += f" AND member IN ({member_placeholders})"
+            filter_params.extend(request.members)
         
         # Filtrer pour les points spécifiques (avec tolérance de 0.1 degré)
-        # Optimisation: utiliser une condition combinée pour meilleure performance
+        # Bornes explicites plutôt que ABS(lat - x) < 0.1: DuckDB peut alors ignorer
+        # les row groups dont les min/max de lat/lon sont hors de la boîte
         point_conditions = []
         for point in all_points:
-            point_conditions.append(f"(ABS(lat - {point['lat']}) < 0.1 AND ABS(lon - {point['lon']}) < 0.1)")
-        
-        query += f" AND ({' OR '.join(point_conditions)})"
+            point_conditions.append(
+                f"(lat > {point['lat'] - 0.1} AND lat < {point['lat'] + 0.1} "
+                f"AND lon > {point['lon'] - 0.1} AND lon < {point['lon'] + 0.1})"
+            )
         
-        query += """
-            GROUP BY lat, lon, gcm, rcm, member, year, month
-            ORDER BY lat, lon, gcm, rcm, member, year, month
-        """
+        filters += f" AND ({' OR '.join(point_conditions)})"
         
-        result_df = loader.conn.execute(query, params).df()
+        # Précipitations: somme mensuelle en mm; température: moyenne mensuelle en °C
+        # (conversion depuis l'unité de stockage de la table variable_units)
+        result_df = loader.get_monthly_values(
+            request.variable,
+            experiment.value,
+            start_date,
+            end_date,
+            aggregate="sum" if request.variable == 'pr' else "mean",
+            unit=MM_PER_DAY if request.variable == 'pr' else CELSIUS,
+            filters=filters,
+            filter_params=filter_params
+        )
         
         if result_df.empty:
             return {
@@ -398,13 +464,8 @@ async def get_monthly_chart_data(request: MonthlyChartRequest):
                     "data": []
                 }
             
-            # Récupérer la valeur selon la variable
-            if request.variable == 'pr':
-                # Précipitations: valeur déjà convertie en mm
-                value = float(row['monthly_total'])
-            else:  # tas
-                # Température: moyenne en °C
-                value = float(row['monthly_avg'])
+            # Valeur déjà convertie (mm pour pr, °C pour tas)
+            value = float(row['value'])
             
             data_by_point_gcm_rcm[unique_key]["data"].append({
                 "year": int(row['year']),
@@ -440,7 +501,8 @@ async def get_monthly_chart_data(request: MonthlyChartRequest):
 
 
 @app.post("/api/charts/cover-crop-feasibility")
-async def get_cover_crop_feasibility(request: CoverCropFeasibilityRequest):
+@with_duckdb_cursor
+def get_cover_crop_feasibility(request: CoverCropFeasibilityRequest):
     """
     Calcule le % de membres EMUL qui vérifient le critère de faisabilité des couverts végétaux :
     - Minimum des fenêtres glissantes de précipitations sur la période
@@ -481,16 +543,10 @@ async def get_cover_crop_feasibility(request: CoverCropFeasibilityRequest):
         }
         experiment = experiment_map.get(request.experiment.lower(), ExperimentType.SSP370)
         
-        # Récupérer tous les membres EMUL disponibles
-        members_df = loader.conn.execute("""
-            SELECT DISTINCT member
-            FROM climate_data
-            WHERE (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
-              AND experiment = ?
-            ORDER BY member
-        """, [experiment.value]).df()
-        
-        available_members = members_df['member'].tolist() if not members_df.empty else []
+        # Récupérer tous les membres EMUL disponibles (liste des simulations, sans lire les valeurs)
+        runs_df = loader.get_runs('pr', experiment.value)
+        emul_runs = runs_df[runs_df['rcm'].str.contains('EMUL', case=False) & (runs_df['experiment'] == experiment.value)]
+        available_members = sorted(emul_runs['member'].unique().tolist())
         
         if not available_members:
             return {
@@ -501,76 +557,53 @@ async def get_cover_crop_feasibility(request: CoverCropFeasibilityRequest):
         
         years = list(range(request.start_year, request.end_year + 1))
         
-        # Pour chaque année, calculer le minimum des fenêtres glissantes pour chaque membre et chaque taille de fenêtre
+        # Minimum des fenêtres glissantes pour chaque année, membre et taille de fenêtre
+        # (période : 15 août au 15 octobre), toutes les années en une requête : les sommes
+        # glissantes et leur index de minimum sont construits une fois par taille de fenêtre.
+        # Précipitations en mm, moyenne jour par jour des cellules de la zone.
+        window_queries = [
+            (window_size, date(year, 8, 15), date(year, 10, 15))
+            for year in years
+            for window_size in window_sizes
+        ]
+        window_df = loader.get_rolling_minima(
+            'pr',
+            experiment.value,
+            window_queries,
+            unit=MM_PER_DAY,
+            filters="""
+                AND (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
+                AND lat > ? AND lat < ?
+                AND lon > ? AND lon < ?
+            """,
+            filter_params=[point['lat'] - 0.1, point['lat'] + 0.1, point['lon'] - 0.1, point['lon'] + 0.1],
+            mean_cells=True
+        )
+        window_minima = window_df.groupby(['query', 'member'])['value'].min()
+        window_days = window_df.groupby('query')['days_count'].sum()
+        
         yearly_data = {}
         
-        for year in years:
-            # Période : 15 août au 15 octobre
-            start_date = date(year, 8, 15)
-            end_date = date(year, 10, 15)
+        for year_index, year in enumerate(years):
+            first_query = year_index * len(window_sizes)
             
-            # Récupérer les données quotidiennes pour tous les membres
-            query = """
-                SELECT 
-                    member,
-                    time,
-                    SUM(value * 86400) as daily_pr_mm  -- Convertir kg/m²/s en mm
-                FROM climate_data
-                WHERE variable = 'pr'
-                  AND experiment = ?
-                  AND time >= ?
-                  AND time <= ?
-                  AND (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
-                  AND ABS(lat - ?) < 0.1
-                  AND ABS(lon - ?) < 0.1
-                GROUP BY member, time, lat, lon
-                ORDER BY member, time
-            """
-            
-            result_df = loader.conn.execute(
-                query,
-                [experiment.value, start_date, end_date, point['lat'], point['lon']]
-            ).df()
-            
-            if result_df.empty:
+            if window_days.get(first_query, 0) == 0:
                 yearly_data[year] = {
                     "member_minima": {}
                 }
                 continue
             
-            # Pour chaque taille de fenêtre, calculer le minimum pour chaque membre
+            # Pour chaque taille de fenêtre, le minimum pour chaque membre
+            # (None si pas de données ou pas de fenêtre complète dans la période)
             member_minima_by_window = {}
             
-            for window_size in window_sizes:
+            for window_index, window_size in enumerate(window_sizes):
                 member_minima = {}
                 
                 for member in available_members:
-                    member_data = result_df[result_df['member'] == member].copy()
-                    
-                    if member_data.empty:
-                        member_minima[member] = None
-                        continue
-                    
-                    # Convertir en datetime si nécessaire
-                    if 'time' in member_data.columns:
-                        member_data['time'] = pd.to_datetime(member_data['time'])
-                        member_data = member_data.sort_values('time')
-                    
-                    # Calculer le minimum des fenêtres glissantes
-                    daily_pr = member_data['daily_pr_mm'].values
-                    
-                    if len(daily_pr) < window_size:
-                        member_minima[member] = None
-                        continue
-                    
-                    # Fenêtres glissantes
-                    window_sums = []
-                    for i in range(len(daily_pr) - window_size + 1):
-                        window_sum = sum(daily_pr[i:i+window_size])
-                        window_sums.append(window_sum)
-                    
-                    if window_sums:
-                        member_minima[member] = round(min(window_sums), 2)
+                    minimum = window_minima.get((first_query + window_index, member))
+                    if minimum is not None and not pd.isna(minimum):
+                        member_minima[member] = round(float(minimum), 2)
                     else:
                         member_minima[member] = None
                 
@@ -601,7 +634,8 @@ async def get_cover_crop_feasibility(request: CoverCropFeasibilityRequest):
 
 
 @app.post("/api/charts/corn-viability")
-async def get_corn_viability(request: CornViabilityRequest):
+@with_duckdb_cursor
+def get_corn_viability(request: CornViabilityRequest):
     """
     Calcule le % de membres EMUL qui vérifient les critères de viabilité du maïs :
     - Semis : cumul minimum sur mars-avril
@@ -641,16 +675,10 @@ async def get_corn_viability(request: CornViabilityRequest):
         }
         experiment = experiment_map.get(request.experiment.lower(), ExperimentType.SSP370)
         
-        # Récupérer tous les membres EMUL disponibles
-        members_df = loader.conn.execute("""
-            SELECT DISTINCT member
-            FROM climate_data
-            WHERE (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
-              AND experiment = ?
-            ORDER BY member
-        """, [experiment.value]).df()
-        
-        available_members = members_df['member'].tolist() if not members_df.empty else []
+        # Récupérer tous les membres EMUL disponibles (liste des simulations, sans lire les valeurs)
+        runs_df = loader.get_runs('pr', experiment.value)
+        emul_runs = runs_df[runs_df['rcm'].str.contains('EMUL', case=False) & (runs_df['experiment'] == experiment.value)]
+        available_members = sorted(emul_runs['member'].unique().tolist())
         
         if not available_members:
             return {
@@ -662,49 +690,61 @@ async def get_corn_viability(request: CornViabilityRequest):
         years = list(range(request.start_year, request.end_year + 1))
         yearly_data = {}
         
+        # Zone autour du point, membres EMUL: moyenne des cellules jour par jour
+        zone_filters = """
+            AND (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
+            AND lat > ? AND lat < ?
+            AND lon > ? AND lon < ?
+        """
+        zone_params = [point['lat'] - 0.1, point['lat'] + 0.1, point['lon'] - 0.1, point['lon'] + 0.1]
+        
+        # Semis : cumuls de mars-avril de toutes les années en une seule requête
+        # (différences de cumuls si la table cumulative_sums existe)
+        sowing_df = loader.get_period_totals(
+            'pr',
+            experiment.value,
+            [(date(year, 3, 1), date(year, 4, 30)) for year in years],
+            unit=MM_PER_DAY,
+            filters=zone_filters,
+            filter_params=zone_params
+        )
+        # Moyenne des cellules de la zone, par année et par membre
+        sowing_by_year = sowing_df.groupby(['period', 'member'])['value'].mean()
+        
+        # Croissance (mi-mai à fin août, fenêtres de 60 et 30 jours) et récolte (mi-octobre
+        # à mi-décembre, fenêtres de 15 jours) : minima des sommes glissantes de toutes les
+        # années, répondus par l'index de minimum sans reparcourir les fenêtres
+        window_queries = []
         for year in years:
-            # Périodes pour chaque critère
-            # Semis : mars-avril
-            sowing_start = date(year, 3, 1)
-            sowing_end = date(year, 4, 30)
-            
-            # Croissance : mi-mai à fin août
-            growth_start = date(year, 5, 15)
-            growth_end = date(year, 8, 31)
-            
-            # Récolte : mi-octobre à mi-décembre
-            harvest_start = date(year, 10, 15)
-            harvest_end = date(year, 12, 15)
-            
-            # Récupérer toutes les données nécessaires pour cette année
-            # IMPORTANT: Grouper uniquement par member, time pour agréger toutes les cellules de grille
-            query = """
-                SELECT 
-                    member,
-                    time,
-                    SUM(value * 86400) as daily_pr_mm
-                FROM climate_data
-                WHERE variable = 'pr'
-                  AND experiment = ?
-                  AND time >= ?
-                  AND time <= ?
-                  AND (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
-                  AND ABS(lat - ?) < 0.1
-                  AND ABS(lon - ?) < 0.1
-                GROUP BY member, time
-                ORDER BY member, time
-            """
-            
-            # Utiliser la période la plus large pour récupérer toutes les données d'un coup
-            all_period_start = sowing_start
-            all_period_end = harvest_end
-            
-            result_df = loader.conn.execute(
-                query,
-                [experiment.value, all_period_start, all_period_end, point['lat'], point['lon']]
-            ).df()
+            window_queries += [
+                (60, date(year, 5, 15), date(year, 8, 31)),
+                (30, date(year, 5, 15), date(year, 8, 31)),
+                (15, date(year, 10, 15), date(year, 12, 15)),
+            ]
+        window_df = loader.get_rolling_minima(
+            'pr',
+            experiment.value,
+            window_queries,
+            unit=MM_PER_DAY,
+            filters=zone_filters,
+            filter_params=zone_params,
+            mean_cells=True
+        )
+        window_minima = window_df.groupby(['query', 'member'])['value'].min()
+        window_days = window_df.groupby('query')['days_count'].sum()
+        
+        def rounded(value):
+            return round(float(value), 2) if value is not None and not pd.isna(value) else None
+        
+        for year_index, year in enumerate(years):
+            growth_query, harvest_query = 3 * year_index, 3 * year_index + 2
             
-            if result_df.empty:
+            has_data = (
+                sowing_df['period'].eq(year_index).any()
+                or window_days.get(growth_query, 0) > 0
+                or window_days.get(harvest_query, 0) > 0
+            )
+            if not has_data:
                 yearly_data[year] = {
                     "sowing_totals": {},
                     "growth_minima_60d": {},
@@ -713,83 +753,21 @@ async def get_corn_viability(request: CornViabilityRequest):
                 }
                 continue
             
-            # Pour chaque membre, calculer les indicateurs
+            # Pour chaque membre, les indicateurs (None si pas de données ou de fenêtre complète)
             sowing_totals = {}
             growth_minima_60d = {}
             growth_minima_30d = {}
             harvest_minima_15d = {}
             
             for member in available_members:
-                member_data = result_df[result_df['member'] == member].copy()
-                
-                if member_data.empty:
-                    sowing_totals[member] = None
-                    growth_minima_60d[member] = None
-                    growth_minima_30d[member] = None
-                    harvest_minima_15d[member] = None
-                    continue
-                
-                # Convertir en datetime si nécessaire
-                if 'time' in member_data.columns:
-                    member_data['time'] = pd.to_datetime(member_data['time'])
-                    member_data = member_data.sort_values('time')
-                
-                daily_pr = member_data['daily_pr_mm'].values
-                dates = pd.to_datetime(member_data['time'].values)
-                
                 # 1. Semis : cumul sur mars-avril
-                sowing_mask = (dates >= pd.Timestamp(sowing_start)) & (dates <= pd.Timestamp(sowing_end))
-                sowing_pr = daily_pr[sowing_mask]
-                if len(sowing_pr) > 0:
-                    sowing_totals[member] = round(sum(sowing_pr), 2)
-                else:
-                    sowing_totals[member] = None
-                
+                sowing_totals[member] = rounded(sowing_by_year.get((year_index, member)))
                 # 2. Croissance courbe 1 : minimum des fenêtres glissantes de 60 jours
-                growth_mask = (dates >= pd.Timestamp(growth_start)) & (dates <= pd.Timestamp(growth_end))
-                growth_pr = daily_pr[growth_mask]
-                if len(growth_pr) >= 60:
-                    window_size = 60
-                    window_sums = []
-                    for i in range(len(growth_pr) - window_size + 1):
-                        window_sum = sum(growth_pr[i:i+window_size])
-                        window_sums.append(window_sum)
-                    if window_sums:
-                        growth_minima_60d[member] = round(min(window_sums), 2)
-                    else:
-                        growth_minima_60d[member] = None
-                else:
-                    growth_minima_60d[member] = None
-                
+                growth_minima_60d[member] = rounded(window_minima.get((growth_query, member)))
                 # 3. Croissance courbe 2 : minimum des fenêtres glissantes de 30 jours
-                if len(growth_pr) >= 30:
-                    window_size = 30
-                    window_sums = []
-                    for i in range(len(growth_pr) - window_size + 1):
-                        window_sum = sum(growth_pr[i:i+window_size])
-                        window_sums.append(window_sum)
-                    if window_sums:
-                        growth_minima_30d[member] = round(min(window_sums), 2)
-                    else:
-                        growth_minima_30d[member] = None
-                else:
-                    growth_minima_30d[member] = None
-                
+                growth_minima_30d[member] = rounded(window_minima.get((growth_query + 1, member)))
                 # 4. Récolte : minimum des fenêtres glissantes de 15 jours (on veut le min pour vérifier qu'au moins une fenêtre <= seuil)
-                harvest_mask = (dates >= pd.Timestamp(harvest_start)) & (dates <= pd.Timestamp(harvest_end))
-                harvest_pr = daily_pr[harvest_mask]
-                if len(harvest_pr) >= 15:
-                    window_size = 15
-                    window_sums = []
-                    for i in range(len(harvest_pr) - window_size + 1):
-                        window_sum = sum(harvest_pr[i:i+window_size])
-                        window_sums.append(window_sum)
-                    if window_sums:
-                        harvest_minima_15d[member] = round(min(window_sums), 2)
-                    else:
-                        harvest_minima_15d[member] = None
-                else:
-                    harvest_minima_15d[member] = None
+                harvest_minima_15d[member] = rounded(window_minima.get((harvest_query, member)))
             
             yearly_data[year] = {
                 "sowing_totals": sowing_totals,
@@ -817,8 +795,133 @@ async def get_corn_viability(request: CornViabilityRequest):
         }
 
 
+@app.post("/api/charts/dry-spells")
+@with_duckdb_cursor
+def get_dry_spells(request: DrySpellsRequest):
+    """
+    Plus longue période sèche (jours consécutifs sous le seuil de précipitations)
+    de la saison, pour chaque année et chaque membre EMUL, sur les cellules de la ville.
+    
+    Les périodes sèches à cheval sur le début ou la fin de la saison sont coupées
+    à la saison. Lues dans la table dry_spells si elle existe (--dry-spells).
+    """
+    loader = get_duckdb_loader()
+    if loader is None:
+        return {
+            "error": "Base de données DuckDB non disponible",
+            "years": [],
+            "yearly_data": {}
+        }
+    
+    try:
+        from models import ExperimentType
+        from points_config import get_point_by_name
+        
+        # Récupérer le point géographique
+        try:
+            point = get_point_by_name(request.city)
+        except ValueError:
+            return {
+                "error": f"Ville non trouvée: {request.city}",
+                "years": [],
+                "yearly_data": {}
+            }
+        
+        # Convertir l'expérience
+        experiment_map = {
+            "historical": ExperimentType.HISTORICAL,
+            "ssp370": ExperimentType.SSP370,
+            "ssp585": ExperimentType.SSP585,
+            "ssp245": ExperimentType.SSP245,
+            "ssp126": ExperimentType.SSP126,
+        }
+        experiment = experiment_map.get(request.experiment.lower(), ExperimentType.SSP370)
+        
+        # Récupérer tous les membres EMUL disponibles (liste des simulations, sans lire les valeurs)
+        runs_df = loader.get_runs('pr', experiment.value)
+        emul_runs = runs_df[runs_df['rcm'].str.contains('EMUL', case=False) & (runs_df['experiment'] == experiment.value)]
+        available_members = sorted(emul_runs['member'].unique().tolist())
+        
+        if not available_members:
+            return {
+                "error": "Aucun membre EMUL trouvé",
+                "years": [],
+                "yearly_data": {}
+            }
+        
+        years = list(range(request.start_year, request.end_year + 1))
+        
+        # Saisons de toutes les années en une requête
+        periods = [request.season(year) for year in years]
+        zone_filters = """
+            AND (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
+            AND lat > ? AND lat < ?
+            AND lon > ? AND lon < ?
+        """
+        zone_params = [point['lat'] - 0.1, point['lat'] + 0.1, point['lon'] - 0.1, point['lon'] + 0.1]
+        spells_df = loader.get_longest_dry_spells(
+            experiment.value,
+            periods,
+            threshold=request.threshold,
+            filters=zone_filters,
+            filter_params=zone_params
+        )
+        # Plus longue période sèche parmi les cellules de la zone
+        longest_spells = spells_df.groupby(['period', 'member'])['longest_spell'].max()
+        
+        # Jours avec données par saison et par membre: une saison avec données
+        # mais sans jour sec a une plus longue période sèche de 0 jour
+        totals_df = loader.get_period_totals(
+            'pr',
+            experiment.value,
+            periods,
+            filters=zone_filters,
+            filter_params=zone_params
+        )
+        days_with_data = totals_df.groupby(['period', 'member'])['days_count'].sum()
+        periods_with_data = set(days_with_data[days_with_data > 0].index.get_level_values('period'))
+        
+        yearly_data = {}
+        for period_index, year in enumerate(years):
+            # Aucune donnée dans la zone pour cette saison
+            if period_index not in periods_with_data:
+                yearly_data[year] = {
+                    "member_longest_spells": {}
+                }
+                continue
+            
+            # Pour chaque membre, la plus longue période sèche (None si pas de données)
+            yearly_data[year] = {
+                "member_longest_spells": {
+                    member: int(longest_spells.get((period_index, member), 0))
+                    if days_with_data.get((period_index, member), 0) > 0 else None
+                    for member in available_members
+                }
+            }
+        
+        return {
+            "city": request.city,
+            "criterion": f"Plus longue période sèche (< {request.threshold} mm/jour, "
+                         f"{request.season_start} au {request.season_end})",
+            "years": years,
+            "yearly_data": yearly_data,
+            "total_members": len(available_members),
+            "members": available_members
+        }
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return {
+            "error": str(e),
+            "years": [],
+            "yearly_data": {}
+        }
+
+
 @app.post("/api/dev/sql")
-async def execute_sql_query(request: SQLQueryRequest):
+@with_duckdb_cursor
+def execute_sql_query(request: SQLQueryRequest):
     """
     Endpoint de développement pour exécuter des requêtes SQL directement.
     
@@ -864,6 +967,8 @@ async def execute_sql_query(request: SQLQueryRequest):
         }
     
     try:
+        # Base partitionnée: vues sur toutes les partitions
+        loader.route()
         # Exécuter la requête
         result_df = loader.conn.execute(query).df()
         
@@ -907,7 +1012,8 @@ async def execute_sql_query(request: SQLQueryRequest):
 
 
 @app.get("/api/charts/options")
-async def get_charts_options():
+@with_duckdb_cursor
+def get_charts_options():
     """
     Retourne les options disponibles pour les filtres (villes et membres d'ensemble).
     """
@@ -926,14 +1032,9 @@ async def get_charts_options():
         
         # Récupérer les membres d'ensemble disponibles depuis la base de données
         # (pour toutes les variables, pas seulement pr)
-        members_df = loader.conn.execute("""
-            SELECT DISTINCT member
-            FROM climate_data
-            WHERE (rcm LIKE '%EMUL%' OR rcm LIKE '%emul%' OR rcm = 'CNRM-ALADIN63-EMUL')
-            ORDER BY member
-        """).df()
-        
-        members = members_df['member'].tolist() if not members_df.empty else []
+        runs_df = loader.get_runs()
+        emul_runs = runs_df[runs_df['rcm'].str.contains('EMUL', case=False)]
+        members = sorted(emul_runs['member'].unique().tolist())
         
         return {
             "cities": cities,
@@ -0,0 +1,722 @@
+"""
+Lecture des fichiers NetCDF Météo-France par blocs colonnaires
+Utilisé par l'import DuckDB (séquentiel ou depuis des processus parallèles)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Iterator
+from datetime import date
+import hashlib
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+import netCDF4 as nc
+NETCDF4_AVAILABLE = True
+
+from models import VariableType
+from grid_index import GridIndex
+from time_axis import load_time_axis
+
+logger = logging.getLogger(__name__)
+
+# Étages de l'import en pipeline (voir NetCDFBatchReader.iter_batches_pipelined)
+PIPELINE_STAGES = ("reader", "converter", "writer")
+_END_OF_STREAM = object()
+
+
+# Noms possibles de chaque variable dans les fichiers NetCDF
+NETCDF_VARIABLE_NAMES = {
+    VariableType.PR: ["prAdjust", "prAdjusted", "pr"],
+    VariableType.TAS: ["tasAdjust", "tasAdjusted", "tas"],
+    VariableType.TASMAX: ["tasmaxAdjust", "tasmaxAdjusted", "tasmax"],
+    VariableType.TASMIN: ["tasminAdjust", "tasminAdjusted", "tasmin"],
+    VariableType.RSDS: ["rsdsAdjust", "rsdsAdjusted", "rsds"],
+    VariableType.RLDS: ["rldsAdjust", "rldsAdjusted", "rlds"],
+    VariableType.HUSS: ["hussAdjust", "hussAdjusted", "huss"],
+    VariableType.SFCWIND: ["sfcWindAdjust", "sfcWindAdjusted", "sfcWind"]
+}
+
+
+def time_block_size(source_var, max_block_mb: float, n_cells: Optional[int] = None) -> Tuple[int, Optional[int]]:
+    """
+    Calcule le nombre de pas de temps par bloc de lecture pour un budget mémoire.
+    
+    Le bloc est arrondi à un multiple de la taille de chunk temporel du fichier
+    (quand le budget le permet) pour ne jamais décompresser deux fois un chunk.
+    
+    Args:
+        source_var: Variable netCDF4 ou DataArray xarray de shape (time, lat, lon)
+        max_block_mb: Budget mémoire d'un bloc en MB (valeurs converties en float64)
+        n_cells: Nombre de cellules lues par pas de temps (toute la grille si None)
+    
+    Returns:
+        Tuple (pas de temps par bloc, taille du chunk temporel ou None si contigu)
+    """
+    if n_cells is None:
+        n_cells = int(np.prod(source_var.shape[1:]))
+    step_bytes = n_cells * np.dtype(np.float64).itemsize
+    block_t = max(1, int(max_block_mb * 1e6 // step_bytes))
+    
+    # Chunking sur disque: netCDF4 -> chunking(), xarray -> encoding['chunksizes']
+    chunk_t = None
+    if hasattr(source_var, 'chunking'):
+        chunking = source_var.chunking()
+        if chunking != 'contiguous':
+            chunk_t = int(chunking[0])
+    elif getattr(source_var, 'encoding', {}).get('chunksizes'):
+        chunk_t = int(source_var.encoding['chunksizes'][0])
+    
+    if chunk_t and block_t >= chunk_t:
+        block_t = (block_t // chunk_t) * chunk_t
+    return block_t, chunk_t
+
+
+def iter_time_blocks(t_start: int, t_stop: int, block_t: int):
+    """
+    Découpe la plage [t_start, t_stop) en blocs dont les bornes sont des multiples
+    de block_t (et donc alignées sur le chunking si block_t en est un multiple).
+    
+    Yields:
+        Tuples (t0, t1) avec t1 exclu
+    """
+    t0 = t_start
+    while t0 < t_stop:
+        t1 = min((t0 // block_t + 1) * block_t, t_stop)
+        yield t0, t1
+        t0 = t1
+
+
+def read_point_series(
+    source_var,
+    t_start: int,
+    t_stop: int,
+    lat_idx: np.ndarray,
+    lon_idx: np.ndarray,
+    mode: str = "auto"
+) -> np.ndarray:
+    """
+    Lit les séries temporelles [t_start, t_stop) d'un ensemble de cellules.
+    
+    Deux stratégies de lecture (hyperslabs temps-majeur):
+    - "series": un appel source_var[t_start:t_stop, i, j] par cellule
+    - "bbox": un seul bloc source_var[t_start:t_stop, i0:i1, j0:j1] englobant les cellules
+    - "auto": "bbox" si le bloc englobant contient au plus 4 fois plus de cellules
+      que demandé (points groupés), sinon "series"
+    
+    Args:
+        source_var: Variable netCDF4 ou DataArray xarray indexable en [time, lat, lon]
+        t_start: Premier indice temporel (inclus)
+        t_stop: Dernier indice temporel (exclu)
+        lat_idx: Indices de ligne des cellules
+        lon_idx: Indices de colonne des cellules
+        mode: "auto", "series" ou "bbox"
+    
+    Returns:
+        Tableau float64 de shape (t_stop - t_start, n_cellules), NaN pour les valeurs masquées
+    """
+    if mode not in ("auto", "series", "bbox"):
+        raise ValueError(f"Mode de lecture non supporté: {mode}")
+    
+    i0, i1 = int(lat_idx.min()), int(lat_idx.max()) + 1
+    j0, j1 = int(lon_idx.min()), int(lon_idx.max()) + 1
+    if mode == "auto":
+        bbox_cells = (i1 - i0) * (j1 - j0)
+        mode = "bbox" if bbox_cells <= 4 * len(lat_idx) else "series"
+    
+    if mode == "bbox":
+        block = np.ma.filled(np.ma.asarray(source_var[t_start:t_stop, i0:i1, j0:j1], dtype=np.float64), np.nan)
+        return block[:, lat_idx - i0, lon_idx - j0]
+    
+    series = np.empty((t_stop - t_start, len(lat_idx)), dtype=np.float64)
+    for k, (i, j) in enumerate(zip(lat_idx, lon_idx)):
+        series[:, k] = np.ma.filled(np.ma.asarray(source_var[t_start:t_stop, int(i), int(j)], dtype=np.float64), np.nan)
+    return series
+
+
+def file_fingerprint(file_path: str, chunk_bytes: int = 8 << 20) -> str:
+    """
+    Empreinte du contenu complet d'un fichier NetCDF (sha256, lu par blocs de chunk_bytes).
+    
+    Calculée seulement quand la taille ou le mtime ont changé depuis le dernier
+    import (voir DuckDBClimateLoader.plan_import): toute modification des données,
+    même hors en-tête, change l'empreinte.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def selection_key(
+    lat_filter=None,
+    lon_filter=None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None
+) -> str:
+    """
+    Identifiant lisible de la sélection importée (points et années).
+    
+    Exemples: "grid|1990-2100", "points:3f2a9c1b|*-*"
+    """
+    if lat_filter is None or lon_filter is None:
+        cells = "grid"
+    else:
+        if not isinstance(lat_filter, (list, tuple)):
+            lat_filter, lon_filter = [lat_filter], [lon_filter]
+        points = ";".join(f"{lat:.5f},{lon:.5f}" for lat, lon in zip(lat_filter, lon_filter))
+        cells = f"points:{hashlib.sha1(points.encode()).hexdigest()[:8]}"
+    return f"{cells}|{start_year or '*'}-{end_year or '*'}"
+
+
+class NetCDFBatchReader:
+    """
+    Lit un fichier NetCDF par blocs de pas de temps et les convertit en batchs
+    colonnaires (lat, lon, time, value) prêts à être insérés dans DuckDB.
+    
+    Le lecteur ne dépend pas de DuckDB: il peut être utilisé dans un processus
+    de décodage séparé, les batchs étant ensuite écrits par un seul writer.
+    
+    Les trois étapes sont exposées séparément:
+    - iter_blocks(): lecture des blocs (time × cellules) depuis le fichier
+    - block_to_columns(): conversion d'un bloc en colonnes, NaN éliminés par masque
+    - iter_batches(): regroupement des colonnes en DataFrames d'environ chunk_size lignes
+    """
+    
+    def __init__(
+        self,
+        file_path: str,
+        variable: VariableType,
+        lat_filter: Optional[float] = None,
+        lon_filter: Optional[float] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        chunk_size: int = 500_000,
+        point_read_mode: str = "auto",
+        max_block_mb: float = 256,
+        cache_dir: Optional[str] = None,
+        verbose: bool = True
+    ):
+        """
+        Ouvre le fichier NetCDF et prépare la sélection temporelle et spatiale.
+        
+        Args:
+            file_path: Chemin vers le fichier NetCDF
+            variable: Variable climatique
+            lat_filter: Latitude(s) des points à extraire (toute la grille si None)
+            lon_filter: Longitude(s) des points à extraire (toute la grille si None)
+            start_year: Première année à importer
+            end_year: Dernière année à importer
+            chunk_size: Nombre de lignes (approximatif) par batch
+            point_read_mode: Stratégie de lecture des points (voir read_point_series)
+            max_block_mb: Budget mémoire (MB) d'un bloc de pas de temps
+            cache_dir: Répertoire du cache disque (index de grille, axes temporels)
+            verbose: Afficher la progression (désactivé dans les processus de décodage)
+        """
+        self.file_path = Path(file_path)
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"Fichier non trouvé: {self.file_path}")
+        
+        self.variable = variable
+        self.chunk_size = chunk_size
+        self.point_read_mode = point_read_mode
+        self.max_block_mb = max_block_mb
+        self.cache_dir = cache_dir
+        self.verbose = verbose
+        self.stats: Dict[str, float] = {
+            "rows": 0,
+            "bytes_read": 0,
+            "read_seconds": 0.0,
+        }
+        
+        self._log(f"   📂 Ouverture du fichier NetCDF avec netCDF4 (accès direct aux slices)...")
+        
+        # Utiliser netCDF4 directement pour un accès plus efficace aux slices
+        # Cela évite l'overhead de xarray et permet un accès direct optimisé
+        self.nc_file = None
+        self.ds = None
+        if NETCDF4_AVAILABLE:
+            self.nc_file = nc.Dataset(self.file_path, 'r')
+            self._log(f"   ✅ Fichier ouvert avec netCDF4")
+        else:
+            # Fallback sur xarray si netCDF4 n'est pas disponible
+            self.ds = xr.open_dataset(self.file_path, decode_times=False)
+            self._log(f"   ✅ Fichier ouvert avec xarray")
+        
+        try:
+            self._read_metadata()
+            self._select_times(start_year, end_year)
+            self._select_cells(lat_filter, lon_filter)
+        except Exception:
+            self.close()
+            raise
+    
+    def _log(self, message: str):
+        """Affiche un message de progression si verbose"""
+        if self.verbose:
+            print(message)
+    
+    def _read_metadata(self):
+        """Trouve la variable et lit les coordonnées (temps, lat, lon)"""
+        candidates = NETCDF_VARIABLE_NAMES.get(self.variable, [self.variable.value])
+        
+        if self.nc_file is not None:
+            var_name = next((name for name in candidates if name in self.nc_file.variables), None)
+            if not var_name:
+                raise ValueError(f"Variable {self.variable.value} non trouvée dans {self.file_path}")
+            
+            self._log(f"   🔍 Variable trouvée: {var_name}")
+            self.source_var = self.nc_file.variables[var_name]
+            nc_time = self.nc_file.variables['time']
+            
+            # Obtenir les dimensions directement depuis netCDF4
+            self._log(f"   📊 Lecture des dimensions...")
+            lat_coords_raw = self.nc_file.variables['lat'][:]
+            lon_coords_raw = self.nc_file.variables['lon'][:]
+            
+            # Valeurs brutes (ex: jours depuis 1850-01-01), lues seulement si l'axe n'est pas en cache
+            def read_time():
+                return nc_time[:], nc_time.units, getattr(nc_time, 'calendar', 'standard')
+        else:
+            # Fallback sur xarray
+            var_name = next((name for name in candidates if name in self.ds.data_vars), None)
+            if not var_name:
+                raise ValueError(f"Variable {self.variable.value} non trouvée dans {self.file_path}")
+            
+            self._log(f"   🔍 Variable trouvée: {var_name}")
+            self.source_var = self.ds[var_name]
+            
+            if 'lat' not in self.source_var.coords or 'lon' not in self.source_var.coords:
+                raise ValueError("Coordonnées 'lat' et 'lon' non trouvées dans le dataset")
+            
+            self._log(f"   📊 Lecture des dimensions...")
+            lat_coords_raw = self.source_var.coords['lat'].values
+            lon_coords_raw = self.source_var.coords['lon'].values
+            
+            # Le dataset est ouvert avec decode_times=False: valeurs brutes et attributs CF
+            def read_time():
+                ds_time = self.ds['time']
+                return ds_time.values, ds_time.attrs['units'], ds_time.attrs.get('calendar', 'standard')
+        
+        self.var_name = var_name
+        # Axe temporel décodé en datetime64[D] (vectorisé, en cache par signature de fichier)
+        self.time_axis = load_time_axis(self.file_path, read_time=read_time, cache_dir=self.cache_dir)
+        self.time_values = self.time_axis.dates
+        # Dates Python pour l'affichage et import_manifest (None si la date n'existe pas)
+        self.time_coords = self.time_values.astype(object)
+        self.n_times = len(self.time_axis)
+        self._log(f"   📅 Calendrier: {self.time_axis.calendar}")
+        self._log(f"   📐 Shape de la variable: {self.source_var.shape}")
+        if self.n_times:
+            self._log(f"   📅 Période: {self.time_coords[0]} à {self.time_coords[-1]}")
+        n_invalid = int(np.count_nonzero(~self.time_axis.valid))
+        if n_invalid:
+            self._log(f"   ⚠️  {n_invalid} pas de temps sans date grégorienne (calendrier {self.time_axis.calendar}) ignorés")
+        
+        # Convertir les coordonnées en tableaux float64 (valeurs masquées -> NaN)
+        lat_values = np.asarray(np.ma.filled(lat_coords_raw, np.nan), dtype=np.float64)
+        lon_values = np.asarray(np.ma.filled(lon_coords_raw, np.nan), dtype=np.float64)
+        
+        logger.info(f"Forme des coordonnées lat: {lat_values.shape}, lon: {lon_values.shape}")
+        self._log(f"   📐 Forme des coordonnées lat: {lat_values.shape}, lon: {lon_values.shape}")
+        
+        # Ramener les deux cas (coordonnées 1D ou 2D) à des grilles 2D (lat, lon)
+        # alignées sur les deux dernières dimensions de la variable
+        if lat_values.ndim == 2:
+            # Grille 2D: les coordonnées sont des arrays 2D
+            self.lat_grid, self.lon_grid = lat_values, lon_values
+            logger.info(f"Grille 2D détectée: {self.lat_grid.shape[0]} × {self.lat_grid.shape[1]}")
+        else:
+            # Coordonnées 1D: dimensions séparées
+            self.lon_grid, self.lat_grid = np.meshgrid(lon_values, lat_values)
+            logger.info(f"Coordonnées 1D détectées: {self.lat_grid.shape[0]} lat × {self.lat_grid.shape[1]} lon")
+        
+        n_lats, n_lons = self.lat_grid.shape
+        logger.info(f"Dimensions: {self.n_times} temps × {n_lats} lat × {n_lons} lon = {self.n_times * n_lats * n_lons:,} points")
+        self._log(f"   📏 Dimensions: {self.n_times} temps × {n_lats} lat × {n_lons} lon = {self.n_times * n_lats * n_lons:,} points")
+    
+    def _select_times(self, start_year: Optional[int], end_year: Optional[int]):
+        """Sélectionne les pas de temps valides compris dans [start_year, end_year]"""
+        self.time_indices = np.flatnonzero(self.time_axis.year_mask(start_year, end_year))
+        if start_year is None and end_year is None:
+            return
+        
+        self._log(f"   📅 Filtrage temporel: {start_year or 'début'} - {end_year or 'fin'}...")
+        if len(self.time_indices) > 0:
+            first_date = self.time_coords[self.time_indices[0]]
+            last_date = self.time_coords[self.time_indices[-1]]
+            self._log(f"   ✅ {len(self.time_indices)}/{self.n_times} pas de temps sélectionnés ({first_date} à {last_date})")
+        else:
+            self._log(f"   ⚠️  Aucun pas de temps ne correspond au filtre !")
+            if self.n_times:
+                self._log(f"   📅 Période disponible: {self.time_coords[0]} à {self.time_coords[-1]}")
+    
+    def _select_cells(self, lat_filter, lon_filter):
+        """Sélectionne les cellules à extraire (points filtrés ou toute la grille)"""
+        n_lats, n_lons = self.lat_grid.shape
+        
+        # Gérer plusieurs points géographiques si filtrage spatial
+        # Convertir en liste si un seul point fourni
+        if lat_filter is not None and lon_filter is not None:
+            if not isinstance(lat_filter, (list, tuple)):
+                lat_filter = [lat_filter]
+                lon_filter = [lon_filter]
+        
+        # Trouver les mailles les plus proches (KD-tree sur la sphère, distance haversine)
+        if lat_filter is not None and lon_filter is not None:
+            self._log(f"   📍 Filtrage spatial: {len(lat_filter)} point(s)...")
+            index = GridIndex.load_or_build(self.lat_grid, self.lon_grid, cache_dir=self.cache_dir)
+            lat_idx, lon_idx, distances = index.nearest(lat_filter, lon_filter)
+            if len(lat_filter) <= 20:
+                for point_idx, (target_lat, target_lon) in enumerate(zip(lat_filter, lon_filter)):
+                    actual_lat = float(self.lat_grid[lat_idx[point_idx], lon_idx[point_idx]])
+                    actual_lon = float(self.lon_grid[lat_idx[point_idx], lon_idx[point_idx]])
+                    self._log(f"   ✅ Point {point_idx+1}: ({target_lat:.4f}, {target_lon:.4f}) → "
+                              f"({actual_lat:.4f}, {actual_lon:.4f}) à {distances[point_idx]:.2f} km")
+            else:
+                self._log(f"   ✅ {len(lat_filter)} points associés à leur maille "
+                          f"(distance médiane {np.median(distances):.2f} km, max {distances.max():.2f} km)")
+            
+            # Dédoublonner les cellules (plusieurs points peuvent tomber dans la même maille)
+            # en conservant l'ordre des points: l'ordre des cellules est celui des colonnes des blocs lus
+            flat_ids = np.ravel_multi_index((lat_idx, lon_idx), (n_lats, n_lons))
+            _, first = np.unique(flat_ids, return_index=True)
+            first.sort()
+            self.cell_lat_idx = lat_idx[first].astype(np.intp)
+            self.cell_lon_idx = lon_idx[first].astype(np.intp)
+            self.cell_lat = self.lat_grid[self.cell_lat_idx, self.cell_lon_idx]
+            self.cell_lon = self.lon_grid[self.cell_lat_idx, self.cell_lon_idx]
+        else:
+            self.cell_lat_idx = self.cell_lon_idx = None
+            self.cell_lat = self.lat_grid.ravel()
+            self.cell_lon = self.lon_grid.ravel()
+    
+    def resume_after(self, last_time_index: int, last_time: date) -> bool:
+        """
+        Restreint la lecture aux pas de temps postérieurs à un import précédent.
+        
+        Args:
+            last_time_index: Dernier indice temporel déjà importé
+            last_time: Date correspondante lors de l'import précédent
+        
+        Returns:
+            False si l'axe temporel ne correspond plus (fichier réécrit): rien n'est restreint
+        """
+        if last_time_index >= self.n_times or self.time_values[last_time_index] != np.datetime64(last_time, 'D'):
+            return False
+        self.time_indices = self.time_indices[self.time_indices > last_time_index]
+        return True
+    
+    @property
+    def last_selected_time(self) -> Tuple[Optional[int], Optional[date]]:
+        """Dernier pas de temps sélectionné (indice, date), ou (None, None) si aucun"""
+        if len(self.time_indices) == 0:
+            return None, None
+        last_index = int(self.time_indices[-1])
+        return last_index, self.time_coords[last_index]
+    
+    @property
+    def point_mode(self) -> bool:
+        """True si seules certaines cellules sont extraites (filtre spatial)"""
+        return self.cell_lat_idx is not None
+    
+    def selected_cells(self) -> Dict[str, np.ndarray]:
+        """
+        Cellules extraites, avec leurs indices dans la grille du fichier.
+        
+        Returns:
+            Dictionnaire lat, lon, grid_y, grid_x (cellules aux coordonnées NaN exclues)
+        """
+        if self.point_mode:
+            grid_y, grid_x = self.cell_lat_idx, self.cell_lon_idx
+        else:
+            grid_y, grid_x = np.unravel_index(np.arange(self.lat_grid.size), self.lat_grid.shape)
+        finite = np.isfinite(self.cell_lat) & np.isfinite(self.cell_lon)
+        return {
+            "lat": self.cell_lat[finite],
+            "lon": self.cell_lon[finite],
+            "grid_y": np.asarray(grid_y)[finite],
+            "grid_x": np.asarray(grid_x)[finite],
+        }
+    
+    def iter_blocks(self) -> Iterator[Tuple[int, int, np.ndarray, np.ndarray]]:
+        """
+        Étape de lecture: parcourt les pas de temps sélectionnés par blocs.
+        
+        - Mode grille complète: blocs nc_var[t0:t1, :, :] dimensionnés par max_block_mb
+          et alignés sur le chunking temporel du fichier
+        - Mode points: séries complètes des cellules (nc_var[t0:t1, i, j] ou bloc
+          englobant) par fenêtres de temps bornées par max_block_mb
+        
+        Yields:
+            Tuples (t0, t1, indices de temps sélectionnés dans [t0, t1), valeurs)
+            où valeurs est un tableau float64 (temps sélectionnés, cellules)
+        """
+        if len(self.time_indices) == 0:
+            return
+        
+        t_start = int(self.time_indices[0])
+        t_stop = int(self.time_indices[-1]) + 1
+        selected = np.zeros(self.n_times, dtype=bool)
+        selected[self.time_indices] = True
+        
+        n_cells = len(self.cell_lat)
+        block_t, chunk_t = time_block_size(
+            self.source_var, self.max_block_mb, n_cells if self.point_mode else None
+        )
+        blocks = list(iter_time_blocks(t_start, t_stop, block_t))
+        if self.point_mode:
+            self._log(f"   🚀 Extraction de {n_cells} cellule(s) sur {len(self.time_indices)} pas de temps "
+                      f"(lecture des séries complètes, mode {self.point_read_mode}, {len(blocks)} fenêtre(s))...")
+        else:
+            self._log(f"   🚀 Début de l'importation ({n_cells:,} cellule(s) par pas de temps, "
+                      f"blocs de {block_t} pas de temps ≤ {self.max_block_mb} MB, chunk disque: {chunk_t or 'contigu'})...")
+        
+        for block_idx, (t0, t1) in enumerate(blocks):
+            read_start = time.perf_counter()
+            if self.point_mode:
+                values = read_point_series(
+                    self.source_var, t0, t1, self.cell_lat_idx, self.cell_lon_idx,
+                    mode=self.point_read_mode
+                )
+                bytes_read = values.nbytes
+            else:
+                raw_block = self.source_var[t0:t1, :, :]  # Shape: (t1 - t0, lat, lon)
+                bytes_read = np.asarray(raw_block).nbytes
+                # Gérer les valeurs masquées (masked arrays) en les convertissant en NaN
+                values = np.ma.filled(np.ma.asarray(raw_block, dtype=np.float64), np.nan).reshape(t1 - t0, -1)
+                del raw_block
+            self.stats["read_seconds"] += time.perf_counter() - read_start
+            self.stats["bytes_read"] += bytes_read
+            
+            block_selected = selected[t0:t1]
+            t_indices = np.arange(t0, t1)[block_selected]
+            
+            logger.info(f"Bloc {block_idx+1}/{len(blocks)} (t={t0}-{t1-1}) lu")
+            if not self.point_mode:
+                self._log(f"   ⏳ Bloc {block_idx+1}/{len(blocks)} ({self.time_coords[t0]} à {self.time_coords[t1-1]}) - "
+                          f"{self.stats['bytes_read'] / 1e6:,.0f} MB lus à {self.read_mb_s:,.1f} MB/s")
+            
+            yield t0, t1, t_indices, values[block_selected]
+    
+    def block_to_columns(self, t_indices: np.ndarray, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Étape de conversion: transforme un bloc (temps × cellules) en colonnes NumPy.
+        
+        Les NaN (cellules hors domaine, ex: mer) sont éliminés par masque. L'ordre
+        des lignes est temps-majeur.
+        
+        Returns:
+            Dictionnaire de colonnes lat, lon, time, value
+        """
+        valid = ~np.isnan(values)
+        return {
+            'lat': np.broadcast_to(self.cell_lat, values.shape)[valid],
+            'lon': np.broadcast_to(self.cell_lon, values.shape)[valid],
+            'time': np.broadcast_to(self.time_values[t_indices][:, None], values.shape)[valid],
+            'value': values[valid],
+        }
+    
+    def _append_block(self, buffer: "ColumnBuffer", t_indices: np.ndarray, values: np.ndarray):
+        """Convertit un bloc et l'ajoute au tampon avec son dernier pas de temps sélectionné"""
+        if len(t_indices):
+            last_index = int(t_indices[-1])
+            buffer.append(self.block_to_columns(t_indices, values), last_index, self.time_coords[last_index])
+    
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        """
+        Lit, convertit et regroupe les blocs en DataFrames d'environ chunk_size lignes.
+        
+        Un batch se termine toujours à la fin d'un bloc: batch.attrs["last_time_index"]
+        et batch.attrs["last_time"] indiquent le dernier pas de temps entièrement couvert,
+        ce qui permet de reprendre un import interrompu (voir import_manifest).
+        
+        Yields:
+            DataFrames avec les colonnes lat, lon, time, value
+        """
+        buffer = ColumnBuffer()
+        for _, _, t_indices, values in self.iter_blocks():
+            self._append_block(buffer, t_indices, values)
+            if buffer.rows >= self.chunk_size:
+                yield buffer.flush()
+        if buffer.rows:
+            yield buffer.flush()
+    
+    def iter_batches_pipelined(self, queue_size: int = 2) -> Iterator[pd.DataFrame]:
+        """
+        Variante de iter_batches() en trois étages concurrents reliés par des files bornées.
+        
+        - lecture: un thread exécute iter_blocks() (les lectures netCDF4 libèrent le GIL)
+        - conversion: un thread transforme les blocs en batchs colonnaires
+        - écriture: l'appelant, qui consomme les batchs (insertion DuckDB)
+        
+        Les files de `queue_size` éléments assurent la contre-pression: un étage en
+        avance bloque sur put() au lieu d'accumuler des blocs en mémoire. Les temps
+        de chaque étage (travail, attente en entrée, attente en sortie) sont conservés
+        dans self.stats["stages"] pour identifier le goulot d'étranglement.
+        
+        Yields:
+            DataFrames avec les colonnes lat, lon, time, value
+        """
+        stages = {
+            name: {"busy_seconds": 0.0, "wait_in_seconds": 0.0, "wait_out_seconds": 0.0, "items": 0}
+            for name in PIPELINE_STAGES
+        }
+        self.stats["stages"] = stages
+        blocks_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        batches_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        
+        def put(target: queue.Queue, item, stage: dict) -> bool:
+            """Envoie un élément à l'étage suivant (bloque si la file est pleine)"""
+            start = time.perf_counter()
+            try:
+                while not stop.is_set():
+                    try:
+                        target.put(item, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        continue
+                return False
+            finally:
+                stage["wait_out_seconds"] += time.perf_counter() - start
+        
+        def get(source: queue.Queue, stage: dict):
+            """Reçoit un élément de l'étage précédent (bloque si la file est vide)"""
+            start = time.perf_counter()
+            try:
+                while not stop.is_set():
+                    try:
+                        return source.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                return _END_OF_STREAM
+            finally:
+                stage["wait_in_seconds"] += time.perf_counter() - start
+        
+        def read_stage():
+            stage = stages["reader"]
+            try:
+                blocks = self.iter_blocks()
+                while True:
+                    start = time.perf_counter()
+                    block = next(blocks, _END_OF_STREAM)
+                    stage["busy_seconds"] += time.perf_counter() - start
+                    if block is _END_OF_STREAM:
+                        break
+                    stage["items"] += 1
+                    if not put(blocks_queue, block, stage):
+                        return
+                put(blocks_queue, _END_OF_STREAM, stage)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+        
+        def convert_stage():
+            stage = stages["converter"]
+            buffer = ColumnBuffer()
+            try:
+                while True:
+                    block = get(blocks_queue, stage)
+                    if block is _END_OF_STREAM:
+                        break
+                    start = time.perf_counter()
+                    _, _, t_indices, values = block
+                    self._append_block(buffer, t_indices, values)
+                    batch = buffer.flush() if buffer.rows >= self.chunk_size else None
+                    stage["busy_seconds"] += time.perf_counter() - start
+                    stage["items"] += 1
+                    if batch is not None and not put(batches_queue, batch, stage):
+                        return
+                if stop.is_set():
+                    return
+                if buffer.rows and not put(batches_queue, buffer.flush(), stage):
+                    return
+                put(batches_queue, _END_OF_STREAM, stage)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+        
+        threads = [
+            threading.Thread(target=read_stage, name="netcdf-reader", daemon=True),
+            threading.Thread(target=convert_stage, name="netcdf-converter", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        
+        writer = stages["writer"]
+        try:
+            while True:
+                batch = get(batches_queue, writer)
+                if batch is _END_OF_STREAM:
+                    break
+                start = time.perf_counter()
+                yield batch
+                # Temps passé par l'appelant à écrire le batch
+                writer["busy_seconds"] += time.perf_counter() - start
+                writer["items"] += 1
+        finally:
+            # Arrêt anticipé (erreur d'écriture, generator fermé): débloquer les autres étages
+            stop.set()
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            raise errors[0]
+    
+    @property
+    def read_mb_s(self) -> float:
+        """Débit de lecture moyen depuis le fichier (MB/s)"""
+        if self.stats["read_seconds"] <= 0:
+            return 0.0
+        return self.stats["bytes_read"] / 1e6 / self.stats["read_seconds"]
+    
+    def close(self):
+        """Ferme proprement le fichier NetCDF"""
+        if self.nc_file is not None:
+            self.nc_file.close()
+            self.nc_file = None
+        if self.ds is not None:
+            self.ds.close()
+            self.ds = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ColumnBuffer:
+    """Accumule des colonnes NumPy et les concatène en un seul DataFrame"""
+    
+    def __init__(self):
+        self.parts: Dict[str, List[np.ndarray]] = {}
+        self.rows = 0
+        self.last_time_index: Optional[int] = None
+        self.last_time: Optional[date] = None
+    
+    def append(self, columns: Dict[str, np.ndarray], last_time_index: int, last_time: date):
+        """Ajoute un ensemble de colonnes de même longueur couvrant les pas de temps jusqu'à last_time_index"""
+        for name, values in columns.items():
+            self.parts.setdefault(name, []).append(values)
+        self.rows += len(next(iter(columns.values())))
+        self.last_time_index = int(last_time_index)
+        self.last_time = last_time
+    
+    def flush(self) -> pd.DataFrame:
+        """Retourne les colonnes accumulées sous forme de DataFrame et vide le tampon"""
+        batch = pd.DataFrame({name: np.concatenate(parts) for name, parts in self.parts.items()})
+        batch.attrs["last_time_index"] = self.last_time_index
+        batch.attrs["last_time"] = self.last_time
+        self.parts = {}
+        self.rows = 0
+        return batch
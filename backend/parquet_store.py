@@ -0,0 +1,175 @@
+"""
+Stockage Parquet partitionné (Hive) des données climatiques
+
+Alternative à la base DuckDB: chaque fichier NetCDF est écrit directement en
+Parquet compressé zstd, partitionné par variable, scénario, membre et année:
+
+    <racine>/variable=pr/experiment=ssp370/member=r1/year=2015/<gcm>_<rcm>_<fichier>_<uuid>.parquet
+
+Chaque fichier source produit ses propres fichiers Parquet, sans writer unique:
+plusieurs processus peuvent écrire en parallèle, un fichier source peut être
+réécrit seul, et une racine complète peut être déployée telle quelle.
+DuckDBClimateLoader lit une racine Parquet avec read_parquet (voir route).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+
+from models import VariableType, ExperimentType
+from netcdf_reader import NetCDFBatchReader, selection_key
+
+# Colonnes de partitionnement (répertoires Hive), dans l'ordre de l'arborescence
+PARQUET_PARTITIONS = ("variable", "experiment", "member", "year")
+
+# Signature (taille, mtime, sélection) des fichiers sources déjà écrits, un JSON par fichier source
+MANIFEST_DIR = "_manifest"
+
+
+def parquet_directory(db_path) -> Path:
+    """Racine Parquet par défaut associée au chemin d'une base DuckDB"""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}_parquet")
+
+
+def is_parquet_root(path) -> bool:
+    """True si path est un répertoire de données Parquet partitionnées (variable=...)"""
+    path = Path(path)
+    return path.is_dir() and any(path.glob("variable=*"))
+
+
+def parquet_partition_keys(root) -> List[Tuple[str, str]]:
+    """(variable, scénario) présents sous une racine Parquet"""
+    return sorted(
+        (directory.parent.name.split("=", 1)[1], directory.name.split("=", 1)[1])
+        for directory in Path(root).glob("variable=*/experiment=*")
+        if any(directory.glob("member=*/year=*/*.parquet"))
+    )
+
+
+def parquet_glob(root, variable: str, experiment: str) -> str:
+    """Motif des fichiers Parquet d'une variable et d'un scénario"""
+    return str(Path(root) / f"variable={variable}" / f"experiment={experiment}" / "member=*" / "year=*" / "*.parquet")
+
+
+def source_prefix(gcm: str, rcm: str, file_path) -> str:
+    """Préfixe des fichiers Parquet écrits depuis un fichier source"""
+    return re.sub(r"[^\w.-]", "_", f"{gcm}_{rcm}_{Path(file_path).stem}")
+
+
+def write_netcdf_to_parquet(
+    file_path: str,
+    root: str,
+    variable: VariableType,
+    experiment: ExperimentType,
+    gcm: str,
+    rcm: str,
+    member: str = "r1",
+    value_type: str = "DOUBLE",
+    rows_per_write: int = 10_000_000,
+    force: bool = False,
+    verbose: bool = True,
+    **reader_options
+) -> Dict:
+    """
+    Écrit un fichier NetCDF en Parquet partitionné sous root.
+    
+    Les lignes de chaque année sont triées par simulation, point puis date (min/max
+    des row groups exploitables pour les lectures par point). Les fichiers sont
+    écrits dans un répertoire temporaire puis remplacent d'un coup ceux d'un
+    précédent import du même fichier source.
+    
+    Args:
+        file_path: Chemin vers le fichier NetCDF
+        root: Racine Parquet
+        variable, experiment, gcm, rcm, member: Simulation du fichier
+        value_type: Type Parquet des valeurs (DOUBLE ou FLOAT)
+        rows_per_write: Lignes accumulées avant chaque écriture (taille des fichiers)
+        force: Réécrire même si le fichier source n'a pas changé
+        verbose: Afficher la progression
+        **reader_options: Options de NetCDFBatchReader (lat_filter, start_year, max_block_mb...)
+    
+    Returns:
+        Dictionnaire rows, files, skipped, elapsed_seconds, bytes_read
+    """
+    start = time.perf_counter()
+    root, source = Path(root), Path(file_path)
+    prefix = source_prefix(gcm, rcm, source)
+    stat = source.stat()
+    selection = selection_key(*(reader_options.get(name) for name in ("lat_filter", "lon_filter", "start_year", "end_year")))
+    signature = {"path": str(source.resolve()), "size": stat.st_size, "mtime": stat.st_mtime, "selection": selection}
+    manifest_path = root / MANIFEST_DIR / f"{prefix}.json"
+    if not force and manifest_path.exists():
+        entry = json.loads(manifest_path.read_text())
+        if all(entry.get(key) == value for key, value in signature.items()):
+            return {"rows": 0, "files": entry["files"], "skipped": True, "elapsed_seconds": 0.0, "bytes_read": 0}
+    
+    staging = root / f".staging_{prefix}"
+    shutil.rmtree(staging, ignore_errors=True)
+    root.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(":memory:")
+    rows = 0
+    try:
+        with NetCDFBatchReader(str(source), variable, verbose=verbose, **reader_options) as reader:
+            batches = []
+            
+            def flush():
+                frame = pd.concat(batches, ignore_index=True)
+                batches.clear()
+                conn.register("batch", frame)
+                # OVERWRITE_OR_IGNORE: plusieurs écritures dans le même répertoire, noms uniques ({uuid})
+                conn.execute(f"""
+                    COPY (
+                        SELECT '{variable.value}' AS variable, '{experiment.value}' AS experiment,
+                               ? AS member, year(time)::SMALLINT AS year,
+                               ? AS gcm, ? AS rcm, lat, lon, time::DATE AS time, value::{value_type} AS value
+                        FROM batch
+                        ORDER BY year, lat, lon, time
+                    ) TO '{staging}' (
+                        FORMAT parquet, COMPRESSION zstd,
+                        PARTITION_BY ({', '.join(PARQUET_PARTITIONS)}),
+                        FILENAME_PATTERN '{prefix}_{{uuid}}', OVERWRITE_OR_IGNORE
+                    )
+                """, [member, gcm, rcm])
+                conn.unregister("batch")
+                return len(frame)
+            
+            buffered = 0
+            for batch in reader.iter_batches():
+                batches.append(batch)
+                buffered += len(batch)
+                if buffered >= rows_per_write:
+                    rows += flush()
+                    buffered = 0
+            if batches:
+                rows += flush()
+            bytes_read = reader.stats["bytes_read"]
+        
+        # Remplacer les fichiers d'un précédent import de ce fichier source
+        partition = root / f"variable={variable.value}" / f"experiment={experiment.value}"
+        for old in partition.glob(f"member=*/year=*/{prefix}_*.parquet"):
+            old.unlink()
+        files = 0
+        for new in sorted(staging.rglob("*.parquet")):
+            target = root / new.relative_to(staging)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            new.replace(target)
+            files += 1
+    finally:
+        conn.close()
+        shutil.rmtree(staging, ignore_errors=True)
+    
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({**signature, "rows": rows, "files": files}))
+    elapsed = time.perf_counter() - start
+    if verbose:
+        print(f"   ✅ Parquet: {rows:,} lignes en {files} fichier(s) en {elapsed:.1f}s")
+    return {"rows": rows, "files": files, "skipped": False, "elapsed_seconds": elapsed, "bytes_read": bytes_read}
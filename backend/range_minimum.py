@@ -0,0 +1,121 @@
+"""
+Sommes glissantes et minimum sur intervalle en O(1) pour des séries journalières
+
+Les critères de fenêtres glissantes (couverts végétaux 21/42 jours, maïs
+15/30/60 jours) prennent le minimum des sommes sur w jours dont la fenêtre est
+incluse dans une saison. Les sommes glissantes sont calculées une fois par
+série, puis RangeMinimumIndex répond au minimum sur n'importe quelle saison
+en temps constant.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def rolling_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sommes sur window jours consécutifs, le long du dernier axe.
+    
+    Args:
+        values: Séries journalières (..., n), NaN pour un jour sans valeur
+        window: Longueur de la fenêtre en jours
+    
+    Returns:
+        Tableau (..., n) dont l'élément t est la somme des jours t-window+1 à t,
+        NaN si la fenêtre déborde du début de la série ou contient un jour sans valeur
+    """
+    valid = ~np.isnan(values)
+    shape = values.shape[:-1] + (1,)
+    cumsum = np.concatenate([np.zeros(shape), np.cumsum(np.where(valid, values, 0.0), axis=-1)], axis=-1)
+    counts = np.concatenate([np.zeros(shape, dtype=np.int64), np.cumsum(valid, axis=-1)], axis=-1)
+    
+    sums = np.full(values.shape, np.nan)
+    if window <= values.shape[-1]:
+        window_sums = cumsum[..., window:] - cumsum[..., :-window]
+        complete = counts[..., window:] - counts[..., :-window] == window
+        sums[..., window - 1:] = np.where(complete, window_sums, np.nan)
+    return sums
+
+
+class RangeMinimumIndex:
+    """
+    Minimum sur un intervalle [first, last] en O(1), pour plusieurs séries à la fois.
+    
+    Structure par blocs: minima préfixes et suffixes dans chaque bloc de block_size
+    valeurs, et table creuse (sparse table) des minima de blocs. Un intervalle
+    couvrant plusieurs blocs est le minimum du suffixe de son premier bloc, du
+    préfixe de son dernier bloc et de deux lectures dans la table creuse; un
+    intervalle inclus dans un seul bloc (moins de block_size valeurs) est lu
+    directement. Mémoire: environ 3 fois les séries. Les NaN sont ignorés.
+    """
+    
+    def __init__(self, values: np.ndarray, block_size: int = 32):
+        """
+        Args:
+            values: Séries (m, n), NaN pour une valeur absente
+            block_size: Taille des blocs
+        """
+        self.values = np.asarray(values, dtype=np.float64)
+        self.block_size = block_size
+        m, n = self.values.shape
+        n_blocks = -(-n // block_size)
+        padded = np.full((m, n_blocks * block_size), np.nan)
+        padded[:, :n] = self.values
+        blocks = padded.reshape(m, n_blocks, block_size)
+        
+        with np.errstate(invalid="ignore"):
+            self.prefix = np.fmin.accumulate(blocks, axis=2).reshape(m, -1)
+            self.suffix = np.fmin.accumulate(blocks[:, :, ::-1], axis=2)[:, :, ::-1].reshape(m, -1)
+        
+        # levels[k][:, b] = minimum des blocs b à b + 2**k - 1
+        self.levels = [self.prefix[:, block_size - 1::block_size]]
+        while 2 ** len(self.levels) <= n_blocks:
+            previous, half = self.levels[-1], 2 ** (len(self.levels) - 1)
+            self.levels.append(np.fmin(previous[:, :-half], previous[:, half:]))
+    
+    def _blocks_minimum(self, first_block: np.ndarray, last_block: np.ndarray) -> np.ndarray:
+        """Minimum des blocs first_block à last_block (inclus, non vides)"""
+        result = np.empty((self.values.shape[0], len(first_block)))
+        level = np.floor(np.log2(last_block - first_block + 1)).astype(np.int64)
+        for k in np.unique(level):
+            selected = level == k
+            table = self.levels[k]
+            result[:, selected] = np.fmin(
+                table[:, first_block[selected]], table[:, last_block[selected] - 2 ** k + 1]
+            )
+        return result
+    
+    def query(self, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        """
+        Minimum de chaque série sur des intervalles d'indices.
+        
+        Args:
+            first: Premiers indices (q,), inclus
+            last: Derniers indices (q,), inclus
+        
+        Returns:
+            Tableau (m, q); NaN si l'intervalle est vide ou sans valeur
+        """
+        n = self.values.shape[1]
+        first = np.maximum(np.asarray(first, dtype=np.int64), 0)
+        last = np.minimum(np.asarray(last, dtype=np.int64), n - 1)
+        result = np.full((self.values.shape[0], len(first)), np.nan)
+        
+        first_block, last_block = first // self.block_size, last // self.block_size
+        spanning = (first <= last) & (first_block < last_block)
+        if spanning.any():
+            f, l = first[spanning], last[spanning]
+            minimum = np.fmin(self.suffix[:, f], self.prefix[:, l])
+            inner = last_block[spanning] - first_block[spanning] > 1
+            if inner.any():
+                minimum[:, inner] = np.fmin(minimum[:, inner], self._blocks_minimum(
+                    first_block[spanning][inner] + 1, last_block[spanning][inner] - 1
+                ))
+            result[:, spanning] = minimum
+        
+        # Intervalles courts inclus dans un bloc: au plus block_size valeurs lues
+        for j in np.flatnonzero((first <= last) & (first_block == last_block)):
+            with np.errstate(invalid="ignore"):
+                result[:, j] = np.fmin.reduce(self.values[:, first[j]:last[j] + 1], axis=1)
+        return result
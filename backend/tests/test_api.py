@@ -6,15 +6,81 @@ import pytest
 import sys
 from pathlib import Path
 
+import netCDF4 as nc
+import numpy as np
+
 # Ajouter le répertoire parent au path pour les imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastapi.testclient import TestClient
+import main
 from main import app
+from duckdb_loader import DuckDBClimateLoader
+from tests.test_duckdb_loader import import_args
 
 client = TestClient(app)
 
 
+@pytest.fixture
+def orleans_loader(tmp_path, monkeypatch):
+    """
+    Base de l'API: 2015 sur une grille de 0.05° autour d'Orléans (47.90, 1.90).
+    Les 16 cellules à moins de 0.1° du point alternent 1 et 3 mm/jour (moyenne 2 mm),
+    les cellules extérieures reçoivent 50 mm/jour.
+    """
+    path = tmp_path / "prAdjust_orleans.nc"
+    n_days = 365
+    with nc.Dataset(path, "w") as ds:
+        ds.createDimension("time", None)
+        ds.createDimension("y", 6)
+        ds.createDimension("x", 6)
+        time = ds.createVariable("time", "f8", ("time",))
+        time.units = "days since 1850-01-01"
+        time.calendar = "standard"
+        time[:] = 60265 + np.arange(n_days)
+        lat = ds.createVariable("lat", "f8", ("y", "x"))
+        lon = ds.createVariable("lon", "f8", ("y", "x"))
+        offsets = 0.05 * np.arange(6) - 0.125
+        lon[:], lat[:] = np.meshgrid(1.90 + offsets, 47.90 + offsets)
+        inside = np.zeros((6, 6), dtype=bool)
+        inside[1:5, 1:5] = True
+        daily_mm = np.where(inside, np.where(np.indices((6, 6)).sum(axis=0) % 2 == 0, 1.0, 3.0), 50.0)
+        pr = ds.createVariable("prAdjust", "f4", ("time", "y", "x"), fill_value=1e20)
+        pr[:] = np.broadcast_to(daily_mm / 86400.0, (n_days, 6, 6))
+    
+    db = DuckDBClimateLoader(db_path=str(tmp_path / "api.duckdb"), read_only=False)
+    db.import_netcdf_file(**import_args(path))
+    monkeypatch.setattr(main, "_duckdb_loader", db)
+    yield db
+    db.close()
+
+
+def test_cover_crop_feasibility_zone_mean(orleans_loader):
+    """Minima glissants de la pluie moyenne de la zone (et non de la somme des cellules)"""
+    response = client.post("/api/charts/cover-crop-feasibility",
+                           json={"city": "Orléans", "start_year": 2015, "end_year": 2016})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["members"] == ["r1"]
+    minima = data["yearly_data"]["2015"]["member_minima_by_window"]
+    assert minima["21"]["r1"] == pytest.approx(42.0)
+    assert minima["42"]["r1"] == pytest.approx(84.0)
+    assert data["yearly_data"]["2016"] == {"member_minima": {}}
+
+
+def test_corn_viability_zone_mean(orleans_loader):
+    """Cumul de semis et minima glissants en pluie moyenne de la zone"""
+    response = client.post("/api/charts/corn-viability",
+                           json={"city": "Orléans", "start_year": 2015, "end_year": 2015})
+    assert response.status_code == 200
+    yearly = response.json()["yearly_data"]["2015"]
+    # 61 jours de mars-avril à 2 mm
+    assert yearly["sowing_totals"]["r1"] == pytest.approx(122.0)
+    assert yearly["growth_minima_60d"]["r1"] == pytest.approx(120.0)
+    assert yearly["growth_minima_30d"]["r1"] == pytest.approx(60.0)
+    assert yearly["harvest_minima_15d"]["r1"] == pytest.approx(30.0)
+
+
 def test_health():
     """Test de l'endpoint health"""
     response = client.get("/health")
@@ -119,3 +185,34 @@ def test_maps_data_with_real_data():
             assert "features" in data["data"]
             assert len(data["data"]["features"]) > 0
 
+
+
+def test_dry_spells_season_validation(orleans_loader):
+    """Dates de saison MM-JJ validées, 29 février ramené au 28 hors années bissextiles"""
+    response = client.post("/api/charts/dry-spells", json={"city": "Orléans", "season_start": "bad"})
+    assert response.status_code == 422
+    response = client.post("/api/charts/dry-spells", json={"city": "Orléans", "season_end": "02-30"})
+    assert response.status_code == 422
+    
+    response = client.post("/api/charts/dry-spells", json={
+        "city": "Orléans", "start_year": 2015, "end_year": 2016, "season_start": "02-29", "season_end": "03-31"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert "error" not in data
+    assert data["yearly_data"]["2015"] == {"member_longest_spells": {"r1": 0}}
+
+
+def test_dry_spells_without_dry_day(orleans_loader):
+    """Saison avec données mais sans jour sec: 0 jour, saison sans données: vide"""
+    response = client.post("/api/charts/dry-spells",
+                           json={"city": "Orléans", "start_year": 2015, "end_year": 2016})
+    assert response.status_code == 200
+    yearly = response.json()["yearly_data"]
+    assert yearly["2015"] == {"member_longest_spells": {"r1": 0}}
+    assert yearly["2016"] == {"member_longest_spells": {}}
+    
+    # Seuil au-dessus de la pluie des cellules à 1 mm/jour: toute la saison est sèche
+    response = client.post("/api/charts/dry-spells",
+                           json={"city": "Orléans", "start_year": 2015, "end_year": 2015, "threshold": 2.0})
+    assert response.json()["yearly_data"]["2015"] == {"member_longest_spells": {"r1": 183}}
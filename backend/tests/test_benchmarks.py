@@ -0,0 +1,44 @@
+"""
+Tests pour le générateur SAFRAN synthétique et le harnais de benchmark
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import netCDF4 as nc
+
+from benchmarks.generate_safran import write_safran_file, synthetic_filename
+from benchmarks.bench_import import run_case
+
+
+def test_synthetic_file_layout(tmp_path):
+    """Le fichier généré a la structure des fichiers Météo-France"""
+    path = write_safran_file(tmp_path / synthetic_filename("tasAdjust", 2015, 2016), "tasAdjust", 2015, 2016, ny=12, nx=10)
+    
+    with nc.Dataset(path) as ds:
+        assert ds.variables["tasAdjust"].dimensions == ("time", "y", "x")
+        assert ds.variables["lat"].dimensions == ("y", "x")
+        assert ds.variables["time"].units.startswith("days since 1850-01-01")
+        assert len(ds.variables["time"]) == 731
+        values = ds.variables["tasAdjust"][:]
+    # Mailles "mer" masquées, températures plausibles ailleurs
+    assert values.mask[:, 0, 0].all()
+    assert 250 < values.mean() < 310
+
+
+def test_run_case_metrics(tmp_path):
+    """Un cas de benchmark importe le fichier et retourne les mesures attendues"""
+    path = write_safran_file(tmp_path / "prAdjust_bench.nc", "prAdjust", 2015, 2015, ny=12, nx=10)
+    
+    points = run_case(str(path), "prAdjust", "points", str(tmp_path / "points.duckdb"), {})
+    grid = run_case(str(path), "prAdjust", "grid", str(tmp_path / "grid.duckdb"), {"bulk_load": True})
+    
+    assert 0 < points["rows"] <= 6 * 365
+    assert grid["rows"] == grid["inserted"] > points["rows"]
+    for result in (points, grid):
+        assert result["rows_per_second"] > 0
+        assert result["db_size_mb"] > 0
+        assert result["peak_rss_mb"] is None or result["peak_rss_mb"] > 0
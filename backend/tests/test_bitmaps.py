@@ -0,0 +1,52 @@
+"""
+Tests des bitmaps de dépassement de seuil
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bitmaps
+from bitmaps import pack_flags, unpack_flags, popcount, count_in_ranges, longest_runs
+
+
+def longest_run(flags):
+    best = current = 0
+    for flag in flags:
+        current = current + 1 if flag else 0
+        best = max(best, current)
+    return best
+
+
+def test_counts_and_longest_runs_match_brute_force():
+    """Comptes et plus longues suites sur des intervalles à cheval sur plusieurs mots"""
+    rng = np.random.default_rng(0)
+    flags = rng.random((3, 1000)) < np.array([[0.2], [0.8], [0.0]])
+    flags[0, 100:190] = True
+    words = pack_flags(flags)
+    assert words.dtype == np.uint64 and words.shape == (3, 16)
+    np.testing.assert_array_equal(unpack_flags(words, 1000), flags)
+    
+    first = rng.integers(-30, 1000, size=300)
+    last = first + rng.integers(-3, 300, size=300)
+    counts = count_in_ranges(words, 1000, first, last)
+    runs = longest_runs(words, 1000, first, last)
+    for j, (f, l) in enumerate(zip(first, last)):
+        f, l = max(f, 0), min(l, 999)
+        for series in range(3):
+            window = flags[series, f:l + 1] if f <= l else flags[series, :0]
+            assert counts[series, j] == window.sum()
+            assert runs[series, j] == longest_run(window)
+
+
+def test_popcount_without_bitwise_count(monkeypatch):
+    """Table d'octets pour numpy < 2.0"""
+    words = np.array([0, 1, 0xFFFFFFFFFFFFFFFF, 0x8000000000000001], dtype=np.uint64)
+    expected = [0, 1, 64, 2]
+    np.testing.assert_array_equal(popcount(words), expected)
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    np.testing.assert_array_equal(bitmaps.popcount(words), expected)
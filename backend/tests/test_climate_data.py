@@ -0,0 +1,65 @@
+"""
+Tests des indicateurs calculés sur les DataArray xarray
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from climate_data import ClimateIndicatorCalculator
+
+
+def test_rainfall_totals_match_single_period():
+    """Cumuls de plusieurs périodes = cumul de chaque période calculé séparément"""
+    times = pd.date_range("2015-01-01", "2017-12-31", freq="D")
+    rng = np.random.default_rng(0)
+    values = rng.gamma(0.5, 4e-5, size=(len(times), 3, 2))
+    values[:, 0, 0] = np.nan
+    values[100, 1, 1] = np.nan
+    precipitation = xr.DataArray(
+        values, dims=("time", "y", "x"),
+        coords={"time": times, "lat": (("y", "x"), np.full((3, 2), 46.0))}
+    )
+    periods = [(date(year, 3, 1), date(year, 4, 30)) for year in (2015, 2016, 2017)]
+    periods += [(date(2014, 12, 1), date(2015, 1, 15)), (date(2017, 12, 20), date(2018, 1, 10))]
+    
+    totals = ClimateIndicatorCalculator.calculate_rainfall_totals(precipitation, periods)
+    
+    assert totals.dims == ("period", "y", "x")
+    assert "lat" in totals.coords
+    for index, (start, end) in enumerate(periods):
+        expected = ClimateIndicatorCalculator.calculate_rainfall_total(precipitation, start, end)
+        np.testing.assert_allclose(totals.isel(period=index).values, expected.values, rtol=1e-9, atol=1e-9)
+    assert (totals.isel(x=0, y=0) == 0).all()
+
+
+def test_consecutive_dry_days():
+    """Plus longue suite de jours secs de chaque point, comparée à un parcours jour par jour"""
+    times = pd.date_range("2015-01-01", "2015-12-31", freq="D")
+    rng = np.random.default_rng(0)
+    values = rng.gamma(0.3, 4e-5, size=(3, len(times), 4))
+    values[0, 50:90, 1] = 0.0
+    values[1, :, 2] = 0.0
+    values[2, :, 3] = 1e-3
+    values[2, 10, 0] = np.nan
+    precipitation = xr.DataArray(
+        values, dims=("lat", "time", "lon"),
+        coords={"time": times, "lat": [46.0, 46.1, 46.2], "lon": [1.0, 1.1, 1.2, 1.3]}
+    )
+    
+    result = ClimateIndicatorCalculator.calculate_consecutive_dry_days(precipitation)
+    
+    assert result.dims == ("lat", "lon")
+    dry = values * 86400 < 0.1
+    for i in range(3):
+        for j in range(4):
+            runs = np.diff(np.flatnonzero(np.concatenate([[True], ~dry[i, :, j], [True]]))) - 1
+            assert result.values[i, j] == runs.max()
+    assert result.values[1, 2] == len(times) and result.values[2, 3] == 0
@@ -0,0 +1,77 @@
+"""
+Tests du pool borné de curseurs
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import duckdb
+import pytest
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cursor_pool import CursorPool, PoolTimeout
+
+
+def test_pool_reuses_cursors_and_times_out():
+    """Curseurs réutilisés, au plus size empruntés, PoolTimeout une fois saturé"""
+    conn = duckdb.connect(":memory:")
+    pool = CursorPool(conn.cursor, size=2, timeout=5)
+    with pool.checkout() as first:
+        assert first.execute("SELECT 42").fetchone() == (42,)
+    with pool.checkout() as again:
+        assert again is first
+    
+    with pool.checkout() as a, pool.checkout() as b:
+        assert a is not b
+        metrics = pool.metrics()
+        assert metrics["in_use"] == 2 and metrics["saturation"] == 1.0
+        with pytest.raises(PoolTimeout):
+            with pool.checkout(timeout=0.05):
+                pass
+    
+    metrics = pool.metrics()
+    assert metrics["created"] == 2 and metrics["idle"] == 2 and metrics["in_use"] == 0
+    assert metrics["checkouts"] == 4 and metrics["timeouts"] == 1 and metrics["max_in_use"] == 2
+    pool.close()
+    assert pool.metrics()["idle"] == 0
+    conn.close()
+
+
+def test_pool_close_closes_borrowed_cursors():
+    """Un curseur rendu après close() est fermé, et le pool fermé ne prête plus"""
+    conn = duckdb.connect(":memory:")
+    pool = CursorPool(conn.cursor, size=2, timeout=5)
+    with pool.checkout() as borrowed:
+        pool.close()
+    assert pool.metrics()["idle"] == 0 and pool.metrics()["in_use"] == 0
+    with pytest.raises(duckdb.ConnectionException):
+        borrowed.execute("SELECT 1")
+    with pytest.raises(RuntimeError):
+        with pool.checkout():
+            pass
+    conn.close()
+
+
+def test_pool_waits_for_a_free_cursor():
+    """Un emprunt en attente obtient le curseur rendu par un autre thread"""
+    conn = duckdb.connect(":memory:")
+    pool = CursorPool(conn.cursor, size=1, timeout=5)
+    results = []
+    
+    def worker():
+        with pool.checkout() as cursor:
+            results.append(cursor.execute("SELECT 1").fetchone()[0])
+    
+    with pool.checkout():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        while pool.metrics()["waiting"] == 0:
+            time.sleep(0.01)
+    thread.join()
+    assert results == [1]
+    assert pool.metrics()["created"] == 1 and pool.metrics()["max_wait_ms"] > 0
+    conn.close()
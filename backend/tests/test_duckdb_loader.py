@@ -0,0 +1,875 @@
+"""
+Tests pour l'import NetCDF -> DuckDB
+"""
+
+import pytest
+import sys
+from datetime import date
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import netCDF4 as nc
+
+from duckdb_loader import DuckDBClimateLoader
+from models import VariableType, ExperimentType
+
+
+def write_netcdf(path: Path, n_days: int = 40, ny: int = 4, nx: int = 5, coords_2d: bool = True):
+    """Écrit un petit fichier NetCDF au format Météo-France (time × y × x)"""
+    with nc.Dataset(path, "w") as ds:
+        ds.createDimension("time", None)
+        time = ds.createVariable("time", "f8", ("time",))
+        time.units = "days since 1850-01-01"
+        time.calendar = "standard"
+        # 2015-01-01 = 60265 jours après 1850-01-01
+        time[:] = 60265 + np.arange(n_days)
+        
+        lats = 46.0 + 0.1 * np.arange(ny)
+        lons = 1.0 + 0.1 * np.arange(nx)
+        if coords_2d:
+            ds.createDimension("y", ny)
+            ds.createDimension("x", nx)
+            lat = ds.createVariable("lat", "f8", ("y", "x"))
+            lon = ds.createVariable("lon", "f8", ("y", "x"))
+            lon[:], lat[:] = np.meshgrid(lons, lats)
+            dims = ("time", "y", "x")
+        else:
+            ds.createDimension("lat", ny)
+            ds.createDimension("lon", nx)
+            lat = ds.createVariable("lat", "f8", ("lat",))
+            lon = ds.createVariable("lon", "f8", ("lon",))
+            lat[:] = lats
+            lon[:] = lons
+            dims = ("time", "lat", "lon")
+        
+        pr = ds.createVariable("prAdjust", "f4", dims, fill_value=1e20)
+        values = np.arange(n_days * ny * nx, dtype="f4").reshape(n_days, ny, nx) * 1e-6
+        values = np.ma.masked_array(values, mask=np.zeros_like(values, dtype=bool))
+        # Une cellule "mer" toujours masquée
+        values.mask[:, 0, 0] = True
+        pr[:] = values
+
+
+@pytest.fixture
+def loader(tmp_path):
+    with DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb"), read_only=False) as db:
+        yield db
+
+
+def import_args(path, member="r1", **kwargs):
+    return dict(
+        file_path=str(path),
+        variable=VariableType.PR,
+        experiment=ExperimentType.SSP370,
+        gcm="CNRM-ESM2-1",
+        rcm="CNRM-ALADIN63-EMUL",
+        member=member,
+        **kwargs
+    )
+
+
+@pytest.mark.parametrize("coords_2d", [True, False])
+def test_import_full_grid(tmp_path, loader, coords_2d):
+    """Import de toute la grille: les cellules masquées sont ignorées"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path, coords_2d=coords_2d)
+    
+    rows = loader.import_netcdf_file(**import_args(path, chunk_size=50, max_block_mb=0.001))
+    assert rows == 40 * (4 * 5 - 1)
+    
+    count, n_cells, first, last = loader.conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT (lat, lon)), MIN(time), MAX(time) FROM climate_data"
+    ).fetchone()
+    assert count == rows
+    assert n_cells == 19
+    assert str(first) == "2015-01-01"
+    assert str(last) == "2015-02-09"
+    
+    # La valeur d'une cellule correspond bien au slice NetCDF
+    value = loader.conn.execute(
+        "SELECT value FROM climate_data WHERE time = DATE '2015-01-02' AND ABS(lat - 46.1) < 1e-6 AND ABS(lon - 1.2) < 1e-6"
+    ).fetchone()[0]
+    assert value == pytest.approx(np.float32((1 * 20 + 1 * 5 + 2) * 1e-6))
+    
+    # Un second import n'ajoute pas de doublons
+    loader.import_netcdf_file(**import_args(path))
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == rows
+
+
+def test_import_points_and_years(tmp_path, loader):
+    """Import filtré sur des points et une plage d'années"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path, n_days=400)
+    
+    rows = loader.import_netcdf_file(**import_args(
+        path, lat_filter=[46.21, 46.0], lon_filter=[1.29, 1.0], start_year=2016, end_year=2016
+    ))
+    # Le second point tombe sur la cellule masquée
+    assert rows == 400 - 365
+    
+    lat, lon, first = loader.conn.execute(
+        "SELECT DISTINCT lat, lon, MIN(time) OVER () FROM climate_data"
+    ).fetchone()
+    assert (round(lat, 6), round(lon, 6)) == (46.2, 1.3)
+    assert str(first) == "2016-01-01"
+
+
+@pytest.mark.parametrize("mode", ["series", "bbox"])
+def test_point_read_modes(tmp_path, loader, mode):
+    """Les deux stratégies de lecture des points donnent les mêmes lignes"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    
+    rows = loader.import_netcdf_file(**import_args(
+        path, lat_filter=[46.1, 46.3, 46.1], lon_filter=[1.1, 1.4, 1.1], point_read_mode=mode
+    ))
+    assert rows == 2 * 40
+    
+    total = loader.conn.execute("SELECT SUM(value) FROM climate_data").fetchone()[0]
+    expected = sum((t * 20 + i * 5 + j) * 1e-6 for t in range(40) for i, j in [(1, 1), (3, 4)])
+    assert total == pytest.approx(expected, rel=1e-5)
+
+
+def test_import_pipelined(tmp_path, loader):
+    """Le mode pipeline importe les mêmes lignes et mesure le temps de chaque étage"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    
+    rows = loader.import_netcdf_file(**import_args(
+        path, chunk_size=50, max_block_mb=0.001, pipelined=True, queue_size=1
+    ))
+    assert rows == 40 * 19
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == rows
+    
+    stages = loader.last_import_stats["stages"]
+    assert set(stages) == {"reader", "converter", "writer"}
+    assert stages["reader"]["items"] == stages["converter"]["items"]
+    assert stages["writer"]["items"] > 1
+
+
+def test_import_pipelined_reader_error(tmp_path, loader):
+    """Une erreur de l'étage de lecture est remontée à l'appelant"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    
+    with pytest.raises(ValueError):
+        loader.import_netcdf_file(**import_args(
+            path, lat_filter=[46.1], lon_filter=[1.1], point_read_mode="inconnu", pipelined=True
+        ))
+
+
+def test_import_manifest_skip_and_append(tmp_path, loader):
+    """Un fichier inchangé est ignoré, un fichier prolongé n'importe que les nouvelles dates"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path, n_days=40)
+    assert loader.import_netcdf_file(**import_args(path)) == 40 * 19
+    
+    assert loader.import_netcdf_file(**import_args(path)) == 0
+    assert loader.last_import_stats["skipped"]
+    
+    # Le fichier gagne 20 jours: seule la nouvelle période est lue
+    write_netcdf(path, n_days=60)
+    assert loader.import_netcdf_file(**import_args(path)) == 20 * 19
+    assert loader.last_import_stats["resumed"]
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == 60 * 19
+    
+    status, last_index, last_time, rows = loader.conn.execute(
+        "SELECT status, last_time_index, last_time, rows FROM import_manifest"
+    ).fetchone()
+    assert (status, last_index, str(last_time), rows) == ("complete", 59, "2015-03-01", 60 * 19)
+
+
+def test_import_manifest_rewritten_file(tmp_path, loader):
+    """Un fichier réécrit sur le même axe temporel est réimporté en entier, valeurs corrigées"""
+    import os
+    
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path, n_days=40)
+    assert loader.import_netcdf_file(**import_args(path)) == 40 * 19
+    
+    # Correction d'une valeur au milieu des données, taille inchangée
+    with nc.Dataset(path, "a") as ds:
+        ds["prAdjust"][20, 2, 2] = 1.0
+    selection = loader.get_manifest_entry(str(path.resolve()), "grid|*-*")["selection"]
+    assert loader.plan_import(str(path), selection)["action"] == "import"
+    assert loader.import_netcdf_file(**import_args(path)) == 40 * 19
+    assert loader.conn.execute("SELECT COUNT(*), MAX(value) FROM climate_data").fetchone() == (40 * 19, 1.0)
+    
+    # Octet modifié, mtime restauré puis "touché": l'empreinte porte sur tout le fichier
+    stat = path.stat()
+    data = bytearray(path.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert loader.plan_import(str(path), selection)["action"] != "skip"
+
+
+def test_import_shortened_file_refreshes_derived_tables(tmp_path, loader):
+    """Fichier réécrit sur une période plus courte: années supprimées aussi dans les tables dérivées"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path, n_days=731)
+    loader.import_netcdf_file(**import_args(path))
+    loader.build_monthly_aggregates()
+    loader.build_cumulative_sums()
+    loader.build_exceedance_bitmaps(["pr_gt_2", "pr_lt_0.1"])
+    loader.build_dry_spells()
+    
+    write_netcdf(path, n_days=365)
+    assert loader.import_netcdf_file(**import_args(path)) == 365 * 19
+    for table, last in [
+        ("climate_data", "MAX(time)"), ("cumulative_sums", "MAX(time)"),
+        ("monthly_aggregates", "MAX(make_date(year, month, 1))"),
+        ("exceedance_bitmaps", "MAX(make_date(year, 1, 1))"), ("dry_spells", "MAX(end_date)"),
+    ]:
+        assert loader.conn.execute(f"SELECT {last} FROM {table}").fetchone()[0].year == 2015, table
+
+
+def test_import_counts_inserted_rows(tmp_path, loader):
+    """Lignes comptées sans les doublons ignorés par ON CONFLICT DO NOTHING"""
+    write_netcdf(tmp_path / "pr_a.nc")
+    write_netcdf(tmp_path / "pr_b.nc")
+    assert loader.import_netcdf_file(**import_args(tmp_path / "pr_a.nc")) == 40 * 19
+    # Même simulation et mêmes valeurs depuis un autre fichier: rien d'inséré
+    assert loader.import_netcdf_file(**import_args(tmp_path / "pr_b.nc")) == 0
+    assert loader.get_manifest_entry(str((tmp_path / "pr_b.nc").resolve()), "grid|*-*")["rows"] == 0
+
+
+def test_import_manifest_resume(tmp_path, loader, monkeypatch):
+    """Un import interrompu reprend après le dernier batch validé"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    
+    insert_batch = loader.insert_batch
+    calls = []
+    
+    def failing_insert(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("interruption")
+        return insert_batch(*args, **kwargs)
+    
+    monkeypatch.setattr(loader, "insert_batch", failing_insert)
+    with pytest.raises(RuntimeError):
+        loader.import_netcdf_file(**import_args(path, chunk_size=50, max_block_mb=0.001))
+    monkeypatch.undo()
+    
+    status, last_index, rows = loader.conn.execute(
+        "SELECT status, last_time_index, rows FROM import_manifest"
+    ).fetchone()
+    assert status == "partial"
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == rows == (last_index + 1) * 19
+    
+    resumed_rows = loader.import_netcdf_file(**import_args(path, chunk_size=50, max_block_mb=0.001))
+    assert resumed_rows == (39 - last_index) * 19
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == 40 * 19
+
+
+def test_import_bulk_load(tmp_path, loader):
+    """Le chargement via staging déduplique en une passe et compte les doublons"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    
+    rows = loader.import_netcdf_file(**import_args(
+        path, chunk_size=50, max_block_mb=0.001, bulk_load=True, staging_rows=300
+    ))
+    assert rows == 40 * 19
+    assert loader.last_import_stats["duplicates"] == 0
+    
+    # Un réimport forcé ne trouve que des doublons
+    assert loader.import_netcdf_file(**import_args(path, bulk_load=True, force=True)) == 0
+    assert loader.last_import_stats["duplicates"] == 40 * 19
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == 40 * 19
+    assert loader.conn.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'climate_staging'"
+    ).fetchone()[0] == 0
+
+
+def test_normalized_schema(tmp_path):
+    """Schéma normalisé: dimensions runs/cells et vue climate_data compatible"""
+    path = tmp_path / "prAdjust_test.nc"
+    path_r2 = tmp_path / "prAdjust_test_r2.nc"
+    write_netcdf(path)
+    write_netcdf(path_r2)
+    
+    with DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb"), read_only=False, normalized=True) as loader:
+        assert loader.layout == "normalized"
+        assert loader.import_netcdf_file(**import_args(path, chunk_size=50, max_block_mb=0.001)) == 40 * 19
+        # Second membre chargé via staging
+        assert loader.import_netcdf_file(**import_args(path_r2, member="r2", bulk_load=True)) == 40 * 19
+        assert loader.last_import_stats["duplicates"] == 0
+        
+        assert loader.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+        n_cells, n_grid = loader.conn.execute("SELECT COUNT(*), COUNT(grid_y) FROM cells").fetchone()
+        assert n_cells == n_grid == 20
+        assert loader.conn.execute("SELECT COUNT(*) FROM climate_values").fetchone()[0] == 2 * 40 * 19
+        
+        # Les requêtes existantes sur climate_data fonctionnent sur la vue
+        value = loader.conn.execute(
+            "SELECT value FROM climate_data WHERE member = 'r1' AND time = DATE '2015-01-02' "
+            "AND ABS(lat - 46.1) < 1e-6 AND ABS(lon - 1.2) < 1e-6"
+        ).fetchone()[0]
+        assert value == pytest.approx(np.float32((1 * 20 + 1 * 5 + 2) * 1e-6))
+        series = loader.get_time_series(46.1, 1.2, VariableType.PR, ExperimentType.SSP370, "CNRM-ESM2-1", "CNRM-ALADIN63-EMUL", "r2")
+        assert len(series) == 40
+        assert loader.get_runs()["member"].tolist() == ["r1", "r2"]
+    
+    with DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb")) as reader:
+        assert reader.layout == "normalized"
+
+
+def test_normalize_existing_database(tmp_path):
+    """Une base historique est convertie au schéma normalisé sans perte"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    db_path = str(tmp_path / "test.duckdb")
+    
+    with DuckDBClimateLoader(db_path=db_path, read_only=False) as loader:
+        assert loader.layout == "long"
+        loader.import_netcdf_file(**import_args(path))
+        expected = loader.conn.execute("SELECT COUNT(*), SUM(value), MIN(time), MAX(time) FROM climate_data").fetchone()
+    
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=True) as loader:
+        assert loader.layout == "normalized"
+        assert loader.conn.execute("SELECT COUNT(*), SUM(value), MIN(time), MAX(time) FROM climate_data").fetchone() == expected
+        assert loader.conn.execute(
+            "SELECT table_type FROM information_schema.tables WHERE table_name = 'climate_data'"
+        ).fetchone()[0] == "VIEW"
+        # Le fichier reste connu de import_manifest
+        assert loader.import_netcdf_file(**import_args(path)) == 0
+
+
+@pytest.mark.parametrize("normalized", [False, True])
+def test_wide_table(tmp_path, normalized):
+    """La table large fusionne les variables et se lit en une requête"""
+    from benchmarks.generate_safran import write_safran_file
+    
+    with DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb"), read_only=False, normalized=normalized) as loader:
+        for name, variable in [("prAdjust", VariableType.PR), ("tasAdjust", VariableType.TAS)]:
+            path = write_safran_file(tmp_path / f"{name}.nc", name, 2015, 2015, ny=6, nx=5)
+            loader.import_netcdf_file(**dict(import_args(path), variable=variable))
+        lat, lon = loader.conn.execute("SELECT lat, lon FROM climate_data LIMIT 1").fetchone()
+        
+        # Sans table large: pivot à la volée
+        pivoted = loader.get_multi_variable_series(lat + 0.01, lon, [VariableType.PR, VariableType.TAS], ExperimentType.SSP370)
+        assert len(pivoted) == 365
+        
+        n_cells = loader.conn.execute("SELECT COUNT(DISTINCT (lat, lon)) FROM climate_data").fetchone()[0]
+        assert loader.build_wide_table() == n_cells * 365
+        wide = loader.get_multi_variable_series(lat + 0.01, lon, [VariableType.PR, VariableType.TAS], ExperimentType.SSP370)
+        assert wide.equals(pivoted)
+        assert wide["pr"].notna().all() and (wide["tas"] > 250).all()
+        
+        # Reconstruction d'une seule simulation
+        assert loader.build_wide_table([("ssp370", "CNRM-ESM2-1", "CNRM-ALADIN63-EMUL", "r1")]) == n_cells * 365
+        assert loader.conn.execute("SELECT COUNT(*) FROM climate_wide").fetchone()[0] == n_cells * 365
+        
+        # Import ultérieur (sans reconstruction): table large tenue à jour
+        path = write_safran_file(tmp_path / "prAdjust_r2.nc", "prAdjust", 2015, 2015, ny=6, nx=5)
+        loader.import_netcdf_file(**import_args(path, member="r2"))
+        series = loader.get_multi_variable_series(lat + 0.01, lon, [VariableType.PR, VariableType.TAS], ExperimentType.SSP370)
+        assert sorted(series["member"].unique()) == ["r1", "r2"]
+        assert series.loc[series["member"] == "r2", "pr"].notna().sum() == 365
+
+
+def test_packed_series(tmp_path, loader):
+    """Les séries annuelles compactées restituent les valeurs journalières"""
+    from benchmarks.generate_safran import write_safran_file
+    
+    for member in ["r1", "r2"]:
+        path = write_safran_file(tmp_path / f"prAdjust_{member}.nc", "prAdjust", 2015, 2016, ny=6, nx=5, seed=len(member))
+        if member == "r1":
+            loader.import_netcdf_file(**import_args(path, member=member))
+    lat, lon = loader.conn.execute("SELECT lat, lon FROM climate_data LIMIT 1").fetchone()
+    
+    n_cells = loader.conn.execute("SELECT COUNT(DISTINCT (lat, lon)) FROM climate_data").fetchone()[0]
+    assert loader.build_series_table(years_per_chunk=1) == 2 * n_cells
+    
+    # Un import postérieur à la construction met à jour climate_series
+    loader.import_netcdf_file(**import_args(path, member="r2"))
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_series").fetchone()[0] == 2 * 2 * n_cells
+    
+    dates, simulations, values = loader.get_series_array(lat + 0.01, lon, VariableType.PR, ExperimentType.SSP370)
+    assert [member for _, _, member in simulations] == ["r1", "r2"]
+    assert values.shape == (2, 731) and values.dtype == np.float32
+    assert str(dates[0]) == "2015-01-01" and str(dates[-1]) == "2016-12-31"
+    
+    expected = loader.get_time_series(lat, lon, VariableType.PR, ExperimentType.SSP370, "CNRM-ESM2-1", "CNRM-ALADIN63-EMUL", "r2")
+    np.testing.assert_allclose(values[1], expected["value"].to_numpy(), rtol=1e-6)
+    
+    # Filtre sur les années et les membres
+    dates, simulations, values = loader.get_series_array(
+        lat, lon, VariableType.PR, ExperimentType.SSP370, members=["r1"], start_year=2016
+    )
+    assert len(simulations) == 1 and values.shape == (1, 366)
+
+
+@pytest.mark.parametrize("value_encoding, normalized", [("float", False), ("int16", True), ("int32", True)])
+def test_value_encodings(tmp_path, value_encoding, normalized):
+    """Les valeurs encodées sont décodées par climate_data à l'erreur de quantification près"""
+    from benchmarks.generate_safran import write_safran_file
+    
+    files = [
+        (write_safran_file(tmp_path / "prAdjust.nc", "prAdjust", 2015, 2015, ny=6, nx=5), VariableType.PR),
+        (write_safran_file(tmp_path / "tasAdjust.nc", "tasAdjust", 2015, 2015, ny=6, nx=5), VariableType.TAS),
+    ]
+    query = "SELECT variable, lat, lon, time, value FROM climate_data ORDER BY ALL"
+    with DuckDBClimateLoader(db_path=str(tmp_path / "reference.duckdb"), read_only=False) as reference:
+        for path, variable in files:
+            reference.import_netcdf_file(**dict(import_args(path), variable=variable))
+        expected = reference.conn.execute(query).df()
+        assert reference.encoding_report().empty
+    
+    db_path = str(tmp_path / "test.duckdb")
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=normalized, value_encoding=value_encoding) as loader:
+        # Import direct pour pr, via staging pour tas
+        for (path, variable), bulk_load in zip(files, [False, True]):
+            loader.import_netcdf_file(**dict(import_args(path), variable=variable, bulk_load=bulk_load))
+        actual = loader.conn.execute(query).df()
+        report = loader.encoding_report().set_index("variable")
+    
+    assert actual[["variable", "lat", "lon", "time"]].equals(expected[["variable", "lat", "lon", "time"]])
+    error = (actual["value"] - expected["value"]).abs()
+    assert list(report.index) == ["pr", "tas"]
+    assert (report["clipped"] == 0).all()
+    for name, group in error.groupby(actual["variable"]):
+        # Le rapport donne exactement l'erreur maximale constatée
+        assert group.max() == pytest.approx(report.loc[name, "max_abs_error"], rel=1e-6, abs=1e-12)
+        if value_encoding != "float":
+            assert group.max() <= report.loc[name, "scale"] / 2 * (1 + 1e-6)
+    
+    # L'encodage est retrouvé à la réouverture
+    with DuckDBClimateLoader(db_path=db_path, read_only=True) as loader:
+        assert loader.value_encoding == value_encoding
+
+
+def test_scaled_encoding_requires_normalized(tmp_path):
+    """Les entiers ne peuvent pas être décodés par la table climate_data historique"""
+    with pytest.raises(ValueError, match="normalisé"):
+        DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb"), read_only=False, value_encoding="int16")
+
+
+def test_normalize_with_value_encoding(tmp_path):
+    """La conversion au schéma normalisé applique l'encodage demandé"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    db_path = str(tmp_path / "test.duckdb")
+    
+    with DuckDBClimateLoader(db_path=db_path, read_only=False) as loader:
+        loader.import_netcdf_file(**import_args(path))
+        expected = loader.conn.execute("SELECT value FROM climate_data ORDER BY lat, lon, time").fetchnumpy()["value"]
+    
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=True, value_encoding="int16") as loader:
+        assert loader.value_encoding == "int16"
+        values = loader.conn.execute("SELECT value FROM climate_data ORDER BY lat, lon, time").fetchnumpy()["value"]
+        report = loader.encoding_report()
+    np.testing.assert_allclose(values, expected, atol=report["scale"].iloc[0] / 2 * (1 + 1e-6))
+    assert report["max_abs_error"].iloc[0] == pytest.approx(np.abs(values - expected).max(), rel=1e-6)
+
+
+@pytest.mark.parametrize("value_encoding", ["double", "int16"])
+def test_agronomic_units(tmp_path, value_encoding):
+    """Import en mm/jour et °C: unités enregistrées dans variable_units, requêtes sans conversion"""
+    from benchmarks.generate_safran import write_safran_file
+    from units import MM_PER_DAY, CELSIUS
+    
+    files = [
+        (write_safran_file(tmp_path / "prAdjust.nc", "prAdjust", 2015, 2015, ny=4, nx=4), VariableType.PR),
+        (write_safran_file(tmp_path / "tasAdjust.nc", "tasAdjust", 2015, 2015, ny=4, nx=4), VariableType.TAS),
+    ]
+    query = "SELECT variable, lat, lon, time, value FROM climate_data ORDER BY ALL"
+    with DuckDBClimateLoader(db_path=str(tmp_path / "native.duckdb"), read_only=False) as native:
+        for path, variable in files:
+            native.import_netcdf_file(**dict(import_args(path), variable=variable))
+        assert native.get_variable_units()["pr"] == "kg m-2 s-1"
+        pr_sql, tas_sql = native.unit_sql("pr", MM_PER_DAY), native.unit_sql("tas", CELSIUS)
+        expected = native.conn.execute(f"""
+            SELECT variable, lat, lon, time,
+                   CASE variable WHEN 'pr' THEN {pr_sql} ELSE {tas_sql} END AS value
+            FROM climate_data ORDER BY ALL
+        """).df()
+    
+    db_path = str(tmp_path / "test.duckdb")
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=True,
+                             value_encoding=value_encoding, agronomic_units=True) as loader:
+        for (path, variable), bulk_load in zip(files, [False, True]):
+            loader.import_netcdf_file(**dict(import_args(path), variable=variable, bulk_load=bulk_load))
+        actual = loader.conn.execute(query).df()
+        report = loader.encoding_report()
+    
+    with DuckDBClimateLoader(db_path=db_path, read_only=True) as loader:
+        assert loader.get_variable_units()["pr"] == MM_PER_DAY
+        assert loader.get_variable_units()["tas"] == CELSIUS
+        assert loader.unit_sql("pr", MM_PER_DAY) == "value"
+        assert loader.unit_sql("tas", "K") == "(value + 273.15)"
+    
+    tolerance = 1e-4 if value_encoding == "double" else 0.005 * (1 + 1e-6)
+    np.testing.assert_allclose(actual["value"], expected["value"], atol=tolerance)
+    if value_encoding == "int16":
+        # Pas exprimés dans l'unité de stockage: 0.01 mm/jour et 0.01 °C
+        assert report.set_index("variable")["scale"].to_dict() == {"pr": 0.01, "tas": 0.01}
+        assert (report["clipped"] == 0).all()
+
+
+def test_units_of_existing_database(tmp_path):
+    """Une base antérieure à variable_units garde les unités des fichiers"""
+    path = tmp_path / "prAdjust_test.nc"
+    write_netcdf(path)
+    db_path = str(tmp_path / "test.duckdb")
+    with DuckDBClimateLoader(db_path=db_path, read_only=False) as loader:
+        loader.import_netcdf_file(**import_args(path))
+        loader.conn.execute("DROP TABLE variable_units")
+    
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, agronomic_units=True) as loader:
+        assert loader.conn.execute("SELECT * FROM variable_units").fetchall() == [("pr", "kg m-2 s-1")]
+
+
+@pytest.mark.parametrize("normalized", [False, True])
+def test_optimize_layout(tmp_path, normalized):
+    """La réécriture trie la table par simulation, point puis date sans perte ni doublon"""
+    db_path = str(tmp_path / "test.duckdb")
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=normalized) as loader:
+        for member in ["r2", "r1"]:
+            path = tmp_path / f"prAdjust_{member}.nc"
+            write_netcdf(path)
+            loader.import_netcdf_file(**import_args(path, member=member))
+        summary = "SELECT COUNT(*), SUM(value), MIN(time), MAX(time) FROM climate_data"
+        expected = loader.conn.execute(summary).fetchone()
+        
+        assert loader.optimize_layout() == expected[0]
+        assert loader.conn.execute(summary).fetchone() == expected
+        table, order = ("climate_values", ["run_id", "cell_id", "time"]) if normalized else \
+            ("climate_data", ["member", "lat", "lon", "time"])
+        stored = loader.conn.execute(f"SELECT {', '.join(order)} FROM {table} ORDER BY rowid").df()
+        assert stored.equals(stored.sort_values(order, ignore_index=True))
+        assert loader.conn.execute("SELECT COUNT(*) FROM duckdb_indexes() WHERE index_name LIKE 'idx_%'").fetchone()[0] == 0
+        
+        # La clé primaire est conservée: un nouvel import du même fichier n'ajoute rien
+        batch = loader.conn.execute("SELECT lat, lon, time, value FROM climate_data WHERE member = 'r1'").df()
+        loader.insert_batch(batch, VariableType.PR, ExperimentType.SSP370, "CNRM-ESM2-1", "CNRM-ALADIN63-EMUL", "r1")
+        assert loader.conn.execute(summary).fetchone() == expected
+
+
+@pytest.mark.parametrize("normalized", [False, True])
+def test_monthly_aggregates(tmp_path, normalized):
+    """Les agrégats mensuels donnent les mêmes valeurs que climate_data et suivent les imports"""
+    from benchmarks.generate_safran import write_safran_file
+    from units import MM_PER_DAY
+    
+    db_path = str(tmp_path / "test.duckdb")
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=normalized) as loader:
+        path = write_safran_file(tmp_path / "prAdjust_r1.nc", "prAdjust", 2015, 2015, ny=4, nx=3)
+        loader.import_netcdf_file(**import_args(path))
+        
+        # Période non alignée sur les mois: mois partiels lus dans climate_data
+        args = ("pr", "ssp370", date(2015, 1, 10), date(2015, 11, 20))
+        filters, params = " AND member IN (?, ?)", ["r1", "r2"]
+        expected = loader.get_monthly_values(*args, unit=MM_PER_DAY, filters=filters, filter_params=params)
+        assert loader.build_monthly_aggregates() == loader.conn.execute(
+            "SELECT COUNT(DISTINCT (lat, lon)) * 12 FROM climate_data"
+        ).fetchone()[0]
+        actual = loader.get_monthly_values(*args, unit=MM_PER_DAY, filters=filters, filter_params=params)
+        assert actual[["lat", "lon", "member", "year", "month", "days_count"]].equals(
+            expected[["lat", "lon", "member", "year", "month", "days_count"]]
+        )
+        np.testing.assert_allclose(actual["value"], expected["value"], rtol=1e-9)
+        assert actual.groupby("month")["days_count"].first().to_dict()[1] == 22
+        
+        # Un nouveau membre (import direct) et une nouvelle année (staging) sont ajoutés
+        path = write_safran_file(tmp_path / "prAdjust_r2.nc", "prAdjust", 2015, 2015, ny=4, nx=3, seed=1)
+        loader.import_netcdf_file(**import_args(path, member="r2"))
+        path = write_safran_file(tmp_path / "prAdjust_r1_2016.nc", "prAdjust", 2016, 2016, ny=4, nx=3, seed=2)
+        loader.import_netcdf_file(**import_args(path, bulk_load=True))
+        counts = loader.conn.execute("""
+            SELECT member, year, SUM(days_count), SUM(value_sum) FROM monthly_aggregates
+            GROUP BY ALL ORDER BY ALL
+        """).fetchall()
+        raw = loader.conn.execute("""
+            SELECT member, year(time), COUNT(*), SUM(value) FROM climate_data
+            GROUP BY ALL ORDER BY ALL
+        """).fetchall()
+        assert [row[:3] for row in counts] == [row[:3] for row in raw]
+        np.testing.assert_allclose([row[3] for row in counts], [row[3] for row in raw], rtol=1e-9)
+        assert [row[:2] for row in counts] == [("r1", 2015), ("r1", 2016), ("r2", 2015)]
+
+
+@pytest.mark.parametrize("normalized", [False, True])
+def test_cumulative_sums(tmp_path, normalized):
+    """Totaux de périodes par différence de cumuls, identiques au calcul sur climate_data"""
+    from benchmarks.generate_safran import write_safran_file
+    from units import MM_PER_DAY
+    
+    db_path = str(tmp_path / "test.duckdb")
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=normalized) as loader:
+        path = write_safran_file(tmp_path / "prAdjust_r1.nc", "prAdjust", 2015, 2015, ny=4, nx=3)
+        loader.import_netcdf_file(**import_args(path))
+        # Un jour manquant: la veille du 2015-06-11 n'a pas de valeur
+        if not normalized:
+            loader.conn.execute("DELETE FROM climate_data WHERE time = '2015-06-10'")
+        
+        periods = [(date(2015, 3, 1), date(2015, 4, 30)), (date(2014, 12, 1), date(2015, 1, 31)),
+                   (date(2015, 6, 11), date(2015, 6, 20)), (date(2015, 6, 10), date(2015, 6, 10)),
+                   (date(2015, 12, 1), date(2016, 1, 31)), (date(2015, 3, 1), date(2015, 4, 30))]
+        expected = loader.get_period_totals("pr", "ssp370", periods, unit=MM_PER_DAY)
+        loader.build_cumulative_sums()
+        assert loader.has_cumulative_sums("pr") and not loader.has_cumulative_sums("tas")
+        actual = loader.get_period_totals("pr", "ssp370", periods, unit=MM_PER_DAY)
+        
+        # Sans données après la fin de période, pas de total pour la période débordant des données
+        expected = expected[expected["period"] != 4].reset_index(drop=True)
+        assert sorted(actual["period"].unique()) == ([0, 1, 2, 5] if not normalized else [0, 1, 2, 3, 5])
+        assert actual.drop(columns="value").equals(expected.drop(columns="value"))
+        np.testing.assert_allclose(actual["value"], expected["value"], rtol=1e-9)
+        assert (actual.loc[actual["period"] == 1, "days_count"] == 31).all()
+        
+        # L'import d'une année suivante prolonge les cumuls existants
+        path = write_safran_file(tmp_path / "prAdjust_r1_2016.nc", "prAdjust", 2016, 2016, ny=4, nx=3, seed=1)
+        loader.import_netcdf_file(**import_args(path, bulk_load=True))
+        periods = [(date(2015, 12, 1), date(2016, 1, 31)), (date(2015, 1, 1), date(2016, 12, 31))]
+        actual = loader.get_period_totals("pr", "ssp370", periods)
+        loader.conn.execute("DROP TABLE cumulative_sums")
+        expected = loader.get_period_totals("pr", "ssp370", periods)
+        assert actual.drop(columns="value").equals(expected.drop(columns="value"))
+        np.testing.assert_allclose(actual["value"], expected["value"], rtol=1e-9)
+
+
+def test_rolling_minima(tmp_path, loader):
+    """Minimum des sommes glissantes dans une saison, comparé aux fenêtres parcourues une à une"""
+    from benchmarks.generate_safran import write_safran_file
+    from units import MM_PER_DAY
+    
+    for seed, member in enumerate(["r1", "r2"]):
+        path = write_safran_file(tmp_path / f"prAdjust_{member}.nc", "prAdjust", 2015, 2016, ny=4, nx=3, seed=seed)
+        loader.import_netcdf_file(**import_args(path, member=member))
+    queries = [(15, date(2015, 10, 15), date(2015, 12, 15)), (60, date(2015, 5, 15), date(2015, 8, 31)),
+               (30, date(2016, 5, 15), date(2016, 8, 31)), (30, date(2016, 12, 10), date(2017, 1, 31)),
+               (42, date(2015, 8, 15), date(2015, 9, 10))]
+    filters, params = " AND lat > ? AND lat < ?", [0.0, 90.0]
+    
+    result = loader.get_rolling_minima("pr", "ssp370", queries, unit=MM_PER_DAY, filters=filters,
+                                       filter_params=params, mean_cells=True)
+    daily = loader.conn.execute(f"""
+        SELECT member, time, AVG({loader.unit_sql('pr', MM_PER_DAY)}) AS value
+        FROM climate_data WHERE variable = 'pr' {filters} GROUP BY ALL ORDER BY ALL
+    """, params).df()
+    
+    assert len(result) == 2 * len(queries)
+    for row in result.itertuples():
+        season = daily[(daily["member"] == row.member)
+                       & (daily["time"] >= pd.Timestamp(row.start_date))
+                       & (daily["time"] <= pd.Timestamp(row.end_date))]["value"].to_numpy()
+        assert row.days_count == len(season)
+        if len(season) < row.window:
+            assert np.isnan(row.value)
+        else:
+            sums = [season[i:i + row.window].sum() for i in range(len(season) - row.window + 1)]
+            assert row.value == pytest.approx(min(sums), rel=1e-9)
+    
+    # Index gardés en mémoire jusqu'à la prochaine écriture
+    per_cell = loader.get_rolling_minima("pr", "ssp370", queries[:1])
+    assert len(per_cell) == 2 * loader.conn.execute("SELECT COUNT(DISTINCT (lat, lon)) FROM climate_data").fetchone()[0]
+    assert len(loader._rolling_indexes) == 2
+    path = write_safran_file(tmp_path / "prAdjust_r3.nc", "prAdjust", 2015, 2015, ny=4, nx=3, seed=3)
+    loader.import_netcdf_file(**import_args(path, member="r3"))
+    assert not loader._rolling_indexes
+
+
+def test_exceedance_bitmaps(tmp_path, loader):
+    """Jours au-delà d'un seuil et plus longues suites, depuis les bitmaps ou climate_data"""
+    from benchmarks.generate_safran import write_safran_file
+    from units import MM_PER_DAY
+    
+    path = write_safran_file(tmp_path / "prAdjust_r1.nc", "prAdjust", 2015, 2016, ny=4, nx=3)
+    loader.import_netcdf_file(**import_args(path))
+    periods = [(date(2015, 3, 1), date(2015, 4, 30)), (date(2015, 12, 20), date(2016, 3, 1)),
+               (date(2014, 12, 1), date(2015, 1, 10)), (date(2016, 12, 31), date(2017, 6, 30))]
+    
+    expected = loader.get_exceedance_days("pr_lt_0.1", "ssp370", periods)
+    daily = loader.conn.execute(f"""
+        SELECT lat, lon, time, {loader.unit_sql('pr', MM_PER_DAY)} < 0.1 AS dry
+        FROM climate_data ORDER BY ALL
+    """).df()
+    cells = loader.conn.execute("SELECT COUNT(DISTINCT (lat, lon)) FROM climate_data").fetchone()[0]
+    assert len(expected) == len(periods) * cells
+    for row in expected.sample(20, random_state=0).itertuples():
+        dry = daily[(daily["lat"] == row.lat) & (daily["lon"] == row.lon)
+                    & (daily["time"] >= row.start_date) & (daily["time"] <= row.end_date)]["dry"]
+        runs = (dry != dry.shift()).cumsum()[dry]
+        assert row.days_count == dry.sum()
+        assert row.longest_run == (runs.value_counts().max() if dry.any() else 0)
+    
+    assert loader.build_exceedance_bitmaps(["pr_lt_0.1", "pr_gt_2", "tasmax_gt_30"]) == 2 * 2 * cells
+    assert loader.get_exceedance_days("pr_lt_0.1", "ssp370", periods).equals(expected)
+    
+    # Une nouvelle année importée est ajoutée aux bitmaps existants
+    path = write_safran_file(tmp_path / "prAdjust_r1_2017.nc", "prAdjust", 2017, 2017, ny=4, nx=3, seed=1)
+    loader.import_netcdf_file(**import_args(path, bulk_load=True))
+    actual = loader.get_exceedance_days("pr_gt_2", "ssp370", periods, longest_run=False)
+    loader.conn.execute("DROP TABLE exceedance_bitmaps")
+    assert actual.equals(loader.get_exceedance_days("pr_gt_2", "ssp370", periods, longest_run=False))
+    assert actual.loc[actual["period"] == 3, "days_count"].sum() > 0
+    
+    with pytest.raises(ValueError):
+        loader.get_exceedance_days("pr_gt_50", "ssp370", periods)
+
+
+@pytest.mark.parametrize("normalized", [False, True])
+def test_dry_spells(tmp_path, normalized):
+    """Plus longues périodes sèches coupées aux bornes des périodes, suites fusionnées entre imports"""
+    from benchmarks.generate_safran import write_safran_file
+    from units import MM_PER_DAY
+    
+    db_path = str(tmp_path / "test.duckdb")
+    with DuckDBClimateLoader(db_path=db_path, read_only=False, normalized=normalized) as loader:
+        path = write_safran_file(tmp_path / "prAdjust_r1.nc", "prAdjust", 2015, 2015, ny=4, nx=3)
+        loader.import_netcdf_file(**import_args(path))
+        periods = [(date(2015, 3, 1), date(2015, 4, 30)), (date(2014, 12, 1), date(2015, 1, 10)),
+                   (date(2015, 12, 20), date(2016, 1, 20)), (date(2015, 7, 4), date(2015, 7, 4))]
+        
+        expected = loader.get_longest_dry_spells("ssp370", periods, threshold=1.0)
+        daily = loader.conn.execute(f"""
+            SELECT lat, lon, time, {loader.unit_sql('pr', MM_PER_DAY)} < 1.0 AS dry
+            FROM climate_data ORDER BY ALL
+        """).df()
+        cells = daily.groupby(["lat", "lon"])
+        for (start, end), (period, rows) in zip(periods, expected.groupby("period")):
+            for row in rows.itertuples():
+                dry = cells.get_group((row.lat, row.lon)).set_index("time")["dry"]
+                dry = dry[pd.Timestamp(start):pd.Timestamp(end)]
+                assert row.dry_days == dry.sum()
+                assert row.longest_spell == (dry != dry.shift()).cumsum()[dry].value_counts().max()
+            assert len(rows) == sum(
+                group.set_index("time")["dry"][pd.Timestamp(start):pd.Timestamp(end)].any() for _, group in cells
+            )
+        
+        # Jours secs jusqu'au 31 décembre: une suite continue sur l'import suivant
+        if not normalized:
+            loader.conn.execute("UPDATE climate_data SET value = 0 WHERE time >= '2015-12-25'")
+            expected = loader.get_longest_dry_spells("ssp370", periods, threshold=1.0)
+        assert loader.build_dry_spells() > 0
+        assert loader.has_dry_spells(0.1) and not loader.has_dry_spells(2.0)
+        assert loader.get_longest_dry_spells("ssp370", periods, threshold=1.0).equals(expected)
+        
+        # Les suites à cheval sur deux imports sont fusionnées
+        path = write_safran_file(tmp_path / "prAdjust_r1_2016.nc", "prAdjust", 2016, 2016, ny=4, nx=3, seed=1)
+        loader.import_netcdf_file(**import_args(path, bulk_load=True))
+        spells = "SELECT * FROM dry_spells ORDER BY ALL"
+        actual = loader.conn.execute(spells).fetchall()
+        loader.build_dry_spells()
+        assert loader.conn.execute(spells).fetchall() == actual
+        result = loader.get_longest_dry_spells("ssp370", periods)
+        loader.conn.execute("DROP TABLE dry_spells")
+        assert result.equals(loader.get_longest_dry_spells("ssp370", periods))
+
+
+def test_partitioned_database(tmp_path):
+    """Un fichier par scénario et variable, attachés à la demande; répartition d'une base existante"""
+    from duckdb_loader import partition_directory
+    
+    db_path = tmp_path / "climate_data.duckdb"
+    write_netcdf(tmp_path / "pr_r1.nc", n_days=400)
+    write_netcdf(tmp_path / "pr_r2.nc", n_days=400)
+    with DuckDBClimateLoader(db_path=str(tmp_path / "single.duckdb"), read_only=False) as single:
+        single.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc"))
+        single.import_netcdf_file(**import_args(tmp_path / "pr_r2.nc", member="r2", bulk_load=True))
+        periods = [(date(2015, 1, 1), date(2015, 1, 31)), (date(2015, 3, 1), date(2015, 5, 31))]
+        totals = single.get_period_totals("pr", "ssp370", periods)
+        monthly = single.get_monthly_values("pr", "ssp370", date(2015, 1, 1), date(2015, 12, 31))
+    
+    with DuckDBClimateLoader(db_path=str(db_path), read_only=False, partitioned=True) as loader:
+        assert loader.layout == "partitioned"
+        loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc"))
+        loader.import_netcdf_file(**import_args(tmp_path / "pr_r2.nc", member="r2", bulk_load=True))
+        args = import_args(tmp_path / "pr_r1.nc")
+        args["experiment"] = ExperimentType.SSP585
+        loader.import_netcdf_file(**args)
+        assert sorted(p.relative_to(partition_directory(db_path)).as_posix()
+                      for p in partition_directory(db_path).rglob("*.duckdb")) == ["ssp370/pr.duckdb", "ssp585/pr.duckdb"]
+        assert not db_path.exists()
+        
+        assert len(loader.get_runs()) == 3 and len(loader.get_runs("pr", "ssp370")) == 2
+        assert loader.get_period_totals("pr", "ssp370", periods).equals(totals)
+        assert loader.build_monthly_aggregates() > 0 and loader.has_table("monthly_aggregates")
+        actual = loader.get_monthly_values("pr", "ssp370", date(2015, 1, 1), date(2015, 12, 31))
+        pd.testing.assert_frame_equal(actual, monthly, check_dtype=False, rtol=1e-9)
+    
+    # Lecture seule (API): seule la partition interrogée est attachée
+    with DuckDBClimateLoader(db_path=str(db_path)) as loader:
+        assert loader.layout == "partitioned"
+        assert loader.get_period_totals("pr", "ssp370", periods).equals(totals)
+        assert loader.get_partitions().set_index("experiment")["attached"].to_dict() == {"ssp370": True, "ssp585": False}
+    
+    # Répartition d'une base existante
+    with DuckDBClimateLoader(db_path=str(tmp_path / "single.duckdb"), read_only=False, partitioned=True) as loader:
+        assert loader.get_runs()["member"].tolist() == ["r1", "r2"]
+        assert loader.get_period_totals("pr", "ssp370", periods).equals(totals)
+        # import_manifest copié: fichier inchangé non réimporté
+        assert loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc")) == 0
+
+
+def test_maintain_and_storage_report(tmp_path, loader):
+    """Compaction sans perte de données ni de clé primaire, rapport de stockage par colonne et row group"""
+    write_netcdf(tmp_path / "pr_r1.nc", n_days=2000, ny=8, nx=8)
+    loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc"))
+    loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc", force=True))
+    loader.build_monthly_aggregates()
+    loader.optimize_layout()
+    expected = loader.conn.execute("SELECT * FROM climate_data ORDER BY ALL").df()
+    
+    sizes = loader.maintain()
+    assert sizes["path"].tolist() == [str(loader.db_path)]
+    assert (sizes["size_after_mb"] < sizes["size_before_mb"]).all()
+    assert loader.conn.execute("SELECT * FROM climate_data ORDER BY ALL").df().equals(expected)
+    # Pool de curseurs recréé sur la nouvelle connexion
+    with loader.cursor():
+        assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == len(expected)
+    
+    report = loader.storage_report()
+    columns = report["columns"].set_index(["table_name", "column_name"])
+    assert (columns.loc["climate_data", "rows"] == len(expected)).all()
+    assert columns.loc[("climate_data", "value"), "bytes"] > 0
+    assert columns.loc[("climate_data", "variable"), "compression"] == "Dictionary"
+    row_groups = report["row_groups"].query("table_name == 'climate_data'")
+    assert row_groups["rows"].sum() == len(expected) and not row_groups["has_updates"].any()
+    assert report["row_groups"]["bytes"].sum() == report["columns"]["bytes"].sum()
+    
+    # Connexion rouverte: clé primaire conservée (doublons ignorés), base toujours modifiable
+    assert loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc", force=True)) == 0
+    assert loader.conn.execute("SELECT COUNT(*) FROM climate_data").fetchone()[0] == len(expected)
+
+
+@pytest.mark.parametrize("partitioned", [False, True])
+def test_concurrent_cursors(tmp_path, partitioned):
+    """Lectures parallèles par des curseurs du pool (vues de route propres à chaque curseur)"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    db_path = tmp_path / "climate_data.duckdb"
+    write_netcdf(tmp_path / "pr_r1.nc", n_days=400)
+    with DuckDBClimateLoader(db_path=str(db_path), read_only=False, partitioned=partitioned) as loader:
+        loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc"))
+        args = import_args(tmp_path / "pr_r1.nc")
+        args["experiment"] = ExperimentType.SSP585
+        loader.import_netcdf_file(**args)
+    
+    periods = [(date(2015, 1, 1), date(2015, 1, 31)), (date(2015, 3, 1), date(2015, 5, 31))]
+    with DuckDBClimateLoader(db_path=str(db_path), pool_size=2) as loader:
+        expected = {experiment: loader.get_period_totals("pr", experiment, periods) for experiment in ("ssp370", "ssp585")}
+        
+        def read(experiment):
+            with loader.cursor() as cursor:
+                assert loader.conn is cursor
+                with loader.cursor() as nested:
+                    assert nested is cursor
+                return experiment, loader.get_period_totals("pr", experiment, periods)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(read, ["ssp370", "ssp585"] * 8))
+        for experiment, totals in results:
+            assert totals.equals(expected[experiment])
+        
+        metrics = loader.pool.metrics()
+        assert metrics["checkouts"] == 16 and metrics["created"] <= 2 and metrics["in_use"] == 0
+        assert loader.conn is loader._conn
@@ -0,0 +1,69 @@
+"""
+Tests pour l'index spatial des grilles (plus proches mailles)
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+import grid_index
+from grid_index import GridIndex, haversine_km
+
+
+def make_grid(ny: int = 30, nx: int = 40):
+    """Grille curviligne légèrement tournée, avec une maille sans coordonnées"""
+    j, i = np.meshgrid(np.arange(nx), np.arange(ny))
+    lat = 42.0 + 0.08 * i + 0.01 * j
+    lon = -4.0 + 0.11 * j - 0.02 * i
+    lat[0, 0] = lon[0, 0] = np.nan
+    return lat, lon
+
+
+def test_nearest_matches_brute_force_haversine():
+    """Le KD-tree (ou la recherche exhaustive) retrouve la maille la plus proche en haversine"""
+    lat, lon = make_grid()
+    rng = np.random.default_rng(0)
+    targets_lat = rng.uniform(42.0, 44.5, 500)
+    targets_lon = rng.uniform(-4.0, 0.0, 500)
+    
+    index = GridIndex(lat, lon)
+    lat_idx, lon_idx, distances = index.nearest(targets_lat, targets_lon)
+    
+    all_distances = haversine_km(targets_lat[:, None], targets_lon[:, None], lat.ravel()[None, :], lon.ravel()[None, :])
+    expected = np.nanargmin(all_distances, axis=1)
+    assert np.array_equal(np.ravel_multi_index((lat_idx, lon_idx), lat.shape), expected)
+    assert np.allclose(distances, np.nanmin(all_distances, axis=1))
+
+
+def test_k_nearest_sorted_and_brute_force_fallback(monkeypatch):
+    """Les k voisins sont triés et identiques sans scipy"""
+    lat, lon = make_grid()
+    targets = (np.array([43.0, 42.5]), np.array([-2.0, -3.1]))
+    
+    _, _, distances = GridIndex(lat, lon).query(*targets, k=4)
+    assert distances.shape == (2, 4)
+    assert np.all(np.diff(distances, axis=1) >= 0)
+    
+    monkeypatch.setattr(grid_index, "SCIPY_AVAILABLE", False)
+    fallback = GridIndex(lat, lon)
+    assert fallback.tree is None
+    assert np.allclose(fallback.query(*targets, k=4)[2], distances)
+
+
+def test_disk_cache(tmp_path, monkeypatch):
+    """L'index est sérialisé par signature de grille et relu depuis le disque"""
+    lat, lon = make_grid()
+    monkeypatch.setattr(grid_index, "_grid_index_cache", {})
+    index = GridIndex.load_or_build(lat, lon, cache_dir=str(tmp_path))
+    cache_files = list(tmp_path.glob("grid_index_*.pkl"))
+    assert [f.name for f in cache_files] == [f"grid_index_{index.signature}.pkl"]
+    
+    monkeypatch.setattr(grid_index, "_grid_index_cache", {})
+    reloaded = GridIndex.load_or_build(lat, lon, cache_dir=str(tmp_path))
+    assert reloaded is not index
+    assert reloaded.signature == index.signature
+    assert reloaded.nearest(43.0, -2.0)[2][0] == index.nearest(43.0, -2.0)[2][0]
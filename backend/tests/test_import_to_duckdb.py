@@ -0,0 +1,76 @@
+"""
+Tests pour le script d'import parallèle NetCDF -> DuckDB
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from duckdb_loader import DuckDBClimateLoader
+from import_to_duckdb import import_parallel
+from models import VariableType, ExperimentType
+from tests.test_duckdb_loader import write_netcdf
+
+
+@pytest.mark.parametrize("bulk_load, normalized", [(False, False), (True, False), (False, True)])
+def test_import_parallel_single_writer(tmp_path, bulk_load, normalized):
+    """Plusieurs fichiers décodés en parallèle, écrits par le processus principal"""
+    datasets_config = []
+    for member in ["r1", "r2", "r3"]:
+        path = tmp_path / f"prAdjust_{member}.nc"
+        write_netcdf(path)
+        datasets_config.append({
+            "file_path": path,
+            "variable": VariableType.PR,
+            "experiment": ExperimentType.SSP370,
+            "gcm": "CNRM-ESM2-1",
+            "rcm": "CNRM-ALADIN63-EMUL",
+            "member": member
+        })
+    # Un fichier absent ne bloque pas les autres
+    datasets_config.append({**datasets_config[0], "file_path": tmp_path / "absent.nc", "member": "r4"})
+    
+    args = SimpleNamespace(full_grid=True, max_block_mb=0.001, workers=2, queue_size=1, force=False,
+                           bulk_load=bulk_load, staging_rows=300)
+    with DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb"), read_only=False, normalized=normalized) as loader:
+        results = import_parallel(loader, datasets_config, args)
+        
+        assert sorted(name for name, _, _, _ in results) == ["prAdjust_r1.nc", "prAdjust_r2.nc", "prAdjust_r3.nc"]
+        assert all(rows == 40 * 19 for _, rows, _, _ in results)
+        members = loader.conn.execute(
+            "SELECT member, COUNT(*) FROM climate_data GROUP BY member ORDER BY member"
+        ).fetchall()
+        assert members == [("r1", 760), ("r2", 760), ("r3", 760)]
+
+
+def test_import_parallel_writer_error(tmp_path, monkeypatch):
+    """Une erreur d'écriture arrête les processus de décodage (file pleine) et est relevée"""
+    datasets_config = []
+    for member in ["r1", "r2"]:
+        path = tmp_path / f"prAdjust_{member}.nc"
+        write_netcdf(path, n_days=400)
+        datasets_config.append({
+            "file_path": path,
+            "variable": VariableType.PR,
+            "experiment": ExperimentType.SSP370,
+            "gcm": "CNRM-ESM2-1",
+            "rcm": "CNRM-ALADIN63-EMUL",
+            "member": member
+        })
+    
+    args = SimpleNamespace(full_grid=True, max_block_mb=0.001, workers=2, queue_size=1, force=False,
+                           bulk_load=True, staging_rows=300)
+    with DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb"), read_only=False) as loader:
+        def failing_merge(*args, **kwargs):
+            raise IOError("disque plein")
+        monkeypatch.setattr(loader, "merge_staging", failing_merge)
+        with pytest.raises(IOError, match="disque plein"):
+            import_parallel(loader, datasets_config, args)
+        assert not loader.conn.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_name LIKE 'climate_staging%'"
+        ).fetchall()
@@ -0,0 +1,68 @@
+"""
+Tests de l'export Parquet partitionné et de sa lecture par DuckDBClimateLoader
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pytest
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from duckdb_loader import DuckDBClimateLoader
+from models import VariableType, ExperimentType
+from parquet_store import write_netcdf_to_parquet, is_parquet_root
+from tests.test_duckdb_loader import write_netcdf, import_args
+
+
+def parquet_args(path, root, member="r1"):
+    args = import_args(path, member=member)
+    args["root"] = str(root)
+    return args
+
+
+def test_parquet_export_matches_duckdb(tmp_path):
+    """Partitions Hive zstd, réécriture d'un fichier source seul, mêmes résultats qu'une base DuckDB"""
+    root = tmp_path / "climate_data_parquet"
+    write_netcdf(tmp_path / "pr_r1.nc", n_days=800)
+    write_netcdf(tmp_path / "pr_r2.nc", n_days=400)
+    stats = write_netcdf_to_parquet(**parquet_args(tmp_path / "pr_r1.nc", root), verbose=False)
+    assert stats["rows"] == 800 * 19 and stats["files"] == 3 and not stats["skipped"]
+    write_netcdf_to_parquet(**parquet_args(tmp_path / "pr_r2.nc", root, member="r2"), verbose=False)
+    assert is_parquet_root(root)
+    
+    files = sorted(path.relative_to(root).parent.as_posix() for path in root.rglob("*.parquet"))
+    assert files[0] == "variable=pr/experiment=ssp370/member=r1/year=2015" and len(files) == 5
+    assert duckdb.execute(
+        f"SELECT DISTINCT compression FROM parquet_metadata('{root}/*/*/*/*/*.parquet')"
+    ).fetchall() == [("ZSTD",)]
+    
+    # Fichier inchangé ignoré; réécrit sans doublons avec force
+    assert write_netcdf_to_parquet(**parquet_args(tmp_path / "pr_r1.nc", root), verbose=False)["skipped"]
+    write_netcdf_to_parquet(**parquet_args(tmp_path / "pr_r1.nc", root), force=True, verbose=False)
+    assert len(list(root.rglob("*.parquet"))) == 5
+    
+    periods = [(date(2015, 1, 1), date(2015, 1, 31)), (date(2016, 3, 1), date(2016, 5, 31))]
+    with DuckDBClimateLoader(db_path=str(tmp_path / "test.duckdb"), read_only=False) as loader:
+        loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc"))
+        loader.import_netcdf_file(**import_args(tmp_path / "pr_r2.nc", member="r2"))
+        runs = loader.get_runs()
+        totals = loader.get_period_totals("pr", "ssp370", periods)
+        series = loader.get_time_series(
+            46.1, 1.2, VariableType.PR, ExperimentType.SSP370, "CNRM-ESM2-1", "CNRM-ALADIN63-EMUL", "r2"
+        )
+    
+    with DuckDBClimateLoader(db_path=str(root)) as loader:
+        assert loader.layout == "parquet"
+        assert loader.get_runs().equals(runs)
+        pd.testing.assert_frame_equal(loader.get_period_totals("pr", "ssp370", periods), totals, check_dtype=False)
+        pd.testing.assert_frame_equal(loader.get_time_series(
+            46.1, 1.2, VariableType.PR, ExperimentType.SSP370, "CNRM-ESM2-1", "CNRM-ALADIN63-EMUL", "r2"
+        ), series, check_dtype=False)
+        assert loader.get_runs("pr", "ssp585").empty
+        with pytest.raises(ValueError):
+            loader.import_netcdf_file(**import_args(tmp_path / "pr_r1.nc"))
@@ -0,0 +1,42 @@
+"""
+Tests des sommes glissantes et du minimum sur intervalle
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from range_minimum import rolling_sums, RangeMinimumIndex
+
+
+def test_rolling_sums():
+    """Fenêtre incomplète ou contenant un jour sans valeur: NaN"""
+    values = np.array([[1.0, 2.0, 3.0, np.nan, 5.0, 6.0, 7.0]])
+    np.testing.assert_array_equal(rolling_sums(values, 2), [[np.nan, 3.0, 5.0, np.nan, np.nan, 11.0, 13.0]])
+    assert np.isnan(rolling_sums(values, 10)).all()
+
+
+def test_range_minimum_matches_brute_force():
+    """Minimum sur des intervalles courts, sur plusieurs blocs ou hors de la série"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(3, 1000))
+    values[1, 200:260] = np.nan
+    values[2, :] = np.nan
+    index = RangeMinimumIndex(values, block_size=16)
+    
+    first = rng.integers(-20, 1000, size=500)
+    last = first + rng.integers(-5, 400, size=500)
+    result = index.query(first, last)
+    
+    for j, (f, l) in enumerate(zip(first, last)):
+        f, l = max(f, 0), min(l, 999)
+        for series in range(3):
+            window = values[series, f:l + 1]
+            if f > l or np.isnan(window).all():
+                assert np.isnan(result[series, j])
+            else:
+                assert result[series, j] == np.nanmin(window)
@@ -0,0 +1,84 @@
+"""
+Tests pour le décodage vectorisé des axes temporels NetCDF
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cftime
+import netCDF4 as nc
+import numpy as np
+import pytest
+
+import time_axis
+from time_axis import decode_time_axis, load_time_axis
+from climate_data import ClimateDataLoader
+from models import VariableType, ExperimentType
+
+
+@pytest.mark.parametrize("calendar", ["standard", "noleap", "360_day", "all_leap"])
+@pytest.mark.parametrize("units,scale", [("days since 1850-01-01", 1), ("hours since 1949-12-01 12:00:00", 24)])
+def test_decode_matches_cftime(calendar, units, scale):
+    """Les champs décodés sont ceux de cftime pour chaque calendrier"""
+    values = np.arange(0, 20000, 0.5) * scale
+    axis = decode_time_axis(values, units, calendar)
+    expected = cftime.num2date(values, units, calendar)
+    
+    assert np.array_equal(axis.year, [d.year for d in expected])
+    assert np.array_equal(axis.month, [d.month for d in expected])
+    assert np.array_equal(axis.day, [d.day for d in expected])
+    assert np.array_equal(axis.dayofyear, [d.dayofyr for d in expected])
+    
+    # Les dates grégoriennes n'existent que pour les jours valides (pas de 30 février)
+    valid = axis.valid
+    assert np.array_equal(axis.dates[valid], np.array(
+        [f"{d.year:04d}-{d.month:02d}-{d.day:02d}" for d, ok in zip(expected, valid) if ok], dtype="datetime64[D]"
+    ))
+    if calendar == "360_day":
+        assert not valid[(axis.month == 2) & (axis.day == 30)].any()
+
+
+def test_year_mask_and_unsupported_units():
+    """Filtrage par années vectorisé, erreurs explicites sur les unités inconnues"""
+    axis = decode_time_axis(60265 + np.arange(731), "days since 1850-01-01")
+    assert axis.year_mask(2016, 2016).sum() == 366
+    with pytest.raises(ValueError):
+        decode_time_axis([0], "months since 1850-01-01")
+
+
+def write_time_file(path: Path, calendar: str, n_days: int = 400):
+    """Petit fichier NetCDF (time × lat × lon) au calendrier donné"""
+    with nc.Dataset(path, "w") as ds:
+        ds.createDimension("time", None)
+        ds.createDimension("lat", 2)
+        ds.createDimension("lon", 2)
+        time = ds.createVariable("time", "f8", ("time",))
+        time.units = "days since 2015-01-01"
+        time.calendar = calendar
+        time[:] = np.arange(n_days)
+        ds.createVariable("lat", "f8", ("lat",))[:] = [46.0, 46.1]
+        ds.createVariable("lon", "f8", ("lon",))[:] = [1.0, 1.1]
+        ds.createVariable("prAdjust", "f4", ("time", "lat", "lon"))[:] = np.ones((n_days, 2, 2))
+
+
+def test_file_cache_shared_with_climate_data_loader(tmp_path, monkeypatch):
+    """L'axe décodé est mis en cache sur disque et réutilisé par ClimateDataLoader"""
+    path = tmp_path / "prAdjust_FR-Metro_CNRM-ESM2-1_ssp370_r1i1p1f2_CNRM-MF_CNRM-ALADIN63-EMUL_test.nc"
+    write_time_file(path, "360_day")
+    cache_dir = tmp_path / ".cache"
+    
+    axis = load_time_axis(str(path), cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("time_axis_*.npz"))) == 1
+    
+    # Nouveau processus simulé: cache mémoire vide, relecture depuis le disque sans décoder
+    monkeypatch.setattr(time_axis, "_time_axis_cache", {})
+    monkeypatch.setattr(time_axis, "decode_time_axis", lambda *args: pytest.fail("axe décodé à nouveau"))
+    loader = ClimateDataLoader(data_directory=str(tmp_path))
+    ds = loader.load_dataset(VariableType.PR, ExperimentType.SSP370, "CNRM-ESM2-1", "CNRM-ALADIN63-EMUL")
+    
+    assert ds.sizes["time"] == int(axis.valid.sum()) < 400
+    assert str(ds.time.values[0])[:10] == "2015-01-01"
+    assert ds.sel(time="2015-03").sizes["time"] == 30
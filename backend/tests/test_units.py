@@ -0,0 +1,58 @@
+"""
+Tests des conversions d'unités
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import VariableType
+from units import MM_PER_DAY, CELSIUS, NATIVE_UNITS, normalize_unit, unit_conversion, convert_units, convert_units_sql
+
+
+def test_convert_units():
+    """Conversions kg/m²/s <-> mm/jour et K <-> °C, identité si même unité"""
+    np.testing.assert_allclose(convert_units(np.array([1e-5, 0.0]), "kg m-2 s-1", MM_PER_DAY), [0.864, 0.0])
+    assert convert_units(273.15, "K", "°C") == pytest.approx(0.0)
+    assert convert_units(20.0, "degC", "K") == pytest.approx(293.15)
+    assert unit_conversion("mm/day", MM_PER_DAY) == (1.0, 0.0)
+    assert normalize_unit("Celsius") == CELSIUS
+    with pytest.raises(ValueError):
+        unit_conversion("K", MM_PER_DAY)
+
+
+@pytest.mark.parametrize("unit", ["degrees_Celsius", "degree_Celsius", "degrees_C", "deg_C"])
+def test_cf_celsius_aliases(unit):
+    """Écritures CF des degrés Celsius reconnues"""
+    assert normalize_unit(unit) == CELSIUS
+    assert unit_conversion(unit, "degC") == (1.0, 0.0)
+    assert unit_conversion("K", unit) == (1.0, -273.15)
+
+
+def test_mm_per_day_aliases():
+    """Flux journaliers en kg m-2 d-1 équivalents aux mm/jour"""
+    for unit in ["mm d-1", "kg m-2 d-1", "kg m-2 day-1", "kg/m2/day"]:
+        assert normalize_unit(unit) == MM_PER_DAY
+    assert unit_conversion("kg m-2 s-1", "kg m-2 d-1") == (86400.0, 0.0)
+
+
+def test_convert_units_sql():
+    """L'expression SQL laisse la colonne intacte si aucune conversion n'est nécessaire"""
+    assert convert_units_sql("value", MM_PER_DAY, "mm/jour") == "value"
+    assert convert_units_sql("value", "kg m-2 s-1", MM_PER_DAY) == "(value * 86400.0)"
+    assert convert_units_sql("value", "K", CELSIUS) == "(value + -273.15)"
+
+
+def test_units_without_models():
+    """Tables d'unités par nom de variable: units (et climate_data) s'importent sans models"""
+    assert NATIVE_UNITS[VariableType.PR] == NATIVE_UNITS["pr"] == "kg m-2 s-1"
+    code = "import sys; sys.modules['models'] = None; import climate_data; print(climate_data.MM_PER_DAY)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == MM_PER_DAY
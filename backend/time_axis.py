@@ -0,0 +1,263 @@
+"""
+Décodage vectorisé des axes temporels NetCDF (CF "<unités> since <date>")
+Calendriers standard, noleap/365_day, all_leap/366_day et 360_day
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Dict, Tuple, Callable
+import hashlib
+import logging
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Durée d'une unité de temps CF, en jours
+TIME_UNIT_DAYS = {
+    "days": 1.0, "day": 1.0, "d": 1.0,
+    "hours": 1 / 24, "hour": 1 / 24, "h": 1 / 24,
+    "minutes": 1 / 1440, "minute": 1 / 1440, "min": 1 / 1440,
+    "seconds": 1 / 86400, "second": 1 / 86400, "s": 1 / 86400, "sec": 1 / 86400,
+}
+
+# Noms de calendriers CF -> calendrier de décodage
+CALENDAR_ALIASES = {
+    "standard": "standard",
+    "gregorian": "standard",
+    "proleptic_gregorian": "standard",
+    "noleap": "noleap",
+    "365_day": "noleap",
+    "all_leap": "all_leap",
+    "366_day": "all_leap",
+    "360_day": "360_day",
+}
+
+# Longueur des mois des calendriers des modèles (années toutes identiques)
+MODEL_MONTH_DAYS = {
+    "noleap": [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+    "all_leap": [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+    "360_day": [30] * 12,
+}
+
+_UNITS_PATTERN = re.compile(
+    r"^\s*(\w+)\s+since\s+(-?\d{1,4})-(\d{1,2})-(\d{1,2})"
+    r"(?:[ T]+(\d{1,2}):(\d{1,2})(?::(\d{1,2}(?:\.\d*)?))?)?",
+    re.IGNORECASE
+)
+
+# Axes déjà décodés dans ce processus, par signature de fichier
+_time_axis_cache: Dict[str, "TimeAxis"] = {}
+
+
+def parse_time_units(units: str) -> Tuple[float, Tuple[int, int, int], float]:
+    """
+    Analyse des unités CF de la forme "days since 1850-01-01 00:00:00".
+    
+    Returns:
+        Tuple (durée d'une unité en jours, (année, mois, jour) de référence,
+        fraction de jour de l'heure de référence)
+    """
+    match = _UNITS_PATTERN.match(units or "")
+    if not match or match.group(1).lower() not in TIME_UNIT_DAYS:
+        raise ValueError(f"Unités de temps non supportées: {units!r}")
+    unit, year, month, day, hour, minute, second = match.groups()
+    day_fraction = (int(hour or 0) * 3600 + int(minute or 0) * 60 + float(second or 0)) / 86400
+    return TIME_UNIT_DAYS[unit.lower()], (int(year), int(month), int(day)), day_fraction
+
+
+def dates_from_fields(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Construit des datetime64[D] à partir de champs année/mois/jour (vectorisé).
+    
+    Returns:
+        Tuple (dates, valid) où les dates inexistantes (ex: 30 février) valent NaT
+    """
+    months = (np.asarray(year, dtype=np.int64) - 1970).astype('datetime64[Y]').astype('datetime64[M]')
+    months = months + (np.asarray(month, dtype=np.int64) - 1)
+    dates = months.astype('datetime64[D]') + (np.asarray(day, dtype=np.int64) - 1)
+    valid = dates.astype('datetime64[M]') == months
+    dates[~valid] = np.datetime64('NaT')
+    return dates, valid
+
+
+class TimeAxis:
+    """
+    Axe temporel décodé: dates datetime64[D] et champs calendaires vectorisés.
+    
+    Les champs year/month/day/dayofyear sont ceux du calendrier du fichier (jour
+    360 possible en 360_day). `dates` vaut NaT pour les jours qui n'existent pas
+    dans le calendrier grégorien (29-30 février en 360_day), signalés par `valid`.
+    """
+    
+    def __init__(
+        self,
+        dates: np.ndarray,
+        year: np.ndarray,
+        month: np.ndarray,
+        day: np.ndarray,
+        dayofyear: np.ndarray,
+        calendar: str = "standard"
+    ):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.valid = ~np.isnat(self.dates)
+        self.year = np.asarray(year, dtype=np.int32)
+        self.month = np.asarray(month, dtype=np.int32)
+        self.day = np.asarray(day, dtype=np.int32)
+        self.dayofyear = np.asarray(dayofyear, dtype=np.int32)
+        self.calendar = calendar
+    
+    @classmethod
+    def from_dates(cls, dates: np.ndarray, calendar: str = "standard") -> "TimeAxis":
+        """Construit un axe à partir de dates grégoriennes datetime64"""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        years = dates.astype('datetime64[Y]')
+        months = dates.astype('datetime64[M]')
+        return cls(
+            dates,
+            year=years.astype(np.int64) + 1970,
+            month=(months - years.astype('datetime64[M]')).astype(np.int64) + 1,
+            day=(dates - months.astype('datetime64[D]')).astype(np.int64) + 1,
+            dayofyear=(dates - years.astype('datetime64[D]')).astype(np.int64) + 1,
+            calendar=calendar
+        )
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def year_mask(self, start_year: Optional[int] = None, end_year: Optional[int] = None) -> np.ndarray:
+        """Masque des pas de temps valides compris dans [start_year, end_year]"""
+        mask = self.valid.copy()
+        if start_year is not None:
+            mask &= self.year >= start_year
+        if end_year is not None:
+            mask &= self.year <= end_year
+        return mask
+    
+    def save(self, path: Path):
+        """Sérialise l'axe dans un fichier .npz"""
+        np.savez(
+            path, dates=self.dates.astype(np.int64), year=self.year, month=self.month,
+            day=self.day, dayofyear=self.dayofyear, calendar=np.array(self.calendar)
+        )
+    
+    @classmethod
+    def load(cls, path: Path) -> "TimeAxis":
+        """Relit un axe sérialisé par save()"""
+        with np.load(path) as data:
+            return cls(
+                data["dates"].astype('datetime64[D]'), data["year"], data["month"],
+                data["day"], data["dayofyear"], calendar=str(data["calendar"])
+            )
+
+
+def decode_time_axis(values, units: str, calendar: str = "standard") -> TimeAxis:
+    """
+    Décode des valeurs de temps CF en TimeAxis, sans boucle Python.
+    
+    Les valeurs sont ramenées au jour (les heures éventuelles sont tronquées). Le
+    calendrier standard est traité comme grégorien proleptique (identique après 1582).
+    
+    Args:
+        values: Valeurs brutes de la variable time
+        units: Unités CF, ex: "days since 1850-01-01"
+        calendar: Calendrier CF (standard, gregorian, proleptic_gregorian, noleap,
+            365_day, all_leap, 366_day, 360_day)
+    
+    Returns:
+        TimeAxis décodé
+    """
+    cf_calendar = (calendar or "standard").lower()
+    if cf_calendar not in CALENDAR_ALIASES:
+        raise ValueError(f"Calendrier non supporté: {calendar}")
+    kind = CALENDAR_ALIASES[cf_calendar]
+    unit_days, (ref_year, ref_month, ref_day), ref_fraction = parse_time_units(units)
+    
+    raw = np.ma.filled(np.ma.asarray(values, dtype=np.float64), np.nan)
+    finite = np.isfinite(raw)
+    # Jours entiers écoulés depuis la date de référence (marge pour les erreurs d'arrondi)
+    offsets = np.floor(np.where(finite, raw, 0.0) * unit_days + ref_fraction + 1e-6).astype(np.int64)
+    
+    if kind == "standard":
+        reference = np.datetime64(f"{ref_year:04d}-{ref_month:02d}-{ref_day:02d}", 'D')
+        dates = reference + offsets
+        dates[~finite] = np.datetime64('NaT')
+        return TimeAxis.from_dates(dates, calendar=cf_calendar)
+    
+    # Calendriers de modèles: toutes les années ont la même longueur
+    month_days = np.array(MODEL_MONTH_DAYS[kind])
+    month_starts = np.concatenate([[0], np.cumsum(month_days)])
+    year_length = int(month_starts[-1])
+    ordinal = ref_year * year_length + month_starts[ref_month - 1] + (ref_day - 1) + offsets
+    
+    year = ordinal // year_length
+    day_index = ordinal % year_length
+    month = np.searchsorted(month_starts, day_index, side='right')
+    day = day_index - month_starts[month - 1] + 1
+    
+    dates, _ = dates_from_fields(year, month, day)
+    dates[~finite] = np.datetime64('NaT')
+    return TimeAxis(dates, year, month, day, day_index + 1, calendar=cf_calendar)
+
+
+def time_axis_signature(file_path: str) -> str:
+    """Signature d'un fichier (chemin, taille, mtime) utilisée comme clé de cache"""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def read_netcdf_time(file_path: str) -> Tuple[np.ndarray, str, str]:
+    """Lit la variable time d'un fichier NetCDF (valeurs brutes, unités, calendrier)"""
+    import netCDF4 as nc
+    with nc.Dataset(file_path, 'r') as ds:
+        nc_time = ds.variables['time']
+        return nc_time[:], nc_time.units, getattr(nc_time, 'calendar', 'standard')
+
+
+def load_time_axis(
+    file_path: str,
+    read_time: Optional[Callable[[], Tuple[np.ndarray, str, str]]] = None,
+    cache_dir: Optional[str] = None
+) -> TimeAxis:
+    """
+    Retourne l'axe temporel décodé d'un fichier, depuis le cache si possible.
+    
+    Le cache est indexé par signature de fichier (chemin, taille, mtime): en
+    mémoire pour le processus et, si cache_dir est fourni, sur disque
+    (time_axis_<signature>.npz), partagé entre l'import DuckDB et ClimateDataLoader.
+    
+    Args:
+        file_path: Chemin vers le fichier NetCDF
+        read_time: Fonction retournant (valeurs, unités, calendrier) si le fichier
+            est déjà ouvert (par défaut, lecture avec netCDF4)
+        cache_dir: Répertoire du cache disque (désactivé si None)
+    """
+    signature = time_axis_signature(file_path)
+    if signature in _time_axis_cache:
+        return _time_axis_cache[signature]
+    
+    cache_path = Path(cache_dir) / f"time_axis_{signature}.npz" if cache_dir else None
+    axis = None
+    if cache_path is not None and cache_path.exists():
+        try:
+            axis = TimeAxis.load(cache_path)
+            logger.info(f"Axe temporel chargé depuis {cache_path}")
+        except Exception as e:
+            logger.warning(f"Cache d'axe temporel illisible ({cache_path}): {e}")
+    
+    if axis is None:
+        values, units, calendar = (read_time or (lambda: read_netcdf_time(file_path)))()
+        axis = decode_time_axis(values, units, calendar)
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                axis.save(cache_path)
+            except OSError as e:
+                logger.warning(f"Impossible d'écrire le cache d'axe temporel: {e}")
+    
+    _time_axis_cache[signature] = axis
+    return axis
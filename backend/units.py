@@ -0,0 +1,114 @@
+"""
+Unités des variables climatiques et conversions linéaires entre unités
+(unités CF des fichiers NetCDF, unités agronomiques mm/jour et °C)
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+# Unités des fichiers NetCDF (conventions CF), par nom de variable (sans dépendre de models)
+NATIVE_UNITS = {
+    "pr": "kg m-2 s-1",
+    "tas": "K",
+    "tasmin": "K",
+    "tasmax": "K",
+    "rsds": "W m-2",
+    "rlds": "W m-2",
+    "huss": "kg kg-1",
+    "sfcWind": "m s-1",
+}
+
+MM_PER_DAY = "mm day-1"
+CELSIUS = "degC"
+
+# Unités agronomiques (import avec conversion): précipitations en mm/jour, températures en °C
+AGRONOMIC_UNITS = {
+    **NATIVE_UNITS,
+    "pr": MM_PER_DAY,
+    "tas": CELSIUS,
+    "tasmin": CELSIUS,
+    "tasmax": CELSIUS,
+}
+
+# Écritures usuelles -> unité de référence
+UNIT_ALIASES = {
+    "kg/m2/s": "kg m-2 s-1",
+    "kg m**-2 s**-1": "kg m-2 s-1",
+    "kg.m-2.s-1": "kg m-2 s-1",
+    "mm/day": MM_PER_DAY,
+    "mm/jour": MM_PER_DAY,
+    "mm/d": MM_PER_DAY,
+    "mm d-1": MM_PER_DAY,
+    "kg m-2 d-1": MM_PER_DAY,
+    "kg m-2 day-1": MM_PER_DAY,
+    "kg/m2/day": MM_PER_DAY,
+    "kelvin": "K",
+    "°c": CELSIUS,
+    "c": CELSIUS,
+    "celsius": CELSIUS,
+    "deg_c": CELSIUS,
+    "degree_c": CELSIUS,
+    "degrees_c": CELSIUS,
+    "degree_celsius": CELSIUS,
+    "degrees_celsius": CELSIUS,
+    "degc": CELSIUS,
+    "w/m2": "W m-2",
+    "kg/kg": "kg kg-1",
+    "m/s": "m s-1",
+}
+
+# (unité source, unité cible) -> (facteur, décalage): cible = source * facteur + décalage
+UNIT_CONVERSIONS = {
+    ("kg m-2 s-1", MM_PER_DAY): (86400.0, 0.0),
+    (MM_PER_DAY, "kg m-2 s-1"): (1 / 86400.0, 0.0),
+    ("K", CELSIUS): (1.0, -273.15),
+    (CELSIUS, "K"): (1.0, 273.15),
+}
+
+
+def normalize_unit(unit: str) -> str:
+    """Unité de référence d'une écriture d'unité ("mm/day" -> "mm day-1", "°C" -> "degC")"""
+    text = unit.strip()
+    return UNIT_ALIASES.get(text.lower(), text)
+
+
+def unit_conversion(from_unit: str, to_unit: str) -> Tuple[float, float]:
+    """
+    Facteur et décalage pour passer d'une unité à l'autre.
+    
+    Returns:
+        Tuple (facteur, décalage) tel que cible = source * facteur + décalage
+    
+    Raises:
+        ValueError: Si la conversion n'est pas connue
+    """
+    from_unit, to_unit = normalize_unit(from_unit), normalize_unit(to_unit)
+    if from_unit == to_unit:
+        return 1.0, 0.0
+    try:
+        return UNIT_CONVERSIONS[(from_unit, to_unit)]
+    except KeyError:
+        raise ValueError(f"Conversion d'unité non supportée: {from_unit} -> {to_unit}") from None
+
+
+def convert_units(values, from_unit: str, to_unit: str):
+    """Convertit des valeurs (scalaire, tableau numpy, DataArray xarray) vers une autre unité"""
+    factor, offset = unit_conversion(from_unit, to_unit)
+    if factor == 1.0 and offset == 0.0:
+        return values
+    if offset == 0.0:
+        return values * factor
+    return values * factor + offset
+
+
+def convert_units_sql(column: str, from_unit: str, to_unit: str) -> str:
+    """Expression SQL convertissant column vers une autre unité (column seule si identique)"""
+    factor, offset = unit_conversion(from_unit, to_unit)
+    if factor == 1.0 and offset == 0.0:
+        return column
+    if offset == 0.0:
+        return f"({column} * {factor!r})"
+    if factor == 1.0:
+        return f"({column} + {offset!r})"
+    return f"({column} * {factor!r} + {offset!r})"